@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+
+"""
+This module provides a scheduler for running a batch of calculations (e.g. one
+for each of many input files) in parallel, with each calculation isolated in
+its own process so that a failure or hang in one does not affect the others.
+"""
+
+# Standard library imports
+import sys
+import json
+import time
+import traceback
+import multiprocessing as mp
+from multiprocessing.connection import wait
+from collections import deque
+
+
+def mp_context():
+    """ Return multiprocessing context to use for running jobs
+
+    Where available, processes are forked so that data passed to the jobs
+    (e.g. weather data) is shared with them without being copied for each job.
+    """
+    if 'fork' in mp.get_all_start_methods():
+        return mp.get_context('fork')
+    return mp.get_context()
+
+def run_job(func, job, shared_args, conn):
+    """ Run a single job and send outcome to parent process
+
+    Arguments:
+    func        -- function to call for the job
+    job         -- dictionary of keyword arguments for func
+    shared_args -- dictionary of keyword arguments shared by all jobs
+    conn        -- connection to parent process
+    """
+    try:
+        func(**shared_args, **job)
+        conn.send(('success', None))
+    except BaseException:
+        conn.send(('failed', traceback.format_exc()))
+    finally:
+        conn.close()
+
+def run_jobs(
+        func,
+        jobs,
+        processes,
+        shared_args=None,
+        timeout=None,
+        retries=0,
+        manifest_filename=None,
+        job_name_key='inp_filename',
+        ):
+    """ Run jobs in parallel and return list of manifest entries, one per job
+
+    Arguments:
+    func              -- function to call for each job
+    jobs              -- list of dictionaries, each containing the keyword
+                         arguments for func for one job
+    processes         -- maximum number of jobs to run simultaneously
+    shared_args       -- dictionary of keyword arguments passed to func for
+                         every job (e.g. weather data). These are passed to the
+                         job processes without being pickled where the platform
+                         supports forking processes
+    timeout           -- maximum run time for each attempt at a job, in seconds
+                         (None for no limit). Jobs exceeding this are terminated
+    retries           -- number of times to retry a failed or timed-out job
+    manifest_filename -- path of JSON file to write manifest to (None to skip)
+    job_name_key      -- key of job dictionary to use to identify job in
+                         progress reports
+
+    Each manifest entry records the job index and name, its outcome
+    ('success', 'failed' or 'timeout'), the number of attempts, the run time
+    of the last attempt and the error message (if any).
+    """
+    if processes < 1:
+        sys.exit('ERROR: Number of processes for batch run must be at least 1')
+    if shared_args is None:
+        shared_args = {}
+    ctx = mp_context()
+
+    manifest = [None] * len(jobs)
+    # Queue of (job index, attempt no.) still to be started
+    pending = deque((job_idx, 1) for job_idx in range(len(jobs)))
+    # Jobs currently running, keyed by connection to job process. Connections
+    # become ready when the job sends its outcome or the process exits
+    running = {}
+    no_of_jobs_complete = 0
+
+    while len(pending) > 0 or len(running) > 0:
+        # Start jobs until the maximum number of simultaneous jobs is reached
+        while len(pending) > 0 and len(running) < processes:
+            job_idx, attempt = pending.popleft()
+            conn_recv, conn_send = ctx.Pipe(duplex=False)
+            process = ctx.Process(
+                target=run_job,
+                args=(func, jobs[job_idx], shared_args, conn_send),
+                )
+            process.start()
+            conn_send.close()
+            running[conn_recv] = (job_idx, attempt, process, time.monotonic())
+
+        # Wait until a job finishes or the earliest deadline is reached
+        wait_time = None
+        if timeout is not None:
+            time_now = time.monotonic()
+            wait_time = max(
+                0.0,
+                min(time_start + timeout - time_now for _, _, _, time_start in running.values()),
+                )
+        finished = wait(list(running.keys()), timeout=wait_time)
+
+        time_now = time.monotonic()
+        for conn_recv in list(running.keys()):
+            job_idx, attempt, process, time_start = running[conn_recv]
+            if conn_recv in finished:
+                try:
+                    outcome, error = conn_recv.recv()
+                except EOFError:
+                    # Process exited without reporting outcome (e.g. crashed)
+                    outcome = 'failed'
+                    error = None
+                process.join()
+                if error is None and outcome == 'failed':
+                    error = 'Process exited with code ' + str(process.exitcode)
+            elif timeout is not None and time_now - time_start >= timeout:
+                process.kill()
+                process.join()
+                outcome = 'timeout'
+                error = 'Exceeded time limit of ' + str(timeout) + ' s'
+            else:
+                continue
+
+            conn_recv.close()
+            del running[conn_recv]
+
+            job_name = str(jobs[job_idx].get(job_name_key, job_idx))
+            if outcome != 'success' and attempt <= retries:
+                print('Retrying ' + job_name + ' (' + outcome + ' on attempt '
+                      + str(attempt) + ')')
+                pending.append((job_idx, attempt + 1))
+                continue
+
+            no_of_jobs_complete += 1
+            print('[' + str(no_of_jobs_complete) + '/' + str(len(jobs)) + '] '
+                  + outcome + ': ' + job_name)
+            if error is not None:
+                print(error, file=sys.stderr)
+            manifest[job_idx] = {
+                'job': job_idx,
+                'name': job_name,
+                'outcome': outcome,
+                'attempts': attempt,
+                'run_time': time_now - time_start,
+                'error': error,
+                }
+
+    if manifest_filename is not None:
+        with open(manifest_filename, 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent=4)
+
+    return manifest
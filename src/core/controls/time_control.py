@@ -6,9 +6,11 @@ This module provides objects to model time controls.
 
 # Standard library imports
 import sys
-from heapq import nsmallest
 from math import ceil
 
+# Third-party imports
+import numpy as np
+
 # Local imports
 import core.units as units
 
@@ -29,10 +31,12 @@ class OnOffTimeControl:
         self.__simulation_time = simulation_time
         self.__start_day = start_day
         self.__time_series_step = time_series_step
+        self.__schedule_idx \
+            = simulation_time.time_series_idx_array(start_day, time_series_step)
 
     def is_on(self):
         """ Return true if control will allow system to run """
-        return self.__schedule[self.__simulation_time.time_series_idx(self.__start_day, self.__time_series_step)]
+        return self.__schedule[self.__schedule_idx[self.__simulation_time.index()]]
 
 
 class ToUChargeControl:
@@ -54,10 +58,12 @@ class ToUChargeControl:
         self.__start_day = start_day
         self.__time_series_step = time_series_step
         self.__charge_level = charge_level
+        self.__schedule_idx \
+            = simulation_time.time_series_idx_array(start_day, time_series_step)
 
     def is_on(self):
         """ Return true if control will allow system to run """
-        return self.__schedule[self.__simulation_time.time_series_idx(self.__start_day, self.__time_series_step)]
+        return self.__schedule[self.__schedule_idx[self.__simulation_time.index()]]
 
     def target_charge(self):
         """ Return the charge level value from the list given in inputs; one value per day """
@@ -89,43 +95,46 @@ class OnOffCostMinimisingTimeControl:
         self.__start_day = start_day
         self.__time_series_step = time_series_step
         self.__time_on_daily = time_on_daily
+        self.__schedule_idx \
+            = simulation_time.time_series_idx_array(start_day, time_series_step)
 
         timesteps_per_day = int(units.hours_per_day / time_series_step)
         timesteps_on_daily = int(time_on_daily / time_series_step)
         time_series_len_days = ceil(len(schedule) * time_series_step / units.hours_per_day)
 
-        # For each day of schedule, find the specified number of hours with the lowest cost
-        self.__schedule = []
-        for day in range(0, time_series_len_days):
-            # Get part of the schedule for current day
-            schedule_day_start = day * timesteps_per_day
-            schedule_day_end = schedule_day_start + timesteps_per_day
-            schedule_day = schedule[schedule_day_start : schedule_day_end]
-
-            # Find required number of timesteps with lowest costs
-            schedule_day_cost_lowest = sorted(set(nsmallest(timesteps_on_daily, schedule_day)))
-
-            # Initialise boolean schedule for day
-            schedule_onoff_day = [False] * timesteps_per_day
-
-            # Set lowest cost times to True, then next lowest etc. until required
-            # number of timesteps have been set to True
-            assert len(schedule_onoff_day) == len(schedule_day)
-            timesteps_to_be_allocated = timesteps_on_daily
-            for cost in schedule_day_cost_lowest:
-                for idx, entry in enumerate(schedule_day):
-                    if timesteps_to_be_allocated < 1:
-                        break
-                    if entry == cost:
-                        schedule_onoff_day[idx] = True
-                        timesteps_to_be_allocated -= 1
-
-            # Add day of schedule to overall
-            self.__schedule.extend(schedule_onoff_day)
+        # Arrange schedule as one row per day
+        assert len(schedule) == time_series_len_days * timesteps_per_day
+        schedule_days = np.array(schedule, dtype=float).reshape(
+            (time_series_len_days, timesteps_per_day),
+            )
+
+        # For each day of schedule, find the specified number of timesteps with
+        # the lowest cost. All timesteps cheaper than the highest cost selected
+        # are set to True, then timesteps at the highest cost selected are set
+        # to True, earliest first, until the required number have been set
+        timesteps_on_daily = min(max(timesteps_on_daily, 0), timesteps_per_day)
+        if timesteps_on_daily == 0:
+            schedule_onoff = np.zeros(schedule_days.shape, dtype=bool)
+        elif timesteps_on_daily == timesteps_per_day:
+            schedule_onoff = np.ones(schedule_days.shape, dtype=bool)
+        else:
+            cost_highest_on = np.partition(
+                schedule_days,
+                timesteps_on_daily - 1,
+                axis=1,
+                )[:, timesteps_on_daily - 1 : timesteps_on_daily]
+            cost_lower = schedule_days < cost_highest_on
+            cost_equal = schedule_days == cost_highest_on
+            timesteps_equal_on \
+                = timesteps_on_daily - np.sum(cost_lower, axis=1, keepdims=True)
+            schedule_onoff \
+                = cost_lower | (cost_equal & (np.cumsum(cost_equal, axis=1) <= timesteps_equal_on))
+
+        self.__schedule = schedule_onoff.ravel().tolist()
 
     def is_on(self):
         """ Return true if control will allow system to run """
-        return self.__schedule[self.__simulation_time.time_series_idx(self.__start_day, self.__time_series_step)]
+        return self.__schedule[self.__schedule_idx[self.__simulation_time.index()]]
 
 
 class SetpointTimeControl:
@@ -165,67 +174,44 @@ class SetpointTimeControl:
         self.__default_to_max = default_to_max
         self.__timesteps_advstart \
             = round(duration_advanced_start / self.__simulation_time.timestep())
-
-    def in_required_period(self):
-        """ Return true if current time is inside specified time for heating/cooling
-        
-        (not including timesteps where system is only on due to min or max
-        setpoint or advanced start)
+        self.__schedule_idx \
+            = simulation_time.time_series_idx_array(start_day, time_series_step)
+
+        # Results of each function below depend only on the schedule entry for
+        # the current timestep (and entries following it, for advanced start),
+        # so are calculated for every schedule entry here rather than on every
+        # call
+        setpnt_advstart = self.__setpoints_incl_advanced_start()
+        self.__is_on = [
+            setpnt is not None or setpoint_min is not None or setpoint_max is not None
+            for setpnt in setpnt_advstart
+            ]
+        self.__setpnt = [self.__limit_setpnt(setpnt) for setpnt in setpnt_advstart]
+
+    def __setpoints_incl_advanced_start(self):
+        """ Return list of setpoints for each schedule entry, where entries
+        with no setpoint take the setpoint from the start of the following
+        heating period, if this starts within the duration of the warmup period
+        """
+        setpnt_advstart = list(self.__schedule)
+        next_setpnt_idx = None
+        # Work backwards through the schedule so that the start of the next
+        # heating period is always known
+        for schedule_idx in reversed(range(len(self.__schedule))):
+            if self.__schedule[schedule_idx] is not None:
+                next_setpnt_idx = schedule_idx
+            elif next_setpnt_idx is not None \
+            and next_setpnt_idx - schedule_idx <= self.__timesteps_advstart:
+                setpnt_advstart[schedule_idx] = self.__schedule[next_setpnt_idx]
+        return setpnt_advstart
+
+    def __limit_setpnt(self, setpnt):
+        """ Return setpoint after applying min/max limits
+
+        If no setpoint value is in the schedule and both min and max are set
+        but which to use by default is not specified, None is returned (and
+        the error is reported if the setpoint is requested).
         """
-        schedule_idx = self.__simulation_time.time_series_idx(
-            self.__start_day,
-            self.__time_series_step,
-            )
-        setpnt = self.__schedule[schedule_idx]
-        return (setpnt is not None)
-
-    def is_on(self):
-        """ Return true if control will allow system to run """
-        schedule_idx = self.__simulation_time.time_series_idx(
-            self.__start_day,
-            self.__time_series_step,
-            )
-        setpnt = self.__schedule[schedule_idx]
-
-        if setpnt is None:
-            # Look ahead for duration of warmup period: system is on if setpoint
-            # is not None heating period if found
-            for timesteps_ahead in range(1, 1 + self.__timesteps_advstart):
-                if len(self.__schedule) <= schedule_idx + timesteps_ahead:
-                    # Stop looking ahead if we have reached the end of the schedule
-                    break
-                if self.__schedule[schedule_idx + timesteps_ahead] is not None:
-                    # If heating period starts within duration of warmup period
-                    # from now, system is on
-                    return True
-
-        # For this type of control, system is always on if min or max are set
-        if setpnt is None and self.__setpoint_min is None and self.__setpoint_max is None:
-            return False
-        else:
-            return True
-
-    def setpnt(self):
-        """ Return setpoint for the current timestep """
-        schedule_idx = self.__simulation_time.time_series_idx(
-            self.__start_day,
-            self.__time_series_step,
-            )
-        setpnt = self.__schedule[schedule_idx]
-
-        if setpnt is None:
-            # Look ahead for duration of warmup period and use setpoint from
-            # start of heating period if found
-            for timesteps_ahead in range(1, 1 + self.__timesteps_advstart):
-                if len(self.__schedule) <= schedule_idx + timesteps_ahead:
-                    # Stop looking ahead if we have reached the end of the schedule
-                    break
-                if self.__schedule[schedule_idx + timesteps_ahead] is not None:
-                    # If heating period starts within duration of warmup period
-                    # from now, use setpoint from start of heating period
-                    setpnt = self.__schedule[schedule_idx + timesteps_ahead]
-                    break
-
         if setpnt is None:
             # If no setpoint value is in the schedule, use the min/max if set
             if self.__setpoint_max is None and self.__setpoint_min is None:
@@ -236,8 +222,7 @@ class SetpointTimeControl:
                 setpnt = self.__setpoint_min
             else: # min and max both set
                 if self.__default_to_max is None:
-                    sys.exit('ERROR: Setpoint not set but min and max both set, '
-                             'and which to use by default not specified')
+                    pass # Error reported in setpnt function
                 elif self.__default_to_max:
                     setpnt = self.__setpoint_max
                 else:
@@ -250,3 +235,25 @@ class SetpointTimeControl:
             if self.__setpoint_min is not None:
                 setpnt = max(self.__setpoint_min, setpnt)
         return setpnt
+
+    def in_required_period(self):
+        """ Return true if current time is inside specified time for heating/cooling
+        
+        (not including timesteps where system is only on due to min or max
+        setpoint or advanced start)
+        """
+        schedule_idx = self.__schedule_idx[self.__simulation_time.index()]
+        return (self.__schedule[schedule_idx] is not None)
+
+    def is_on(self):
+        """ Return true if control will allow system to run """
+        return self.__is_on[self.__schedule_idx[self.__simulation_time.index()]]
+
+    def setpnt(self):
+        """ Return setpoint for the current timestep """
+        setpnt = self.__setpnt[self.__schedule_idx[self.__simulation_time.index()]]
+        if setpnt is None \
+        and self.__setpoint_min is not None and self.__setpoint_max is not None:
+            sys.exit('ERROR: Setpoint not set but min and max both set, '
+                     'and which to use by default not specified')
+        return setpnt
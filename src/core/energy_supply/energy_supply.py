@@ -66,6 +66,12 @@ class EnergySupplyConnection:
         """ Forwards the amount of energy demanded (in kWh) to the relevant EnergySupply object """
         self.__energy_supply._EnergySupply__demand_energy(self.__end_user_name, amount_demanded)
 
+    def demand_energy_series(self, amounts_demanded):
+        """ Forwards the amount of energy demanded (in kWh) in every timestep of
+        the simulation to the relevant EnergySupply object, for demand that is
+        known before the simulation is run """
+        self.__energy_supply._EnergySupply__demand_energy_series(self.__end_user_name, amounts_demanded)
+
     def supply_energy(self, amount_produced):
         """ Forwards the amount of energy produced (in kWh) to the relevant EnergySupply object """
         self.__energy_supply._EnergySupply__supply_energy(self.__end_user_name, amount_produced)
@@ -73,13 +79,37 @@ class EnergySupplyConnection:
     def fuel_type(self):
         return self.__energy_supply.fuel_type()
 
+class EnergySupplyEndUserResults:
+    """ An object to read the results for an end user of an energy supply
+
+    Indexing by timestep returns the total of the demand and energy out
+    recorded for the end user so far, as for EnergySupply.results_by_end_user
+    """
+
+    def __init__(self, demand, energy_out):
+        """ Construct an EnergySupplyEndUserResults object
+
+        Arguments:
+        demand     -- list of demand for the end user at each timestep
+        energy_out -- list of energy out for the end user at each timestep
+        """
+        self.__demand = demand
+        self.__energy_out = energy_out
+
+    def __getitem__(self, t_idx):
+        return float(self.__demand[t_idx] + self.__energy_out[t_idx])
+
+    def __len__(self):
+        return len(self.__demand)
+
+
 class EnergySupply:
     """ An object to represent an energy supply, and to report energy consumption """
     # TODO Do we need a subclass for electricity supply specifically, to
     #      account for generators? Or do we just handle it in this object and
     #      have an empty list of generators when not electricity?
 
-    def __init__(self, fuel_type, simulation_time, elec_battery = None):
+    def __init__(self, fuel_type, simulation_time, elec_battery = None, summary_only = False):
         """ Construct an EnergySupply object
 
         Arguments:
@@ -87,16 +117,29 @@ class EnergySupply:
                               TODO Consider replacing with fuel_type object
         simulation_time    -- reference to SimulationTime object
         elec_battery       -- reference to an ElectricBattery object
+        summary_only       -- if True, results are only recorded for the current
+                              timestep and added to totals over the simulation
+                              by the timestep_end function, and the functions
+                              that return results return lists with a single
+                              element holding the total
 
         Other variables:
         demand_total       -- list to hold total demand on this energy supply at each timestep
         demand_by_end_user -- dictionary of lists to hold demand from each end user on this
                               energy supply at each timestep
+        peak_net_import    -- tuple of highest net import (i.e. import plus export)
+                              in any timestep so far and index of that timestep
         """
         self.__fuel_type          = Fuel_code.from_string(fuel_type)
         self.__simulation_time    = simulation_time
         self.__elec_battery       = elec_battery
         self.__diverter = None
+        self.__summary_only       = summary_only
+        self.__peak_net_import    = None
+        # Demand registered for every timestep in advance, by end user (only
+        # needed in summary-only mode, where it is added at the start of each
+        # timestep)
+        self.__demand_series_by_end_user = {}
 
         self.__demand_total       = self.__init_demand_list()
         self.__demand_by_end_user = {}
@@ -109,12 +152,38 @@ class EnergySupply:
         self.__energy_diverted = self.__init_demand_list()
         self.__energy_generated_consumed = self.__init_demand_list()
 
+        if summary_only:
+            # Totals over the simulation of the results recorded in each timestep
+            self.__totals = {
+                name: self.__init_demand_list()
+                for name in (
+                    'demand_total',
+                    'beta_factor',
+                    'supply_surplus',
+                    'demand_not_met',
+                    'energy_into_battery',
+                    'energy_out_of_battery',
+                    'energy_diverted',
+                    'energy_generated_consumed',
+                    )
+                }
+            self.__totals_by_end_user = {}
+
     def __init_demand_list(self):
-        """ Initialise zeroed list of demand figures (one list entry for each timestep) """
+        """ Initialise zeroed list of demand figures (one list entry for each
+        timestep, or a single entry in summary-only mode) """
         # TODO Consider moving this function to SimulationTime object if it
         #      turns out to be more generally useful.
+        if self.__summary_only:
+            return [0]
         return [0] * self.__simulation_time.total_steps()
 
+    def __results_index(self):
+        """ Return index of results for current timestep in lists of results """
+        if self.__summary_only:
+            return 0
+        return self.__simulation_time.index()
+
     def connection(self, end_user_name):
         """ Return an EnergySupplyConnection object and initialise list for the end user demand """
         # Check that end_user_name is not already registered/connected
@@ -124,6 +193,8 @@ class EnergySupply:
 
         self.__demand_by_end_user[end_user_name] = self.__init_demand_list()
         self.__energy_out_by_end_user[end_user_name] = self.__init_demand_list()
+        if self.__summary_only:
+            self.__totals_by_end_user[end_user_name] = self.__init_demand_list()
         return EnergySupplyConnection(self, end_user_name)
 
     def __energy_out(self, end_user_name, amount_demanded):
@@ -133,7 +204,7 @@ class EnergySupply:
                      ") not already registered by calling connection function.")
             # TODO Exit just the current case instead of whole program entirely?
 
-        t_idx = self.__simulation_time.index()
+        t_idx = self.__results_index()
         self.__energy_out_by_end_user[end_user_name][t_idx] \
             = self.__energy_out_by_end_user[end_user_name][t_idx] \
             + amount_demanded
@@ -154,12 +225,47 @@ class EnergySupply:
                      ") not already registered by calling connection function.")
             # TODO Exit just the current case instead of whole program entirely?
 
-        t_idx = self.__simulation_time.index()
+        t_idx = self.__results_index()
         self.__demand_total[t_idx] = self.__demand_total[t_idx] + amount_demanded
         self.__demand_by_end_user[end_user_name][t_idx] \
             = self.__demand_by_end_user[end_user_name][t_idx] \
             + amount_demanded
 
+    def __demand_energy_series(self, end_user_name, amounts_demanded):
+        """ Record energy demand (in kWh) for the end user specified for every
+        timestep of the simulation at once.
+
+        Note: Call via an EnergySupplyConnection object, not directly.
+        """
+        # Check that end_user_name is already connected/registered
+        if end_user_name not in self.__demand_by_end_user.keys():
+            sys.exit("Error: End user name ("+end_user_name+
+                     ") not already registered by calling connection function.")
+
+        amounts_demanded = np.asarray(amounts_demanded, dtype=float)
+        if len(amounts_demanded) != self.__simulation_time.total_steps():
+            sys.exit("Error: Demand for end user ("+end_user_name+
+                     ") must have one entry per timestep.")
+
+        if self.__summary_only:
+            # Only current timestep is held, so add the demand for the current
+            # timestep now and the demand for each later timestep when the
+            # previous timestep ends
+            self.__demand_energy(
+                end_user_name,
+                float(amounts_demanded[self.__simulation_time.index()]),
+                )
+            if end_user_name in self.__demand_series_by_end_user:
+                amounts_demanded = self.__demand_series_by_end_user[end_user_name] \
+                                 + amounts_demanded
+            self.__demand_series_by_end_user[end_user_name] = amounts_demanded
+        else:
+            # Update lists in place, as they may be referenced elsewhere
+            self.__demand_total[:] \
+                = (np.array(self.__demand_total) + amounts_demanded).tolist()
+            self.__demand_by_end_user[end_user_name][:] \
+                = (np.array(self.__demand_by_end_user[end_user_name]) + amounts_demanded).tolist()
+
     def __supply_energy(self, end_user_name, amount_produced):
         """ Record energy produced (in kWh) for the end user specified.
 
@@ -172,6 +278,8 @@ class EnergySupply:
 
     def results_total(self):
         """ Return list of the total demand on this energy source for each timestep """
+        if self.__summary_only:
+            return self.__totals['demand_total']
         return self.__demand_total
 
     def results_by_end_user(self):
@@ -179,6 +287,12 @@ class EnergySupply:
 
         Returns dictionary of lists, where dictionary keys are names of end users.
         """
+        if self.__summary_only:
+            return {
+                user_name: np.array(total)
+                for user_name, total in self.__totals_by_end_user.items()
+                }
+
         # If the keys do match then we will just return the demand by end users
         if self.__demand_by_end_user.keys() != self.__energy_out_by_end_user.keys():
             return self.__demand_by_end_user
@@ -191,27 +305,126 @@ class EnergySupply:
 
         return all_results_by_end_user
 
+    def results_by_end_user_live(self):
+        """ Return the demand from each end user on this energy source for each timestep.
+
+        Returns dictionary of EnergySupplyEndUserResults objects, where
+        dictionary keys are names of end users. Unlike results_by_end_user,
+        these reflect the results recorded so far, so can be used to read
+        results as the simulation progresses.
+        """
+        return {
+            user_name: EnergySupplyEndUserResults(
+                self.__demand_by_end_user[user_name],
+                self.__energy_out_by_end_user[user_name],
+                )
+            for user_name in self.__demand_by_end_user.keys()
+            }
+
+    def results_live(self):
+        """ Return the results recorded so far for this energy source.
+
+        Returns dictionary of lists with one entry for each timestep (in
+        summary-only mode, a single entry for the current timestep, which is
+        reset when the timestep ends), where dictionary keys are the names of
+        the results (demand_total, beta_factor, supply_surplus, demand_not_met,
+        energy_into_battery, energy_out_of_battery, energy_diverted and
+        energy_generated_consumed). As for results_by_end_user_live, these can
+        be used to read results as the simulation progresses.
+        """
+        return {
+            'demand_total': self.__demand_total,
+            'beta_factor': self.__beta_factor,
+            'supply_surplus': self.__supply_surplus,
+            'demand_not_met': self.__demand_not_met,
+            'energy_into_battery': self.__energy_into_battery,
+            'energy_out_of_battery': self.__energy_out_of_battery,
+            'energy_diverted': self.__energy_diverted,
+            'energy_generated_consumed': self.__energy_generated_consumed,
+            }
+
     def get_energy_import(self):
+        if self.__summary_only:
+            return self.__totals['demand_not_met']
         return self.__demand_not_met
 
     def get_energy_export(self):
+        if self.__summary_only:
+            return self.__totals['supply_surplus']
         return self.__supply_surplus
 
     def get_energy_generated_consumed(self):
         """ Return the amount of generated energy consumed in the building for all timesteps """
+        if self.__summary_only:
+            return self.__totals['energy_generated_consumed']
         return self.__energy_generated_consumed
 
     def get_energy_to_from_battery(self):
         """ Return the amount of generated energy sent to battery and drawn from battery """
+        if self.__summary_only:
+            return self.__totals['energy_into_battery'], self.__totals['energy_out_of_battery']
         return self.__energy_into_battery, self.__energy_out_of_battery
 
     def get_energy_diverted(self):
         """ Return the amount of generated energy diverted to minimise export """
+        if self.__summary_only:
+            return self.__totals['energy_diverted']
         return self.__energy_diverted
 
     def get_beta_factor(self):
+        """ Return beta factor for each timestep (in summary-only mode, the
+        sum of the beta factors for all timesteps) """
+        if self.__summary_only:
+            return self.__totals['beta_factor']
         return self.__beta_factor
 
+    def get_peak_net_import(self):
+        """ Return tuple of highest net import (i.e. import plus export, where
+        export is negative) in any timestep and the index of the first timestep
+        in which it occurred, or None if no timesteps have ended yet """
+        return self.__peak_net_import
+
+    def timestep_end(self):
+        """ Record results for the current timestep, once all energy demand and
+        supply for the timestep has been recorded and import and export have
+        been calculated
+
+        In summary-only mode, the results for the timestep are added to the
+        totals and reset ready for the next timestep.
+        """
+        t_idx = self.__results_index()
+        net_import = self.__demand_not_met[t_idx] + self.__supply_surplus[t_idx]
+        if self.__peak_net_import is None or net_import > self.__peak_net_import[0]:
+            self.__peak_net_import = (net_import, self.__simulation_time.index())
+
+        if not self.__summary_only:
+            return
+
+        for user_name, total in self.__totals_by_end_user.items():
+            total[0] += self.__demand_by_end_user[user_name][0] \
+                      + self.__energy_out_by_end_user[user_name][0]
+            self.__demand_by_end_user[user_name][0] = 0
+            self.__energy_out_by_end_user[user_name][0] = 0
+
+        for name, results in (
+                ('demand_total', self.__demand_total),
+                ('beta_factor', self.__beta_factor),
+                ('supply_surplus', self.__supply_surplus),
+                ('demand_not_met', self.__demand_not_met),
+                ('energy_into_battery', self.__energy_into_battery),
+                ('energy_out_of_battery', self.__energy_out_of_battery),
+                ('energy_diverted', self.__energy_diverted),
+                ('energy_generated_consumed', self.__energy_generated_consumed),
+                ):
+            self.__totals[name][0] += results[0]
+            results[0] = 0
+
+        # Add demand registered in advance for the next timestep
+        t_idx_next = self.__simulation_time.index() + 1
+        if t_idx_next < self.__simulation_time.total_steps():
+            for user_name, amounts_demanded in self.__demand_series_by_end_user.items():
+                self.__demand_energy(user_name, float(amounts_demanded[t_idx_next]))
+
     def calc_energy_import_export_betafactor(self):
         """
         calculate how much of that supply can be offset against demand.
@@ -220,7 +433,7 @@ class EnergySupply:
 
         supplies=[]
         demands=[]
-        t_idx = self.__simulation_time.index()
+        t_idx = self.__results_index()
         for user in self.__demand_by_end_user.keys():
             demand = self.__demand_by_end_user[user][t_idx]
             if demand < 0.0:
@@ -10,9 +10,11 @@ based on BS EN ISO 52010-1:2017.
 
 # Standard library imports
 import sys
-from math import cos, sin, tan, pi, asin, acos, radians, degrees, exp, sqrt, floor
+from math import cos, sin, tan, pi, asin, acos, radians, degrees, exp, sqrt
 from itertools import product
-from copy import deepcopy
+
+# Third-party imports
+import numpy as np
 
 # Local imports
 import core.units as units
@@ -38,6 +40,8 @@ class ExternalConditions:
             leap_day_included,
             direct_beam_conversion_needed,
             shading_segments,
+            precompute_solar=False,
+            solar_data=None,
             ):
         """ Construct an ExternalConditions object
 
@@ -65,6 +69,14 @@ class ExternalConditions:
                                         values are provided then no conversion is needed.
         shading_segments -- data splitting the ground plane into segments (8-36) and giving height
                             and distance to shading objects surrounding the building
+        precompute_solar -- flag to indicate whether solar irradiance and shading factors
+                            should be calculated for all timesteps at once, the first time
+                            they are requested for each surface, and looked up thereafter
+                            (rather than calculated timestep by timestep)
+        solar_data      -- dictionary of solar geometry and sky model inputs, as
+                           returned by the solar_data function of an object
+                           constructed with the same weather data, to use
+                           instead of calculating them (e.g. from a WeatherStore)
         """     
 
         self.__simulation_time  = simulation_time
@@ -87,129 +99,189 @@ class ExternalConditions:
         self.__cached_results = {}
         self.__cached_timestep = None
 
+        # Initialise cache of results for all timesteps, with
+        # (tilt, orientation) as keys (only used if precompute_solar is True)
+        self.__precompute_solar = precompute_solar
+        self.__precomputed_irradiance = {}
+        self.__precomputed_shading_factors = {}
+
         days_in_year = 366 if leap_day_included else 365
         hours_in_year = days_in_year * 24
         time_shift = self.__init_time_shift()
 
-        # Calculate earth orbit deviation for each day of year
-        earth_orbit_deviation = [
-            self.__init_earth_orbit_deviation(current_day)
-            for current_day in range(0, days_in_year)
-            ]
-        # Calculate extra terrestrial radiation
-        self.__extra_terrestrial_radiation = [
-            self.__init_extra_terrestrial_radiation(earth_orbit_deviation[current_day])
-            for current_day in range(0, days_in_year)
-            ]
-        # Calculate solar declination for each day of year
-        self.__solar_declination = [
-            self.__init_solar_declination(earth_orbit_deviation[current_day])
-            for current_day in range(0, days_in_year)
-            ]
-        # Calculate equation of time for each day of year
-        equation_of_time = [
-            self.__init_equation_of_time(current_day)
-            for current_day in range(0, days_in_year)
-            ]
-        # Calculate solar time for each hour of year
-        self.__solar_time = [
-            self.__init_solar_time(
-                floor(current_hour % 24),
-                equation_of_time[floor(current_hour / 24)],
+        # The solar geometry and sky model inputs below are calculated for the
+        # whole year (or simulation period) at once, as arrays, rather than
+        # element by element. Day numbers run from 0 to 364 (or 365) and hour
+        # numbers from 0 to 8759 (or 8783).
+        day_of_year = np.arange(days_in_year)
+        hour_of_year = np.arange(hours_in_year)
+        day_of_hour = hour_of_year // units.hours_per_day
+
+        if solar_data is None:
+            # Calculate earth orbit deviation for each day of year
+            earth_orbit_deviation = self.__init_earth_orbit_deviation(day_of_year)
+            # Calculate extra terrestrial radiation for each day of year
+            self.__extra_terrestrial_radiation \
+                = self.__init_extra_terrestrial_radiation(earth_orbit_deviation)
+            # Calculate solar declination for each day of year
+            self.__solar_declination = self.__init_solar_declination(earth_orbit_deviation)
+            # Calculate equation of time for each day of year
+            equation_of_time = self.__init_equation_of_time(day_of_year)
+            # Calculate solar time for each hour of year
+            self.__solar_time = self.__init_solar_time(
+                hour_of_year % units.hours_per_day,
+                equation_of_time[day_of_hour],
                 time_shift,
                 )
-            for current_hour in range(0, hours_in_year)
-            ]
-        # Calculate solar hour angle for each hour of year
-        self.__solar_hour_angle = [
-            self.__init_solar_hour_angle(self.__solar_time[current_hour])
-            for current_hour in range(0, hours_in_year)
-            ]
-        # Calculate solar altitude for each hour of year
-        self.__solar_altitude = [
-            self.__init_solar_altitude(
-                self.__solar_declination[floor(current_hour / 24)],
-                self.__solar_hour_angle[current_hour],
-                )
-            for current_hour in range(0, hours_in_year)
-            ]
-        # Calculate solar zenith angle for each hour of year
-        self.__solar_zenith_angle = [
-            self.__init_solar_zenith_angle(self.__solar_altitude[current_hour])
-            for current_hour in range(0, hours_in_year)
-            ]
-        # Calculate solar azimuth angle for each hour of year
-        self.__solar_azimuth_angle = [
-            self.__init_solar_azimuth_angle(
-                self.__solar_declination[floor(current_hour / 24)],
-                self.__solar_hour_angle[current_hour],
-                self.__solar_altitude[current_hour],
+            # Calculate solar hour angle for each hour of year
+            self.__solar_hour_angle = self.__init_solar_hour_angle(self.__solar_time)
+            # Calculate solar altitude for each hour of year
+            self.__solar_altitude = self.__init_solar_altitude(
+                self.__solar_declination[day_of_hour],
+                self.__solar_hour_angle,
                 )
-            for current_hour in range(0, hours_in_year)
-            ]
-        # Calculate air mass for each hour of year
-        self.__air_mass = [
-            self.__init_air_mass(self.__solar_altitude[current_hour])
-            for current_hour in range(0, hours_in_year)
-            ]
-
-        # Calculate direct beam radiation for each timestep
-        simtime = deepcopy(self.__simulation_time)
-        self.__direct_beam_radiation = [
-            self.__init_direct_beam_radiation(
-                direct_beam_radiation[simtime.time_series_idx(self.__start_day, self.__time_series_step)],
-                self.__solar_altitude[simtime.current_hour()]
+            # Calculate solar zenith angle for each hour of year
+            self.__solar_zenith_angle = self.__init_solar_zenith_angle(self.__solar_altitude)
+            # Calculate solar azimuth angle for each hour of year
+            self.__solar_azimuth_angle = self.__init_solar_azimuth_angle(
+                self.__solar_declination[day_of_hour],
+                self.__solar_hour_angle,
+                self.__solar_altitude,
                 )
-            for _, _, _ in simtime
-            ]
-        # Calculate diffuse horizontal radiation for each timestep
-        simtime = deepcopy(self.__simulation_time)
-        self.__diffuse_horizontal_radiation = [
-            diffuse_horizontal_radiation[
-                simtime.time_series_idx(self.__start_day, self.__time_series_step)
-                ]
-            for _, _, _ in simtime
-            ]
-        # Calculate dimensionless clearness parameter for each timestep
-        simtime = deepcopy(self.__simulation_time)
-        dimensionless_clearness_parameter = [
-            self.__init_dimensionless_clearness_parameter(
-                self.__diffuse_horizontal_radiation[t_idx],
-                self.__direct_beam_radiation[t_idx],
-                self.__solar_altitude[simtime.current_hour()],
+            # Calculate air mass for each hour of year
+            self.__air_mass = self.__init_air_mass(self.__solar_altitude)
+
+        else:
+            self.__extra_terrestrial_radiation = solar_data['extra_terrestrial_radiation']
+            self.__solar_declination = solar_data['solar_declination']
+            self.__solar_time = solar_data['solar_time']
+            self.__solar_hour_angle = solar_data['solar_hour_angle']
+            self.__solar_altitude = solar_data['solar_altitude']
+            self.__solar_zenith_angle = solar_data['solar_zenith_angle']
+            self.__solar_azimuth_angle = solar_data['solar_azimuth_angle']
+            self.__air_mass = solar_data['air_mass']
+
+        # Look up hour of year, day of year and index in the time series
+        # input data for each timestep
+        times = self.__simulation_time.times()
+        self.__timestep_hour = np.floor(times).astype(int)
+        self.__timestep_day = np.floor(times / units.hours_per_day).astype(int)
+        self.__timestep_series_idx = np.floor(
+            (times - self.__start_day * units.hours_per_day) / self.__time_series_step
+            ).astype(int)
+        timestep_hour = self.__timestep_hour
+        timestep_day = self.__timestep_day
+        timestep_series_idx = self.__timestep_series_idx
+        solar_altitude_timestep = self.__solar_altitude[timestep_hour]
+
+        if solar_data is not None and time_series_step == 1:
+            # Each timestep falls within the hour that corresponds to its row
+            # of the time series data, so the sky model inputs calculated for
+            # each row can be used directly
+            self.__direct_beam_radiation \
+                = np.asarray(solar_data['direct_beam_radiation'])[timestep_series_idx]
+            self.__diffuse_horizontal_radiation \
+                = np.asarray(solar_data['diffuse_horizontal_radiation'])[timestep_series_idx]
+            self.__F1 = np.asarray(solar_data['F1'])[timestep_series_idx]
+            self.__F2 = np.asarray(solar_data['F2'])[timestep_series_idx]
+        else:
+            # Calculate direct beam radiation for each timestep
+            self.__direct_beam_radiation = self.__init_direct_beam_radiation(
+                np.asarray(direct_beam_radiation, dtype=float)[timestep_series_idx],
+                solar_altitude_timestep,
                 )
-            for t_idx, _, _ in simtime
-            ]
-        # Calculate dimensionless sky brightness parameter for each timestep
-        simtime = deepcopy(self.__simulation_time)
-        dimensionless_sky_brightness_parameter = [
-            self.__init_dimensionless_sky_brightness_parameter(
-                self.__air_mass[simtime.current_hour()],
-                self.__diffuse_horizontal_radiation[t_idx],
-                self.__extra_terrestrial_radiation[simtime.current_day()],
+            # Calculate diffuse horizontal radiation for each timestep
+            self.__diffuse_horizontal_radiation \
+                = np.asarray(diffuse_horizontal_radiation, dtype=float)[timestep_series_idx]
+            # Calculate dimensionless clearness parameter for each timestep
+            dimensionless_clearness_parameter = self.__init_dimensionless_clearness_parameter(
+                self.__diffuse_horizontal_radiation,
+                self.__direct_beam_radiation,
+                solar_altitude_timestep,
                 )
-            for t_idx, _, _ in simtime
-            ]
-        # Calculate circumsolar brightness coefficient, F1 for each timestep
-        simtime = deepcopy(self.__simulation_time)
-        self.__F1 = [
-            self.__init_F1(
-                dimensionless_clearness_parameter[t_idx],
-                dimensionless_sky_brightness_parameter[t_idx],
-                self.__solar_zenith_angle[simtime.current_hour()],
+            # Calculate dimensionless sky brightness parameter for each timestep
+            dimensionless_sky_brightness_parameter \
+                = self.__init_dimensionless_sky_brightness_parameter(
+                    self.__air_mass[timestep_hour],
+                    self.__diffuse_horizontal_radiation,
+                    self.__extra_terrestrial_radiation[timestep_day],
+                    )
+            # Calculate circumsolar brightness coefficient, F1 for each timestep
+            self.__F1 = self.__init_F1(
+                dimensionless_clearness_parameter,
+                dimensionless_sky_brightness_parameter,
+                self.__solar_zenith_angle[timestep_hour],
                 )
-            for t_idx, _, _ in simtime
-            ]
-        # Calculate horizontal brightness coefficient, F2 for each timestep
-        simtime = deepcopy(self.__simulation_time)
-        self.__F2 = [
-            self.__init_F2(
-                dimensionless_clearness_parameter[t_idx],
-                dimensionless_sky_brightness_parameter[t_idx],
-                self.__solar_zenith_angle[simtime.current_hour()],
+            # Calculate horizontal brightness coefficient, F2 for each timestep
+            self.__F2 = self.__init_F2(
+                dimensionless_clearness_parameter,
+                dimensionless_sky_brightness_parameter,
+                self.__solar_zenith_angle[timestep_hour],
                 )
-            for t_idx, _, _ in simtime
-            ]
+
+    @classmethod
+    def from_weather_store(
+            cls,
+            simulation_time,
+            weather_store,
+            shading_segments,
+            precompute_solar=False,
+            ):
+        """ Construct an ExternalConditions object from a WeatherStore
+
+        Arguments:
+        simulation_time  -- reference to SimulationTime object
+        weather_store    -- reference to WeatherStore object
+        shading_segments -- data splitting the ground plane into segments (8-36) and giving height
+                            and distance to shading objects surrounding the building
+        precompute_solar -- see __init__
+
+        The weather data and derived solar geometry are used directly from the
+        store (i.e. without being copied, where the store is memory-mapped).
+        """
+        return cls(
+            simulation_time,
+            weather_store.array('air_temperatures'),
+            weather_store.array('wind_speeds'),
+            weather_store.array('diffuse_horizontal_radiation'),
+            weather_store.array('direct_beam_radiation'),
+            weather_store.array('solar_reflectivity_of_ground'),
+            weather_store.metadata('latitude'),
+            weather_store.metadata('longitude'),
+            weather_store.metadata('timezone'),
+            weather_store.metadata('start_day'),
+            weather_store.metadata('end_day'),
+            weather_store.metadata('time_series_step'),
+            weather_store.metadata('january_first'),
+            weather_store.metadata('daylight_savings'),
+            weather_store.metadata('leap_day_included'),
+            weather_store.metadata('direct_beam_conversion_needed'),
+            shading_segments,
+            precompute_solar,
+            weather_store.solar_data(),
+            )
+
+    def solar_data(self):
+        """ Return dictionary of solar geometry and sky model inputs
+
+        Solar geometry is given for each day or hour of the year and sky model
+        inputs (including direct beam radiation after any conversion to normal
+        incidence) for each timestep.
+        """
+        return {
+            'extra_terrestrial_radiation': self.__extra_terrestrial_radiation,
+            'solar_declination': self.__solar_declination,
+            'solar_time': self.__solar_time,
+            'solar_hour_angle': self.__solar_hour_angle,
+            'solar_altitude': self.__solar_altitude,
+            'solar_zenith_angle': self.__solar_zenith_angle,
+            'solar_azimuth_angle': self.__solar_azimuth_angle,
+            'air_mass': self.__air_mass,
+            'direct_beam_radiation': self.__direct_beam_radiation,
+            'diffuse_horizontal_radiation': self.__diffuse_horizontal_radiation,
+            'F1': self.__F1,
+            'F2': self.__F2,
+            }
 
     def testoutput_setup(self,tilt,orientation):
         """ print output to a file for analysis """
@@ -349,13 +421,15 @@ class ExternalConditions:
         normal beam irradiance is very sensative for tiny errors in the calculation of the 
         solar altitude."""
         if self.__direct_beam_conversion_needed:
-            sin_asol = sin(radians(solar_altitude))
+            sin_asol = np.sin(np.radians(solar_altitude))
             #prevent division by zero error. if sin_asol = 0 then the sun is lower than the
             #horizon and there will be no direct radiation to convert
-            if sin_asol > 0:
-                Gsol_b = raw_value / sin_asol
-            else:
-                Gsol_b = raw_value # TODO should this be zero?
+            with np.errstate(divide='ignore', invalid='ignore'):
+                Gsol_b = np.where(
+                    sin_asol > 0,
+                    raw_value / sin_asol,
+                    raw_value, # TODO should this be zero?
+                    )
         else:
             Gsol_b = raw_value
 
@@ -417,7 +491,11 @@ class ExternalConditions:
         # not current used
 
     def __init_earth_orbit_deviation(self, current_day):
-        """ Calculate Rdc, the earth orbit deviation, as a function of the day, in degrees """
+        """ Calculate Rdc, the earth orbit deviation, as a function of the day, in degrees
+
+        Arguments:
+        current_day -- array of day numbers, from 0 to 364 or 365
+        """
 
         nday = current_day + 1
         # nday is the day of the year, from 1 to 365 or 366 (leap year)
@@ -431,12 +509,12 @@ class ExternalConditions:
     def __init_solar_declination(self, earth_orbit_deviation):
         """ Calculate solar declination in degrees """
 
-        Rdc = radians(earth_orbit_deviation)
+        Rdc = np.radians(earth_orbit_deviation)
         # note we convert to radians for the python cos & sin inputs in formula below
 
-        solar_declination = 0.33281 - 22.984 * cos(Rdc) - 0.3499 * cos(2 * Rdc) \
-                          - 0.1398 * cos(3 * Rdc) + 3.7872 * sin(Rdc) + 0.03205 \
-                          * sin(2 * Rdc) + 0.07187 * sin(3 * Rdc)
+        solar_declination = 0.33281 - 22.984 * np.cos(Rdc) - 0.3499 * np.cos(2 * Rdc) \
+                          - 0.1398 * np.cos(3 * Rdc) + 3.7872 * np.sin(Rdc) + 0.03205 \
+                          * np.sin(2 * Rdc) + 0.07187 * np.sin(3 * Rdc)
 
         return solar_declination
 
@@ -457,18 +535,19 @@ class ExternalConditions:
         # even though the 180 / pi is converting from radians into degrees
         # this way the formula remains consistent with as written in the ISO document
 
-        if   nday < 21:
-            teq = 2.6 + 0.44 * nday
-        elif nday < 136:
-            teq = 5.2 + 9.0 * cos((nday - 43) * 0.0357)
-        elif nday < 241:
-            teq = 1.4 - 5.0 * cos((nday - 135) * 0.0449)
-        elif nday < 336:
-            teq = -6.3 - 10.0 * cos((nday - 306) * 0.036)
-        elif nday <= 366:
-            teq = 0.45 * (nday - 359)
-        else:
-            sys.exit("Day of the year ("+str(nday)+") not valid")
+        if np.any(nday > 366):
+            sys.exit("Day of the year ("+str(np.max(nday))+") not valid")
+
+        teq = np.select(
+            [nday < 21, nday < 136, nday < 241, nday < 336],
+            [
+                2.6 + 0.44 * nday,
+                5.2 + 9.0 * np.cos((nday - 43) * 0.0357),
+                1.4 - 5.0 * np.cos((nday - 135) * 0.0449),
+                -6.3 - 10.0 * np.cos((nday - 306) * 0.036),
+                ],
+            default=0.45 * (nday - 359),
+            )
 
         return teq
 
@@ -519,10 +598,8 @@ class ExternalConditions:
 
         w = (180 / 12) * (12.5 - solar_time)
 
-        if w > 180:
-            w = w - 360
-        elif w < -180:
-            w = w + 360
+        w = np.where(w > 180, w - 360, w)
+        w = np.where(w < -180, w + 360, w)
 
         return w
 
@@ -542,15 +619,13 @@ class ExternalConditions:
         # note that we convert to radians for the sin & cos python functions and then
         # we need to convert the result back to degrees after the arcsin transformation
 
-        asol = asin(
-            sin(radians(solar_declination)) * sin(radians(self.latitude())) \
-          + cos(radians(solar_declination)) * cos(radians(self.latitude())) * cos(radians(solar_hour_angle))
+        asol = np.arcsin(
+            np.sin(np.radians(solar_declination)) * sin(radians(self.latitude())) \
+          + np.cos(np.radians(solar_declination)) * cos(radians(self.latitude())) \
+          * np.cos(np.radians(solar_hour_angle))
           )
 
-        if degrees(asol) < 0.0001:
-            return (0)
-
-        return degrees(asol)
+        return np.where(np.degrees(asol) < 0.0001, 0.0, np.degrees(asol))
 
     def __init_solar_zenith_angle(self, solar_altitude):
         """  the complementary angle of the solar altitude """
@@ -569,29 +644,26 @@ class ExternalConditions:
         """
 
         sin_aux1_numerator \
-            = cos(radians(solar_declination)) \
-            * sin(radians(180 - solar_hour_angle))
+            = np.cos(np.radians(solar_declination)) \
+            * np.sin(np.radians(180 - solar_hour_angle))
 
         cos_aux1_numerator = cos(radians(self.latitude())) \
-                    * sin(radians(solar_declination)) + sin(radians(self.latitude())) \
-                    * cos(radians(solar_declination)) \
-                    * cos(radians(180 - solar_hour_angle))
+                    * np.sin(np.radians(solar_declination)) + sin(radians(self.latitude())) \
+                    * np.cos(np.radians(solar_declination)) \
+                    * np.cos(np.radians(180 - solar_hour_angle))
 
-        denominator = cos(asin(sin(radians(solar_altitude))))
+        denominator = np.cos(np.arcsin(np.sin(np.radians(solar_altitude))))
 
         sin_aux1 = sin_aux1_numerator / denominator            
         cos_aux1 = cos_aux1_numerator / denominator 
-        aux2 = degrees(asin(sin_aux1_numerator) / denominator)
+        aux2 = np.degrees(np.arcsin(sin_aux1_numerator) / denominator)
 
         # BS EN ISO 52010-1:2017. Formula 16
-        if (sin_aux1 >= 0 and cos_aux1 > 0):
-            solar_azimuth = 180 - aux2
-            if solar_azimuth < 0:
-                solar_azimuth = -solar_azimuth
-        elif cos_aux1 < 0:
-            solar_azimuth = aux2
-        else:
-            solar_azimuth = -(180 + aux2)
+        solar_azimuth = np.select(
+            [(sin_aux1 >= 0) & (cos_aux1 > 0), cos_aux1 < 0],
+            [np.abs(180 - aux2), aux2],
+            default=-(180 + aux2),
+            )
 
         return solar_azimuth
 
@@ -601,10 +673,12 @@ class ExternalConditions:
 
         sa = solar_altitude
 
-        if sa >= 10:
-            m = 1 / sin(radians(sa))
-        else:
-            m = 1 / (sin(radians(sa)) + 0.15 * (sa + 3.885)**-1.253)
+        with np.errstate(divide='ignore'):
+            m = np.where(
+                sa >= 10,
+                1 / np.sin(np.radians(sa)),
+                1 / (np.sin(np.radians(sa)) + 0.15 * (sa + 3.885)**-1.253),
+                )
 
         return m
 
@@ -740,7 +814,7 @@ class ExternalConditions:
         #when it should be the solar constant, given elsewhere as 1367
         #we use the correct version of the formula here
 
-        extra_terrestrial_radiation = 1367 * (1 + 0.033 * cos(radians(earth_orbit_deviation)))
+        extra_terrestrial_radiation = 1367 * (1 + 0.033 * np.cos(np.radians(earth_orbit_deviation)))
 
         return extra_terrestrial_radiation
 
@@ -787,6 +861,25 @@ class ExternalConditions:
 
         return brightness_coeff_dict[index][Fij]
 
+    def __brightness_coefficients(self, E, Fij):
+        """ returns brightness coefficients as a look up from Table 8 in ISO 52010,
+        for an array of dimensionless clearness parameters
+
+        Gives the same results as brightness_coefficient applied to each element.
+
+        Arguments:
+        E    -- array of dimensionless clearness parameters
+        Fij  -- the coefficient to be returned. e.g. f12 or f23
+        """
+        # Lower bound of E for clearness categories 2 to 8 (overcast to clear)
+        E_thresholds = [1.065, 1.23, 1.5, 1.95, 2.8, 4.5, 6.2]
+        # Representative value of E for each clearness category, to be passed
+        # to brightness_coefficient so that the table is only held in one place
+        E_categories = [1.0] + E_thresholds
+
+        coeffs = np.array([self.brightness_coefficient(E_cat, Fij) for E_cat in E_categories])
+        return coeffs[np.searchsorted(E_thresholds, E, side='right')]
+
     def __init_F1(self, E, delta, solar_zenith_angle):
         """ returns the circumsolar brightness coefficient, F1
 
@@ -797,13 +890,13 @@ class ExternalConditions:
         """
 
         #brightness coeffs
-        f11 = self.brightness_coefficient(E, 'f11')
-        f12 = self.brightness_coefficient(E, 'f12')
-        f13 = self.brightness_coefficient(E, 'f13')
+        f11 = self.__brightness_coefficients(E, 'f11')
+        f12 = self.__brightness_coefficients(E, 'f12')
+        f13 = self.__brightness_coefficients(E, 'f13')
         #The formulation of F1 is made so as to avoid non-physical negative values 
         #that may occur and result in unacceptable distortions if the model is used 
         #for very low solar elevation angles
-        F1 = max(0, f11 + f12 * delta + f13 * (pi * solar_zenith_angle / 180))
+        F1 = np.maximum(0, f11 + f12 * delta + f13 * (pi * solar_zenith_angle / 180))
 
         return F1
 
@@ -817,9 +910,9 @@ class ExternalConditions:
         """
 
         #horizontal brightness coefficient, F2
-        f21 = self.brightness_coefficient(E, 'f21')
-        f22 = self.brightness_coefficient(E, 'f22')
-        f23 = self.brightness_coefficient(E, 'f23')
+        f21 = self.__brightness_coefficients(E, 'f21')
+        f22 = self.__brightness_coefficients(E, 'f22')
+        f23 = self.__brightness_coefficients(E, 'f23')
         #F2 does not have the same restriction of max 0 as F1
         #from the EnergyPlus Engineering Reference:
         #The horizon brightening is assumed to be a linear source at the horizon 
@@ -844,11 +937,13 @@ class ExternalConditions:
         #constant parameter for the clearness formula, K, in rad^-3 from table 9 of ISO 52010
         K = 1.014
 
-        if Gsol_d == 0:
-            E = 999
-        else:
-            E = (((Gsol_d + Gsol_b) / Gsol_d) + K * (pi / 180 * asol)**3) \
-              / (1 + K * (pi / 180 * asol)**3)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            E = np.where(
+                Gsol_d == 0,
+                999,
+                (((Gsol_d + Gsol_b) / Gsol_d) + K * (pi / 180 * asol)**3) \
+                / (1 + K * (pi / 180 * asol)**3),
+                )
 
         return E
 
@@ -1006,13 +1101,127 @@ class ExternalConditions:
                           
         """
 
+        if self.__precompute_solar:
+            _, _, total_irradiance \
+                = self.calculated_direct_diffuse_total_irradiance(tilt, orientation)
+            return total_irradiance
+
         total_irradiance = self.calculated_direct_irradiance(tilt, orientation) \
                          + self.calculated_diffuse_irradiance(tilt, orientation)
 
         return total_irradiance
 
+    def __precompute_direct_diffuse_total_irradiance(self, tilt, orientation):
+        """ calculates the direct, diffuse and total irradiance on an inclined surface,
+        and the breakdown of the diffuse irradiance, for all timesteps at once
+
+        The calculation is the same as in calculated_direct_diffuse_total_irradiance
+        (via direct_irradiance, diffuse_irradiance and ground_reflection_irradiance)
+        but each variable is an array with one element per timestep.
+
+        Arguments:
+        tilt           -- is the tilt angle of the inclined surface from horizontal, measured 
+                          upwards facing, 0 to 180, in degrees;
+        orientation    -- is the orientation angle of the inclined surface, expressed as the 
+                          geographical azimuth angle of the horizontal projection of the inclined 
+                          surface normal, -180 to 180, in degrees;
+        """
+        timestep_hour = self.__timestep_hour
+        Gsol_d = self.__diffuse_horizontal_radiation
+        Gsol_b = self.__direct_beam_radiation
+        F1 = self.__F1
+        F2 = self.__F2
+
+        # Solar angle of incidence (see solar_angle_of_incidence function)
+        solar_declination = self.__solar_declination[self.__timestep_day]
+        sin_dec = np.sin(np.radians(solar_declination))
+        cos_dec = np.cos(np.radians(solar_declination))
+        sin_lat = sin(radians(self.latitude()))
+        cos_lat = cos(radians(self.latitude()))
+        sin_t = sin(radians(tilt))
+        cos_t = cos(radians(tilt))
+        sin_o = sin(radians(orientation))
+        cos_o = cos(radians(orientation))
+        solar_hour_angle = self.__solar_hour_angle[timestep_hour]
+        sin_sha = np.sin(np.radians(solar_hour_angle))
+        cos_sha = np.cos(np.radians(solar_hour_angle))
+
+        solar_angle_of_incidence = np.degrees(np.arccos( \
+                                   sin_dec * sin_lat * cos_t \
+                                 - sin_dec * cos_lat * sin_t * cos_o \
+                                 + cos_dec * cos_lat * cos_t * cos_sha \
+                                 + cos_dec * sin_lat * sin_t * cos_o * cos_sha \
+                                 + cos_dec * sin_t * sin_o * sin_sha \
+                                 ))
+        cos_aoi = np.cos(np.radians(solar_angle_of_incidence))
+
+        # Direct irradiance (see direct_irradiance function)
+        direct_irr = np.maximum(0, Gsol_b * cos_aoi)
+
+        # Diffuse irradiance (see diffuse_irradiance, circumsolar_irradiance
+        # and a_over_b functions)
+        a = np.maximum(0, cos_aoi)
+        b = np.maximum(
+            cos(radians(85)),
+            np.cos(np.radians(self.__solar_zenith_angle[timestep_hour])),
+            )
+        diffuse_irr_sky = Gsol_d * (1 - F1) * ((1 + cos(radians(tilt))) / 2)
+        diffuse_irr_circumsolar = Gsol_d * F1 * (a / b)
+        diffuse_irr_horiz = Gsol_d * F2 * sin(radians(tilt))
+        diffuse_irr_total = diffuse_irr_sky + diffuse_irr_circumsolar + diffuse_irr_horiz
+
+        # Ground reflection irradiance (see ground_reflection_irradiance function)
+        asol = np.radians(self.__solar_altitude[timestep_hour])
+        solar_reflectivity_of_ground \
+            = np.asarray(self.__solar_reflectivity_of_ground)[self.__timestep_series_idx]
+        ground_refl_irr = (Gsol_d + Gsol_b * np.sin(asol)) * solar_reflectivity_of_ground \
+                        * ((1 - cos(radians(tilt))) / 2)
+
+        calculated_direct = direct_irr + diffuse_irr_circumsolar
+        calculated_diffuse = diffuse_irr_total \
+                           - diffuse_irr_circumsolar \
+                           + ground_refl_irr
+        total_irradiance = calculated_direct \
+                         + calculated_diffuse
+
+        return {
+            'calculated_direct': calculated_direct,
+            'calculated_diffuse': calculated_diffuse,
+            'total_irradiance': total_irradiance,
+            'diffuse_res_breakdown': {
+                'sky': diffuse_irr_sky,
+                'circumsolar': diffuse_irr_circumsolar,
+                'horiz': diffuse_irr_horiz,
+                'ground_refl': ground_refl_irr,
+                },
+            }
+
+    def __precomputed_direct_diffuse_total_irradiance(self, tilt, orientation):
+        """ returns the direct, diffuse and total irradiance on an inclined surface
+        for all timesteps, calculating them if this tilt and orientation has not
+        already been calculated """
+        if (tilt, orientation) not in self.__precomputed_irradiance.keys():
+            self.__precomputed_irradiance[(tilt, orientation)] \
+                = self.__precompute_direct_diffuse_total_irradiance(tilt, orientation)
+        return self.__precomputed_irradiance[(tilt, orientation)]
+
     def calculated_direct_diffuse_total_irradiance(self, tilt, orientation, diffuse_breakdown=False):
         t_idx = self.__simulation_time.index()
+
+        if self.__precompute_solar:
+            results = self.__precomputed_direct_diffuse_total_irradiance(tilt, orientation)
+            calculated_direct = results['calculated_direct'][t_idx]
+            calculated_diffuse = results['calculated_diffuse'][t_idx]
+            total_irradiance = results['total_irradiance'][t_idx]
+            if diffuse_breakdown:
+                diffuse_res_breakdown = {
+                    component: values[t_idx]
+                    for component, values in results['diffuse_res_breakdown'].items()
+                    }
+                return calculated_direct, calculated_diffuse, total_irradiance, diffuse_res_breakdown
+            else:
+                return calculated_direct, calculated_diffuse, total_irradiance
+
         if t_idx != self.__cached_timestep:
             # If we have moved on to a new timestep, then clear the cached results
             self.__cached_results = {}
@@ -1136,7 +1345,8 @@ class ExternalConditions:
                          and the shading overhang, q, in segment i, in m
         """
 
-        Hshade = max(0, Hk + Hkbase - Hovh + Lkovh * tan(radians(self.solar_altitude())))
+        current_hour = self.__simulation_time.current_hour()
+        Hshade = max(0, Hk + Hkbase - Hovh + Lkovh * tan(radians(self.__solar_altitude[current_hour])))
         return Hshade
 
     def direct_shading_reduction_factor(self, base_height, height, width, orientation, window_shading):
@@ -1280,6 +1490,44 @@ class ExternalConditions:
         diffuse_irr_ref = diffuse_breakdown['ground_refl']
         diffuse_irr_total = diffuse_irr_sky + diffuse_irr_hor + diffuse_irr_ref
 
+        F_sh_dif_ref_list = self.__diffuse_shading_factors_sky_ground(
+            tilt,
+            height,
+            width,
+            window_shading,
+            )
+
+        #calculate the diffuse shading factor for each combination of overhangs
+        #and fins and keep the largest one
+        Fdiff_list = []
+        for F_sh_dif, F_sh_ref in F_sh_dif_ref_list:
+            Fdiff = ( F_sh_dif * (diffuse_irr_sky + diffuse_irr_hor)
+                    + F_sh_ref * diffuse_irr_ref
+                    ) \
+                  / diffuse_irr_total
+            Fdiff_list.append(Fdiff)
+
+        Fdiff = max(Fdiff_list)
+
+        return Fdiff
+
+    def __diffuse_shading_factors_sky_ground(self, tilt, height, width, window_shading):
+        """ calculates the shading factors for diffuse radiation from the sky
+        and for radiation reflected from the ground, due to external shading
+        objects, for each combination of overhangs and side fins
+
+        These depend only on the geometry of the shaded surface and the shading
+        objects, not on the position of the sun.
+
+        Arguments:
+        tilt           -- is the tilt angle of the inclined surface from horizontal, measured 
+                          upwards facing, 0 to 180, in degrees;
+        height         -- is the height of the shaded surface (if surface is tilted then
+                          this must be the vertical projection of the height), in m
+        width          -- is the width of the shaded surface, in m
+        window_shading -- data on overhangs and side fins associated to this building element
+                          includes the shading object type, depth, and distance from element
+        """
         # TODO Calculate shading from distant objects (PD CEN ISO/TR 52016-2:2017 Section F.6.2)
         # TODO Loop over segments
         # TODO     Calculate sky-diffuse shading factor for the segment
@@ -1309,9 +1557,10 @@ class ExternalConditions:
         #      F_w_sky when alpha = 0
         beta = radians(tilt)
 
-        #create lists of diffuse shading factors to keep the largest one
-        #in case there are multiple shading objects
-        Fdiff_list = []
+        #create list of diffuse shading factors for sky and ground reflected
+        #radiation so that the largest can be kept in case there are multiple
+        #shading objects
+        F_sh_dif_ref_list = []
 
         # Unpack window shading details
         ovh_D_L_ls = [[0.0,1.0]] # [D,L] - L cannot be zero as this leads to divide-by-zero later on
@@ -1450,16 +1699,181 @@ class ExternalConditions:
             # F_sh_ref = max(0.0, min(F_sh_ref_setback, F_sh_ref_fins, F_sh_ref_overhangs))
             F_sh_dif = max(0.0, min(F_sh_dif_fins, F_sh_dif_overhangs))
             F_sh_ref = max(0.0, min(F_sh_ref_fins, F_sh_ref_overhangs))
+            F_sh_dif_ref_list.append((F_sh_dif, F_sh_ref))
 
-            Fdiff = ( F_sh_dif * (diffuse_irr_sky + diffuse_irr_hor)
+        return F_sh_dif_ref_list
+
+    def __window_shading_key(self, window_shading):
+        """ returns a hashable equivalent of the window shading data, for use as
+        part of a key for cached results """
+        if not window_shading:
+            return window_shading
+        return tuple(tuple(sorted(shade_obj.items())) for shade_obj in window_shading)
+
+    def __precompute_shading_reduction_factor_direct_diffuse(
+            self,
+            base_height,
+            height,
+            width,
+            tilt,
+            orientation,
+            window_shading,
+            ):
+        """ calculates the direct and diffuse shading factors due to external
+        shading objects for all timesteps at once
+
+        The calculation is the same as in shading_reduction_factor_direct_diffuse
+        (via outside_solar_beam, direct_shading_reduction_factor and
+        diffuse_shading_reduction_factor) but each variable is an array with one
+        element per timestep.
+
+        Arguments:
+        height         -- is the height of the shaded surface (if surface is tilted then
+                          this must be the vertical projection of the height), in m
+        base_height    -- is the base height of the shaded surface k, in m
+        width          -- is the width of the shaded surface, in m
+        orientation    -- is the orientation angle of the inclined surface, expressed as the 
+                          geographical azimuth angle of the horizontal projection of the 
+                          inclined surface normal, -180 to 180, in degrees;
+        tilt           -- is the tilt angle of the inclined surface from horizontal, measured 
+                          upwards facing, 0 to 180, in degrees;
+        window_shading -- data on overhangs and side fins associated to this building element
+                          includes the shading object type, depth, anf distance from element
+        """
+        irradiance = self.__precomputed_direct_diffuse_total_irradiance(tilt, orientation)
+        no_radiation = (irradiance['calculated_direct'] + irradiance['calculated_diffuse']) == 0
+        altitude = self.__solar_altitude[self.__timestep_hour]
+        azimuth = self.__solar_azimuth_angle[self.__timestep_hour]
+
+        # Check if the surface is outside the solar beam (see outside_solar_beam function)
+        test1 = orientation - azimuth
+        test1 = np.where(test1 > +180.0, test1 - 360.0, np.where(test1 < -180.0, test1 + 360.0, test1))
+        test2 = tilt - altitude
+        outside_solar_beam = (-90 > test1) | (test1 > 90) | (-90 > test2) | (test2 > 90)
+
+        # Direct shading reduction factor (see direct_shading_reduction_factor function)
+        Hshade_obst = np.zeros_like(altitude)
+        Hshade_ovh = np.zeros_like(altitude)
+        WfinR = np.zeros_like(altitude)
+        WfinL = np.zeros_like(altitude)
+
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            tan_altitude = np.tan(np.radians(altitude))
+
+            # Find the shading segment the sun is in for each timestep (-1 if not found)
+            segment_idx = np.select(
+                [
+                    (azimuth < segment["start"]) & (azimuth > segment["end"])
+                    for segment in self.__shading_segments
+                    ],
+                range(len(self.__shading_segments)),
+                default=-1,
+                )
+            if np.any(segment_idx[~no_radiation & ~outside_solar_beam] == -1):
+                sys.exit("solar segment not found. Check shading inputs")
+
+            for i, segment in enumerate(self.__shading_segments):
+                if "shading" not in segment.keys():
+                    continue
+                in_segment = segment_idx == i
+                for shade_obj in segment["shading"]:
+                    if shade_obj["type"] == "obstacle":
+                        new_shade_height = np.maximum(
+                            0,
+                            shade_obj["height"] - base_height \
+                            - shade_obj["distance"] * tan_altitude,
+                            )
+                        Hshade_obst = np.where(
+                            in_segment,
+                            np.maximum(Hshade_obst, new_shade_height),
+                            Hshade_obst,
+                            )
+                    elif shade_obj["type"] == "overhang":
+                        new_shade_height = np.maximum(
+                            0,
+                            height + base_height - shade_obj["height"] \
+                            + shade_obj["distance"] * tan_altitude,
+                            )
+                        Hshade_ovh = np.where(
+                            in_segment,
+                            np.maximum(Hshade_ovh, new_shade_height),
+                            Hshade_ovh,
+                            )
+                    else:
+                        sys.exit("shading object type" + shade_obj["type"] + "not recognised")
+
+            if window_shading:
+                for shade_obj in window_shading:
+                    depth = shade_obj["depth"]
+                    distance = shade_obj["distance"]
+                    if shade_obj["type"] == "overhang":
+                        new_shade_height = (depth * tan_altitude \
+                                        / np.cos(np.radians(azimuth - orientation))) \
+                                        - distance
+
+                        Hshade_ovh = np.maximum(Hshade_ovh, new_shade_height)
+                    elif shade_obj["type"] == "sidefinright":
+                        #check if the sun is in the opposite direction
+                        check = azimuth - orientation
+                        new_finRshade = np.where(
+                            check > 0,
+                            0,
+                            depth * np.tan(np.radians(azimuth - orientation)) - distance,
+                            )
+                        WfinR = np.maximum(WfinR, new_finRshade)
+                    elif shade_obj["type"] == "sidefinleft":
+                        #check if the sun is in the opposite direction
+                        check = azimuth - orientation
+                        new_finLshade = np.where(
+                            check < 0,
+                            0,
+                            depth * np.tan(np.radians(azimuth - orientation)) - distance,
+                            )
+                        WfinL = np.maximum(WfinL, new_finLshade)
+                    else:
+                        sys.exit("shading object type" + shade_obj["type"] + "not recognised")
+
+        Hk_obst = np.minimum(height, Hshade_obst)
+        Hk_ovh = np.minimum(height, Hshade_ovh)
+        Hk_sun = np.maximum(0, height - (Hk_obst + Hk_ovh))
+        Wk_finR = np.minimum(width, WfinR)
+        Wk_finL = np.minimum(width, WfinL)
+        Wk_sun = np.maximum(0, width - (Wk_finR + Wk_finL))
+        Fdir = np.where(
+            outside_solar_beam,
+            1.0,
+            (Hk_sun * Wk_sun) / (height * width),
+            )
+
+        # Diffuse shading reduction factor (see diffuse_shading_reduction_factor function)
+        diffuse_irr_sky = irradiance['diffuse_res_breakdown']['sky']
+        diffuse_irr_hor = irradiance['diffuse_res_breakdown']['horiz']
+        diffuse_irr_ref = irradiance['diffuse_res_breakdown']['ground_refl']
+        diffuse_irr_total = diffuse_irr_sky + diffuse_irr_hor + diffuse_irr_ref
+
+        F_sh_dif_ref_list = self.__diffuse_shading_factors_sky_ground(
+            tilt,
+            height,
+            width,
+            window_shading,
+            )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            Fdiff = np.max(
+                [
+                    ( F_sh_dif * (diffuse_irr_sky + diffuse_irr_hor)
                     + F_sh_ref * diffuse_irr_ref
                     ) \
-                  / diffuse_irr_total
-            Fdiff_list.append(Fdiff)
+                    / diffuse_irr_total
+                    for F_sh_dif, F_sh_ref in F_sh_dif_ref_list
+                    ],
+                axis=0,
+                )
 
-        Fdiff = max(Fdiff_list)
+        # If there is no radiation then shading is irrelevant
+        Fdir = np.where(no_radiation, 0.0, Fdir)
+        Fdiff = np.where(no_radiation, 0.0, Fdiff)
 
-        return Fdiff
+        return Fdir, Fdiff
 
     def shading_reduction_factor_direct_diffuse(
             self,
@@ -1487,6 +1901,29 @@ class ExternalConditions:
                           includes the shading object type, depth, anf distance from element
         """
 
+        if self.__precompute_solar:
+            shading_factors_key = (
+                base_height,
+                height,
+                width,
+                tilt,
+                orientation,
+                self.__window_shading_key(window_shading),
+                )
+            if shading_factors_key not in self.__precomputed_shading_factors.keys():
+                self.__precomputed_shading_factors[shading_factors_key] \
+                    = self.__precompute_shading_reduction_factor_direct_diffuse(
+                        base_height,
+                        height,
+                        width,
+                        tilt,
+                        orientation,
+                        window_shading,
+                        )
+            Fdir, Fdiff = self.__precomputed_shading_factors[shading_factors_key]
+            t_idx = self.__simulation_time.index()
+            return Fdir[t_idx], Fdiff[t_idx]
+
         # first chceck if there is any radiation. This is needed to prevent a potential 
         # divide by zero error in the final step, but also, if there is no radiation 
         # then shading is irrelevant and we can skip the whole calculation
@@ -6,6 +6,8 @@ This module provides object(s) to model the behaviour of electric storage heater
 
 # Third-party imports
 import sys
+from bisect import bisect_right
+from math import sqrt, isfinite
 from enum import Enum, auto
 from scipy.integrate import solve_ivp
 import numpy as np
@@ -39,6 +41,16 @@ class AirFlowType(Enum):
 class ElecStorageHeater:
     """ Class to represent electric storage heaters """
 
+    # Tolerances for the fast integrator for the core and wall temperatures
+    # (tighter than the default tolerances of solve_ivp, which is used otherwise)
+    __FAST_INTEGRATOR_RTOL = 1e-4
+    __FAST_INTEGRATOR_ATOL = 1e-3  # K
+    # Max. no. of steps (including rejected steps) per call for the fast
+    # integrator, beyond which solve_ivp is used instead
+    __FAST_INTEGRATOR_MAX_STEPS = 500
+    # Length of first step tried by the fast integrator, in seconds
+    __FAST_INTEGRATOR_STEP_INIT = 60.0
+
     def __init__(
         self,
         rated_power: float,
@@ -62,7 +74,8 @@ class ElecStorageHeater:
         energy_supply_conn: EnergySupplyConnection,
         simulation_time: SimulationTime,
         control: SetpointTimeControl,
-        charge_control: ToUChargeControl
+        charge_control: ToUChargeControl,
+        use_fast_integrator: bool = False,
     ):
         """Construct an ElecStorageHeater object
 
@@ -92,6 +105,11 @@ class ElecStorageHeater:
         energy_supply_conn   -- reference to EnergySupplyConnection object
         simulation_time      -- reference to SimulationTime object
         control              -- reference to a control object which must implement is_on() and setpnt() funcs
+        charge_control       -- reference to a ToUChargeControl object
+        use_fast_integrator  -- flag to indicate whether to solve the heat balance of the core and wall/case
+                                with the dedicated integrator (see __solve_core_and_wall_temps_fast) where
+                                possible, rather than solve_ivp from scipy (results may differ slightly,
+                                within the tolerance of solve_ivp)
         """
 
         self.__pwr_in: float = (rated_power * units.W_per_kW)
@@ -125,6 +143,7 @@ class ElecStorageHeater:
         # Parameters
 
         self.__c_p: float = 1.0054  # J/kg/K air specific heat
+        self.__use_fast_integrator: bool = use_fast_integrator
 
         """
         The value of R (resistance of air gap) depends on several factors such as the thickness of the air gap, the
@@ -142,6 +161,12 @@ class ElecStorageHeater:
         self.__Rair_off: float = 0.17
         self.__Rair_on: float = 0.07  # Same as above when the damper is on
 
+        # U value between core and wall/case, when discharging and when not
+        # discharging, calculated as U value for the insulation and resistance
+        # of the air layer between the insulation and the wall/case
+        self.__insulation_on: float = 1 / (1 / self.__Uins + self.__Rair_on)
+        self.__insulation_off: float = 1 / (1 / self.__Uins + self.__Rair_off)
+
         self.temp_air: float = self.__zone.temp_internal_air()  # °C Room temperature
         # case/wall c and n parameters as emitter.
 
@@ -215,6 +240,12 @@ class ElecStorageHeater:
             self.labs_tests = self.labs_tests_400
         else:
             sys.exit('AirFlowType does not have characteristic data for EHS system')
+        self.__labs_tests_x: list = [row[0] for row in self.labs_tests]
+        self.__labs_tests_y: list = [row[1] for row in self.labs_tests]
+
+        # Length of first step accepted in most recent call to the fast
+        # integrator, used as the first step to try in the next call
+        self.__step_fast_integrator: float = self.__FAST_INTEGRATOR_STEP_INIT
 
         # Initial conditions
         self.t_core: float = 200.0 # self.__zone.temp_internal_air()
@@ -282,9 +313,22 @@ class ElecStorageHeater:
 
     def __lab_test_ha(self, t_core_rm_diff: float) -> float:
         # labs_test for electric storage heater
-        x: list = [row[0] for row in self.labs_tests]
-        y: list = [row[1] for row in self.labs_tests]
-        return np.interp(t_core_rm_diff, x, y)
+        return np.interp(t_core_rm_diff, self.__labs_tests_x, self.__labs_tests_y)
+
+    def __lab_test_ha_and_slope(self, t_core_rm_diff: float) -> tuple:
+        """
+        Returns value from labs_test for electric storage heater, interpolated
+        as in __lab_test_ha, and derivative of value w.r.t. t_core_rm_diff
+        """
+        x: list = self.__labs_tests_x
+        y: list = self.__labs_tests_y
+        idx: int = bisect_right(x, t_core_rm_diff)
+        if idx == 0:
+            return y[0], 0.0
+        if idx == len(x):
+            return y[-1], 0.0
+        slope: float = (y[idx] - y[idx - 1]) / (x[idx] - x[idx - 1])
+        return y[idx - 1] + slope * (t_core_rm_diff - x[idx - 1]), slope
 
     def __calulate_q_dis(self, time: float, t_core: float, q_out_wall: float, q_dis_modo: str) -> float:
         q_dis: float
@@ -364,9 +408,9 @@ class ElecStorageHeater:
         # Calculation of the U value between core and wall/case as
         # U value for the insulation and resistance of the air layer between the insulation and the wall/case
         if q_dis > 0:
-            insulation: float = 1 / (1 / self.__Uins + self.__Rair_on)
+            insulation: float = self.__insulation_on
         else:
-            insulation: float = 1 / (1 / self.__Uins + self.__Rair_off)
+            insulation: float = self.__insulation_off
 
         # Equation for the heat transfer between the core and the wall/case of the heater
         q_out_ins: float = insulation * self.__A * (t_core - t_wall)
@@ -389,18 +433,189 @@ class ElecStorageHeater:
                                                                  time=time,
                                                                  q_dis_modo=q_dis_modo)[0]
 
+    def __solve_core_and_wall_temps_fast(self,
+                                         time_range: list,
+                                         temp_core_and_wall: list,
+                                         q_dis_modo: Union[str, float]) -> Union[list, None]:
+        """
+        Solves heat balance for core and wall/case temperatures without using solve_ivp
+
+        Returns the core and wall/case temperatures at the end of the time range, or
+        None if the solution did not converge within __FAST_INTEGRATOR_MAX_STEPS steps.
+
+        The heat balance is stiff, as the wall/case has a much smaller thermal mass
+        than the core, so it is solved with the 2-stage Rosenbrock method ROS2 (see
+        Verwer et al. 1999, "An implicit-explicit approach for atmospheric transport-
+        chemistry problems"), which is L-stable and is second-order accurate even when
+        the Jacobian is approximate, so it copes with the kinks in the heat balance
+        (e.g. where the charging power or the lab test data change slope). The
+        Jacobian is calculated analytically and the linear system for each stage is
+        solved directly as it has only 2 unknowns. The step length is controlled using
+        the difference from the first-order (linearly implicit Euler) solution.
+
+        The factors for the charging power that do not depend on the core temperature
+        are evaluated once per call rather than for each evaluation of the heat balance,
+        and the first step tried is the first step accepted in the previous call, as
+        consecutive calls (e.g. the leak, max. and target discharge calculations in
+        demand_energy) start from similar conditions.
+        """
+        temp_air: float = self.temp_air
+        c: float = self.__c
+        n: float = self.__n
+        A: float = self.__A
+        UA_on: float = self.__insulation_on * A
+        UA_off: float = self.__insulation_off * A
+        k_core: float = 1 / (self.__mass * self.__c_pcore)
+        k_wall: float = 1 / self.__thermal_mass_wall
+        pwr_in: float = self.__pwr_in
+
+        # Charging power (see __electric_charge) is zero above t_core_charge_max
+        # and linear in core temp (up to the rated power) below it
+        charging: bool = self.temp_air < self.__temp_charge_cut_corr() and self.__charge_control.is_on()
+        if charging:
+            t_core_charge_max: float = self.__t_core_target * self.__charge_control.target_charge()
+            charge_coeff: float = self.__mass * self.__c_pcore / self.__simtime.timestep()
+
+        def change_rate_and_jacobian(t_core: float, t_wall: float) -> tuple:
+            """ Returns rates of change of core and wall temps and Jacobian of these """
+            # Equation for electric charging
+            if charging and t_core <= t_core_charge_max:
+                q_in: float = (t_core_charge_max - t_core) * charge_coeff
+                if q_in > pwr_in:
+                    q_in = pwr_in
+                    dq_in_dt_core: float = 0.0
+                else:
+                    dq_in_dt_core = -charge_coeff
+            else:
+                q_in = 0.0
+                dq_in_dt_core = 0.0
+
+            # Equation for heat transfer to room from wall/case of heater
+            temp_diff_wall: float = t_wall - temp_air
+            if temp_diff_wall >= 0:
+                q_out_wall: float = c * temp_diff_wall ** n
+                if temp_diff_wall > 0:
+                    dq_out_wall_dt_wall: float = n * c * temp_diff_wall ** (n - 1)
+                else:
+                    dq_out_wall_dt_wall = c
+            else:
+                q_out_wall = c * temp_diff_wall
+                dq_out_wall_dt_wall = c
+
+            # Equation for calculating q_dis (see __calulate_q_dis)
+            if q_dis_modo == "max":
+                temp_diff_core: float = t_core - temp_air
+                ha, dha_dt_core = self.__lab_test_ha_and_slope(temp_diff_core)
+                q_dis: float = ha * temp_diff_core
+                dq_dis_dt_core: float = ha + dha_dt_core * temp_diff_core
+                dq_dis_dt_wall: float = 0.0
+            elif q_dis_modo == 0:
+                q_dis = 0.0
+                dq_dis_dt_core = 0.0
+                dq_dis_dt_wall = 0.0
+            else:
+                q_dis = q_dis_modo - q_out_wall
+                dq_dis_dt_core = 0.0
+                dq_dis_dt_wall = -dq_out_wall_dt_wall
+
+            # Equation for the heat transfer between the core and the wall/case of the heater
+            UA: float = UA_on if q_dis > 0 else UA_off
+            q_out_ins: float = UA * (t_core - t_wall)
+
+            return (
+                k_core * (q_in - q_out_ins - q_dis),
+                k_wall * (q_out_ins - q_out_wall),
+                k_core * (dq_in_dt_core - UA - dq_dis_dt_core),
+                k_core * (UA - dq_dis_dt_wall),
+                k_wall * UA,
+                - k_wall * (UA + dq_out_wall_dt_wall),
+                )
+
+        gamma: float = 1 + 1 / sqrt(2)
+        rtol: float = self.__FAST_INTEGRATOR_RTOL
+        atol: float = self.__FAST_INTEGRATOR_ATOL
+        time_current: float = time_range[0]
+        time_end: float = time_range[1]
+        t_core: float = float(temp_core_and_wall[0])
+        t_wall: float = float(temp_core_and_wall[1])
+        step: float = self.__step_fast_integrator
+        step_first_accepted: Union[float, None] = None
+
+        for _ in range(self.__FAST_INTEGRATOR_MAX_STEPS):
+            if time_current >= time_end:
+                if step_first_accepted is not None:
+                    self.__step_fast_integrator = step_first_accepted
+                return [t_core, t_wall]
+            step = min(step, time_end - time_current)
+
+            f_core, f_wall, j_cc, j_cw, j_wc, j_ww = change_rate_and_jacobian(t_core, t_wall)
+
+            # Solve (I - gamma * step * J) k = r for each stage
+            w_cc: float = 1 - gamma * step * j_cc
+            w_cw: float = - gamma * step * j_cw
+            w_wc: float = - gamma * step * j_wc
+            w_ww: float = 1 - gamma * step * j_ww
+            det: float = w_cc * w_ww - w_cw * w_wc
+
+            k1_core: float = (w_ww * f_core - w_cw * f_wall) / det
+            k1_wall: float = (w_cc * f_wall - w_wc * f_core) / det
+
+            f2_core, f2_wall = change_rate_and_jacobian(
+                t_core + step * k1_core,
+                t_wall + step * k1_wall,
+                )[:2]
+            r2_core: float = f2_core - 2 * k1_core
+            r2_wall: float = f2_wall - 2 * k1_wall
+            k2_core: float = (w_ww * r2_core - w_cw * r2_wall) / det
+            k2_wall: float = (w_cc * r2_wall - w_wc * r2_core) / det
+
+            t_core_new: float = t_core + step * (1.5 * k1_core + 0.5 * k2_core)
+            t_wall_new: float = t_wall + step * (1.5 * k1_wall + 0.5 * k2_wall)
+
+            # Estimate error from difference between 2nd-order and 1st-order solutions
+            err: float = max(
+                abs(0.5 * step * (k1_core + k2_core)) / (atol + rtol * max(abs(t_core), abs(t_core_new))),
+                abs(0.5 * step * (k1_wall + k2_wall)) / (atol + rtol * max(abs(t_wall), abs(t_wall_new))),
+                )
+            if not isfinite(err):
+                step *= 0.2
+                continue
+
+            if err <= 1.0:
+                time_current += step
+                t_core = t_core_new
+                t_wall = t_wall_new
+                if step_first_accepted is None:
+                    step_first_accepted = step
+
+            if err == 0.0:
+                step *= 5.0
+            else:
+                step *= min(5.0, max(0.2, 0.9 / sqrt(err)))
+
+        return None
+
     def __calculate_sol_and_q_released(self,
                                        time_range: list,
                                        temp_core_and_wall: list,
                                        q_dis_modo: Union[str, float]) -> tuple:
 
-        # first calculate how much the system is leaking without active discharging
-        sol: OdeResult = solve_ivp(fun=self.__func_core_temperature_change_rate(q_dis_modo=q_dis_modo),
-                                   t_span=time_range,
-                                   y0=temp_core_and_wall,
-                                   method='BDF')
-
-        new_temp_core_and_wall: list = sol.y[:, -1]
+        new_temp_core_and_wall: Union[list, None] = None
+        if self.__use_fast_integrator:
+            new_temp_core_and_wall = self.__solve_core_and_wall_temps_fast(
+                time_range=time_range,
+                temp_core_and_wall=temp_core_and_wall,
+                q_dis_modo=q_dis_modo,
+                )
+
+        if new_temp_core_and_wall is None:
+            # first calculate how much the system is leaking without active discharging
+            sol: OdeResult = solve_ivp(fun=self.__func_core_temperature_change_rate(q_dis_modo=q_dis_modo),
+                                       t_span=time_range,
+                                       y0=temp_core_and_wall,
+                                       method='BDF')
+
+            new_temp_core_and_wall = sol.y[:, -1]
 
         values: tuple = self.__heat_balance(temp_core_and_wall=new_temp_core_and_wall,
                                             time=time_range[1],
@@ -12,11 +12,20 @@ import core.external_conditions as external_conditions
 
 # Standard library inputs
 import sys
+from math import exp, log
 from enum import Enum,auto
 from numpy import interp
 
 class Emitters:
 
+    # Tolerance for the error in emitter temperature (in K) accumulated by the
+    # fast integrator over one hour. The error allowed in each substep is in
+    # proportion to its length
+    __FAST_INTEGRATOR_TOLERANCE = 1e-6
+    # Max. no. of substeps per call for the fast integrator, beyond which
+    # solve_ivp is used instead
+    __FAST_INTEGRATOR_MAX_STEPS = 1000
+
     def __init__(
             self,
             thermal_mass,
@@ -29,7 +38,8 @@ class Emitters:
             ext_cond,
             ecodesign_controller,
             design_flow_temp,
-            simulation_time
+            simulation_time,
+            use_fast_integrator=False,
             ):
         """ Construct an Emitters object
 
@@ -44,6 +54,12 @@ class Emitters:
         zone -- reference to the Zone object representing the zone in which the
                 emitters are located
         simulation_time -- reference to SimulationTime object
+        use_fast_integrator -- flag to indicate whether to solve the emitter
+                               temperature change rate eqn with the dedicated
+                               integrator (see __temp_diff_emitter_rm_fast)
+                               where possible, rather than solve_ivp from scipy
+                               (results may differ slightly, within the
+                               tolerance of solve_ivp)
 
         Other variables:
         temp_emitter_prev -- temperature of the emitters at the end of the
@@ -60,6 +76,7 @@ class Emitters:
         self.__zone = zone
         self.__simtime = simulation_time
         self.__external_conditions = ext_cond
+        self.__use_fast_integrator = use_fast_integrator
 
         self.__design_flow_temp = design_flow_temp
         self.__ecodesign_control_class = Ecodesign_control_class.from_num(ecodesign_controller['ecodesign_control_class'])
@@ -218,7 +235,48 @@ class Emitters:
 
         if temp_emitter_max is not None:
             temp_diff_max = temp_emitter_max - temp_rm
-    
+        else:
+            temp_diff_max = None
+
+        results = None
+        if self.__use_fast_integrator:
+            results = self.__temp_diff_emitter_rm_fast(
+                time_start,
+                time_end,
+                temp_diff_start,
+                power_input,
+                temp_diff_max,
+                )
+        if results is None:
+            results = self.__temp_diff_emitter_rm_solve_ivp(
+                time_start,
+                time_end,
+                temp_diff_start,
+                power_input,
+                temp_diff_max,
+                )
+        temp_diff_emitter_rm_final, time_temp_diff_max_reached = results
+
+        # Get emitter temp at end of timestep
+        temp_emitter = temp_rm + temp_diff_emitter_rm_final
+        return temp_emitter, time_temp_diff_max_reached
+
+    def __temp_diff_emitter_rm_solve_ivp(
+            self,
+            time_start,
+            time_end,
+            temp_diff_start,
+            power_input,
+            temp_diff_max,
+            ):
+        """ Solve emitter temperature change rate eqn using solve_ivp
+
+        Returns the temperature difference between emitters and room at the end
+        of the time period (or when the max. temperature difference is
+        reached, if earlier) and the time at which the max. temperature
+        difference is reached (None if not reached)
+        """
+        if temp_diff_max is not None:
             # Define event where emitter reaches max. temp (event occurs when func returns zero)
             def temp_diff_max_reached(t, y):
                 return y[0] - temp_diff_max
@@ -240,15 +298,190 @@ class Emitters:
 
         # Get time at which emitters reach max. temp
         time_temp_diff_max_reached = None
-        if temp_emitter_max is not None:
+        if temp_diff_max is not None:
             t_events = temp_diff_emitter_rm_results.t_events[0]
             if len(t_events) > 0:
                 time_temp_diff_max_reached = temp_diff_emitter_rm_results.t_events[0][-1]
 
-        # Get emitter temp at end of timestep
-        temp_diff_emitter_rm_final = temp_diff_emitter_rm_results.y[0][-1]
-        temp_emitter = temp_rm + temp_diff_emitter_rm_final
-        return temp_emitter, time_temp_diff_max_reached
+        return temp_diff_emitter_rm_results.y[0][-1], time_temp_diff_max_reached
+
+    def __temp_diff_emitter_rm_fast(
+            self,
+            time_start,
+            time_end,
+            temp_diff_start,
+            power_input,
+            temp_diff_max,
+            ):
+        """ Solve emitter temperature change rate eqn without using solve_ivp
+
+        Returns the same results as __temp_diff_emitter_rm_solve_ivp, or None
+        if the eqn cannot be solved by this method (negative power input,
+        emitter exponent less than 1 or very stiff eqn).
+
+        The change rate eqn (see __func_temp_emitter_change_rate) is:
+            d(deltaT)/dt = (power_input - c * max(0, deltaT) ^ n) / K_E
+        With non-negative power input, deltaT changes monotonically towards
+        the equilibrium value (power_input / c) ^ (1 / n), so the max.
+        temperature difference is reached if it lies between the temperature
+        differences at the start and end of the time period. The eqn is solved:
+        - while deltaT < 0: exactly, as the change rate is constant
+        - where n = 1 or power input is zero: exactly, using the analytical
+          solution of the eqn
+        - otherwise: using the classic 4th-order Runge-Kutta method with
+          adaptive substeps (see __FAST_INTEGRATOR_TOLERANCE), and Newton's
+          method to find the time at which the max. temperature difference is
+          reached.
+        Compared with solve_ivp with relative and absolute tolerances of 1e-12,
+        the error is below 3e-6 K in temperature and 3e-8 h in the time at
+        which the max. temperature is reached, for 1 <= n <= 2 (and much
+        smaller for typical emitters, with n of 1.2 to 1.4). This is much
+        closer than solve_ivp with its default tolerances (relative tolerance
+        of 1e-3), so results differ from those using solve_ivp by up to the
+        error of solve_ivp.
+        """
+        if power_input < 0.0 or self.__n < 1.0:
+            return None
+
+        K_E = self.__thermal_mass
+        c = self.__c
+        n = self.__n
+        time_current = time_start
+        temp_diff = temp_diff_start
+
+        def max_reached(temp_diff_a, temp_diff_b):
+            """ Return True if temp_diff_max is between the two values (inclusive) """
+            return temp_diff_max is not None \
+                and (temp_diff_a - temp_diff_max) * (temp_diff_b - temp_diff_max) <= 0.0
+
+        # If emitters are already at max. temp, then max. temp is reached at start
+        if temp_diff_max is not None and temp_diff == temp_diff_max:
+            return temp_diff_max, time_start
+
+        # While emitter temp is below room temp, emitters do not release any
+        # heat, so temperature rises at constant rate
+        if temp_diff < 0.0:
+            if power_input == 0.0:
+                return temp_diff, None
+            time_zero = time_current - temp_diff * K_E / power_input
+            temp_diff_end = 0.0 if time_zero <= time_end \
+                else temp_diff + power_input * (time_end - time_current) / K_E
+            if max_reached(temp_diff, temp_diff_end):
+                return temp_diff_max, \
+                    time_current + (temp_diff_max - temp_diff) * K_E / power_input
+            if time_zero >= time_end:
+                return temp_diff_end, None
+            time_current = time_zero
+            temp_diff = 0.0
+
+        time_remaining = time_end - time_current
+
+        if n == 1.0:
+            # Analytical solution:
+            #     deltaT(t) = deltaT_eq + (deltaT(0) - deltaT_eq) * exp(-c * t / K_E)
+            temp_diff_eq = power_input / c
+            temp_diff_end = temp_diff_eq \
+                + (temp_diff - temp_diff_eq) * exp(-c * time_remaining / K_E)
+            if max_reached(temp_diff, temp_diff_end):
+                if temp_diff_max == temp_diff_eq:
+                    # Equilibrium temperature is only approached asymptotically,
+                    # so is only reached (to within rounding) at the end
+                    return temp_diff_max, time_end
+                return temp_diff_max, min(
+                    time_end,
+                    time_current + K_E / c \
+                        * log((temp_diff - temp_diff_eq) / (temp_diff_max - temp_diff_eq)),
+                    )
+            return temp_diff_end, None
+
+        if power_input == 0.0:
+            # Analytical solution:
+            #     deltaT(t) ^ (1 - n) = deltaT(0) ^ (1 - n) + (n - 1) * c * t / K_E
+            if temp_diff == 0.0:
+                return 0.0, None
+            temp_diff_end \
+                = (temp_diff ** (1.0 - n) + (n - 1.0) * c * time_remaining / K_E) \
+                ** (1.0 / (1.0 - n))
+            if max_reached(temp_diff, temp_diff_end):
+                return temp_diff_max, time_current \
+                    + K_E / ((n - 1.0) * c) * (temp_diff_max ** (1.0 - n) - temp_diff ** (1.0 - n))
+            return temp_diff_end, None
+
+        # Numerical solution, using classic 4th-order Runge-Kutta (RK4) with
+        # step doubling: each substep is taken both as one full RK4 step and as
+        # two half steps, the difference between which estimates the error.
+        # Substeps are accepted if the estimated error is within tolerance (in
+        # proportion to the substep length) and their length is adapted to the
+        # error, so that short substeps are used where deltaT is rising from
+        # close to zero (where the change rate eqn is not smooth for n < 2).
+        # The two half steps are corrected by the error estimate (Richardson
+        # extrapolation), which makes the solution 5th-order accurate.
+        tolerance_per_hour = self.__FAST_INTEGRATOR_TOLERANCE
+
+        def change_rate(temp_diff):
+            return (power_input - c * max(0.0, temp_diff) ** n) / K_E
+
+        def rk4_step(temp_diff, step):
+            k1 = change_rate(temp_diff)
+            k2 = change_rate(temp_diff + 0.5 * step * k1)
+            k3 = change_rate(temp_diff + 0.5 * step * k2)
+            k4 = change_rate(temp_diff + step * k3)
+            return temp_diff + step / 6.0 * (k1 + 2.0 * k2 + 2.0 * k3 + k4)
+
+        def rk4_step_doubling(temp_diff, step):
+            """ Return extrapolated deltaT after step, and error estimate """
+            temp_diff_full = rk4_step(temp_diff, step)
+            temp_diff_half = rk4_step(rk4_step(temp_diff, 0.5 * step), 0.5 * step)
+            error = (temp_diff_half - temp_diff_full) / 15.0
+            return temp_diff_half + error, abs(error)
+
+        # Substep lengths are limited by the sensitivity of the change rate of
+        # deltaT to deltaT, which is largest at the start or equilibrium value,
+        # so that RK4 is well within its stability limit and the error
+        # estimate is reliable
+        temp_diff_eq = (power_input / c) ** (1.0 / n)
+        sensitivity_max = n * c * max(temp_diff, temp_diff_eq) ** (n - 1.0) / K_E
+        step_max = 1.0 / sensitivity_max
+        step = min(time_remaining, 0.1 * step_max)
+
+        no_of_steps = 0
+        while time_current < time_end:
+            no_of_steps += 1
+            if no_of_steps > self.__FAST_INTEGRATOR_MAX_STEPS:
+                return None
+            step = min(step, step_max, time_end - time_current)
+            temp_diff_next, error = rk4_step_doubling(temp_diff, step)
+            error_allowed = tolerance_per_hour * step
+            if error > error_allowed:
+                # Reject substep and retry with shorter substep
+                step *= max(0.1, 0.9 * (error_allowed / error) ** 0.2)
+                continue
+
+            if max_reached(temp_diff, temp_diff_next):
+                # Find time within substep at which max. temp is reached,
+                # starting from linear interpolation
+                step_to_max = step * (temp_diff_max - temp_diff) / (temp_diff_next - temp_diff)
+                for _ in range(8):
+                    temp_diff_trial, _ = rk4_step_doubling(temp_diff, step_to_max)
+                    change_rate_trial = change_rate(temp_diff_trial)
+                    if change_rate_trial == 0.0:
+                        break
+                    correction = (temp_diff_trial - temp_diff_max) / change_rate_trial
+                    step_to_max = min(max(step_to_max - correction, 0.0), step)
+                    if abs(correction) <= 1e-12:
+                        break
+                return temp_diff_max, time_current + step_to_max
+
+            temp_diff = temp_diff_next
+            # Last substep may be shortened to finish at end of time period
+            time_current = time_end if step == time_end - time_current \
+                else time_current + step
+            if error == 0.0:
+                step *= 4.0
+            else:
+                step *= min(4.0, max(0.1, 0.9 * (error_allowed / error) ** 0.2))
+
+        return temp_diff, None
 
     def __energy_required_from_heat_source(
             self,
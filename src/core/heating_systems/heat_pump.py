@@ -10,6 +10,7 @@ BS EN 15316-4-2:2017 and is described in the SAP calculation method CALCM-01.
 # Standard library imports
 import sys
 from copy import deepcopy
+from math import floor
 from enum import Enum, auto
 
 # Third-party imports
@@ -806,6 +807,131 @@ class HeatPumpTestData:
         return np.interp(flow_temp, self.__dsgn_flow_temps, temp_spread_correction_list)
 
 
+class HeatPumpPerformanceMap:
+    """ An object to look up heat pump performance from a map of values
+    calculated on a regular grid of output and source temperatures.
+
+    The values at each grid point are calculated using the exact method the
+    first time they are needed and then reused, so only the part of the grid
+    covered by the operating conditions that actually occur is calculated.
+    Between grid points, the values are interpolated bilinearly.
+
+    When a grid cell is first used, the interpolated values at the centre of
+    the cell (where the error of bilinear interpolation is largest for smooth
+    functions) and at the midpoints of its edges are checked against the exact
+    method. If the error in any value exceeds the tolerance (e.g. because the
+    performance changes gradient within the cell), no values are returned for
+    operating conditions in that cell, so that the caller uses the exact method
+    instead.
+    """
+
+    def __init__(self, func, resolution, tolerance):
+        """ Construct a HeatPumpPerformanceMap object
+
+        Arguments:
+        func -- function taking output and source temperatures (in Kelvin) and
+                returning a tuple of performance values using the exact method
+                (used to calculate values at grid points and to check accuracy
+                of interpolation)
+        resolution -- spacing of grid points, in Kelvin
+        tolerance -- max. interpolation error, relative to the exact value
+                     (or absolute, where the magnitude of the exact value is
+                     less than 1)
+        """
+        self.__func = func
+        self.__resolution = resolution
+        self.__tolerance = tolerance
+
+        # Dicts with grid indices as keys
+        self.__grid_point_values = {}
+        self.__cells = {}
+
+        # Largest interpolation error found in the cells where interpolation is used
+        self.__error_max = 0.0
+
+    def __values_at_grid_point(self, i, j):
+        values = self.__grid_point_values.get((i, j))
+        if values is None:
+            values = self.__func(i * self.__resolution, j * self.__resolution)
+            self.__grid_point_values[(i, j)] = values
+        return values
+
+    def __init_cell(self, i, j):
+        """ Return coefficients for bilinear interpolation within cell, or None
+        if interpolation within the cell is not accurate enough """
+        values_00 = self.__values_at_grid_point(i, j)
+        values_10 = self.__values_at_grid_point(i + 1, j)
+        values_01 = self.__values_at_grid_point(i, j + 1)
+        values_11 = self.__values_at_grid_point(i + 1, j + 1)
+
+        # Check interpolated values against exact values at centre of cell and
+        # at midpoints of edges of cell
+        error_max_cell = 0.0
+        for dx, dy in ((0.5, 0.5), (0.5, 0.0), (0.5, 1.0), (0.0, 0.5), (1.0, 0.5)):
+            values_check = self.__func(
+                (i + dx) * self.__resolution,
+                (j + dy) * self.__resolution,
+                )
+            for v_00, v_10, v_01, v_11, v_check \
+            in zip(values_00, values_10, values_01, values_11, values_check):
+                v_interp \
+                    = v_00 * (1.0 - dx) * (1.0 - dy) + v_10 * dx * (1.0 - dy) \
+                    + v_01 * (1.0 - dx) * dy + v_11 * dx * dy
+                error = abs(v_interp - v_check) / max(1.0, abs(v_check))
+                error_max_cell = max(error_max_cell, error)
+
+        # The error may be larger between the points checked (up to about
+        # double for a change in gradient within the cell), so only use
+        # interpolation if the error at the points checked is within half of
+        # the tolerance
+        if error_max_cell > 0.5 * self.__tolerance:
+            cell = None
+        else:
+            self.__error_max = max(self.__error_max, error_max_cell)
+            # Coefficients such that value = a + b * dx + c * dy + d * dx * dy,
+            # where dx and dy are position within cell as a fraction of cell size
+            cell = tuple(
+                (v_00, v_10 - v_00, v_01 - v_00, v_11 - v_10 - v_01 + v_00)
+                for v_00, v_10, v_01, v_11 in zip(values_00, values_10, values_01, values_11)
+                )
+
+        self.__cells[(i, j)] = cell
+        return cell
+
+    def lookup(self, temp_output, temp_source):
+        """ Return sequence of performance values at the specified operating
+        conditions, or None if the operating conditions are in a cell where
+        interpolation is not accurate enough (in which case the caller should
+        use the exact method)
+
+        Arguments:
+        temp_output -- output temperature, in Kelvin
+        temp_source -- source temperature, in Kelvin
+        """
+        x = temp_output / self.__resolution
+        y = temp_source / self.__resolution
+        i = floor(x)
+        j = floor(y)
+
+        try:
+            cell = self.__cells[(i, j)]
+        except KeyError:
+            cell = self.__init_cell(i, j)
+
+        if cell is None:
+            return None
+
+        dx = x - i
+        dy = y - j
+        return [a + b * dx + (c + d * dx) * dy for a, b, c, d in cell]
+
+    def error_max(self):
+        """ Return largest interpolation error (relative, as for tolerance)
+        found so far at the points checked in the cells where interpolation is
+        used """
+        return self.__error_max
+
+
 class HeatPumpService:
     """ A base class for objects representing services (e.g. water heating) provided by a heat pump.
 
@@ -1138,6 +1264,9 @@ class HeatPump:
     #      with non-electric heat pumps then this will need to be altered.
     __f_aux = 0.0
 
+    # Max. interpolation error for performance map (see HeatPumpPerformanceMap)
+    __performance_map_tolerance = 1e-3
+
     def __init__(
             self,
             hp_dict,
@@ -1148,6 +1277,7 @@ class HeatPump:
             throughput_exhaust_air=None,
             heat_network=None,
             output_detailed_results=False,
+            performance_map_resolution=None,
             ):
         """ Construct a HeatPump object
 
@@ -1214,6 +1344,12 @@ class HeatPump:
                         (for HPs that use heat network as heat source)
         output_detailed_results -- if true, save detailed results from each timestep
                                    for later reporting
+        performance_map_resolution
+            -- if not None, look up CoP, degradation coeff and thermal capacity
+               at operating conditions from a performance map with grid points
+               at this spacing (in Kelvin) rather than calculating them from the
+               test data each time (results may differ slightly, within the
+               tolerance of the performance map)
 
         Other variables:
         energy_supply_connections
@@ -1304,6 +1440,20 @@ class HeatPump:
                 self.__temp_min_modulation_rate_high = 55.0
                 self.__min_modulation_rate_55 = float(hp_dict['min_modulation_rate_55'])
 
+        # Performance at operating conditions depends only on the output and
+        # source temperatures if it is calculated from the test data rather
+        # than the regression on external temperature, so it can be looked up
+        # from a performance map
+        if performance_map_resolution is not None \
+        and (self.__source_type == SourceType.OUTSIDE_AIR or self.__var_flow_temp_ctrl_during_test):
+            self.__performance_map = HeatPumpPerformanceMap(
+                self.__performance_op_cond,
+                performance_map_resolution,
+                self.__performance_map_tolerance,
+                )
+        else:
+            self.__performance_map = None
+
         # If detailed results are to be output, initialise list
         if output_detailed_results:
             self.__detailed_results = []
@@ -1456,12 +1606,19 @@ class HeatPump:
         and not self.__var_flow_temp_ctrl_during_test:
             thermal_capacity_op_cond = self.__test_data.average_capacity(temp_output)
         else:
-            thermal_capacity_op_cond \
-                = self.__test_data.capacity_op_cond_if_not_air_source(
-                    temp_output,
-                    temp_source,
-                    self.__modulating_ctrl,
-                    )
+            performance = None
+            if self.__performance_map is not None:
+                performance = self.__performance_map.lookup(temp_output, temp_source)
+
+            if performance is not None:
+                thermal_capacity_op_cond = performance[2]
+            else:
+                thermal_capacity_op_cond \
+                    = self.__test_data.capacity_op_cond_if_not_air_source(
+                        temp_output,
+                        temp_source,
+                        self.__modulating_ctrl,
+                        )
 
         return thermal_capacity_op_cond
 
@@ -1516,22 +1673,15 @@ class HeatPump:
                     )
             deg_coeff_op_cond = self.__test_data.average_degradation_coeff(temp_output)
         else:
-            carnot_cop_op_cond = carnot_cop(temp_source, temp_output, self.__temp_diff_limit_low)
-            # Get exergy load ratio at operating conditions and exergy load ratio,
-            # exergy efficiency and degradation coeff at test conditions above and
-            # below operating conditions
-            lr_op_cond = self.__test_data.lr_op_cond(temp_output, temp_source, carnot_cop_op_cond)
-            lr_below, lr_above, eff_below, eff_above, deg_coeff_below, deg_coeff_above \
-                = self.__test_data.lr_eff_degcoeff_either_side_of_op_cond(temp_output, lr_op_cond)
-
-            # CALCM-01 - DAHPSE - V2.0_DRAFT13, section 4.5.4
-            # Get exergy efficiency by interpolating between figures above and
-            # below operating conditions
-            exer_eff_op_cond \
-                = eff_below \
-                + (eff_below - eff_above) \
-                * (lr_op_cond - lr_below) \
-                / (lr_below - lr_above)
+            performance = None
+            if self.__performance_map is not None:
+                performance = self.__performance_map.lookup(temp_output, temp_source)
+
+            if performance is not None:
+                cop_op_cond_uncorrected, deg_coeff_op_cond, _ = performance
+            else:
+                cop_op_cond_uncorrected, deg_coeff_op_cond \
+                    = self.__cop_deg_coeff_op_cond_from_test_data(temp_output, temp_source)
 
             # CALCM-01 - DAHPSE - V2.0_DRAFT13, section 4.5.5
             # Note: DAHPSE method document section 4.5.5 doesn't have
@@ -1539,7 +1689,7 @@ class HeatPump:
             # states that the correction factor is to be applied to the CoP.
             cop_op_cond = max(
                 1.0,
-                exer_eff_op_cond * carnot_cop_op_cond * temp_spread_correction_factor,
+                cop_op_cond_uncorrected * temp_spread_correction_factor,
                 )
 
             if self.__sink_type == SinkType.AIR and service_type != ServiceType.WATER:
@@ -1552,19 +1702,67 @@ class HeatPump:
             else:
                 limit_lower = 0.9
 
-            if lr_below == lr_above:
-                deg_coeff_op_cond = deg_coeff_below
-            else:
-                deg_coeff_op_cond \
-                    = deg_coeff_below \
-                    + (deg_coeff_below - deg_coeff_above) \
-                    * (lr_op_cond - lr_below) \
-                    / (lr_below - lr_above)
-
             deg_coeff_op_cond = max(min(deg_coeff_op_cond, limit_upper), limit_lower)
 
         return cop_op_cond, deg_coeff_op_cond
 
+    def __cop_deg_coeff_op_cond_from_test_data(self, temp_output, temp_source):
+        """ Calculate CoP (before temperature spread correction) and degradation
+        coefficient (before limits are applied) at operating conditions from
+        test data, where not using regression on external temperature
+
+        Arguments:
+        temp_output -- output temperature, in Kelvin
+        temp_source -- source temperature, in Kelvin
+        """
+        carnot_cop_op_cond = carnot_cop(temp_source, temp_output, self.__temp_diff_limit_low)
+        # Get exergy load ratio at operating conditions and exergy load ratio,
+        # exergy efficiency and degradation coeff at test conditions above and
+        # below operating conditions
+        lr_op_cond = self.__test_data.lr_op_cond(temp_output, temp_source, carnot_cop_op_cond)
+        lr_below, lr_above, eff_below, eff_above, deg_coeff_below, deg_coeff_above \
+            = self.__test_data.lr_eff_degcoeff_either_side_of_op_cond(temp_output, lr_op_cond)
+
+        # CALCM-01 - DAHPSE - V2.0_DRAFT13, section 4.5.4
+        # Get exergy efficiency by interpolating between figures above and
+        # below operating conditions
+        exer_eff_op_cond \
+            = eff_below \
+            + (eff_below - eff_above) \
+            * (lr_op_cond - lr_below) \
+            / (lr_below - lr_above)
+
+        cop_op_cond = exer_eff_op_cond * carnot_cop_op_cond
+
+        if lr_below == lr_above:
+            deg_coeff_op_cond = deg_coeff_below
+        else:
+            deg_coeff_op_cond \
+                = deg_coeff_below \
+                + (deg_coeff_below - deg_coeff_above) \
+                * (lr_op_cond - lr_below) \
+                / (lr_below - lr_above)
+
+        return cop_op_cond, deg_coeff_op_cond
+
+    def __performance_op_cond(self, temp_output, temp_source):
+        """ Return CoP (before temperature spread correction), degradation
+        coefficient (before limits are applied) and thermal capacity at
+        operating conditions, calculated from test data, for performance map
+
+        Arguments:
+        temp_output -- output temperature, in Kelvin
+        temp_source -- source temperature, in Kelvin
+        """
+        cop_op_cond, deg_coeff_op_cond \
+            = self.__cop_deg_coeff_op_cond_from_test_data(temp_output, temp_source)
+        thermal_capacity_op_cond = self.__test_data.capacity_op_cond_if_not_air_source(
+            temp_output,
+            temp_source,
+            self.__modulating_ctrl,
+            )
+        return cop_op_cond, deg_coeff_op_cond, thermal_capacity_op_cond
+
     def __energy_output_limited(
             self,
             energy_output_required,
@@ -7,9 +7,6 @@ Also incudes solar thermal behaviours.
 Energy calculation (storage modelled with multiple volumes) - Method A from BS EN 15316-5:2017
 """
 
-# Standard library imports
-from copy import deepcopy
-
 # Local imports
 from core.material_properties import WATER
 from core.pipework import Pipework
@@ -103,6 +100,16 @@ class StorageTank:
         self.__Cp = contents.specific_heat_capacity_kWh()
         #volumic mass in kg/litre
         self.__rho = contents.density()
+        #heat capacity of each layer in kWh/K (precalculated as used many times
+        #in each timestep)
+        self.__rho_Cp_Vol_n = [self.__rho * self.__Cp * vol_i for vol_i in self.__Vol_n]
+        #standby losses coefficient for each layer, per unit of temperature
+        #difference to ambient and per hour, in kWh/K.h
+        self.__H_ls_n = [
+            (self.stand_by_losses_coefficient() * self.__rho * self.__Cp)
+            * (vol_i / self.__V_total)
+            for vol_i in self.__Vol_n
+            ]
 
         #6.4.3.2 STEP 0 Initialization
         """for initial conditions all temperatures in the thermal storage unit(s)
@@ -166,13 +173,11 @@ class StorageTank:
 
         The energy stored is calculated, for information, accordingly to the limit value of
         temperature for domestic hot water."""
-        Q_out_W_n = [0] * self.__NB_VOL
-        for i, temp_i in enumerate(self.__temp_n):
-            if temp_i > self.__cold_feed.temperature():
-                Q_out_W_n[i] = self.__rho * self.__Cp * self.__Vol_n[i] \
-                               * (self.__temp_n[i] - self.__cold_feed.temperature())
-            else:
-                Q_out_W_n[i] = 0
+        temp_cold_water = self.__cold_feed.temperature()
+        Q_out_W_n = [
+            rho_Cp_Vol_i * (temp_i - temp_cold_water) if temp_i > temp_cold_water else 0
+            for rho_Cp_Vol_i, temp_i in zip(self.__rho_Cp_Vol_n, self.__temp_n)
+            ]
 
         return Q_out_W_n
 
@@ -204,6 +209,7 @@ class StorageTank:
         Q_use_W_n = [0] * self.__NB_VOL
         #initialise tracker for energy required remainder / unmet energy
         Q_out_W_dis_req_rem = Q_out_W_dis_req
+        temp_cold_water = self.__cold_feed.temperature()
 
         """TODO A few checks to make
         1. Check condition used to compare minimum temperature in two places below.
@@ -212,7 +218,8 @@ class StorageTank:
            Using cold temp instead as per spreadsheet"""
 
         #IMPORTANT to iterate in reversed order -from top of tank where draw off happens
-        for i, vol_i in reversed(list(enumerate(self.__Vol_n))):
+        for i in range(self.__NB_VOL - 1, -1, -1):
+            vol_i = self.__Vol_n[i]
             #special condition for first layer considered (the top layer)
             if i == self.__NB_VOL-1:
                 #threshold minimum temperature
@@ -222,7 +229,7 @@ class StorageTank:
                         Vol_use_W_n[i] \
                             = Q_out_W_dis_req \
                             / ( self.__rho * self.__Cp \
-                              * (self.__temp_n[i] - self.__cold_feed.temperature()) \
+                              * (self.__temp_n[i] - temp_cold_water) \
                               )
                         Q_use_W_n[i] = Q_out_W_dis_req
                         Q_out_W_dis_req_rem = 0
@@ -246,7 +253,7 @@ class StorageTank:
                     Vol_use_W_n[i] \
                         = Q_out_W_dis_req_rem \
                         / ( self.__rho * self.__Cp \
-                          * (self.__temp_n[i] - self.__cold_feed.temperature()) \
+                          * (self.__temp_n[i] - temp_cold_water) \
                           )
                     Q_use_W_n[i] = Q_out_W_dis_req_rem
                     Q_out_W_dis_req_rem = 0
@@ -269,20 +276,21 @@ class StorageTank:
         provided to the input of the storage heater (bottom). The water of the upper volume is
         melted with the quantity of withdrawn water at the temperature of the lower level. """
         #initialise list of temperature of layers AFTER volume withdrawn in degrees
-        temp_s3_n = deepcopy(self.__temp_n)
+        temp_s3_n = list(self.__temp_n)
         #initialise volume in each layer remaining after draw-off
         V_sto_rem_n = [x - y for x, y in zip(self.__Vol_n, Vol_use_W_n)]
 
         #Temperature change only applicable if there is any volume withdrawn
         if sum(Vol_use_W_n) > 0:
+            temp_cold_water = self.__cold_feed.temperature()
             #determine how much water is displaced
             #IMPORTANT to iterate in reverse order -from top of tank
-            for i, vol_i in reversed(list(enumerate(self.__Vol_n))):
+            for i in range(self.__NB_VOL - 1, -1, -1):
                 vol_to_replace = self.__Vol_n[i]
                 #set list of flags for which layers need mixing for this layer
                 vol_mix_n = [0] * self.__NB_VOL
                 #loop through layers i and below
-                for j, vol_j in reversed(list(enumerate(V_sto_rem_n[:i+1]))):
+                for j in range(i, -1, -1):
                     if V_sto_rem_n[j] == 0:
                         pass
                     #layer can replace all of volume withdrawn
@@ -301,7 +309,7 @@ class StorageTank:
                 #calculate new temperature of layer
                 #note 6.4.3.5 equation 9 has an error as adding temps to volumes.
                 temp_s3_n[i] \
-                    = ( (self.__cold_feed.temperature() * vol_to_replace) \
+                    = ( (temp_cold_water * vol_to_replace) \
                         + (sum(self.__temp_n[k] * vol_mix_n[k] for k in range(len(vol_mix_n)))) \
                       ) \
                       / self.__Vol_n[i]
@@ -370,20 +378,20 @@ class StorageTank:
         For step 6, the addition of the temperature of volume 'i' and theoretical variation of
         temperature calculated according to formula (10) can exceed the set temperature defined
         by the control system of the storage unit."""
-        #initialise list of theoretical variation of temperature of layers in degrees
-        delta_temp_n = [0] * self.__NB_VOL
-        #initialise list of theoretical temperature of layers after input in degrees
-        temp_s6_n = [0] * self.__NB_VOL
         #output energy delivered by the storage in kWh - timestep dependent
-        Q_sto_h_out_n = [0] * self.__NB_VOL
-
-        for i, vol_i in list(enumerate(self.__Vol_n)):
-            delta_temp_n[i] = (Q_x_in_n[i] + Q_sto_h_out_n[i]) \
-                              / (self.__rho * self.__Cp * self.__Vol_n[i])
-            temp_s6_n[i] = temp_s3_n[i] + delta_temp_n[i]
-
-        Q_s6 = self.__rho * self.__Cp * sum(self.__Vol_n[i] \
-                * temp_s6_n[i] for i in range(len(self.__Vol_n)))
+        #(not currently modelled, so no contribution to temperature variation)
+
+        #theoretical temperature of layers after input in degrees, i.e. adding
+        #theoretical variation of temperature of each layer
+        temp_s6_n = [
+            temp_s3_i + Q_x_in_i / rho_Cp_Vol_i
+            for temp_s3_i, Q_x_in_i, rho_Cp_Vol_i
+            in zip(temp_s3_n, Q_x_in_n, self.__rho_Cp_Vol_n)
+            ]
+
+        Q_s6 = self.__rho * self.__Cp * sum(
+            vol_i * temp_s6_i for vol_i, temp_s6_i in zip(self.__Vol_n, temp_s6_n)
+            )
 
         return Q_s6, temp_s6_n
 
@@ -391,39 +399,34 @@ class StorageTank:
         """When the temperature of the volume i is higher than the one of the upper volume,
         then the 2 volumes are melted. This iterative process is maintained until the temperature
         of the volume i is lower or equal to the temperature of the volume i+1."""
-        #set list of flags for which layers need mixing
-        mix_layer_n = [0] * self.__NB_VOL
-        temp_s7_n = deepcopy(temp_s6_n)
+        temp_s7_n = list(temp_s6_n)
+        #lowest layer of the group of adjacent layers currently being mixed
+        #(None if the layers below the current layer are stable)
+        mix_layer_start = None
         #for loop :-1 is important here!
         #loop through layers from bottom to top, without including top layer.
         #this is because the top layer has no upper layer to compare too
-        for i, vol_i in list(enumerate(self.__Vol_n[:-1])):
+        for i in range(self.__NB_VOL - 1):
             if temp_s7_n[i] > temp_s7_n[i+1]:
-                #set layers to mix
-                mix_layer_n[i] = 1
-                mix_layer_n[i+1] = 1
+                #add upper layer to layers to mix
+                if mix_layer_start is None:
+                    mix_layer_start = i
+                mix_layers = range(mix_layer_start, i + 2)
                 #mix temeratures of all applicable layers
                 #note error in formula 12 in standard as adding temperature to volume
                 #this is what I think they intended from the description
-                temp_mix = sum( self.__Vol_n[k] * temp_s7_n[k] * mix_layer_n[k] \
-                                for k in range(len(self.__Vol_n)) \
-                              ) \
-                            / ( sum(self.__Vol_n[l] * mix_layer_n[l] \
-                                    for l in range(len(self.__Vol_n)) \
-                                   ) \
-                              )
+                temp_mix = sum(self.__Vol_n[k] * temp_s7_n[k] for k in mix_layers) \
+                         / sum(self.__Vol_n[k] for k in mix_layers)
                 #set same temperature for all applicable layers
-                for j, temp_j in list(enumerate(temp_s7_n[:i+2])):
-                    if mix_layer_n[j] == 1:
-                        temp_s7_n[j] = temp_mix
+                for k in mix_layers:
+                    temp_s7_n[k] = temp_mix
             else:
                 #reset mixing as lower levels now stabalised
-                mix_layer_n = [0] * self.__NB_VOL
+                mix_layer_start = None
 
         Q_h_sto_end \
-            = [ self.__rho * self.__Cp \
-              * self.__Vol_n[i] * temp_s7_n[i]
-              for i in range(len(self.__Vol_n))
+            = [ rho_Cp_Vol_i * temp_s7_i
+              for rho_Cp_Vol_i, temp_s7_i in zip(self.__rho_Cp_Vol_n, temp_s7_n)
               ]
 
         return Q_h_sto_end, temp_s7_n
@@ -431,28 +434,29 @@ class StorageTank:
     def thermal_losses(self, temp_s7_n, Q_x_in_n, Q_h_sto_s7, heater_layer, Q_ls_n_prev_heat_source):
         """Thermal losses are calculated with respect to the impact of the temperature set point"""
         #standby losses coefficient - kW/K
-        H_sto_ls = self.stand_by_losses_coefficient()
+        #(see stand_by_losses_coefficient - this is precalculated for each
+        #layer in __init__)
 
         #standby losses correction factor - dimensionless
         #do not think these are applicable so used: f_sto_dis_ls = 1, f_sto_bac_acc = 1
 
-        #initialise list of thermal losses in kWh
-        Q_ls_n = [0] * self.__NB_VOL
-        #initialise list of final temperature of layers after thermal losses in degrees
-        temp_s8_n = [0] * self.__NB_VOL
+        timestep = self.__simulation_time.timestep()
 
         # Thermal losses
         # Note: Eqn 13 from BS EN 15316-5:2017 does not explicitly multiply by
         # timestep (it seems to assume a 1 hour timestep implicitly), but it is
         # necessary to convert the rate of heat loss to a total heat loss over
         # the time period
-        for i, vol_i in list(enumerate(self.__Vol_n)):
-            Q_ls_n[i] = (H_sto_ls * self.__rho * self.__Cp) \
-                        * (self.__Vol_n[i] / self.__V_total) \
-                        * (min(temp_s7_n[i], self.__temp_set_on) - self.__temp_amb) \
-                        * self.__simulation_time.timestep()
-            # Prevent double-counting of losses with multiple heat sources
-            Q_ls_n[i] = max(0.0, Q_ls_n[i] - Q_ls_n_prev_heat_source[i])
+        # Prevent double-counting of losses with multiple heat sources
+        Q_ls_n = [
+            max(
+                0.0,
+                H_ls_i * (min(temp_s7_i, self.__temp_set_on) - self.__temp_amb) * timestep
+                - Q_ls_prev_i,
+                )
+            for H_ls_i, temp_s7_i, Q_ls_prev_i
+            in zip(self.__H_ls_n, temp_s7_n, Q_ls_n_prev_heat_source)
+            ]
 
         #total thermal losses kWh
         Q_ls = sum(Q_ls_n)
@@ -460,22 +464,21 @@ class StorageTank:
         #the final value of the temperature is reduced due to the effect of the thermal losses.
         #check temperature compared to set point
         #the temperature for each volume are limited to the set point for any volume controlled
-        for i, vol_i in list(enumerate(self.__Vol_n)):
-            if temp_s7_n[i] > self.__temp_set_on:
-                #Case 2 - Temperature exceeding the set point
-                temp_s8_n[i] = self.__temp_set_on
-            else:
-                #Case 1 - Temperature below the set point
-                #TODO - spreadsheet accounts for total thermal losses not just layer
-                """temp_s8_n[i] \
-                    = temp_s7_n[i] - (Q_ls / (self.__rho * self.__Cp * self.__V_total))"""
-
-                #the final value of the temperature
-                #is reduced due to the effect of the thermal losses
-                #Formula (14) in the standard appears to have error as addition not multiply
-                #and P instead of rho
-                temp_s8_n[i] \
-                    = temp_s7_n[i] - (Q_ls_n[i] / (self.__rho * self.__Cp * self.__Vol_n[i]))
+        #Case 2 - Temperature exceeding the set point
+        #Case 1 - Temperature below the set point
+        #TODO - spreadsheet accounts for total thermal losses not just layer
+        """temp_s8_n[i] \
+            = temp_s7_n[i] - (Q_ls / (self.__rho * self.__Cp * self.__V_total))"""
+        #the final value of the temperature
+        #is reduced due to the effect of the thermal losses
+        #Formula (14) in the standard appears to have error as addition not multiply
+        #and P instead of rho
+        temp_s8_n = [
+            self.__temp_set_on if temp_s7_i > self.__temp_set_on
+            else temp_s7_i - (Q_ls_i / rho_Cp_Vol_i)
+            for temp_s7_i, Q_ls_i, rho_Cp_Vol_i
+            in zip(temp_s7_n, Q_ls_n, self.__rho_Cp_Vol_n)
+            ]
 
         #excess energy / energy surplus
         """excess energy is calculated as the difference from the energy stored, Qsto,step7, and
@@ -489,7 +492,7 @@ class StorageTank:
             for i in range(heater_layer, self.__NB_VOL):
                 energy_surplus \
                     += Q_h_sto_s7[i] - Q_ls_n[i] \
-                     - (self.__rho * self.__Cp * self.__Vol_n[i] * self.__temp_set_on)
+                     - (self.__rho_Cp_Vol_n[i] * self.__temp_set_on)
 
         #the thermal energy provided to the system (from heat sources) shall be limited
         #adjustment of the energy delivered to the storage according with the set temperature
@@ -608,10 +611,10 @@ class StorageTank:
         #TODO 6.4.3.11 Heat exchanger
 
         #demand adjusted energy from heat source (before was just using potential without taking it)
-        input_energy_adj = deepcopy(Q_in_H_W)
+        input_energy_adj = Q_in_H_W
 
         #energy demand saved for unittest
-        self.__energy_demand_test = deepcopy(input_energy_adj)
+        self.__energy_demand_test = input_energy_adj
 
         heat_source_output = self.heat_source_output(heat_source, input_energy_adj)
         input_energy_adj = input_energy_adj - heat_source_output
@@ -702,7 +705,8 @@ class StorageTank:
         self.__Q_sto_h_ls_rbl = Q_sto_h_rbl_env + Q_sto_h_rbl_aux
 
         #set temperatures calculated to be initial temperatures of volumes for the next timestep
-        self.__temp_n = deepcopy(temp_s8_n)
+        #(note that temp_s8_n is a new list, so does not need to be copied)
+        self.__temp_n = temp_s8_n
 
         #TODOrecoverable heat losses for heating should impact heating
 
@@ -733,7 +737,8 @@ class StorageTank:
             self.__Q_ls_n_prev_heat_source[i] += Q_ls_n
 
         #set temperatures calculated to be initial temperatures of volumes for the next timestep
-        self.__temp_n = deepcopy(temp_s8_n)
+        #(note that temp_s8_n is a new list, so does not need to be copied)
+        self.__temp_n = temp_s8_n
 
         # Return energy accepted
         return Q_in_H_W
@@ -1022,9 +1027,9 @@ class SolarThermalSystem:
         # If first time step, pick bottom of the tank temperature as inlet_temp_s1
         if (self.__simulation_time.index() == 0):
             inlet_temp_s1 = temp_storage_tank_s3_n[0]
-            self.__inlet_temp = deepcopy(inlet_temp_s1)
+            self.__inlet_temp = inlet_temp_s1
         else:
-            inlet_temp_s1 = deepcopy(self.__inlet_temp)
+            inlet_temp_s1 = self.__inlet_temp
 
         #solar_irradiance in W/m2
         solar_irradiance = self.__external_conditions.calculated_total_solar_irradiance( \
@@ -1090,7 +1095,7 @@ class SolarThermalSystem:
                   )
                                                 
         # Copy the finishing value of inlet temp ready for start of next timestep
-        self.__inlet_temp = deepcopy(inlet_temp2)
+        self.__inlet_temp = inlet_temp2
 
         return self.__heat_output_collector_loop
     
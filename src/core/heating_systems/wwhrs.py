@@ -1,10 +1,45 @@
 #!/usr/bin/env python3
-import scipy.interpolate
 
 """
 This module provides objects to model waste water heat recovery systems of different types.
 """
 
+# Third-party imports
+import numpy as np
+
+
+def sorted_efficiency_table(flow_rates, efficiencies):
+    """ Return flow rates and efficiencies as arrays sorted by flow rate
+
+    Arguments:
+    flow_rates   -- list of waste water flow rates, in any order
+    efficiencies -- list of efficiencies corresponding to flow_rates
+    """
+    flow_rates = np.asarray(flow_rates, dtype=float)
+    efficiencies = np.asarray(efficiencies, dtype=float)
+    order = np.argsort(flow_rates, kind='stable')
+    return flow_rates[order], efficiencies[order]
+
+def interpolate_efficiency(flow_rates_sorted, efficiencies_sorted, flowrate):
+    """ Linearly interpolate efficiency for one or more waste water flow rates
+
+    Flow rates outside the range of the table are an error, as with the
+    scipy interp1d object this replaces.
+
+    Arguments:
+    flow_rates_sorted   -- array of flow rates, in ascending order
+    efficiencies_sorted -- array of efficiencies corresponding to flow_rates_sorted
+    flowrate            -- flow rate of waste water (scalar or array-like)
+    """
+    flowrate_arr = np.asarray(flowrate, dtype=float)
+    if np.any(flowrate_arr < flow_rates_sorted[0]) \
+    or np.any(flowrate_arr > flow_rates_sorted[-1]):
+        raise ValueError(
+            'WWHRS flow rate outside the range of the efficiency table ('
+            + str(flow_rates_sorted[0]) + ' to ' + str(flow_rates_sorted[-1]) + ')'
+            )
+    return np.interp(flowrate_arr, flow_rates_sorted, efficiencies_sorted)
+
 class WWHRS_InstantaneousSystemB:
     """ A class to represent instantaneous waste water heat recovery systems with arrangement B
     
@@ -13,8 +48,8 @@ class WWHRS_InstantaneousSystemB:
 
     def __init__(self, flow_rates, efficiencies, cold_water_source, utilisation_factor):
         self.__cold_water_source = cold_water_source
-        self.__flow_rates = flow_rates
-        self.__efficiencies = efficiencies
+        self.__flow_rates, self.__efficiencies \
+            = sorted_efficiency_table(flow_rates, efficiencies)
         self.__utilisation_factor = utilisation_factor
 
     def return_temperature(self, temp_target, flowrate_waste_water=None, flowrate_cold_water=None):
@@ -42,10 +77,9 @@ class WWHRS_InstantaneousSystemB:
         return(temp_cold)
 
     def get_efficiency_from_flowrate(self, flowrate):
-        # Get the interpolated efficiency from the flowrate of waste water
-        y_interp = scipy.interpolate.interp1d(self.__flow_rates, self.__efficiencies)
-        
-        return(y_interp(flowrate))
+        # Get the interpolated efficiency from the flowrate of waste water.
+        # flowrate may be a scalar or an array of flow rates
+        return interpolate_efficiency(self.__flow_rates, self.__efficiencies, flowrate)
         
 class WWHRS_InstantaneousSystemC:
     """ A class to represent instantaneous waste water heat recovery systems with arrangement C
@@ -56,8 +90,8 @@ class WWHRS_InstantaneousSystemC:
     def __init__(self, flow_rates, efficiencies, cold_water_source, utilisation_factor):
         self.__cold_water_source = cold_water_source
         self.__stored_temperature = self.__cold_water_source.temperature()
-        self.__flow_rates = flow_rates
-        self.__efficiencies = efficiencies
+        self.__flow_rates, self.__efficiencies \
+            = sorted_efficiency_table(flow_rates, efficiencies)
         self.__utilisation_factor = utilisation_factor
 
     def set_temperature_for_return(self, water_temperature):
@@ -92,10 +126,9 @@ class WWHRS_InstantaneousSystemC:
         return(temp_cold)
 
     def get_efficiency_from_flowrate(self, flowrate):
-        # Get the interpolated efficiency from the flowrate of waste water
-        y_interp = scipy.interpolate.interp1d(self.__flow_rates, self.__efficiencies)
-        
-        return(y_interp(flowrate))
+        # Get the interpolated efficiency from the flowrate of waste water.
+        # flowrate may be a scalar or an array of flow rates
+        return interpolate_efficiency(self.__flow_rates, self.__efficiencies, flowrate)
 
 class WWHRS_InstantaneousSystemA:
     """ A class to represent instantaneous waste water heat recovery systems with arrangement A
@@ -107,8 +140,8 @@ class WWHRS_InstantaneousSystemA:
     def __init__(self, flow_rates, efficiencies, cold_water_source, utilisation_factor):
         self.__cold_water_source = cold_water_source
         self.__stored_temperature = self.__cold_water_source.temperature()
-        self.__flow_rates = flow_rates
-        self.__efficiencies = efficiencies
+        self.__flow_rates, self.__efficiencies \
+            = sorted_efficiency_table(flow_rates, efficiencies)
         self.__utilisation_factor = utilisation_factor
 
     def set_temperature_for_return(self, water_temperature):
@@ -132,7 +165,6 @@ class WWHRS_InstantaneousSystemA:
         return(temp_cold)
 
     def get_efficiency_from_flowrate(self, flowrate):
-        # Get the interpolated efficiency from the flowrate of waste water
-        y_interp = scipy.interpolate.interp1d(self.__flow_rates, self.__efficiencies)
-        
-        return(y_interp(flowrate))
+        # Get the interpolated efficiency from the flowrate of waste water.
+        # flowrate may be a scalar or an array of flow rates
+        return interpolate_efficiency(self.__flow_rates, self.__efficiencies, flowrate)
@@ -9,6 +9,9 @@ initialises the relevant objects in the core model.
 import sys
 from math import ceil
 
+# Third-party imports
+import numpy as np
+
 # Local imports
 import core.units as units
 from core.simulation_time import SimulationTime
@@ -49,17 +52,31 @@ from core.ductwork import Ductwork
 import core.heating_systems.wwhrs as wwhrs
 from core.heating_systems.point_of_use import PointOfUse
 from core.units import Kelvin2Celcius
+from core.results import ResultsBuffers, ResultsTotals, ProjectResults
 
 
 class Project:
     """ An object to represent the overall model to be simulated """
 
+    # Convergence criterion (max. change in throughput factor) and max. number
+    # of recalculations of space heating demand per timestep when iterating
+    # over throughput factor for overventilation
+    __THROUGHPUT_FACTOR_TOLERANCE = 1e-6
+    __THROUGHPUT_FACTOR_MAX_ITERATIONS = 10
+
     def __init__(
             self,
             proj_dict,
             print_heat_balance,
             detailed_output_heating_cooling,
             use_fast_solver,
+            precompute_solar=False,
+            weather_store=None,
+            use_fast_emitter_integrator=False,
+            use_fast_storage_heater_integrator=False,
+            heat_pump_performance_map_resolution=None,
+            iterate_throughput_factor=False,
+            summary_only=False,
             ):
         """ Construct a Project object and the various components of the simulation
 
@@ -72,6 +89,43 @@ class Project:
                                            provided for heating and cooling (where possible)
         use_fast_solver -- flag to indicate whether to use the optimised solver (results
                            may differ slightly due to reordering of floating-point ops)
+        precompute_solar -- flag to indicate whether to calculate solar irradiance for all
+                            timesteps at once for each surface (results may differ slightly
+                            due to reordering of floating-point ops)
+        weather_store -- WeatherStore object to take weather data and derived solar
+                         geometry from, instead of the weather data in proj_dict
+        use_fast_emitter_integrator -- flag to indicate whether to calculate wet
+                                       emitter temperatures with the dedicated
+                                       integrator rather than solve_ivp from scipy
+                                       (results may differ slightly, within the
+                                       tolerance of solve_ivp)
+        use_fast_storage_heater_integrator -- flag to indicate whether to calculate
+                                              electric storage heater core and case
+                                              temperatures with the dedicated integrator
+                                              rather than solve_ivp from scipy (results
+                                              may differ slightly, within the tolerance
+                                              of solve_ivp)
+        heat_pump_performance_map_resolution
+            -- if not None, heat pump performance at operating conditions is looked
+               up from a performance map with grid points at this spacing (in
+               Kelvin) rather than calculated from the test data each time (results
+               may differ slightly, within the tolerance of the performance map)
+        iterate_throughput_factor -- flag to indicate whether to iterate the
+                                     calculation of space heating demand and
+                                     throughput factor until they converge,
+                                     where there is overventilation (e.g. due
+                                     to an exhaust air heat pump), rather than
+                                     recalculating space heating demand once
+        summary_only -- flag to indicate whether to keep only totals over the
+                        simulation rather than results for each timestep, so
+                        that memory use does not depend on the number of
+                        timesteps. In this case, each time series returned by
+                        the run function has a single element holding its total
+                        (or, for temperatures, its mean), and the timestep
+                        array holds only the start time. Results for each
+                        timestep can still be written as the simulation
+                        progresses by registering output sinks (see
+                        register_output_sink)
 
         Other (self.__) variables:
         simtime            -- SimulationTime object for this Project
@@ -87,6 +141,20 @@ class Project:
         zones              -- dictionary of Zone objects with names as keys
         """
         self.__detailed_output_heating_cooling = detailed_output_heating_cooling
+        self.__use_linear_superposition = use_fast_solver
+        self.__use_fast_emitter_integrator = use_fast_emitter_integrator
+        self.__use_fast_storage_heater_integrator = use_fast_storage_heater_integrator
+        self.__heat_pump_performance_map_resolution = heat_pump_performance_map_resolution
+        self.__iterate_throughput_factor = iterate_throughput_factor
+        self.__throughput_factor_iterations = None
+        self.__throughput_factor_not_converged = 0
+        self.__output_sinks = []
+        self.__summary_only = summary_only
+        self.__hot_water_energy_demand_daily = None
+
+        if summary_only and detailed_output_heating_cooling:
+            sys.exit('Detailed output for heating and cooling is not available '
+                     'in summary-only mode')
 
         self.__simtime = SimulationTime(
             proj_dict['SimulationTime']['start'],
@@ -103,25 +171,34 @@ class Project:
         else:
             dir_beam_conversion = False
 
-        self.__external_conditions = ExternalConditions(
-            self.__simtime,
-            proj_dict['ExternalConditions']['air_temperatures'],
-            proj_dict['ExternalConditions']['wind_speeds'],
-            proj_dict['ExternalConditions']['diffuse_horizontal_radiation'],
-            proj_dict['ExternalConditions']['direct_beam_radiation'],
-            proj_dict['ExternalConditions']['solar_reflectivity_of_ground'],
-            proj_dict['ExternalConditions']['latitude'],
-            proj_dict['ExternalConditions']['longitude'],
-            0, #proj_dict['ExternalConditions']['timezone'],
-            0, #proj_dict['ExternalConditions']['start_day'],
-            365, #proj_dict['ExternalConditions']['end_day'],
-            1, #proj_dict['ExternalConditions']['time_series_step'],
-            None, #proj_dict['ExternalConditions']['january_first'],
-            None, #proj_dict['ExternalConditions']['daylight_savings'],
-            None, #proj_dict['ExternalConditions']['leap_day_included'],
-            dir_beam_conversion,
-            proj_dict['ExternalConditions']['shading_segments'],
-            )
+        if weather_store is not None:
+            self.__external_conditions = ExternalConditions.from_weather_store(
+                self.__simtime,
+                weather_store,
+                proj_dict['ExternalConditions']['shading_segments'],
+                precompute_solar,
+                )
+        else:
+            self.__external_conditions = ExternalConditions(
+                self.__simtime,
+                proj_dict['ExternalConditions']['air_temperatures'],
+                proj_dict['ExternalConditions']['wind_speeds'],
+                proj_dict['ExternalConditions']['diffuse_horizontal_radiation'],
+                proj_dict['ExternalConditions']['direct_beam_radiation'],
+                proj_dict['ExternalConditions']['solar_reflectivity_of_ground'],
+                proj_dict['ExternalConditions']['latitude'],
+                proj_dict['ExternalConditions']['longitude'],
+                0, #proj_dict['ExternalConditions']['timezone'],
+                0, #proj_dict['ExternalConditions']['start_day'],
+                365, #proj_dict['ExternalConditions']['end_day'],
+                1, #proj_dict['ExternalConditions']['time_series_step'],
+                None, #proj_dict['ExternalConditions']['january_first'],
+                None, #proj_dict['ExternalConditions']['daylight_savings'],
+                None, #proj_dict['ExternalConditions']['leap_day_included'],
+                dir_beam_conversion,
+                proj_dict['ExternalConditions']['shading_segments'],
+                precompute_solar,
+                )
 
         if 'flat' in proj_dict['Infiltration']['build_type']:
             storey_of_dwelling = proj_dict['Infiltration']['storey_of_dwelling']
@@ -156,7 +233,11 @@ class Project:
                 = ColdWaterSource(data['temperatures'], self.__simtime, data['start_day'], data['time_series_step'])
 
         self.__energy_supplies = {}
-        energy_supply_unmet_demand = EnergySupply('unmet_demand', self.__simtime)
+        energy_supply_unmet_demand = EnergySupply(
+            'unmet_demand',
+            self.__simtime,
+            summary_only=summary_only,
+            )
         self.__energy_supplies['_unmet_demand'] = energy_supply_unmet_demand
         diverters = {}
         for name, data in proj_dict['EnergySupply'].items():
@@ -167,10 +248,15 @@ class Project:
                     ElectricBattery(
                         data['ElectricBattery']['capacity'],
                         data['ElectricBattery']['charge_discharge_efficiency'],
-                        )
+                        ),
+                    summary_only=summary_only,
                     )
             else:
-                self.__energy_supplies[name] = EnergySupply(data['fuel'], self.__simtime)
+                self.__energy_supplies[name] = EnergySupply(
+                    data['fuel'],
+                    self.__simtime,
+                    summary_only=summary_only,
+                    )
             # TODO Consider replacing fuel type string with fuel type object
 
             if 'diverter' in data:
@@ -585,6 +671,8 @@ class Project:
                 vent_cool_extra = vent_cool_extra,
                 print_heat_balance = print_heat_balance,
                 use_fast_solver = use_fast_solver,
+                use_linear_superposition = self.__use_linear_superposition,
+                simulation_time = self.__simtime,
                 )
 
         self.__zones = {}
@@ -655,7 +743,8 @@ class Project:
                     self.__external_conditions,
                     throughput_exhaust_air,
                     energy_supply_HN,
-                    self.__detailed_output_heating_cooling
+                    self.__detailed_output_heating_cooling,
+                    self.__heat_pump_performance_map_resolution,
                     )
                 self.__timestep_end_calcs.append(heat_source)
             elif heat_source_type == 'Boiler':
@@ -1014,6 +1103,7 @@ class Project:
                     self.__simtime,
                     ctrl,
                     charge_control,
+                    self.__use_fast_storage_heater_integrator,
                 )
             elif space_heater_type == 'WetDistribution':
                 energy_supply_conn_name = data['HeatSource']['name'] + '_space_heating: ' + name
@@ -1060,6 +1150,7 @@ class Project:
                     data['ecodesign_controller'],
                     data['design_flow_temp'],
                     self.__simtime,
+                    self.__use_fast_emitter_integrator,
                     )
             elif space_heater_type == 'WarmAir':
                 energy_supply_conn_name = data['HeatSource']['name'] + '_space_heating: ' + name
@@ -1202,6 +1293,62 @@ class Project:
         """ Convert orientation from 0-360 (clockwise) to -180 to +180 (anticlockwise) """
         return 180 - orientation360
 
+    def throughput_factor_iterations(self):
+        """ Return array of the number of times space heating demand was
+        recalculated to account for overventilation in each timestep, or None
+        if the calculation was not iterated (see iterate_throughput_factor) """
+        return self.__throughput_factor_iterations
+
+    def throughput_factor_not_converged(self):
+        """ Return the number of timesteps in which the iterated throughput
+        factor calculation did not converge (see iterate_throughput_factor) """
+        return self.__throughput_factor_not_converged
+
+    def register_output_sink(self, sink):
+        """ Register an object to receive time series results as the simulation progresses
+
+        Arguments:
+        sink -- object with the following functions:
+                open(results) -- called at the end of the first timestep, once
+                                 all output channels have been created, with a
+                                 ProjectResults object whose time series are
+                                 filled in as the simulation progresses (CoP
+                                 and detailed heat source wet results are not
+                                 available until the end of the simulation, so
+                                 these are None)
+                write_timestep(t_idx, r_idx) -- called at the end of each
+                                                timestep, once all results for
+                                                the timestep are available,
+                                                where r_idx is the index of the
+                                                results for the timestep in
+                                                each time series (in
+                                                summary-only mode, this is
+                                                always 0, as only the current
+                                                timestep is held)
+                close() -- called at the end of the simulation, or if the
+                           simulation stops early due to an error
+
+        To write results for each timestep without holding them all in memory,
+        use summary-only mode and register output sinks.
+        """
+        self.__output_sinks.append(sink)
+
+    def hot_water_energy_demand_daily(self):
+        """ Return list of total hot water energy demand (including pipework
+        loss) for each day of the simulation, in kWh, once it has been run """
+        return self.__hot_water_energy_demand_daily
+
+    def peak_net_import(self, energy_supply_name):
+        """ Return highest net import (i.e. import plus export, which is
+        negative) in any timestep for the energy supply specified, and the
+        index of the timestep in which it occurs, once simulation has been run
+        """
+        return self.__energy_supplies[energy_supply_name].get_peak_net_import()
+
+    def no_of_timesteps(self):
+        """ Return number of timesteps in simulation """
+        return self.__simtime.total_steps()
+
     def total_floor_area(self):
         return self.__total_floor_area
 
@@ -1320,7 +1467,39 @@ class Project:
             )
 
     def run(self):
-        """ Run the simulation """
+        """ Run the simulation
+
+        Returns a ProjectResults object. Time series results for zones, heating
+        and cooling systems, hot water and heat balance are held in nested
+        dictionaries of arrays with one element per timestep.
+        """
+        timesteps = self.run_timesteps()
+        zone_solutions = None
+        while True:
+            try:
+                zone_systems = timesteps.send(zone_solutions)
+            except StopIteration as stop:
+                return stop.value
+            zone_solutions = {
+                z_name: np.linalg.solve(matrix_a, vector_b)
+                for z_name, (matrix_a, vector_b) in zone_systems.items()
+                }
+
+    def run_timesteps(self):
+        """ Run the simulation, pausing in each timestep to allow the zone heat
+        balance eqns to be solved outside this object
+
+        This is a generator which, in each timestep, yields a dictionary where
+        the key is the zone name and the value is the matrix eqn for the zone
+        heat balance (as returned by Zone.heat_balance_system), and expects the
+        solutions (in a dictionary with the same keys) to be sent back before
+        continuing. This allows several projects to be run in lock-step with
+        the zone heat balance eqns for all of them solved together. The
+        dictionary will be empty if the optimised solver is not in use, in
+        which case the zones solve their own heat balance eqns. The simulation
+        results are returned (in the same format as for the run function) when
+        the generator is exhausted.
+        """
 
         def calc_ductwork_losses(t_idx, delta_t_h, efficiency):
             """ Calculate the losses/gains in the MVHR ductwork
@@ -1367,6 +1546,125 @@ class Project:
 
             return ductwork_watts_heat_loss # heat loss in Watts for the timestep
 
+        def calc_throughput_factor(space_heat_demand_system):
+            """ Calculate throughput factor for all services combined, based on
+            the space heating demand given
+
+            Arguments:
+            space_heat_demand_system -- dictionary of space heating demand for
+                                        each heating system, in kWh
+            """
+            space_heat_running_time_cumulative = 0.0
+            throughput_factor = 1.0
+            for heat_system_name, heat_system in self.__space_heat_systems.items():
+                if heat_system_name in self.__heat_system_names_requiring_overvent:
+                    space_heat_running_time_cumulative, throughput_factor \
+                        = heat_system.running_time_throughput_factor(
+                            space_heat_demand_system[heat_system_name],
+                            space_heat_running_time_cumulative,
+                            )
+            return throughput_factor
+
+        # Estimate of the rate of change of the throughput factor calculated by
+        # calc_throughput_factor with respect to the throughput factor used to
+        # calculate the space heating demand, from the previous timestep in
+        # which the calculation was iterated. Used to warm-start the iteration.
+        throughput_factor_gradient = 0.0
+
+        def iterate_throughput_factor(
+                delta_t_h,
+                temp_ext_air,
+                gains_internal_zone,
+                gains_fans_zone,
+                gains_solar_zone,
+                throughput_factor_no_overvent,
+                ):
+            """ Iterate calculation of space heating demand and throughput factor
+            until they converge
+
+            Arguments:
+            delta_t_h -- calculation timestep, in hours
+            temp_ext_air -- external air temperature, in deg C
+            gains_internal_zone -- dictionary of internal gains for each zone
+                                   with no overventilation, in W
+            gains_fans_zone -- dictionary of additional gains from ventilation
+                               fans for each zone per unit of additional
+                               throughput factor, in W
+            gains_solar_zone -- dictionary of solar gains for each zone, in W
+            throughput_factor_no_overvent
+                -- throughput factor calculated from space heating demand with
+                   no overventilation
+
+            Solves for the throughput factor x for which x = g(x), where g is
+            the throughput factor calculated from the space heating demand
+            with throughput factor x, using the secant method. The first step
+            uses the gradient of g from the previous timestep in which the
+            calculation was iterated (or zero, which makes the first step the
+            same as recalculating the space heating demand once). Returns the
+            throughput factor, the space heating/cooling demand calculated
+            with it (as returned by __space_heat_cool_demand_by_system_and_zone)
+            and the number of times space heating demand was recalculated. If
+            the calculation does not converge within the maximum number of
+            iterations, the last throughput factor for which space heating
+            demand was calculated is returned and the timestep is counted (see
+            throughput_factor_not_converged).
+            """
+            nonlocal throughput_factor_gradient
+
+            # Known point: x = 1 (no overventilation)
+            throughput_factor_prev = 1.0
+            residual_prev = throughput_factor_no_overvent - 1.0
+            throughput_factor \
+                = throughput_factor_prev + residual_prev / (1.0 - throughput_factor_gradient)
+
+            for iteration in range(1, self.__THROUGHPUT_FACTOR_MAX_ITERATIONS + 1):
+                # Note: Ventilation fans are not called here as this would
+                #       record their energy use for each iteration
+                gains_internal_zone_overvent = {
+                    z_name: gains_internal_zone[z_name]
+                          + gains_fans_zone.get(z_name, 0.0) * (throughput_factor - 1.0)
+                    for z_name in self.__zones.keys()
+                    }
+                space_heat_cool_demand \
+                    = self.__space_heat_cool_demand_by_system_and_zone(
+                        delta_t_h,
+                        temp_ext_air,
+                        gains_internal_zone_overvent,
+                        gains_solar_zone,
+                        throughput_factor,
+                        )
+                residual = calc_throughput_factor(space_heat_cool_demand[0]) - throughput_factor
+                if abs(residual) <= self.__THROUGHPUT_FACTOR_TOLERANCE:
+                    break
+                if iteration == self.__THROUGHPUT_FACTOR_MAX_ITERATIONS:
+                    # Not converged. Keep the last throughput factor for which
+                    # space heating demand was calculated, so that the two
+                    # are consistent
+                    self.__throughput_factor_not_converged += 1
+                    break
+
+                if residual == residual_prev:
+                    # Secant method not applicable, so use fixed-point step
+                    throughput_factor_next = throughput_factor + residual
+                else:
+                    throughput_factor_next \
+                        = throughput_factor \
+                        - residual * (throughput_factor - throughput_factor_prev) \
+                        / (residual - residual_prev)
+                    throughput_factor_gradient \
+                        = 1.0 + (residual - residual_prev) \
+                        / (throughput_factor - throughput_factor_prev)
+                    # Only warm-start from a gradient for which fixed-point
+                    # iteration would converge
+                    if not abs(throughput_factor_gradient) < 1.0:
+                        throughput_factor_gradient = 0.0
+
+                throughput_factor_prev, residual_prev = throughput_factor, residual
+                # Throughput factor cannot be less than 1 (no overventilation)
+                throughput_factor = max(1.0, throughput_factor_next)
+
+            return throughput_factor, space_heat_cool_demand, iteration
+
         def calc_space_heating(delta_t_h, gains_internal_dhw):
             """ Calculate space heating demand, heating system output and temperatures
 
@@ -1386,23 +1684,42 @@ class Project:
 
             # Calculate internal and solar gains for each zone
             gains_internal_zone = {}
+            gains_fans_zone = {}
             gains_solar_zone = {}
+            t_idx = self.__simtime.index()
             for z_name, zone in self.__zones.items():
                 # Initialise to dhw internal gains split proportionally to zone floor area
                 gains_internal_zone_inner = gains_internal_dhw * zone.area() / self.__total_floor_area
-                for internal_gains_name, internal_gains_object in self.__internal_gains.items():
-                    gains_internal_zone_inner\
-                        += internal_gains_object.total_internal_gain(zone.area())
+                for internal_gains_zone in self.__internal_gains_by_zone[z_name]:
+                    gains_internal_zone_inner += internal_gains_zone[t_idx]
                 gains_internal_zone[z_name] = gains_internal_zone_inner
                 # Add gains from ventilation fans (also calculates elec demand from fans)
                 # TODO Remove the branch on the type of ventilation (find a better way)
                 if self.__ventilation is not None \
                 and not isinstance(self.__ventilation, NaturalVentilation):
-                    gains_internal_zone[z_name] += self.__ventilation.fans(zone.volume())
+                    gains_fans_zone[z_name] = self.__ventilation.fans(zone.volume())
+                    gains_internal_zone[z_name] += gains_fans_zone[z_name]
                     gains_internal_zone[z_name] += ductwork_losses_per_m3 * zone.volume()
 
                 gains_solar_zone[z_name] = zone.gains_solar()
 
+            # Pause so that the zone heat balance eqns at free-floating
+            # conditions can be solved together with those for other projects.
+            # The solutions will be reused in the calculation of space heating
+            # and cooling demand below
+            zone_systems = {}
+            if self.__use_linear_superposition:
+                for z_name, zone in self.__zones.items():
+                    zone_systems[z_name] = zone.heat_balance_system(
+                        delta_t_h,
+                        temp_ext_air,
+                        gains_internal_zone[z_name],
+                        gains_solar_zone[z_name],
+                        )
+            zone_solutions = yield zone_systems
+            for z_name, vector_x in zone_solutions.items():
+                self.__zones[z_name].set_heat_balance_solution(vector_x)
+
             # Calculate space heating and cooling demand for each zone and sum
             # Keep track of how much is from each zone, so that energy provided
             # can be split between them in same proportion later
@@ -1418,15 +1735,7 @@ class Project:
             # If any heating systems potentially require overventilation,
             # calculate running time and throughput factor for all services
             # combined based on space heating demand assuming no overventilation
-            space_heat_running_time_cumulative = 0.0
-            throughput_factor = 1.0
-            for heat_system_name, heat_system in self.__space_heat_systems.items():
-                if heat_system_name in self.__heat_system_names_requiring_overvent:
-                    space_heat_running_time_cumulative, throughput_factor \
-                        = heat_system.running_time_throughput_factor(
-                            space_heat_demand_system[heat_system_name],
-                            space_heat_running_time_cumulative,
-                            )
+            throughput_factor = calc_throughput_factor(space_heat_demand_system)
 
             # If there is overventilation due to heating or hot water system (e.g.
             # exhaust air heat pump) then recalculate space heating/cooling demand
@@ -1441,8 +1750,30 @@ class Project:
             #      consistent with the approach in SAP 10.2 and keeps the
             #      execution time of the calculation bounded. However, the
             #      merits of iterating over this calculation until converging on
-            #      a solution should be considered in the future.
-            if throughput_factor > 1.0:
+            #      a solution should be considered in the future. Iterating is
+            #      available as an option (see iterate_throughput_factor).
+            if throughput_factor > 1.0 and self.__iterate_throughput_factor:
+                throughput_factor, space_heat_cool_demand, iterations \
+                    = iterate_throughput_factor(
+                        delta_t_h,
+                        temp_ext_air,
+                        gains_internal_zone,
+                        gains_fans_zone,
+                        gains_solar_zone,
+                        throughput_factor,
+                        )
+                space_heat_demand_system, space_cool_demand_system, \
+                    space_heat_demand_zone, space_cool_demand_zone, h_ve_cool_extra_zone \
+                    = space_heat_cool_demand
+                if self.__throughput_factor_iterations is not None:
+                    self.__throughput_factor_iterations[self.__simtime.index()] = iterations
+                # Add additional gains from ventilation fans (also records
+                # elec demand from fans)
+                for z_name, zone in self.__zones.items():
+                    if z_name in gains_fans_zone:
+                        gains_internal_zone[z_name] \
+                            += self.__ventilation.fans(zone.volume(), throughput_factor - 1.0)
+            elif throughput_factor > 1.0:
                 for z_name, zone in self.__zones.items():
                     # Add additional gains from ventilation fans
                     # TODO Remove the branch on the type of ventilation (find a better way)
@@ -1594,168 +1925,80 @@ class Project:
                    space_heat_provided, space_cool_provided, \
                    ductwork_losses, heat_balance_dict
 
-        timestep_array = []
-        gains_internal_dict = {}
-        gains_solar_dict = {}
-        operative_temp_dict = {}
-        internal_air_temp_dict = {}
-        space_heat_demand_dict = {}
-        space_cool_demand_dict = {}
-        space_heat_demand_system_dict = {}
-        space_cool_demand_system_dict = {}
-        space_heat_provided_dict = {}
-        space_cool_provided_dict = {}
-        zone_list = []
-        hot_water_demand_dict = {}
-        hot_water_energy_demand_dict = {}
-        hot_water_energy_demand_dict_incl_pipework = {}
-        hot_water_energy_output_dict = {}
-        hot_water_duration_dict = {}
-        hot_water_no_events_dict = {}
-        hot_water_pipework_dict = {}
-        ductwork_gains_dict = {}
-        heat_balance_all_dict = {'air_node': {}, 'internal_boundary': {},'external_boundary': {}}
-        heat_source_wet_results_dict = {}
-        heat_source_wet_results_annual_dict = {}
+        # Internal gains do not depend on anything calculated during the
+        # simulation, so calculate them for each zone for every timestep before
+        # it starts (this also records the electricity demand from appliances)
+        zone_areas = {z_name: zone.area() for z_name, zone in self.__zones.items()}
+        for internal_gains in self.__internal_gains.values():
+            internal_gains.precompute_zone_gains(zone_areas)
+        self.__internal_gains_by_zone = {
+            z_name: [
+                internal_gains.internal_gain_by_zone()[z_name]
+                for internal_gains in self.__internal_gains.values()
+                ]
+            for z_name in self.__zones.keys()
+            }
 
+        if self.__iterate_throughput_factor:
+            self.__throughput_factor_iterations \
+                = np.zeros(self.__simtime.total_steps(), dtype=int)
+        if self.__summary_only:
+            # Accumulate totals for each output channel
+            results = ResultsTotals()
+            timestep_array = np.array([self.__simtime.current()])
+        else:
+            # Preallocate arrays for each output channel
+            results = ResultsBuffers(self.__simtime.total_steps())
+            timestep_array = results.register('timestep')
+        zone_list = []
         for z_name in self.__zones.keys():
-            gains_internal_dict[z_name] = []
-            gains_solar_dict[z_name] = []
-            operative_temp_dict[z_name] = []
-            internal_air_temp_dict[z_name] = []
-            space_heat_demand_dict[z_name] = []
-            space_cool_demand_dict[z_name] = []
+            results.register('Internal gains', z_name)
+            results.register('Solar gains', z_name)
+            results.register('Operative temp', z_name, reduction='mean')
+            results.register('Internal air temp', z_name, reduction='mean')
+            results.register('Space heat demand', z_name)
+            results.register('Space cool demand', z_name)
             zone_list.append(z_name)
-            for hb_name in heat_balance_all_dict.keys():
-                heat_balance_all_dict[hb_name][z_name] = {}
+            for hb_name in ('air_node', 'internal_boundary', 'external_boundary'):
+                # Heat balance channels are registered in the first timestep,
+                # as their names are not known until then
+                results.group('Heat balance', hb_name, z_name)
 
         for z_name, h_name in self.__heat_system_name_for_zone.items():
-            space_heat_demand_system_dict[h_name] = []
-            space_heat_provided_dict[h_name] = []
+            if h_name not in results.group('Heating system'):
+                results.register('Heating system', h_name)
+                results.register('Heating system output', h_name)
 
         for z_name, c_name in self.__cool_system_name_for_zone.items():
-            space_cool_demand_system_dict[c_name] = []
-            space_cool_provided_dict[c_name] = []
-
-        hot_water_demand_dict['demand'] = []
-        hot_water_energy_demand_dict['energy_demand'] = []
-        hot_water_energy_demand_dict_incl_pipework['energy_demand_incl_pipework_loss'] = []
-        hot_water_energy_output_dict['energy_output'] = []
-        hot_water_duration_dict['duration'] = []
-        hot_water_no_events_dict['no_events'] = []
-        hot_water_pipework_dict['pw_losses'] = []
-        ductwork_gains_dict['ductwork_gains'] = []
-
-        # Loop over each timestep
-        for t_idx, t_current, delta_t_h in self.__simtime:
-            timestep_array.append(t_current)
-            hw_demand_vol, hw_vol_at_tapping_points, hw_duration, no_events, \
-                hw_energy_demand \
-                = self.__dhw_demand.hot_water_demand(t_idx)
-
-            # Convert from litres to kWh
-            cold_water_source = self.__hot_water_sources['hw cylinder'].get_cold_water_source()
-            cold_water_temperature = cold_water_source.temperature()
-            hw_energy_demand_incl_pipework_loss = misc.water_demand_to_kWh(
-                hw_demand_vol,
-                52.0, # Assumed hot water temperature. TODO Need to define/calculate this centrally.
-                cold_water_temperature,
-                )
-
-            hw_energy_output \
-                = self.__hot_water_sources['hw cylinder'].demand_hot_water(hw_demand_vol)
-            # TODO Remove hard-coding of hot water source name
-            # TODO Reporting of the hot water energy output assumes that there
-            #      is only one water heating system. If the model changes in
-            #      future to allow more than one hot water system, this code may
-            #      need to be revised to handle that scenario.
-
-            pw_losses_internal, pw_losses_external, gains_internal_dhw_use \
-                = self.__pipework_losses_and_internal_gains_from_hw(
-                    delta_t_h,
-                    hw_vol_at_tapping_points,
-                    hw_duration,
-                    no_events,
-                    )
-
-            gains_internal_dhw \
-                = (pw_losses_internal + gains_internal_dhw_use) \
-                * units.W_per_kW / self.__simtime.timestep()
-            if isinstance(self.__hot_water_sources['hw cylinder'], StorageTank) \
-            or isinstance(self.__hot_water_sources['hw cylinder'], BoilerServiceWaterCombi):
-                gains_internal_dhw += self.__hot_water_sources['hw cylinder'].internal_gains()
-
-            gains_internal_zone, gains_solar_zone, \
-                operative_temp, internal_air_temp, \
-                space_heat_demand_zone, space_cool_demand_zone, \
-                space_heat_demand_system, space_cool_demand_system, \
-                space_heat_provided, space_cool_provided, \
-                ductwork_gains, heat_balance_dict \
-                = calc_space_heating(delta_t_h, gains_internal_dhw)
-
-            # Perform calculations that can only be done after all heating
-            # services have been calculated.
-            for system in self.__timestep_end_calcs:
-                system.timestep_end()
-
-            for z_name, gains_internal in gains_internal_zone.items():
-                gains_internal_dict[z_name].append(gains_internal)
-
-            for z_name, gains_solar in gains_solar_zone.items():
-                gains_solar_dict[z_name].append(gains_solar)
-
-            for z_name, temp in operative_temp.items():
-                operative_temp_dict[z_name].append(temp)
-
-            for z_name, temp in internal_air_temp.items():
-                internal_air_temp_dict[z_name].append(temp)
-
-            for z_name, demand in space_heat_demand_zone.items():
-                space_heat_demand_dict[z_name].append(demand)
-
-            for z_name, demand in space_cool_demand_zone.items():
-                space_cool_demand_dict[z_name].append(demand)
-
-            for h_name, demand in space_heat_demand_system.items():
-                space_heat_demand_system_dict[h_name].append(demand)
-
-            for c_name, demand in space_cool_demand_system.items():
-                space_cool_demand_system_dict[c_name].append(demand)
-
-            for h_name, output in space_heat_provided.items():
-                space_heat_provided_dict[h_name].append(output)
-
-            for c_name, output in space_cool_provided.items():
-                space_cool_provided_dict[c_name].append(output)
-
-            for z_name, hb_dict in heat_balance_dict.items():
-                if hb_dict is not None:
-                    for hb_name, gains_losses_dict in hb_dict.items():
-                        for heat_gains_losses_name, heat_gains_losses_value in gains_losses_dict.items():
-                            if heat_gains_losses_name in heat_balance_all_dict[hb_name][z_name].keys():
-                                heat_balance_all_dict[hb_name][z_name][heat_gains_losses_name].append(heat_gains_losses_value)
-                            else:
-                                heat_balance_all_dict[hb_name][z_name][heat_gains_losses_name] =[heat_gains_losses_value]
-
-            hot_water_demand_dict['demand'].append(hw_demand_vol)
-            hot_water_energy_demand_dict['energy_demand'].append(hw_energy_demand)
-            hot_water_energy_demand_dict_incl_pipework['energy_demand_incl_pipework_loss'].append(hw_energy_demand_incl_pipework_loss)
-            hot_water_energy_output_dict['energy_output'].append(hw_energy_output)
-            hot_water_duration_dict['duration'].append(hw_duration)
-            hot_water_no_events_dict['no_events'].append(no_events)
-            hot_water_pipework_dict['pw_losses'].append(pw_losses_internal + pw_losses_external)
-            ductwork_gains_dict['ductwork_gains'].append(ductwork_gains)
-
-            #loop through on-site energy generation
-            for g_name, gen in self.__on_site_generation.items():
-                # Get energy produced for the current timestep
-                self.__on_site_generation[g_name].produce_energy()
-
-            for _, supply in self.__energy_supplies.items():
-                supply.calc_energy_import_export_betafactor()
-
-            for diverter in self.__diverters:
-                diverter.timestep_end()
+            if c_name not in results.group('Cooling system'):
+                results.register('Cooling system', c_name)
+                results.register('Cooling system output', c_name)
+
+        hot_water_demand = results.register('Hot water demand', 'demand')
+        hot_water_energy_demand = results.register('Hot water energy demand', 'energy_demand')
+        hot_water_energy_demand_incl_pipework = results.register(
+            'Hot water energy demand incl pipework_loss',
+            'energy_demand_incl_pipework_loss',
+            )
+        hot_water_energy_output = results.register('Hot water energy output', 'energy_output')
+        hot_water_duration = results.register('Hot water duration', 'duration')
+        hot_water_no_events = results.register('Hot Water Events', 'no_events')
+        hot_water_pipework = results.register('Pipework losses', 'pw_losses')
+        ductwork_gains_array = results.register('Ductwork gains', 'ductwork_gains')
+
+        gains_internal_dict = results.group('Internal gains')
+        gains_solar_dict = results.group('Solar gains')
+        operative_temp_dict = results.group('Operative temp')
+        internal_air_temp_dict = results.group('Internal air temp')
+        space_heat_demand_dict = results.group('Space heat demand')
+        space_cool_demand_dict = results.group('Space cool demand')
+        space_heat_demand_system_dict = results.group('Heating system')
+        space_cool_demand_system_dict = results.group('Cooling system')
+        space_heat_provided_dict = results.group('Heating system output')
+        space_cool_provided_dict = results.group('Cooling system output')
+        heat_balance_all_dict = results.group('Heat balance')
+        heat_source_wet_results_dict = {}
+        heat_source_wet_results_annual_dict = {}
 
         zone_dict = {
             'Internal gains': gains_internal_dict,
@@ -1772,13 +2015,202 @@ class Project:
             'Cooling system output': space_cool_provided_dict,
             }
         hot_water_dict = {
-            'Hot water demand': hot_water_demand_dict,
-            'Hot water energy demand': hot_water_energy_demand_dict,
-            'Hot water energy demand incl pipework_loss': hot_water_energy_demand_dict_incl_pipework,
-            'Hot water duration': hot_water_duration_dict,
-            'Hot Water Events': hot_water_no_events_dict,
-            'Pipework losses': hot_water_pipework_dict,
+            name: results.group(name)
+            for name in (
+                'Hot water demand',
+                'Hot water energy demand',
+                'Hot water energy demand incl pipework_loss',
+                'Hot water duration',
+                'Hot Water Events',
+                'Pipework losses',
+                )
             }
+        output_sinks_open = []
+        self.__hot_water_energy_demand_daily = []
+        steps_per_day = int(units.hours_per_day / self.__simtime.timestep())
+
+        try:
+            # Loop over each timestep
+            for t_idx, t_current, delta_t_h in self.__simtime:
+                # Index of results for timestep in arrays for each output channel
+                if self.__summary_only:
+                    r_idx = 0
+                else:
+                    r_idx = t_idx
+                    timestep_array[t_idx] = t_current
+                hw_demand_vol, hw_vol_at_tapping_points, hw_duration, no_events, \
+                    hw_energy_demand \
+                    = self.__dhw_demand.hot_water_demand(t_idx)
+
+                # Convert from litres to kWh
+                cold_water_source = self.__hot_water_sources['hw cylinder'].get_cold_water_source()
+                cold_water_temperature = cold_water_source.temperature()
+                hw_energy_demand_incl_pipework_loss = misc.water_demand_to_kWh(
+                    hw_demand_vol,
+                    52.0, # Assumed hot water temperature. TODO Need to define/calculate this centrally.
+                    cold_water_temperature,
+                    )
+
+                hw_energy_output \
+                    = self.__hot_water_sources['hw cylinder'].demand_hot_water(hw_demand_vol)
+                # TODO Remove hard-coding of hot water source name
+                # TODO Reporting of the hot water energy output assumes that there
+                #      is only one water heating system. If the model changes in
+                #      future to allow more than one hot water system, this code may
+                #      need to be revised to handle that scenario.
+
+                pw_losses_internal, pw_losses_external, gains_internal_dhw_use \
+                    = self.__pipework_losses_and_internal_gains_from_hw(
+                        delta_t_h,
+                        hw_vol_at_tapping_points,
+                        hw_duration,
+                        no_events,
+                        )
+
+                gains_internal_dhw \
+                    = (pw_losses_internal + gains_internal_dhw_use) \
+                    * units.W_per_kW / self.__simtime.timestep()
+                if isinstance(self.__hot_water_sources['hw cylinder'], StorageTank) \
+                or isinstance(self.__hot_water_sources['hw cylinder'], BoilerServiceWaterCombi):
+                    gains_internal_dhw += self.__hot_water_sources['hw cylinder'].internal_gains()
+
+                gains_internal_zone, gains_solar_zone, \
+                    operative_temp, internal_air_temp, \
+                    space_heat_demand_zone, space_cool_demand_zone, \
+                    space_heat_demand_system, space_cool_demand_system, \
+                    space_heat_provided, space_cool_provided, \
+                    ductwork_gains, heat_balance_dict \
+                    = yield from calc_space_heating(delta_t_h, gains_internal_dhw)
+
+                # Perform calculations that can only be done after all heating
+                # services have been calculated.
+                for system in self.__timestep_end_calcs:
+                    system.timestep_end()
+
+                for z_name, gains_internal in gains_internal_zone.items():
+                    gains_internal_dict[z_name][r_idx] = gains_internal
+
+                for z_name, gains_solar in gains_solar_zone.items():
+                    gains_solar_dict[z_name][r_idx] = gains_solar
+
+                for z_name, temp in operative_temp.items():
+                    operative_temp_dict[z_name][r_idx] = temp
+
+                for z_name, temp in internal_air_temp.items():
+                    internal_air_temp_dict[z_name][r_idx] = temp
+
+                for z_name, demand in space_heat_demand_zone.items():
+                    space_heat_demand_dict[z_name][r_idx] = demand
+
+                for z_name, demand in space_cool_demand_zone.items():
+                    space_cool_demand_dict[z_name][r_idx] = demand
+
+                for h_name, demand in space_heat_demand_system.items():
+                    space_heat_demand_system_dict[h_name][r_idx] = demand
+
+                for c_name, demand in space_cool_demand_system.items():
+                    space_cool_demand_system_dict[c_name][r_idx] = demand
+
+                for h_name, output in space_heat_provided.items():
+                    space_heat_provided_dict[h_name][r_idx] = output
+
+                for c_name, output in space_cool_provided.items():
+                    space_cool_provided_dict[c_name][r_idx] = output
+
+                for z_name, hb_dict in heat_balance_dict.items():
+                    if hb_dict is not None:
+                        for hb_name, gains_losses_dict in hb_dict.items():
+                            hb_channels = heat_balance_all_dict[hb_name][z_name]
+                            if t_idx == 0:
+                                for heat_gains_losses_name in gains_losses_dict.keys():
+                                    results.register('Heat balance', hb_name, z_name, heat_gains_losses_name)
+                            for heat_gains_losses_name, heat_gains_losses_value in gains_losses_dict.items():
+                                hb_channels[heat_gains_losses_name][r_idx] = heat_gains_losses_value
+
+                hot_water_demand[r_idx] = hw_demand_vol
+                hot_water_energy_demand[r_idx] = hw_energy_demand
+                hot_water_energy_demand_incl_pipework[r_idx] = hw_energy_demand_incl_pipework_loss
+                hot_water_energy_output[r_idx] = hw_energy_output
+                hot_water_duration[r_idx] = hw_duration
+                hot_water_no_events[r_idx] = no_events
+                hot_water_pipework[r_idx] = pw_losses_internal + pw_losses_external
+                ductwork_gains_array[r_idx] = ductwork_gains
+
+                if t_idx % steps_per_day == 0:
+                    self.__hot_water_energy_demand_daily.append(0)
+                self.__hot_water_energy_demand_daily[-1] += hw_energy_demand_incl_pipework_loss
+
+                #loop through on-site energy generation
+                for g_name, gen in self.__on_site_generation.items():
+                    # Get energy produced for the current timestep
+                    self.__on_site_generation[g_name].produce_energy()
+
+                for _, supply in self.__energy_supplies.items():
+                    supply.calc_energy_import_export_betafactor()
+
+                for diverter in self.__diverters:
+                    diverter.timestep_end()
+
+                if self.__output_sinks:
+                    if t_idx == 0:
+                        # All output channels have now been created
+                        supply_results_live = {
+                            name: supply.results_live()
+                            for name, supply in self.__energy_supplies.items()
+                            }
+
+                        def supply_results(results_name):
+                            return {
+                                name: results_supply[results_name]
+                                for name, results_supply in supply_results_live.items()
+                                }
+
+                        live_results = ProjectResults(
+                            timestep_array,
+                            supply_results('demand_total'),
+                            {name: supply.results_by_end_user_live()
+                             for name, supply in self.__energy_supplies.items()},
+                            supply_results('demand_not_met'),
+                            supply_results('supply_surplus'),
+                            supply_results('energy_generated_consumed'),
+                            supply_results('energy_into_battery'),
+                            supply_results('energy_out_of_battery'),
+                            supply_results('energy_diverted'),
+                            supply_results('beta_factor'),
+                            zone_dict, zone_list, hc_system_dict, hot_water_dict,
+                            None, None, None,
+                            results.group('Ductwork gains'), heat_balance_all_dict,
+                            None, None,
+                            )
+                        for sink in self.__output_sinks:
+                            sink.open(live_results)
+                            output_sinks_open.append(sink)
+                    for sink in output_sinks_open:
+                        sink.write_timestep(t_idx, r_idx)
+
+                # Results for the timestep must be passed to output sinks before
+                # they are added to totals and reset in summary-only mode
+                for _, supply in self.__energy_supplies.items():
+                    supply.timestep_end()
+
+                if self.__summary_only:
+                    results.timestep_end()
+        finally:
+            # Close output sinks even if the simulation stops early, so that
+            # the results written so far are not left in incomplete files
+            for sink in output_sinks_open:
+                sink.close()
+
+        if self.__throughput_factor_not_converged > 0:
+            print('Warning: Throughput factor calculation did not converge in '
+                  + str(self.__throughput_factor_not_converged) + ' timesteps '
+                  + 'within ' + str(self.__THROUGHPUT_FACTOR_MAX_ITERATIONS)
+                  + ' iterations.')
+
+        if self.__summary_only:
+            results.finalise()
+            hot_water_energy_output \
+                = results.group('Hot water energy output')['energy_output']
 
         # Report detailed outputs from heat source wet objects, if requested and available
         # TODO Note that the below assumes that there is only one water
@@ -1792,7 +2224,7 @@ class Project:
                 and callable(heat_source_wet.output_detailed_results):
                     heat_source_wet_results_dict[name], heat_source_wet_results_annual_dict[name] \
                         = heat_source_wet.output_detailed_results(
-                            hot_water_energy_output_dict['energy_output']
+                            hot_water_energy_output
                             )
 
         # Return results from all energy supplies
@@ -1815,7 +2247,7 @@ class Project:
             energy_diverted[name] = supply.get_energy_diverted()
             betafactor[name] = supply.get_beta_factor()
 
-        hot_water_energy_out = {'hw cylinder': hot_water_energy_output_dict['energy_output']}
+        hot_water_energy_out = {'hw cylinder': hot_water_energy_output}
         dhw_cop_dict = self.__heat_cool_cop(
             hot_water_energy_out,
             results_end_user,
@@ -1832,14 +2264,15 @@ class Project:
             self.__energy_supply_conn_name_for_space_cool_system
             )
 
-        return \
-            timestep_array, results_totals, results_end_user, \
-            energy_import, energy_export, energy_generated_consumed, \
-            energy_to_storage, energy_from_storage, energy_diverted, betafactor, \
-            zone_dict, zone_list, hc_system_dict, hot_water_dict, \
-            heat_cop_dict, cool_cop_dict, dhw_cop_dict, \
-            ductwork_gains_dict, heat_balance_all_dict, \
-            heat_source_wet_results_dict, heat_source_wet_results_annual_dict
+        return ProjectResults(
+            timestep_array, results_totals, results_end_user,
+            energy_import, energy_export, energy_generated_consumed,
+            energy_to_storage, energy_from_storage, energy_diverted, betafactor,
+            zone_dict, zone_list, hc_system_dict, hot_water_dict,
+            heat_cop_dict, cool_cop_dict, dhw_cop_dict,
+            results.group('Ductwork gains'), heat_balance_all_dict,
+            heat_source_wet_results_dict, heat_source_wet_results_annual_dict,
+            )
 
     def __heat_cool_cop(
             self,
@@ -1927,6 +2360,10 @@ class Project:
                 # Set cooling setpoint to Planck temperature to ensure no cooling demand
                 temp_setpnt_cool = Kelvin2Celcius(1.4e32)
 
+            # Note: If the optimised solver is in use, zones are set up to use
+            #       linear superposition, so the solution of the heat balance
+            #       eqns calculated here is reused when the zone temperatures
+            #       are updated with the heating/cooling delivered
             space_heat_demand_zone[z_name], space_cool_demand_zone[z_name], h_ve_cool_extra_zone[z_name] \
                 = zone.space_heat_cool_demand(
                     delta_t_h,
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+"""
+This module provides an object that runs several projects (e.g. many dwellings
+sharing the same weather data and timestep) together in lock-step, so that the
+heat balance eqns for the zones of all the projects can be solved together in
+each timestep.
+"""
+
+# Third-party imports
+import numpy as np
+
+
+class ProjectBatch:
+    """ An object to run a batch of Project objects in lock-step """
+
+    def __init__(self, projects):
+        """ Construct a ProjectBatch object
+
+        Arguments:
+        projects -- list of Project objects (or other objects with a
+                    run_timesteps function that behaves in the same way as
+                    Project.run_timesteps). Zone heat balance eqns are only
+                    solved together for projects that use the optimised solver.
+                    Projects with fewer timesteps than others will finish early.
+        """
+        self.__projects = projects
+
+    def run(self):
+        """ Run the simulation for all projects
+
+        Returns a list with the results for each project (in the same format
+        as returned by Project.run), in the same order as the projects.
+        """
+        timesteps = [project.run_timesteps() for project in self.__projects]
+        results = [None] * len(timesteps)
+
+        # Projects that have not yet finished, and the matrix eqns for their
+        # zones for the current timestep
+        zone_systems = {}
+        zone_solutions = {proj_idx: None for proj_idx in range(len(timesteps))}
+        while len(zone_solutions) > 0:
+            # Advance each project to the point in the next timestep where the
+            # zone heat balance eqns are to be solved
+            for proj_idx, zone_solutions_proj in zone_solutions.items():
+                try:
+                    zone_systems[proj_idx] = timesteps[proj_idx].send(zone_solutions_proj)
+                except StopIteration as stop:
+                    results[proj_idx] = stop.value
+                    zone_systems.pop(proj_idx, None)
+
+            zone_solutions = self.__solve_zone_systems(zone_systems)
+
+        return results
+
+    def __solve_zone_systems(self, zone_systems):
+        """ Solve the zone heat balance eqns for all projects together
+
+        Arguments:
+        zone_systems -- dictionary where key is project index and value is a
+                        dictionary of the matrix eqns for each zone in the
+                        project (as yielded by Project.run_timesteps)
+
+        Returns a dictionary with the same structure as zone_systems, where the
+        values are the solutions to the matrix eqns. Eqns are grouped by size
+        and each group is solved with a single call to the matrix solver.
+        """
+        systems_by_size = {}
+        for proj_idx, zone_systems_proj in zone_systems.items():
+            for z_name, (matrix_a, vector_b) in zone_systems_proj.items():
+                systems_by_size.setdefault(matrix_a.shape, []) \
+                    .append((proj_idx, z_name, matrix_a, vector_b))
+
+        zone_solutions = {proj_idx: {} for proj_idx in zone_systems.keys()}
+        for systems in systems_by_size.values():
+            vector_x = np.linalg.solve(
+                np.stack([matrix_a for _, _, matrix_a, _ in systems]),
+                np.stack([vector_b for _, _, _, vector_b in systems]),
+                )
+            for (proj_idx, z_name, _, _), vector_x_zone in zip(systems, vector_x):
+                zone_solutions[proj_idx][z_name] = vector_x_zone
+
+        return zone_solutions
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+
+"""
+This module provides objects to hold the results of a simulation.
+"""
+
+# Standard library imports
+from collections import namedtuple
+
+# Third-party imports
+import numpy as np
+
+# Results returned by Project.run. This is a tuple, so it can be unpacked in
+# the same way as the plain tuple returned previously, but the fields can also
+# be accessed by name
+ProjectResults = namedtuple(
+    'ProjectResults',
+    [
+        'timestep_array',
+        'results_totals',
+        'results_end_user',
+        'energy_import',
+        'energy_export',
+        'energy_generated_consumed',
+        'energy_to_storage',
+        'energy_from_storage',
+        'energy_diverted',
+        'betafactor',
+        'zone_dict',
+        'zone_list',
+        'hc_system_dict',
+        'hot_water_dict',
+        'heat_cop_dict',
+        'cool_cop_dict',
+        'dhw_cop_dict',
+        'ductwork_gains',
+        'heat_balance_dict',
+        'heat_source_wet_results_dict',
+        'heat_source_wet_results_annual_dict',
+        ],
+    )
+
+
+# Ways in which the results for each timestep of an output channel can be
+# reduced to a single value over the simulation (see ResultsTotals)
+REDUCTIONS = ('sum', 'mean', 'min', 'max')
+
+
+def channel_group(channels, keys):
+    """ Return nested dictionary of output channels under the given keys,
+    creating empty dictionaries for any keys not yet present
+
+    Arguments:
+    channels -- nested dictionaries of output channels
+    keys -- sequence of keys identifying group in nested dictionaries
+    """
+    for key in keys:
+        channels = channels.setdefault(key, {})
+    return channels
+
+def add_channel(channels, keys, array, reduction):
+    """ Add output channel to nested dictionaries and return it
+
+    Arguments:
+    channels -- nested dictionaries of output channels
+    keys -- sequence of keys identifying channel in nested dictionaries
+    array -- array to hold results for channel
+    reduction -- one of REDUCTIONS (checked here so that invalid values are
+                 caught whether or not results are reduced)
+    """
+    if reduction not in REDUCTIONS:
+        raise ValueError('Reduction ' + str(reduction) + ' not recognised')
+    group = channel_group(channels, keys[:-1])
+    if keys[-1] in group:
+        raise ValueError('Output channel ' + str(keys) + ' is already registered')
+    group[keys[-1]] = array
+    return array
+
+
+class ResultsBuffers:
+    """ An object to hold preallocated arrays of time series results
+
+    Each output channel is registered once, before the simulation is run, and
+    is then filled in by index as the simulation progresses. The channels are
+    held in nested dictionaries (e.g. group name -> zone name -> array), so
+    they can be consumed by code that expects nested dictionaries of lists.
+    """
+
+    def __init__(self, no_of_timesteps):
+        """ Construct a ResultsBuffers object
+
+        Arguments:
+        no_of_timesteps -- number of timesteps in simulation (i.e. length of
+                           each output channel)
+        """
+        self.__no_of_timesteps = no_of_timesteps
+        self.__channels = {}
+
+    def register(self, *keys, reduction='sum'):
+        """ Create output channel and return array to write results to
+
+        Arguments:
+        keys -- sequence of keys identifying channel in nested dictionaries
+                (e.g. group name, then zone name)
+        reduction -- how the channel would be reduced to a single value over
+                     the simulation (see ResultsTotals). Not used here, as the
+                     results for every timestep are kept.
+        """
+        return add_channel(
+            self.__channels,
+            keys,
+            np.zeros(self.__no_of_timesteps),
+            reduction,
+            )
+
+    def group(self, *keys):
+        """ Return nested dictionary of output channels under the given keys
+
+        Arguments:
+        keys -- sequence of keys identifying group in nested dictionaries
+
+        If no channels have been registered under the keys, an empty dictionary
+        is returned (and will be populated by channels registered later).
+        """
+        return channel_group(self.__channels, keys)
+
+
+class ResultsTotals:
+    """ An object to reduce time series results to single values over a simulation
+
+    This has the same interface as ResultsBuffers, so can be used in its place
+    where results for each timestep do not need to be kept (e.g. where only
+    summary results are needed), so that memory use does not depend on the
+    number of timesteps. Each channel is an array with a single element, to
+    which the result for the current timestep is written. Calling timestep_end
+    adds the results for the timestep to the sum, minimum and maximum for each
+    channel and resets the channels ready for the next timestep. Calling
+    finalise at the end of the simulation replaces each channel in the nested
+    dictionaries with an array holding the reduction chosen for it when it was
+    registered: the sum (e.g. for energy), or the mean, minimum or maximum (e.g.
+    for temperatures). All of these remain available from the statistics
+    function.
+    """
+
+    # Channels are allocated in blocks so that the reductions for all channels
+    # can be updated with a few operations per block
+    __BLOCK_SIZE = 64
+
+    def __init__(self):
+        """ Construct a ResultsTotals object """
+        self.__channels = {}
+        self.__blocks = []
+        self.__no_of_timesteps = 0
+        # List of keys, reduction and block/position in block for each channel
+        self.__channel_positions = []
+        # Block/position in block for each channel, by keys
+        self.__channel_index = {}
+
+    def register(self, *keys, reduction='sum'):
+        """ Create output channel and return array to write results for the
+        current timestep to (at index 0)
+
+        Arguments:
+        keys -- sequence of keys identifying channel in nested dictionaries
+                (e.g. group name, then zone name)
+        reduction -- one of REDUCTIONS, to choose the value that replaces the
+                     channel when the simulation is finalised
+        """
+        channel_idx = len(self.__channel_positions)
+        block_idx, pos = divmod(channel_idx, self.__BLOCK_SIZE)
+        if block_idx == len(self.__blocks):
+            # Each block holds results for current timestep and their sum,
+            # minimum and maximum over the timesteps so far
+            self.__blocks.append({
+                'current': np.zeros(self.__BLOCK_SIZE),
+                'sum': np.zeros(self.__BLOCK_SIZE),
+                'min': np.full(self.__BLOCK_SIZE, np.inf),
+                'max': np.full(self.__BLOCK_SIZE, -np.inf),
+                })
+        channel = add_channel(
+            self.__channels,
+            keys,
+            self.__blocks[block_idx]['current'][pos:pos+1],
+            reduction,
+            )
+        self.__channel_positions.append((keys, reduction, block_idx, pos))
+        self.__channel_index[keys] = (block_idx, pos)
+        return channel
+
+    def group(self, *keys):
+        """ Return nested dictionary of output channels under the given keys
+
+        Arguments:
+        keys -- sequence of keys identifying group in nested dictionaries
+
+        If no channels have been registered under the keys, an empty dictionary
+        is returned (and will be populated by channels registered later).
+        """
+        return channel_group(self.__channels, keys)
+
+    def timestep_end(self):
+        """ Add results for current timestep to reductions and reset channels """
+        for block in self.__blocks:
+            current = block['current']
+            block['sum'] += current
+            np.minimum(block['min'], current, out=block['min'])
+            np.maximum(block['max'], current, out=block['max'])
+            current.fill(0.0)
+        self.__no_of_timesteps += 1
+
+    def statistics(self, *keys):
+        """ Return dictionary of the sum, mean, minimum and maximum of the
+        results for the channel over the timesteps so far (keys as for
+        REDUCTIONS), or None for each if no timesteps have ended yet
+
+        Arguments:
+        keys -- sequence of keys identifying channel in nested dictionaries
+        """
+        block_idx, pos = self.__channel_index[keys]
+        block = self.__blocks[block_idx]
+        if self.__no_of_timesteps == 0:
+            return {reduction: None for reduction in REDUCTIONS}
+        return {
+            'sum': float(block['sum'][pos]),
+            'mean': float(block['sum'][pos]) / self.__no_of_timesteps,
+            'min': float(block['min'][pos]),
+            'max': float(block['max'][pos]),
+            }
+
+    def finalise(self):
+        """ Replace each channel in the nested dictionaries with its chosen
+        reduction over the simulation """
+        for keys, reduction, block_idx, pos in self.__channel_positions:
+            block = self.__blocks[block_idx]
+            if self.__no_of_timesteps == 0:
+                value = np.zeros(1)
+            elif reduction == 'mean':
+                value = block['sum'][pos:pos+1] / self.__no_of_timesteps
+            else:
+                value = block[reduction][pos:pos+1].copy()
+            self.group(*keys[:-1])[keys[-1]] = value
@@ -8,6 +8,9 @@ simulation timestep.
 # Standard library imports
 import math
 
+# Third-party imports
+import numpy as np
+
 # Local imports
 import core.units as units
 
@@ -47,6 +50,7 @@ class SimulationTime:
         """
 
         self.__step    = step
+        self.__start   = starttime
         self.__end     = endtime
         self.__current = starttime
 
@@ -123,6 +127,27 @@ class SimulationTime:
         else:
             return math.floor(self.current_day() - start_day)
 
+    def time_series_idx_array(self, start_day, time_series_step):
+        """ Return list of array lookup index (as returned by time_series_idx)
+        for every timestep, so that lookups can be precomputed """
+        return np.floor(
+            (self.times() - start_day * units.hours_per_day) / time_series_step
+            ).astype(int).tolist()
+
+    def times(self):
+        """ Return array of the simulation time at the start of every timestep, in hours
+
+        Values are accumulated by repeated addition of the step and stop at the
+        end time, exactly as when iterating over this object, so each element
+        matches what current() returns for the corresponding timestep.
+        """
+        # Allow one extra step as accumulated rounding errors may mean that
+        # iteration does not stop after exactly self.__total steps
+        increments = np.full(self.__total + 1, float(self.__step))
+        increments[0] = self.__start
+        times = np.cumsum(increments)
+        return times[times < self.__end]
+
     def total_steps(self):
         """ Return the total number of timesteps in simulation """
         return self.__total
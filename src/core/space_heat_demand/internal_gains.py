@@ -2,12 +2,34 @@
 
 """
 This module provides objects to represent the internal gains.
+
+The gains for each zone can either be calculated on each call to
+total_internal_gain, or calculated for every timestep of the simulation in
+advance by calling precompute_zone_gains and then read from the lists returned
+by internal_gain_by_zone. The latter is used when running the simulation, as
+the gains do not depend on anything calculated during the simulation.
 """
 
+# Third-party imports
+import numpy as np
+
 # Local imports
 import core.units as units
 
 
+def time_series_per_timestep(time_series, simulation_time, start_day, time_series_step):
+    """ Return array of the value of a time series for every timestep of the simulation
+
+    Arguments:
+    time_series      -- list of values (one entry per time_series_step)
+    simulation_time  -- reference to SimulationTime object
+    start_day        -- first day of the time series, day of the year, 0 to 365 (single value)
+    time_series_step -- timestep of the time series data, in hours
+    """
+    schedule_idx = simulation_time.time_series_idx_array(start_day, time_series_step)
+    return np.asarray(time_series, dtype=float)[schedule_idx]
+
+
 class InternalGains:
     """ An object to represent internal gains """
 
@@ -29,6 +51,28 @@ class InternalGains:
         """ Return the total internal gain for the current timestep in W"""
         return self.__total_internal_gains[self.__simulation_time.time_series_idx(self.__start_day, self.__time_series_step)] * zone_area
 
+    def precompute_zone_gains(self, zone_areas):
+        """ Calculate the total internal gain for each zone for every timestep
+
+        Arguments:
+        zone_areas -- dictionary of floor area of each zone, in m2
+        """
+        total_internal_gains = time_series_per_timestep(
+            self.__total_internal_gains,
+            self.__simulation_time,
+            self.__start_day,
+            self.__time_series_step,
+            )
+        self.__internal_gain_by_zone = {
+            zone_name: (total_internal_gains * zone_area).tolist()
+            for zone_name, zone_area in zone_areas.items()
+            }
+
+    def internal_gain_by_zone(self):
+        """ Return dictionary of lists of total internal gain for each zone for
+        every timestep, in W (after precompute_zone_gains has been called) """
+        return self.__internal_gain_by_zone
+
 
 class ApplianceGains:
     """ An object to represent internal gains and energy consumption from appliances"""
@@ -62,3 +106,37 @@ class ApplianceGains:
         self.__energy_supply_conn.demand_energy(total_energy_supplied_kWh)
 
         return total_energy_supplied_W * self.__gains_fraction
+
+    def precompute_zone_gains(self, zone_areas):
+        """ Calculate the total internal gain for each zone for every timestep,
+        and forward the electricity demand for every timestep to the relevant
+        EnergySupply object
+
+        Note: after this has been called, total_internal_gain should not be
+        called, as this would record the electricity demand again.
+
+        Arguments:
+        zone_areas -- dictionary of floor area of each zone, in m2
+        """
+        total_energy_supply = time_series_per_timestep(
+            self.__total_energy_supply,
+            self.__simulation_time,
+            self.__start_day,
+            self.__time_series_step,
+            )
+        total_energy_supplied_kWh = np.zeros(len(total_energy_supply))
+        self.__internal_gain_by_zone = {}
+        for zone_name, zone_area in zone_areas.items():
+            total_energy_supplied_W = total_energy_supply * zone_area # convert to W
+            total_energy_supplied_kWh \
+                = total_energy_supplied_kWh \
+                + total_energy_supplied_W / units.W_per_kW * self.__simulation_time.timestep() # convert to kWh
+            self.__internal_gain_by_zone[zone_name] \
+                = (total_energy_supplied_W * self.__gains_fraction).tolist()
+
+        self.__energy_supply_conn.demand_energy_series(total_energy_supplied_kWh)
+
+    def internal_gain_by_zone(self):
+        """ Return dictionary of lists of total internal gain for each zone for
+        every timestep, in W (after precompute_zone_gains has been called) """
+        return self.__internal_gain_by_zone
@@ -53,6 +53,31 @@ class Zone:
     __temp_prev: cython.double[:]
     __print_heat_balance: cython.bint
     __use_fast_solver  : cython.bint
+    __idx_ext_surface: object
+    __idx_int_surface: object
+    __area_el: object
+    __area_frac_el: object
+    __h_ce_h_re_el: object
+    __a_sol_el: object
+    __therm_rad_to_sky_el: object
+    __k_pli_nodes: object
+    __h_pli_prev_nodes: object
+    __h_pli_next_nodes: object
+    __inside_nodes_by_depth: list
+    __nodes_by_depth_from_int: list
+    __fast_solver_delta_t: cython.double
+    __k_over_dt_nodes: object
+    __coeffs_adj_nodes: object
+    __elim_factor_nodes: object
+    __matrix_a_static: object
+    __matrix_a: object
+    __vector_b: object
+    __use_linear_superposition: cython.bint
+    __temps_superposition: dict
+    __superposition_pending: tuple
+    __solver_inputs_superposition: object
+    __simtime: object
+    __superposition_t_idx: cython.Py_ssize_t
 
     def __init__(
             self,
@@ -66,6 +91,8 @@ class Zone:
             vent_cool_extra: object = None,
             print_heat_balance: cython.bint=False,
             use_fast_solver: cython.bint=False,
+            use_linear_superposition: cython.bint=False,
+            simulation_time: object=None,
             ):
         """ Construct a Zone object
 
@@ -85,6 +112,16 @@ class Zone:
         print_heat_balance-- flag to indicate whether to print the heat balance breakdown
         use_fast_solver -- flag to indicate whether to use the optimised solver (results
                            may differ slightly due to reordering of floating-point ops)
+        use_linear_superposition -- flag to indicate whether to reuse the solution
+                           of the heat balance eqns for all calculations of
+                           temperatures with the same inputs other than the
+                           heating/cooling gains within a timestep (only applies
+                           if use_fast_solver is True; results may differ
+                           slightly due to reordering of floating-point ops).
+                           Solutions are reused until the temperatures are
+                           updated or the timestep changes
+        simulation_time   -- reference to SimulationTime object (required if
+                             use_linear_superposition is True)
 
         Other variables:
         area_el_total     -- total area of all building elements associated
@@ -149,9 +186,89 @@ class Zone:
 
         self.__print_heat_balance = print_heat_balance
         self.__use_fast_solver = use_fast_solver
+        self.__use_linear_superposition = use_fast_solver and use_linear_superposition
+        self.__temps_superposition = {}
+        self.__superposition_pending = None
+        self.__solver_inputs_superposition = None
+        self.__simtime = simulation_time
+        self.__superposition_t_idx = -1
+        if self.__use_linear_superposition and self.__simtime is None:
+            sys.exit('ERROR: Zone requires simulation time when using linear superposition.')
+
+        if self.__use_fast_solver:
+            self.__init_fast_solver()
 
         self.__init_node_temps(temp_ext_air_init, temp_setpnt_init)
 
+    @cython.cfunc
+    def __init_fast_solver(self) -> cython.void:
+        """ Store the time-invariant inputs to the optimised heat balance solver
+
+        The coefficients of the heat balance equations that do not vary over
+        time (areal heat capacities and conductances of nodes, areas and
+        surface heat transfer coefficients of building elements) are collected
+        into arrays once, so that on each call to the solver only the
+        coefficients that vary with time need to be calculated. Arrays
+        indexed by node use the same positions as the temperature vector, and
+        arrays indexed by element are in the same order as the list of
+        building elements.
+        """
+        eli: object
+        self.__idx_ext_surface = np.array(
+            [self.__element_positions[eli][0] for eli in self.__building_elements],
+            dtype=np.intp,
+            )
+        self.__idx_int_surface = np.array(
+            [self.__element_positions[eli][1] for eli in self.__building_elements],
+            dtype=np.intp,
+            )
+        self.__area_el = np.array([eli.area for eli in self.__building_elements])
+        self.__area_frac_el = self.__area_el / self.__area_el_total
+        self.__h_ce_h_re_el = np.array(
+            [eli.h_ce() + eli.h_re() for eli in self.__building_elements]
+            )
+        self.__a_sol_el = np.array([eli.a_sol for eli in self.__building_elements])
+        self.__therm_rad_to_sky_el = np.array(
+            [eli.therm_rad_to_sky for eli in self.__building_elements]
+            )
+
+        # Conductance between each node and the previous/next node in the same
+        # building element (zero for external/internal surface respectively)
+        self.__k_pli_nodes = np.concatenate(
+            [np.array(eli.k_pli, dtype=float) for eli in self.__building_elements]
+            )
+        self.__h_pli_prev_nodes = np.concatenate(
+            [np.array([0.0] + list(eli.h_pli)) for eli in self.__building_elements]
+            )
+        self.__h_pli_next_nodes = np.concatenate(
+            [np.array(list(eli.h_pli) + [0.0]) for eli in self.__building_elements]
+            )
+
+        # Group inside nodes by their distance from the external surface node,
+        # and all nodes other than internal surface nodes by their distance
+        # from the internal surface node, so that the elimination and
+        # substitution steps of the solver can be carried out for all building
+        # elements at once
+        no_of_nodes_el = self.__idx_int_surface - self.__idx_ext_surface + 1
+        depth: cython.Py_ssize_t
+        self.__inside_nodes_by_depth = [
+            self.__idx_ext_surface[no_of_nodes_el > depth + 1] + depth
+            for depth in range(1, max(no_of_nodes_el) - 1)
+            ]
+        self.__nodes_by_depth_from_int = [
+            self.__idx_int_surface[no_of_nodes_el > depth] - depth
+            for depth in range(1, max(no_of_nodes_el))
+            ]
+
+        # Coefficients that depend on the timestep are calculated when the
+        # solver is first called with a given timestep
+        self.__fast_solver_delta_t = 0.0
+
+        # Preallocate matrix and vector for heat balance eqns for the internal
+        # surface nodes and the internal air node
+        self.__matrix_a = np.zeros((len(self.__building_elements) + 1, len(self.__building_elements) + 1))
+        self.__vector_b = np.zeros(len(self.__building_elements) + 1)
+
     @cython.cfunc
     def __init_node_temps(self, temp_ext_air_init: cython.double, temp_setpnt_init: cython.double) -> cython.void:
         """ Initialise temperatures of heat balance nodes
@@ -218,6 +335,7 @@ class Zone:
 
             if not np.isclose(temps_updated, self.__temp_prev, rtol=1e-08).all():
                 self.__temp_prev = temps_updated
+                self.__clear_superposition()
             else:
                 break
 
@@ -249,6 +367,7 @@ class Zone:
             vent_extra_h_ve: cython.double=0.0,
             throughput_factor: cython.double=1.0,
             print_heat_balance: cython.bint = False,
+            solver_inputs: object = None,
             ):
         """ Calculate temperatures according to procedure in BS EN ISO 52016-1:2017, section 6.5.6
 
@@ -265,6 +384,10 @@ class Zone:
         throughput_factor -- proportional increase in ventilation rate due to
                              overventilation requirement
         print_heat_balance -- flag to record whether to return the heat balance outputs
+        solver_inputs   -- time-varying coefficients for the optimised solver, as
+                           returned by __fast_solver_inputs, if already calculated
+                           for temp_prev and the current timestep (only used if
+                           use_fast_solver is True)
 
         Temperatures are calculated by solving (for X) a matrix equation A.X = B, where:
         A is a matrix of known coefficients
@@ -293,179 +416,72 @@ class Zone:
         A.
         """
 
-        # Init matrix with zeroes
-        # Number of rows in matrix = number of columns
-        # = total number of nodes + 1 for overall zone heat balance (and internal air temp)
-        matrix_a: cython.double[:, :] = np.zeros((self.__no_of_temps, self.__no_of_temps))
-
-        # Init vector_b with zeroes (length = number of nodes + 1 for overall zone heat balance)
-        vector_b: cython.double[:] = np.zeros(self.__no_of_temps)
-
-        # One term in eqn 39 is sum from k = 1 to n of (A_elk / A_tot). Given
-        # that A_tot is defined as the sum of A_elk from k = 1 to n, this term
-        # will always evaluate to 1.
-        # TODO Check this is correct. It seems a bit pointless if it is but we
-        #      should probably retain it as an explicit term anyway to match
-        #      the standard.
-        sum_area_frac: cython.double = 1.0
-
-        # Node heat balances - loop through building elements and their nodes:
-        # - Construct row of matrix_a for each node energy balance eqn
-        # - Calculate RHS of node energy balance eqn and add to vector_b
-        idx: cython.Py_ssize_t
-        i: cython.Py_ssize_t
-        h_ci: cython.double
-        eli: object
-        elk: object
-        i_sol_dir: cython.double
-        i_sol_dif: cython.double
-        f_sh_dir: cython.double
-        f_sh_dif: cython.double
-
-        for eli in self.__building_elements:
-            # External surface node (eqn 41)
-            # Get position (row == column) in matrix previously calculated for the first (external) node
-            idx = self.__element_positions[eli][0]
-            # Position of first (external) node within element is zero
-            i = 0
-            # Coeff for temperature of this node
-            matrix_a[idx][idx] = (eli.k_pli[i] / delta_t) + eli.h_ce() + eli.h_re() + eli.h_pli[i]
-            # Coeff for temperature of next node
-            matrix_a[idx][idx + 1] = - eli.h_pli[i]
-            # RHS of heat balance eqn for this node
-            i_sol_dir, i_sol_dif = eli.i_sol_dir_dif()
-            f_sh_dir, f_sh_dif = eli.shading_factors_direct_diffuse()
-            vector_b[idx] = (eli.k_pli[i] / delta_t) * temp_prev[idx] \
-                          + (eli.h_ce() + eli.h_re()) * eli.temp_ext() \
-                          + eli.a_sol * (i_sol_dif * f_sh_dif + i_sol_dir * f_sh_dir) \
-                          - eli.therm_rad_to_sky
-
-            # Inside node(s), if any (eqn 40)
-            for i in range(1, eli.no_of_inside_nodes() + 1):
-                idx = idx + 1
-                # Coeff for temperature of prev node
-                matrix_a[idx][idx - 1] = - eli.h_pli[i - 1]
-                # Coeff for temperature of this node
-                matrix_a[idx][idx] = (eli.k_pli[i] / delta_t) + eli.h_pli[i] + eli.h_pli[i - 1]
-                # Coeff for temperature of next node
-                matrix_a[idx][idx + 1] = - eli.h_pli[i]
-                # RHS of heat balance eqn for this node
-                vector_b[idx] = (eli.k_pli[i] / delta_t) * temp_prev[idx]
-
-            # Internal surface node (eqn 39)
-            idx = idx + 1
-            assert idx == self.__element_positions[eli][1]
-            i = i + 1
-            assert i == eli.no_of_nodes() - 1
-            # Get internal convective surface heat transfer coefficient, which
-            # depends on direction of heat flow, which depends in temperature of
-            # zone and internal surface
-            h_ci = eli.h_ci(temp_prev[self.__zone_idx], temp_prev[idx])
-            # Coeff for temperature of prev node
-            matrix_a[idx][idx - 1] = - eli.h_pli[i - 1]
-            # Coeff for temperature of this node
-            matrix_a[idx][idx] = (eli.k_pli[i] / delta_t) + h_ci \
-                               + eli.h_ri() * sum_area_frac + eli.h_pli[i - 1]
-            # Add final sum term for LHS of eqn 39 in loop below.
-            # These are coeffs for temperatures of internal surface nodes of
-            # all building elements in the zone
-            col: cython.Py_ssize_t
-            for elk in self.__building_elements:
-                col = self.__element_positions[elk][1]
-                # The line below must be an adjustment to the existing value
-                # to handle the case where col = idx (i.e. where we have
-                # already partially set the value of the matrix element above
-                # (before this loop) and do not want to overwrite it)
-                matrix_a[idx][col] = matrix_a[idx][col] \
-                                   - (elk.area / self.__area_el_total) * eli.h_ri()
-            # Coeff for temperature of thermal zone
-            matrix_a[idx][self.__zone_idx] = - h_ci
-            # RHS of heat balance eqn for this node
-            vector_b[idx] = (eli.k_pli[i] / delta_t) * temp_prev[idx] \
-                          + ( (1.0 - f_int_c) * gains_internal \
-                            + (1.0 - f_sol_c) * gains_solar \
-                            + (1.0 - f_hc_c) * gains_heat_cool \
-                            ) \
-                          / self.__area_el_total
-
-        # Zone heat balance:
-        # - Construct row of matrix A for zone heat balance eqn
-        # - Calculate RHS of zone heat balance eqn and add to vector_b
-
-        # Coeff for temperature of thermal zone
-        # TODO Throughput factor only applies to MVHR and WHEV, therefore only
-        #      these systems accept throughput_factor as an argument to the h_ve
-        #      function, hence the branch on the type in the loop below. This
-        #      means that the MVHR and WHEV classes no longer have the same
-        #      interface as other ventilation element classes, which could make
-        #      future development more difficult. Ideally, we would find a
-        #      cleaner way to implement this difference.
-        vei: object
-        sum_vent_elements_h_ve: cython.double = vent_extra_h_ve
-        for vei in self.__vent_elements:
-            if type(vei) in (MechnicalVentilationHeatRecovery, WholeHouseExtractVentilation):
-                sum_vent_elements_h_ve \
-                    += vei.h_ve(self.__volume, throughput_factor)
-            elif type(vei) in (VentilationElementInfiltration, NaturalVentilation):
-                sum_vent_elements_h_ve \
-                    += vei.h_ve(self.__volume)
-            else:
-                sys.exit( 'Applicability of throughput factor not defined for '
-                        + 'ventilation element type ' + str(type(vei)))
-        matrix_a[self.__zone_idx][self.__zone_idx] \
-            = (self.__c_int / delta_t) \
-            + sum([ eli.area
-                  * eli.h_ci(
-                      temp_prev[self.__zone_idx],
-                      temp_prev[self.__element_positions[eli][1]]
-                      )
-                  for eli in self.__building_elements
-                  ]) \
-            + sum_vent_elements_h_ve \
-            + self.__tb_heat_trans_coeff
-        # Add final sum term for LHS of eqn 38 in loop below.
-        # These are coeffs for temperatures of internal surface nodes of
-        # all building elements in the zone
-        for eli in self.__building_elements:
-            col = self.__element_positions[eli][1] # Column for internal surface node temperature
-            matrix_a[self.__zone_idx][col] \
-                = - eli.area \
-                * eli.h_ci(temp_prev[self.__zone_idx], temp_prev[self.__element_positions[eli][1]])
-        # RHS of heat balance eqn for zone
-        # TODO Throughput factor only applies to MVHR and WHEV, therefore only
-        #      these systems accept throughput_factor as an argument to the h_ve
-        #      function, hence the branch on the type in the loop below. This
-        #      means that the MVHR and WHEV classes no longer have the same
-        #      interface as other ventilation element classes, which could make
-        #      future development more difficult. Ideally, we would find a
-        #      cleaner way to implement this difference.
-        sum_vent_elements_h_ve_times_temp_supply: cython.double = 0.0
-        if vent_extra_h_ve != 0:
-            sum_vent_elements_h_ve_times_temp_supply \
-                += vent_extra_h_ve * self.__vent_cool_extra.temp_supply()
-        for vei in self.__vent_elements:
-            if type(vei) in (MechnicalVentilationHeatRecovery, WholeHouseExtractVentilation):
-                sum_vent_elements_h_ve_times_temp_supply \
-                    += vei.h_ve(self.__volume, throughput_factor) * vei.temp_supply()
-            elif type(vei) in (VentilationElementInfiltration, NaturalVentilation):
-                sum_vent_elements_h_ve_times_temp_supply \
-                    += vei.h_ve(self.__volume) * vei.temp_supply()
-            else:
-                sys.exit( 'Applicability of throughput factor not defined for '
-                        + 'ventilation element type ' + str(type(vei)))
-        vector_b[self.__zone_idx] \
-            = (self.__c_int / delta_t) * temp_prev[self.__zone_idx] \
-            + sum_vent_elements_h_ve_times_temp_supply \
-            + self.__tb_heat_trans_coeff * temp_ext_air \
-            + f_int_c * gains_internal \
-            + f_sol_c * gains_solar \
-            + f_hc_c * gains_heat_cool
-
         # Solve matrix eqn A.X = B to calculate vector_x (temperatures)
-        if self.__use_fast_solver:
-            vector_x = self.__fast_solver(matrix_a, vector_b)
+        vector_x: cython.double[:]
+        if self.__use_linear_superposition:
+            # The heat balance eqns are linear in the heating/cooling gains, so
+            # the temperatures can be calculated by superposition of the
+            # temperatures with no heating/cooling gains and the change in
+            # temperatures per W of radiative and convective heating/cooling
+            # gains. These are calculated once from a single factorisation of
+            # matrix A for each set of the other inputs and reused for each
+            # calculation in the same timestep.
+            superposition_key: tuple = self.__superposition_key(
+                delta_t,
+                temp_ext_air,
+                gains_internal,
+                gains_solar,
+                vent_extra_h_ve,
+                throughput_factor,
+                )
+            temps_superposition = self.__temps_superposition.get(superposition_key)
+            if temps_superposition is None:
+                if solver_inputs is None:
+                    solver_inputs = self.__solver_inputs_for_superposition()
+                temps_superposition = self.__fast_solver(
+                    delta_t,
+                    temp_prev,
+                    temp_ext_air,
+                    gains_internal,
+                    gains_solar,
+                    0.0,
+                    1.0, # Value does not matter as gains_heat_cool = 0.0
+                    vent_extra_h_ve,
+                    throughput_factor,
+                    solver_inputs,
+                    True,
+                    )
+                self.__temps_superposition[superposition_key] = temps_superposition
+            vector_x = temps_superposition[:, 0] \
+                     + gains_heat_cool \
+                     * ( (1.0 - f_hc_c) * temps_superposition[:, 1] \
+                       + f_hc_c * temps_superposition[:, 2] \
+                       )
+        elif self.__use_fast_solver:
+            vector_x = self.__fast_solver(
+                delta_t,
+                temp_prev,
+                temp_ext_air,
+                gains_internal,
+                gains_solar,
+                gains_heat_cool,
+                f_hc_c,
+                vent_extra_h_ve,
+                throughput_factor,
+                solver_inputs,
+                )
         else:
-            vector_x = np.linalg.solve(matrix_a, vector_b)
+            vector_x = self.__solve_full_matrix(
+                delta_t,
+                temp_prev,
+                temp_ext_air,
+                gains_internal,
+                gains_solar,
+                gains_heat_cool,
+                f_hc_c,
+                vent_extra_h_ve,
+                throughput_factor,
+                )
 
         heat_balance_dict: dict
         temp_internal: cython.double
@@ -611,14 +627,375 @@ class Zone:
             heat_balance_dict = None
         return vector_x, heat_balance_dict
 
+    def __solve_full_matrix(self,
+            delta_t: cython.double,
+            temp_prev: cython.double[:],
+            temp_ext_air: cython.double,
+            gains_internal: cython.double,
+            gains_solar: cython.double,
+            gains_heat_cool: cython.double,
+            f_hc_c: cython.double,
+            vent_extra_h_ve: cython.double,
+            throughput_factor: cython.double,
+            ):
+        """ Construct the full matrix equation A.X = B for all nodes and solve it
+
+        See __calc_temperatures for description of arguments and of matrix
+        equation.
+        """
+        # Init matrix with zeroes
+        # Number of rows in matrix = number of columns
+        # = total number of nodes + 1 for overall zone heat balance (and internal air temp)
+        matrix_a: cython.double[:, :] = np.zeros((self.__no_of_temps, self.__no_of_temps))
+
+        # Init vector_b with zeroes (length = number of nodes + 1 for overall zone heat balance)
+        vector_b: cython.double[:] = np.zeros(self.__no_of_temps)
+
+        # One term in eqn 39 is sum from k = 1 to n of (A_elk / A_tot). Given
+        # that A_tot is defined as the sum of A_elk from k = 1 to n, this term
+        # will always evaluate to 1.
+        # TODO Check this is correct. It seems a bit pointless if it is but we
+        #      should probably retain it as an explicit term anyway to match
+        #      the standard.
+        sum_area_frac: cython.double = 1.0
+
+        # Node heat balances - loop through building elements and their nodes:
+        # - Construct row of matrix_a for each node energy balance eqn
+        # - Calculate RHS of node energy balance eqn and add to vector_b
+        idx: cython.Py_ssize_t
+        i: cython.Py_ssize_t
+        h_ci: cython.double
+        eli: object
+        elk: object
+        i_sol_dir: cython.double
+        i_sol_dif: cython.double
+        f_sh_dir: cython.double
+        f_sh_dif: cython.double
+
+        for eli in self.__building_elements:
+            # External surface node (eqn 41)
+            # Get position (row == column) in matrix previously calculated for the first (external) node
+            idx = self.__element_positions[eli][0]
+            # Position of first (external) node within element is zero
+            i = 0
+            # Coeff for temperature of this node
+            matrix_a[idx][idx] = (eli.k_pli[i] / delta_t) + eli.h_ce() + eli.h_re() + eli.h_pli[i]
+            # Coeff for temperature of next node
+            matrix_a[idx][idx + 1] = - eli.h_pli[i]
+            # RHS of heat balance eqn for this node
+            i_sol_dir, i_sol_dif = eli.i_sol_dir_dif()
+            f_sh_dir, f_sh_dif = eli.shading_factors_direct_diffuse()
+            vector_b[idx] = (eli.k_pli[i] / delta_t) * temp_prev[idx] \
+                          + (eli.h_ce() + eli.h_re()) * eli.temp_ext() \
+                          + eli.a_sol * (i_sol_dif * f_sh_dif + i_sol_dir * f_sh_dir) \
+                          - eli.therm_rad_to_sky
+
+            # Inside node(s), if any (eqn 40)
+            for i in range(1, eli.no_of_inside_nodes() + 1):
+                idx = idx + 1
+                # Coeff for temperature of prev node
+                matrix_a[idx][idx - 1] = - eli.h_pli[i - 1]
+                # Coeff for temperature of this node
+                matrix_a[idx][idx] = (eli.k_pli[i] / delta_t) + eli.h_pli[i] + eli.h_pli[i - 1]
+                # Coeff for temperature of next node
+                matrix_a[idx][idx + 1] = - eli.h_pli[i]
+                # RHS of heat balance eqn for this node
+                vector_b[idx] = (eli.k_pli[i] / delta_t) * temp_prev[idx]
+
+            # Internal surface node (eqn 39)
+            idx = idx + 1
+            assert idx == self.__element_positions[eli][1]
+            i = i + 1
+            assert i == eli.no_of_nodes() - 1
+            # Get internal convective surface heat transfer coefficient, which
+            # depends on direction of heat flow, which depends in temperature of
+            # zone and internal surface
+            h_ci = eli.h_ci(temp_prev[self.__zone_idx], temp_prev[idx])
+            # Coeff for temperature of prev node
+            matrix_a[idx][idx - 1] = - eli.h_pli[i - 1]
+            # Coeff for temperature of this node
+            matrix_a[idx][idx] = (eli.k_pli[i] / delta_t) + h_ci \
+                               + eli.h_ri() * sum_area_frac + eli.h_pli[i - 1]
+            # Add final sum term for LHS of eqn 39 in loop below.
+            # These are coeffs for temperatures of internal surface nodes of
+            # all building elements in the zone
+            col: cython.Py_ssize_t
+            for elk in self.__building_elements:
+                col = self.__element_positions[elk][1]
+                # The line below must be an adjustment to the existing value
+                # to handle the case where col = idx (i.e. where we have
+                # already partially set the value of the matrix element above
+                # (before this loop) and do not want to overwrite it)
+                matrix_a[idx][col] = matrix_a[idx][col] \
+                                   - (elk.area / self.__area_el_total) * eli.h_ri()
+            # Coeff for temperature of thermal zone
+            matrix_a[idx][self.__zone_idx] = - h_ci
+            # RHS of heat balance eqn for this node
+            vector_b[idx] = (eli.k_pli[i] / delta_t) * temp_prev[idx] \
+                          + ( (1.0 - f_int_c) * gains_internal \
+                            + (1.0 - f_sol_c) * gains_solar \
+                            + (1.0 - f_hc_c) * gains_heat_cool \
+                            ) \
+                          / self.__area_el_total
+
+        # Zone heat balance:
+        # - Construct row of matrix A for zone heat balance eqn
+        # - Calculate RHS of zone heat balance eqn and add to vector_b
+
+        # Coeff for temperature of thermal zone
+        sum_vent_elements_h_ve: cython.double
+        sum_vent_elements_h_ve_times_temp_supply: cython.double
+        sum_vent_elements_h_ve, sum_vent_elements_h_ve_times_temp_supply \
+            = self.__vent_heat_transfer(vent_extra_h_ve, throughput_factor)
+        matrix_a[self.__zone_idx][self.__zone_idx] \
+            = (self.__c_int / delta_t) \
+            + sum([ eli.area
+                  * eli.h_ci(
+                      temp_prev[self.__zone_idx],
+                      temp_prev[self.__element_positions[eli][1]]
+                      )
+                  for eli in self.__building_elements
+                  ]) \
+            + sum_vent_elements_h_ve \
+            + self.__tb_heat_trans_coeff
+        # Add final sum term for LHS of eqn 38 in loop below.
+        # These are coeffs for temperatures of internal surface nodes of
+        # all building elements in the zone
+        for eli in self.__building_elements:
+            col = self.__element_positions[eli][1] # Column for internal surface node temperature
+            matrix_a[self.__zone_idx][col] \
+                = - eli.area \
+                * eli.h_ci(temp_prev[self.__zone_idx], temp_prev[self.__element_positions[eli][1]])
+        # RHS of heat balance eqn for zone
+        vector_b[self.__zone_idx] \
+            = (self.__c_int / delta_t) * temp_prev[self.__zone_idx] \
+            + sum_vent_elements_h_ve_times_temp_supply \
+            + self.__tb_heat_trans_coeff * temp_ext_air \
+            + f_int_c * gains_internal \
+            + f_sol_c * gains_solar \
+            + f_hc_c * gains_heat_cool
+
+        return np.linalg.solve(matrix_a, vector_b)
+
     @cython.cfunc
-    def __fast_solver(self, coeffs: cython.double[:, :], rhs: cython.double[:]) -> cython.double[:]:
-        """ Optimised heat balance solver
+    def __solver_inputs_for_superposition(self) -> tuple:
+        """ Return the time-varying coefficients for the optimised solver for
+        the current timestep, calculating them only on first use
+
+        These depend only on the current timestep and the temperatures from
+        the previous timestep, so they remain valid for as long as the
+        solutions stored for linear superposition do. Reusing them means that
+        solving the heat balance eqns for further sets of inputs in the same
+        timestep (e.g. a different throughput factor) only requires the
+        reduced matrix eqn to be constructed and solved.
+        """
+        self.__superposition_timestep()
+        if self.__solver_inputs_superposition is None:
+            self.__solver_inputs_superposition = self.__fast_solver_inputs(self.__temp_prev)
+        return self.__solver_inputs_superposition
+
+    @cython.cfunc
+    def __clear_superposition(self) -> cython.void:
+        """ Discard solutions (and solver inputs) that are only valid for the
+        previous temperatures """
+        self.__temps_superposition.clear()
+        self.__solver_inputs_superposition = None
+
+    @cython.cfunc
+    def __superposition_timestep(self) -> cython.Py_ssize_t:
+        """ Return index of current timestep, first discarding solutions (and
+        solver inputs) calculated in a previous timestep """
+        t_idx: cython.Py_ssize_t = self.__simtime.index()
+        if t_idx != self.__superposition_t_idx:
+            self.__clear_superposition()
+            self.__superposition_t_idx = t_idx
+        return t_idx
+
+    @cython.cfunc
+    def __superposition_key(self,
+            delta_t: cython.double,
+            temp_ext_air: cython.double,
+            gains_internal: cython.double,
+            gains_solar: cython.double,
+            vent_extra_h_ve: cython.double,
+            throughput_factor: cython.double,
+            ) -> tuple:
+        """ Return key identifying the timestep and inputs (other than
+        heating/cooling gains) for which the heat balance eqns have been solved
+
+        Solutions are only valid for the temperatures from the previous
+        timestep at the time they were calculated, so they must also be
+        discarded whenever these are updated (see __clear_superposition).
+        """
+        return (
+            self.__superposition_timestep(),
+            delta_t,
+            temp_ext_air,
+            gains_internal,
+            gains_solar,
+            vent_extra_h_ve,
+            throughput_factor,
+            )
+
+    def __vent_heat_transfer(self,
+            vent_extra_h_ve: cython.double,
+            throughput_factor: cython.double,
+            ) -> tuple:
+        """ Return the total heat transfer coefficient of the ventilation
+        elements, in W / K, and the sum of the heat transfer coefficient of
+        each ventilation element multiplied by its supply temperature
+
+        Arguments:
+        vent_extra_h_ve -- additional ventilation heat transfer coeff in response
+                           to high internal temperature
+        throughput_factor -- proportional increase in ventilation rate due to
+                             overventilation requirement
+        """
+        # TODO Throughput factor only applies to MVHR and WHEV, therefore only
+        #      these systems accept throughput_factor as an argument to the h_ve
+        #      function, hence the branch on the type in the loop below. This
+        #      means that the MVHR and WHEV classes no longer have the same
+        #      interface as other ventilation element classes, which could make
+        #      future development more difficult. Ideally, we would find a
+        #      cleaner way to implement this difference.
+        vei: object
+        h_ve: cython.double
+        sum_vent_elements_h_ve: cython.double = vent_extra_h_ve
+        sum_vent_elements_h_ve_times_temp_supply: cython.double = 0.0
+        if vent_extra_h_ve != 0:
+            sum_vent_elements_h_ve_times_temp_supply \
+                += vent_extra_h_ve * self.__vent_cool_extra.temp_supply()
+        for vei in self.__vent_elements:
+            if type(vei) in (MechnicalVentilationHeatRecovery, WholeHouseExtractVentilation):
+                h_ve = vei.h_ve(self.__volume, throughput_factor)
+            elif type(vei) in (VentilationElementInfiltration, NaturalVentilation):
+                h_ve = vei.h_ve(self.__volume)
+            else:
+                sys.exit( 'Applicability of throughput factor not defined for '
+                        + 'ventilation element type ' + str(type(vei)))
+            sum_vent_elements_h_ve += h_ve
+            sum_vent_elements_h_ve_times_temp_supply += h_ve * vei.temp_supply()
+
+        return sum_vent_elements_h_ve, sum_vent_elements_h_ve_times_temp_supply
+
+    @cython.cfunc
+    def __fast_solver_inputs(self, temp_prev: cython.double[:]) -> tuple:
+        """ Calculate the time-varying coefficients for the optimised heat balance solver
+
+        Arguments:
+        temp_prev -- temperature vector X from previous timestep
+
+        Returns a tuple containing an array of the internal convective heat
+        transfer coefficient of each building element and an array of the
+        terms on the RHS of the heat balance eqn for each external surface node
+        that do not depend on the length of the timestep. These depend only on
+        the current timestep and temp_prev, so may be calculated once and
+        reused for each call to __calc_temperatures in the same timestep.
+        """
+        temp_prev_arr = np.asarray(temp_prev)
+        temp_zone: cython.double = temp_prev_arr[self.__zone_idx]
+        no_of_els: cython.Py_ssize_t = len(self.__building_elements)
+
+        h_ci_el = np.empty(no_of_els)
+        temp_ext_el = np.empty(no_of_els)
+        i_sol_el = np.empty(no_of_els)
+
+        el_idx: cython.Py_ssize_t
+        eli: object
+        temp_int_surface: cython.double
+        i_sol_dir: cython.double
+        i_sol_dif: cython.double
+        f_sh_dir: cython.double
+        f_sh_dif: cython.double
+        for el_idx, (eli, temp_int_surface) in enumerate(zip(
+                self.__building_elements,
+                temp_prev_arr[self.__idx_int_surface].tolist(),
+                )):
+            # Internal convective surface heat transfer coefficient depends on
+            # direction of heat flow, which depends on temperature of zone and
+            # internal surface
+            h_ci_el[el_idx] = eli.h_ci(temp_zone, temp_int_surface)
+            temp_ext_el[el_idx] = eli.temp_ext()
+            i_sol_dir, i_sol_dif = eli.i_sol_dir_dif()
+            f_sh_dir, f_sh_dif = eli.shading_factors_direct_diffuse()
+            i_sol_el[el_idx] = i_sol_dif * f_sh_dif + i_sol_dir * f_sh_dir
+
+        # Terms on RHS of heat balance eqn for external surface node (eqn 41)
+        # other than the heat stored in the node
+        rhs_ext_el = self.__h_ce_h_re_el * temp_ext_el \
+                   + self.__a_sol_el * i_sol_el \
+                   - self.__therm_rad_to_sky_el
+
+        return h_ci_el, rhs_ext_el
+
+    @cython.cfunc
+    def __init_fast_solver_timestep(self, delta_t: cython.double) -> cython.void:
+        """ Calculate the coefficients of the optimised heat balance solver that
+        depend only on the length of the timestep
 
         Arguments:
-        coeffs -- full matrix of coefficients for the heat balance eqns
-        rhs -- full vector of values that are not temperatures or coefficients
-               (i.e. terms on right hand side of heat balance eqns)
+        delta_t -- calculation timestep, in seconds
+
+        This covers the adjusted coefficients (see __fast_solver) for all nodes
+        except the internal surface nodes, for which only the part that does not
+        depend on the internal convective heat transfer coefficient is stored,
+        and the coefficients linking the internal surface nodes to each other.
+        """
+        self.__k_over_dt_nodes = self.__k_pli_nodes / delta_t
+
+        # Coefficient for temperature of each node in its own heat balance eqn,
+        # (eqns 40 and 41), excluding internal surface terms
+        coeffs_diag = self.__k_over_dt_nodes + self.__h_pli_next_nodes + self.__h_pli_prev_nodes
+        coeffs_diag[self.__idx_ext_surface] += self.__h_ce_h_re_el
+
+        # Adjusted coeffs, working inwards from the external surface node. Note
+        # that coeffs for temperatures of adjacent nodes are -h_pli
+        coeffs_adj = coeffs_diag.copy()
+        elim_factor = np.zeros(len(coeffs_diag))
+        nodes: object
+        for nodes in self.__inside_nodes_by_depth + [self.__idx_int_surface]:
+            elim_factor[nodes] = self.__h_pli_prev_nodes[nodes] / coeffs_adj[nodes - 1]
+            coeffs_adj[nodes] -= self.__h_pli_prev_nodes[nodes] * elim_factor[nodes]
+
+        # Internal surface nodes (eqn 39). One term in eqn 39 is sum from k = 1
+        # to n of (A_elk / A_tot), which will always evaluate to 1
+        sum_area_frac: cython.double = 1.0
+        h_ri_el = np.array([eli.h_ri() for eli in self.__building_elements])
+        coeffs_adj[self.__idx_int_surface] += h_ri_el * sum_area_frac
+
+        # Coeffs for temperatures of internal surface nodes of all building
+        # elements in the zone (final sum term for LHS of eqn 39)
+        no_of_els: cython.Py_ssize_t = len(self.__building_elements)
+        matrix_a_static = np.zeros((no_of_els + 1, no_of_els + 1))
+        matrix_a_static[:no_of_els, :no_of_els] = - np.outer(h_ri_el, self.__area_frac_el)
+        matrix_a_static[range(no_of_els), range(no_of_els)] += coeffs_adj[self.__idx_int_surface]
+
+        self.__coeffs_adj_nodes = coeffs_adj
+        self.__elim_factor_nodes = elim_factor
+        self.__matrix_a_static = matrix_a_static
+        self.__fast_solver_delta_t = delta_t
+
+    @cython.cfunc
+    def __fast_solver(self,
+            delta_t: cython.double,
+            temp_prev: cython.double[:],
+            temp_ext_air: cython.double,
+            gains_internal: cython.double,
+            gains_solar: cython.double,
+            gains_heat_cool: cython.double,
+            f_hc_c: cython.double,
+            vent_extra_h_ve: cython.double,
+            throughput_factor: cython.double,
+            solver_inputs: object,
+            superposition: cython.bint = False,
+            ):
+        """ Optimised heat balance solver
+
+        See __calc_temperatures for description of arguments, except:
+        superposition -- if True, return a 2D array where the columns are the
+                         temperatures with the heating/cooling gains given and
+                         the change in temperatures per W of radiative and
+                         convective heating/cooling gains, respectively
 
         The heat balance equations from BS EN ISO 52016-1:2017 are expressed as a matrix equation and
         solved simultaneously. While this provides a generic calculation procedure that works for an
@@ -714,100 +1091,155 @@ class Zone:
         - Solve heat balance eqns for inside and air nodes using normal matrix solver
         - Loop over nodes, from internal inside node (i.e. inside node nearest to the internal surface) to
           external surface, and calculate temperatures in sequence
-        """
-        # Init matrix with zeroes
-        # Number of rows in matrix = number of columns
-        # = total number of nodes + 1 for overall zone heat balance (and internal air temp)
-        coeffs_adj: cython.double[:, :] = np.zeros((self.__no_of_temps, self.__no_of_temps))
 
-        coeffs_adj[0]
-
-        # Init vector_b with zeroes (length = number of nodes + 1 for overall zone heat balance)
-        rhs_adj: cython.double[:] = np.zeros(self.__no_of_temps)
+        The adjusted coeffs for all nodes other than the internal surface nodes
+        depend only on the length of the timestep, so these (along with the
+        other time-invariant coeffs) are calculated once and reused for each
+        call with the same timestep. Each step of the procedure is carried out
+        for all building elements at once, by grouping the nodes according to
+        their distance from the external or internal surface. Only the coeffs
+        and RHS terms that vary over time are calculated on each call, and the
+        reduced matrix for the internal surface and air nodes is assembled in a
+        preallocated buffer.
+        """
+        matrix_a, vector_b, rhs_adj = self.__fast_solver_reduced_system(
+            delta_t,
+            temp_prev,
+            temp_ext_air,
+            gains_internal,
+            gains_solar,
+            gains_heat_cool,
+            f_hc_c,
+            vent_extra_h_ve,
+            throughput_factor,
+            solver_inputs,
+            superposition,
+            )
 
-        # Init matrix with zeroes
-        # Number of rows in matrix = number of columns
-        # = total number of internal surface nodes + 1 for internal air node
-        num_rows_cols_optimised: cython.int = len(self.__building_elements) + 1
-        zone_idx: cython.Py_ssize_t = num_rows_cols_optimised - 1
-        matrix_a: cython.double[:, :] = np.zeros((num_rows_cols_optimised, num_rows_cols_optimised))
+        # Solve heat balance eqns for internal surface and air nodes using
+        # normal matrix solver
+        vector_x = np.linalg.solve(matrix_a, vector_b)
 
-        # Init vector_b with zeroes (length = number of internal surfaces + 1 for air node)
-        vector_b: cython.double[:] = np.zeros(num_rows_cols_optimised)
+        return self.__fast_solver_back_substitution(vector_x, rhs_adj)
 
-        # Loop over building elements
-        idx_ext_surface: cython.Py_ssize_t
-        idx_int_surface: cython.Py_ssize_t
-        el_idx: cython.Py_ssize_t
-        eli: object
-        idx: cython.Py_ssize_t
-        for el_idx, eli in enumerate(self.__building_elements):
-            idx_ext_surface = self.__element_positions[eli][0]
-            idx_int_surface = self.__element_positions[eli][1]
-
-            # No adjusted coeffs and RHS for external surface heat balance eqn
-            coeffs_adj[idx_ext_surface][idx_ext_surface] = coeffs[idx_ext_surface][idx_ext_surface]
-            rhs_adj[idx_ext_surface] = rhs[idx_ext_surface]
-
-            # Loop over nodes, from inside node adjacent to external surface, to internal surface
-            for idx in range(idx_ext_surface + 1, idx_int_surface + 1):
-                # Calculate adjusted coeffs and RHS for each heat balance eqn
-                coeffs_adj[idx][idx] \
-                    = coeffs[idx][idx] \
-                    - coeffs[idx - 1][idx] * coeffs[idx][idx - 1] / coeffs_adj[idx - 1][idx - 1]
-                rhs_adj[idx] \
-                    = rhs[idx] \
-                    - rhs_adj[idx - 1] * coeffs[idx][idx - 1] / coeffs_adj[idx - 1][idx - 1]
-
-            # Construct matrix eqn for internal surface nodes only (and air node, after this loop)
-            matrix_a[el_idx][el_idx] = coeffs_adj[idx_int_surface][idx_int_surface]
-            vector_b[el_idx] = rhs_adj[idx_int_surface]
-
-            # Add coeffs for temperatures other than the int surface temp of this building element
-            el_idx_other: cython.Py_ssize_t
-            elk: object
-            for el_idx_other, elk in enumerate(self.__building_elements):
-                # Skip the current building element
-                if elk is eli:
-                    continue
-
-                idx_other_int_surface = self.__element_positions[elk][1]
-                matrix_a[el_idx][el_idx_other] = coeffs[idx_int_surface][idx_other_int_surface]
-
-            # Add coeff for air temperature to this element's internal surface heat balance eqn
-            matrix_a[el_idx][zone_idx] = coeffs[idx_int_surface][self.__zone_idx]
-            # Add coeff for this element's internal surface temp to the air node heat balance eqn
-            matrix_a[zone_idx][el_idx] = coeffs[self.__zone_idx][idx_int_surface]
-
-        # Add rest of air node heat balance eqn to matrix
-        # Coeffs for temperatures other than the air temp are added in the loop above
-        matrix_a[zone_idx][zone_idx] = coeffs[self.__zone_idx][self.__zone_idx]
-        vector_b[zone_idx] = rhs[self.__zone_idx]
-
-        # Solve heat balance eqns for inside and air nodes using normal matrix solver
-        # Solve matrix eqn A.X = B to calculate vector_x (temperatures)
-        vector_x: cython.double[:] = np.linalg.solve(matrix_a, vector_b)
+    @cython.cfunc
+    def __fast_solver_reduced_system(self,
+            delta_t: cython.double,
+            temp_prev: cython.double[:],
+            temp_ext_air: cython.double,
+            gains_internal: cython.double,
+            gains_solar: cython.double,
+            gains_heat_cool: cython.double,
+            f_hc_c: cython.double,
+            vent_extra_h_ve: cython.double,
+            throughput_factor: cython.double,
+            solver_inputs: object,
+            superposition: cython.bint = False,
+            ):
+        """ Construct the reduced matrix eqn for the internal surface nodes and
+        air node (see __fast_solver)
 
-        # Init vector_x with zeroes (length = number of nodes + 1 for overall zone heat balance)
-        temperatures: cython.double[:] = np.zeros(self.__no_of_temps)
+        See __fast_solver for description of arguments. Returns matrix A and
+        vector B (or matrix B, if superposition is True) of the reduced matrix
+        eqn and the adjusted RHS of the heat balance eqns for all nodes. Note
+        that matrix A is a buffer that is overwritten on the next call.
+        """
+        if delta_t != self.__fast_solver_delta_t:
+            self.__init_fast_solver_timestep(delta_t)
+        if solver_inputs is None:
+            solver_inputs = self.__fast_solver_inputs(temp_prev)
+        h_ci_el, rhs_ext_el = solver_inputs
+
+        temp_prev_arr = np.asarray(temp_prev)
+        zone_idx: cython.Py_ssize_t = self.__zone_idx
+        no_of_els: cython.Py_ssize_t = len(self.__building_elements)
+        idx_int_surface = self.__idx_int_surface
+        elim_factor = self.__elim_factor_nodes
+
+        # RHS of heat balance eqns for all nodes (eqns 39 to 41)
+        rhs_adj = self.__k_over_dt_nodes * temp_prev_arr[:zone_idx]
+        rhs_adj[self.__idx_ext_surface] += rhs_ext_el
+        rhs_adj[idx_int_surface] \
+            += ( (1.0 - f_int_c) * gains_internal \
+               + (1.0 - f_sol_c) * gains_solar \
+               + (1.0 - f_hc_c) * gains_heat_cool \
+               ) \
+             / self.__area_el_total
+
+        # Adjusted RHS, working inwards from the external surface node
+        nodes: object
+        for nodes in self.__inside_nodes_by_depth:
+            rhs_adj[nodes] += rhs_adj[nodes - 1] * elim_factor[nodes]
+        rhs_adj[idx_int_surface] += rhs_adj[idx_int_surface - 1] * elim_factor[idx_int_surface]
+
+        # Construct matrix eqn for internal surface nodes and air node only
+        sum_vent_elements_h_ve: cython.double
+        sum_vent_elements_h_ve_times_temp_supply: cython.double
+        sum_vent_elements_h_ve, sum_vent_elements_h_ve_times_temp_supply \
+            = self.__vent_heat_transfer(vent_extra_h_ve, throughput_factor)
+        area_h_ci_el = self.__area_el * h_ci_el
+
+        matrix_a = self.__matrix_a
+        vector_b = self.__vector_b
+        np.copyto(matrix_a, self.__matrix_a_static)
+        matrix_a[range(no_of_els), range(no_of_els)] += h_ci_el
+        matrix_a[:no_of_els, no_of_els] = - h_ci_el
+        matrix_a[no_of_els, :no_of_els] = - area_h_ci_el
+        matrix_a[no_of_els, no_of_els] \
+            = (self.__c_int / delta_t) \
+            + area_h_ci_el.sum() \
+            + sum_vent_elements_h_ve \
+            + self.__tb_heat_trans_coeff
+        vector_b[:no_of_els] = rhs_adj[idx_int_surface]
+        vector_b[no_of_els] \
+            = (self.__c_int / delta_t) * temp_prev_arr[zone_idx] \
+            + sum_vent_elements_h_ve_times_temp_supply \
+            + self.__tb_heat_trans_coeff * temp_ext_air \
+            + f_int_c * gains_internal \
+            + f_sol_c * gains_solar \
+            + f_hc_c * gains_heat_cool
 
-        # Populate air node temperature result
-        temperatures[self.__zone_idx] = vector_x[zone_idx]
+        if superposition:
+            # Add RHS for unit radiative and convective heating/cooling gains.
+            # These do not affect the adjusted RHS for nodes other than the
+            # internal surface nodes, so these are zero
+            vector_b_unit_gains = np.zeros((no_of_els + 1, 2))
+            vector_b_unit_gains[:no_of_els, 0] = 1.0 / self.__area_el_total
+            vector_b_unit_gains[no_of_els, 1] = 1.0
+            vector_b = np.column_stack((vector_b, vector_b_unit_gains))
+            rhs_adj = np.column_stack((rhs_adj, np.zeros((len(rhs_adj), 2))))
 
-        # Populate node temperature results for each building element
-        for el_idx, eli in enumerate(self.__building_elements):
-            idx_ext_surface = self.__element_positions[eli][0]
-            idx_int_surface = self.__element_positions[eli][1]
+        return matrix_a, vector_b, rhs_adj
 
-            # Populate internal surface temperature result
-            temperatures[idx_int_surface] = vector_x[el_idx]
+    @cython.cfunc
+    def __fast_solver_back_substitution(self, vector_x: object, rhs_adj: object):
+        """ Calculate the temperatures of all nodes from the solution of the
+        reduced matrix eqn (see __fast_solver)
 
-            # Loop over nodes, from internal inside node (i.e. inside node nearest to the
-            # internal surface) to external surface, and calculate temperatures in sequence
-            for idx in reversed(range(idx_ext_surface, idx_int_surface)):
-                temperatures[idx] \
-                    = (rhs_adj[idx] - coeffs[idx][idx + 1] * temperatures[idx + 1]) \
-                    / coeffs_adj[idx][idx]
+        Arguments:
+        vector_x -- solution of the reduced matrix eqn
+        rhs_adj  -- adjusted RHS of the heat balance eqns for all nodes
+        """
+        zone_idx: cython.Py_ssize_t = self.__zone_idx
+        no_of_els: cython.Py_ssize_t = len(self.__building_elements)
+        h_pli_next = self.__h_pli_next_nodes
+        coeffs_adj = self.__coeffs_adj_nodes
+        if vector_x.ndim == 2:
+            # Solution for multiple RHS (see __fast_solver_reduced_system)
+            h_pli_next = h_pli_next[:, np.newaxis]
+            coeffs_adj = coeffs_adj[:, np.newaxis]
+
+        temperatures = np.empty((self.__no_of_temps,) + vector_x.shape[1:])
+        temperatures[zone_idx] = vector_x[no_of_els]
+        temperatures[self.__idx_int_surface] = vector_x[:no_of_els]
+
+        # Calculate temperatures of other nodes in sequence, working outwards
+        # from the internal surface node
+        nodes: object
+        for nodes in self.__nodes_by_depth_from_int:
+            temperatures[nodes] \
+                = (rhs_adj[nodes] + h_pli_next[nodes] * temperatures[nodes + 1]) \
+                / coeffs_adj[nodes]
 
         return temperatures
 
@@ -880,6 +1312,15 @@ class Zone:
         # Calculate timestep in seconds
         delta_t: cython.double = delta_t_h * units.seconds_per_hour
 
+        # Time-varying coefficients for the optimised solver depend only on the
+        # current timestep and the temperatures from the previous timestep, so
+        # are the same for each calculation of temperatures below. With linear
+        # superposition, most calculations reuse an existing solution so these
+        # are only calculated when needed.
+        solver_inputs: object = None
+        if self.__use_fast_solver and not self.__use_linear_superposition:
+            solver_inputs = self.__fast_solver_inputs(self.__temp_prev)
+
         # For calculation of demand, set heating/cooling gains to zero
         gains_heat_cool: cython.double = 0.0
 
@@ -894,6 +1335,7 @@ class Zone:
             gains_heat_cool,
             1.0, # Value does not matter as gains_heat_cool = 0.0
             throughput_factor = throughput_factor,
+            solver_inputs = solver_inputs,
             )
 
         # Calculate internal operative temperature at free-floating conditions
@@ -924,6 +1366,7 @@ class Zone:
                 1.0, # Value does not matter as gains_heat_cool = 0.0
                 vent_extra_h_ve = h_ve_cool_max,
                 throughput_factor = throughput_factor,
+                solver_inputs = solver_inputs,
                 )
 
             # Calculate internal operative temperature with maximum ventilation
@@ -957,6 +1400,7 @@ class Zone:
                     1.0, # Value does not matter as gains_heat_cool = 0.0
                     vent_extra_h_ve = h_ve_cool_extra,
                     throughput_factor = throughput_factor,
+                    solver_inputs = solver_inputs,
                     )
 
                 # Calculate internal operative temperature at free-floating conditions
@@ -1005,6 +1449,7 @@ class Zone:
             frac_convective,
             vent_extra_h_ve = h_ve_cool_extra,
             throughput_factor = throughput_factor,
+            solver_inputs = solver_inputs,
             )
 
         # Calculate internal operative temperature with maximum heating/cooling
@@ -1034,6 +1479,76 @@ class Zone:
             pass
         return space_heat_demand, space_cool_demand, h_ve_cool_extra
 
+    def heat_balance_system(
+            self,
+            delta_t_h: cython.double,
+            temp_ext_air: cython.double,
+            gains_internal: cython.double,
+            gains_solar: cython.double,
+            throughput_factor: cython.double=1.0,
+            ) -> tuple:
+        """ Return the reduced matrix eqn A.X = B for the zone heat balance at
+        free-floating conditions (i.e. no heating/cooling or additional
+        ventilation) for the current timestep, so that it can be solved outside
+        this object (e.g. together with the eqns for other zones)
+
+        Only available when using linear superposition. The solution must be
+        passed to set_heat_balance_solution before space_heat_cool_demand is
+        called with the same arguments, which will then use this solution.
+        B has one column for the heat balance with no heating/cooling gains and
+        one each for unit radiative and convective heating/cooling gains.
+
+        Arguments:
+        delta_t_h -- calculation timestep, in hours
+        temp_ext_air -- temperature of the external air for the current timestep, in deg C
+        gains_internal -- internal gains for the current timestep, in W
+        gains_solar -- directly transmitted solar gains, in W
+        throughput_factor -- proportional increase in ventilation rate due to
+                             overventilation requirement
+        """
+        if not self.__use_linear_superposition:
+            sys.exit('ERROR: Zone heat balance system is only available when '
+                     'using linear superposition.')
+
+        delta_t: cython.double = delta_t_h * units.seconds_per_hour
+        vent_extra_h_ve: cython.double = 0.0
+        matrix_a, vector_b, rhs_adj = self.__fast_solver_reduced_system(
+            delta_t,
+            self.__temp_prev,
+            temp_ext_air,
+            gains_internal,
+            gains_solar,
+            0.0,
+            1.0, # Value does not matter as gains_heat_cool = 0.0
+            vent_extra_h_ve,
+            throughput_factor,
+            self.__solver_inputs_for_superposition(),
+            True,
+            )
+        superposition_key: tuple = self.__superposition_key(
+            delta_t,
+            temp_ext_air,
+            gains_internal,
+            gains_solar,
+            vent_extra_h_ve,
+            throughput_factor,
+            )
+        self.__superposition_pending = (superposition_key, rhs_adj)
+        return matrix_a, vector_b
+
+    def set_heat_balance_solution(self, vector_x: object) -> cython.void:
+        """ Store the solution X of the matrix eqn returned by the last call to
+        heat_balance_system
+
+        Arguments:
+        vector_x -- solution of matrix eqn, with one column for each column of B
+        """
+        superposition_key: tuple
+        superposition_key, rhs_adj = self.__superposition_pending
+        self.__temps_superposition[superposition_key] \
+            = self.__fast_solver_back_substitution(np.asarray(vector_x), rhs_adj)
+        self.__superposition_pending = None
+
     def update_temperatures(self,
             delta_t: cython.double,
             temp_ext_air: cython.double,
@@ -1072,6 +1587,8 @@ class Zone:
             throughput_factor = throughput_factor,
             print_heat_balance = self.__print_heat_balance,
             )
+        # Solutions for the previous temperatures are no longer valid
+        self.__clear_superposition()
         return heat_balance_dict
 
     def total_fabric_heat_loss(self) -> cython.double:
@@ -48,7 +48,15 @@ class Bath:
         temp_target           -- temperature of warm water delivered at tap, in Celcius
         """
         temp_cold = self.__cold_water_source.temperature()
+        return self.hot_water_demand_events(temp_target, temp_cold)
 
+    def hot_water_demand_events(self, temp_target, temp_cold):
+        """ Calculate volume of hot water required for each of a number of events
+
+        Arguments (each may be a single value or an array with one entry per event):
+        temp_target -- temperature of warm water delivered at tap, in Celcius
+        temp_cold   -- temperature of cold water feed, in Celcius
+        """
         vol_warm_water = self.__bathsize # in litres. we may wish to modify the volume of water
         # compared to the size of the bath
 
@@ -4,6 +4,9 @@
 This module provides objects to represent the source(s) of cold water.
 """
 
+# Third-party imports
+import numpy as np
+
 class ColdWaterSource:
     """ An object to represent a source of cold water """
 
@@ -24,3 +27,11 @@ class ColdWaterSource:
     def temperature(self):
         """ Return the cold water temperature for the current timestep """
         return self.__cold_water_temps[self.__simulation_time.time_series_idx(self.__start_day, self.__time_series_step)]
+
+    def temperature_per_timestep(self):
+        """ Return array of the cold water temperature for every timestep of the simulation """
+        schedule_idx = self.__simulation_time.time_series_idx_array(
+            self.__start_day,
+            self.__time_series_step,
+            )
+        return np.asarray(self.__cold_water_temps, dtype=float)[schedule_idx]
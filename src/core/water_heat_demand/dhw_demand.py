@@ -7,6 +7,9 @@ This module contains the hot water demand calculations.
 # Standard library imports
 import sys
 
+# Third-party imports
+import numpy as np
+
 # Local imports
 from core.pipework import Pipework
 import core.units as units
@@ -31,6 +34,8 @@ class DHWDemand:
             ):
         """ Construct a DHWDemand object """
         self.__event_schedules = event_schedules
+        # Results for each timestep are calculated in advance, when first needed
+        self.__precomputed = None
 
         def dict_to_shower(name, data):
             """ Parse dictionary of shower data and return approprate shower object """
@@ -60,9 +65,14 @@ class DHWDemand:
             return shower
 
         self.__showers = {}
+        # Showers for which hot water demand depends on the state of a WWHRS,
+        # so cannot be calculated in advance
+        self.__showers_wwhrs = {}
         no_of_showers = 0
         for name, data in showers_dict.items():
             self.__showers[name] = dict_to_shower(name, data)
+            if data['type'] == 'MixerShower' and 'WWHRS' in data:
+                self.__showers_wwhrs[name] = self.__showers[name]
             # Count number of showers that draw from HW system
             if data['type'] != 'InstantElecShower':
                 no_of_showers += 1
@@ -118,19 +128,156 @@ class DHWDemand:
         for name, data in hw_pipework_dict.items():
             self.__hw_distribution_pipework[name] = dict_to_water_distribution_system(name, data)
 
+    def __precompute_hot_water_demand(self):
+        """ Calculate totals of hot water demand and related figures for every
+        timestep from the event schedules
+
+        Events for showers with WWHRS are excluded, as these are calculated
+        on each call to hot_water_demand. Totals are accumulated in the same
+        order as the events would be processed one timestep at a time.
+        """
+        event_schedules = \
+            [self.__event_schedules['Shower'][name] for name in self.__showers.keys()] \
+            + [self.__event_schedules['Other'][name] for name in self.__other_hw_users.keys()] \
+            + [self.__event_schedules['Bath'][name] for name in self.__baths.keys()]
+        if not event_schedules:
+            # No hot water users, so no demand in any timestep
+            self.__precomputed = ()
+            return
+        no_of_timesteps = len(event_schedules[0])
+
+        hw_demand_vol = np.zeros(no_of_timesteps)
+        hw_energy_demand = np.zeros(no_of_timesteps)
+        hw_duration = np.zeros(no_of_timesteps)
+        all_events = np.zeros(no_of_timesteps)
+        vol_hot_water_equiv_elec_shower = np.zeros(no_of_timesteps)
+
+        def events_for_schedule(usage_events_by_timestep, include_duration=True):
+            """ Return arrays of timestep index, temperature and duration of
+            each event in the schedule, in order """
+            t_idx_events = []
+            temp_events = []
+            duration_events = []
+            for t_idx, usage_events in enumerate(usage_events_by_timestep):
+                if usage_events is None:
+                    continue
+                for event in usage_events:
+                    t_idx_events.append(t_idx)
+                    temp_events.append(event['temperature'])
+                    if include_duration:
+                        duration_events.append(event['duration'])
+            return np.array(t_idx_events, dtype=int), \
+                   np.array(temp_events, dtype=float), \
+                   np.array(duration_events, dtype=float)
+
+        def add_events(t_idx_events, hw_demand_events, hw_energy_demand_events, duration_events):
+            np.add.at(hw_demand_vol, t_idx_events, hw_demand_events)
+            np.add.at(hw_energy_demand, t_idx_events, hw_energy_demand_events)
+            np.add.at(hw_duration, t_idx_events, duration_events)
+            np.add.at(all_events, t_idx_events, 1)
+
+        for name, shower in self.__showers.items():
+            if name in self.__showers_wwhrs:
+                continue
+            t_idx_events, shower_temp, shower_duration \
+                = events_for_schedule(self.__event_schedules['Shower'][name])
+            cold_water_temperature \
+                = shower.get_cold_water_source().temperature_per_timestep()[t_idx_events]
+            if isinstance(shower, InstantElecShower):
+                vol_hot_water_equiv_events, elec_demand_events \
+                    = shower.hot_water_demand_events(shower_temp, shower_duration, cold_water_temperature)
+                np.add.at(vol_hot_water_equiv_elec_shower, t_idx_events, vol_hot_water_equiv_events)
+                elec_demand = np.zeros(no_of_timesteps)
+                np.add.at(elec_demand, t_idx_events, elec_demand_events)
+                shower.demand_energy_series(elec_demand)
+            else:
+                hw_demand_events = shower.hot_water_demand_events(
+                    shower_temp,
+                    shower_duration,
+                    cold_water_temperature,
+                    )
+                add_events(
+                    t_idx_events,
+                    hw_demand_events,
+                    misc.water_demand_to_kWh(
+                        hw_demand_events,
+                        shower.get_temp_hot(),
+                        cold_water_temperature,
+                        ),
+                    shower_duration,
+                    )
+
+        for name, other in self.__other_hw_users.items():
+            t_idx_events, other_temp, other_duration \
+                = events_for_schedule(self.__event_schedules['Other'][name])
+            cold_water_temperature \
+                = other.get_cold_water_source().temperature_per_timestep()[t_idx_events]
+            hw_demand_events = other.hot_water_demand_events(
+                other_temp,
+                other_duration,
+                cold_water_temperature,
+                )
+            add_events(
+                t_idx_events,
+                hw_demand_events,
+                misc.water_demand_to_kWh(
+                    hw_demand_events,
+                    other.get_temp_hot(),
+                    cold_water_temperature,
+                    ),
+                other_duration,
+                )
+
+        for name, bath in self.__baths.items():
+            t_idx_events, bath_temp, _ \
+                = events_for_schedule(self.__event_schedules['Bath'][name], False)
+            cold_water_temperature \
+                = bath.get_cold_water_source().temperature_per_timestep()[t_idx_events]
+            hw_demand_events = bath.hot_water_demand_events(bath_temp, cold_water_temperature)
+            # litres bath  / litres per minute flowrate = minutes
+            # Assume flow rate for bath event is the same as other hot water events
+            bath_duration = bath.get_size() / bath.get_flowrate()
+            add_events(
+                t_idx_events,
+                hw_demand_events,
+                misc.water_demand_to_kWh(
+                    hw_demand_events,
+                    bath.get_temp_hot(),
+                    cold_water_temperature,
+                    ),
+                np.full(len(t_idx_events), bath_duration),
+                )
+
+        # Convert to lists so that results are plain floats
+        self.__precomputed = (
+            hw_demand_vol.tolist(),
+            hw_energy_demand.tolist(),
+            hw_duration.tolist(),
+            all_events.tolist(),
+            vol_hot_water_equiv_elec_shower.tolist(),
+            )
+
     def hot_water_demand(self, t_idx):
         """ Calculate the hot water demand for the current timestep
 
         Arguments:
         t_idx -- timestep index/count
         """
-        hw_demand_vol = 0.0
-        hw_energy_demand = 0.0
-        hw_duration = 0.0
-        all_events = 0.0
-        vol_hot_water_equiv_elec_shower = 0.0
-
-        for name, shower in self.__showers.items():
+        if self.__precomputed is None:
+            self.__precompute_hot_water_demand()
+        if self.__precomputed:
+            hw_demand_vol, hw_energy_demand, hw_duration, all_events, \
+                vol_hot_water_equiv_elec_shower \
+                = (results[t_idx] for results in self.__precomputed)
+        else:
+            # No hot water users
+            hw_demand_vol = 0.0
+            hw_energy_demand = 0.0
+            hw_duration = 0.0
+            all_events = 0.0
+            vol_hot_water_equiv_elec_shower = 0.0
+
+        for name, shower in self.__showers_wwhrs.items():
             # Get all shower use events for the current timestep
             usage_events = self.__event_schedules['Shower'][name][t_idx]
             the_cold_water_temp = shower.get_cold_water_source()
@@ -138,74 +285,18 @@ class DHWDemand:
 
             # If shower is used in the current timestep, get details of use
             # and calculate HW demand from shower
-
-            # TODO revisit structure and eliminate the branch on the type
             if usage_events is not None:
                 for event in usage_events:
                     shower_temp = event['temperature']
                     shower_duration = event['duration']
                     hw_demand_i = shower.hot_water_demand(shower_temp, shower_duration)
-                    if not isinstance(shower, InstantElecShower):
-                        # don't add hw demand and pipework loss from electric shower
-                        hw_demand_vol += hw_demand_i
-                        hw_energy_demand += misc.water_demand_to_kWh(
-                            hw_demand_i,
-                            shower.get_temp_hot(),
-                            cold_water_temperature
-                            )
-                        hw_duration += event['duration'] # shower minutes duration
-                        all_events += 1
-                    else:
-                        # If electric shower, function returns equivalent
-                        # amount of hot water for internal gains calculation
-                        vol_hot_water_equiv_elec_shower += hw_demand_i
-
-        for name, other in self.__other_hw_users.items():
-            # Get all other use events for the current timestep
-            usage_events = self.__event_schedules['Other'][name][t_idx]
-            the_cold_water_temp = other.get_cold_water_source()
-            cold_water_temperature = the_cold_water_temp.temperature()
-            
-            # If other is used in the current timestep, get details of use
-            # and calculate HW demand from other
-            if usage_events is not None:
-                for event in usage_events:
-                    other_temp = event['temperature']
-                    other_duration = event['duration']
-                    hw_demand_vol += other.hot_water_demand(other_temp, other_duration)
-                    hw_energy_demand += misc.water_demand_to_kWh(
-                        other.hot_water_demand(other_temp, other_duration),
-                        other.get_temp_hot(),
-                        cold_water_temperature
-                        )
-                    hw_duration += event['duration'] # other minutes duration
-                    all_events += 1
-                    
-
-        for name, bath in self.__baths.items():
-            # Get all bath use events for the current timestep
-            usage_events = self.__event_schedules['Bath'][name][t_idx]
-            the_cold_water_temp = bath.get_cold_water_source()
-            cold_water_temperature = the_cold_water_temp.temperature()
-
-            # Assume flow rate for bath event is the same as other hot water events
-            peak_flowrate = bath.get_flowrate()
-
-            # If bath is used in the current timestep, get details of use
-            # and calculate HW demand from bath
-            # Note that bath size is the total water used per bath, not the total capacity of the bath
-            if usage_events is not None:
-                for event in usage_events:
-                    bath_temp = event['temperature']
-                    hw_demand_vol += bath.hot_water_demand(bath_temp)
-                    # litres bath  / litres per minute flowrate = minutes
-                    bath_duration = bath.get_size() / peak_flowrate
+                    hw_demand_vol += hw_demand_i
                     hw_energy_demand += misc.water_demand_to_kWh(
-                        bath.hot_water_demand(bath_temp),
-                        bath.get_temp_hot(),
+                        hw_demand_i,
+                        shower.get_temp_hot(),
                         cold_water_temperature
                         )
-                    hw_duration += bath_duration
+                    hw_duration += event['duration'] # shower minutes duration
                     all_events += 1
 
         hw_vol_at_tapping_points = hw_demand_vol + vol_hot_water_equiv_elec_shower
@@ -46,7 +46,16 @@ class OtherHotWater:
                                  timestep, in minutes
         """
         temp_cold = self.__cold_water_source.temperature()
+        return self.hot_water_demand_events(temp_target, total_demand_duration, temp_cold)
 
+    def hot_water_demand_events(self, temp_target, total_demand_duration, temp_cold):
+        """ Calculate volume of hot water required for each of a number of events
+
+        Arguments (each may be a single value or an array with one entry per event):
+        temp_target           -- temperature of warm water delivered at tap/outlet head, in Celcius
+        total_demand_duration -- cumulative running time of this event, in minutes
+        temp_cold             -- temperature of cold water feed, in Celcius
+        """
         # TODO Account for behavioural variation factor fbeh
         vol_warm_water = self.__flowrate * total_demand_duration
         # ^^^ litres = litres/minute * minutes
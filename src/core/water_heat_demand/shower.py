@@ -4,6 +4,9 @@
 This module provides objects to model showers of different types.
 """
 
+# Standard library imports
+import sys
+
 # Local imports
 import core.units as units
 from core.material_properties import WATER
@@ -32,7 +35,15 @@ class MixerShower:
     
     def get_temp_hot(self):
         return(self.__temp_hot)
-        
+
+    def __vol_hot_water(self, temp_target, total_shower_duration, temp_cold):
+        """ Calculate volume of hot water required, given the temperature of
+        the cold water that it is mixed with """
+        # TODO Account for behavioural variation factor fbeh
+        vol_warm_water = self.__flowrate * total_shower_duration
+        # ^^^ litres = litres/minute * minutes
+        return vol_warm_water * frac_hot_water(temp_target, self.__temp_hot, temp_cold)
+
     def hot_water_demand(self, temp_target, total_shower_duration):
         """ Calculate volume of hot water required
 
@@ -45,10 +56,7 @@ class MixerShower:
         """
         temp_cold = self.__cold_water_source.temperature()
 
-        # TODO Account for behavioural variation factor fbeh
-        vol_warm_water = self.__flowrate * total_shower_duration
-        # ^^^ litres = litres/minute * minutes
-        vol_hot_water  = vol_warm_water * frac_hot_water(temp_target, self.__temp_hot, temp_cold)
+        vol_hot_water = self.__vol_hot_water(temp_target, total_shower_duration, temp_cold)
         # first calculate the volume of hot water needed if heating from cold water source
 
         if self.__wwhrs is not None:
@@ -64,7 +72,9 @@ class MixerShower:
 
             if isinstance(self.__wwhrs, wwhrs.WWHRS_InstantaneousSystemB): # just returns hot water to the shower
                 # return the required volume of hot water once the recovered heat has been accounted for.
-                vol_hot_water  = vol_warm_water * frac_hot_water(temp_target, self.__temp_hot, wwhrs_return_temperature)
+                vol_hot_water = self.__vol_hot_water(
+                    temp_target, total_shower_duration, wwhrs_return_temperature
+                    )
 
             elif isinstance(self.__wwhrs, wwhrs.WWHRS_InstantaneousSystemC): # just returns hot water to the hot water source
                 # Set the actual return temperature given the temperature and flowrate of the waste water.
@@ -75,10 +85,29 @@ class MixerShower:
                 self.__wwhrs.set_temperature_for_return(wwhrs_return_temperature)
                 
                 # return the required volume of hot water once the recovered heat has been accounted for.
-                vol_hot_water  = vol_warm_water * frac_hot_water(temp_target, self.__temp_hot, wwhrs_return_temperature)
+                vol_hot_water = self.__vol_hot_water(
+                    temp_target, total_shower_duration, wwhrs_return_temperature
+                    )
 
         return vol_hot_water
 
+    def hot_water_demand_events(self, temp_target, total_shower_duration, temp_cold):
+        """ Calculate volume of hot water required for each of a number of
+        events, for a shower with no WWHRS
+
+        With a WWHRS, the volume depends on the state of the WWHRS, so
+        hot_water_demand must be called in each timestep instead.
+
+        Arguments (each may be a single value or an array with one entry per event):
+        temp_target           -- temperature of warm water delivered at shower head, in Celcius
+        total_shower_duration -- cumulative running time of this shower, in minutes
+        temp_cold             -- temperature of cold water feed, in Celcius
+        """
+        if self.__wwhrs is not None:
+            sys.exit('ERROR: Hot water demand for shower with WWHRS must be '
+                     'calculated for each timestep using hot_water_demand')
+        return self.__vol_hot_water(temp_target, total_shower_duration, temp_cold)
+
 
 class InstantElecShower:
     """ An object to model instantaneous electric showers
@@ -119,14 +148,8 @@ class InstantElecShower:
         """
         temp_cold = self.__cold_water_source.temperature()
 
-        # TODO Account for behavioural variation factor fbeh
-        elec_demand    = self.__pwr * (total_shower_duration / units.minutes_per_hour)
-        # ^^^ kWh = kW * hours
-        vol_warm_water = elec_demand \
-                       / WATER.volumetric_energy_content_kWh_per_litre(temp_target, temp_cold)
-        temp_hot = 52.0 # TODO Define this centrally rather than hard-coding
-        vol_hot_water_equiv \
-            = vol_warm_water * frac_hot_water(temp_target, temp_hot, temp_cold)
+        vol_hot_water_equiv, elec_demand \
+            = self.hot_water_demand_events(temp_target, total_shower_duration, temp_cold)
 
         self.__elec_supply_conn.demand_energy(elec_demand)
 
@@ -147,3 +170,28 @@ class InstantElecShower:
         #      figure for each timestep.
         # TODO Also send vol_warm_water to connected WWHRS object? Account for
         #      heat loss between shower head and drain?
+
+    def hot_water_demand_events(self, temp_target, total_shower_duration, temp_cold):
+        """ Calculate equivalent volume of hot water and electrical energy
+        required for each of a number of events, without recording the
+        electricity demand
+
+        Arguments (each may be a single value or an array with one entry per event):
+        temp_target           -- temperature of warm water delivered at shower head, in Celcius
+        total_shower_duration -- cumulative running time of this shower, in minutes
+        temp_cold             -- temperature of cold water feed, in Celcius
+        """
+        # TODO Account for behavioural variation factor fbeh
+        elec_demand    = self.__pwr * (total_shower_duration / units.minutes_per_hour)
+        # ^^^ kWh = kW * hours
+        vol_warm_water = elec_demand \
+                       / WATER.volumetric_energy_content_kWh_per_litre(temp_target, temp_cold)
+        temp_hot = 52.0 # TODO Define this centrally rather than hard-coding
+        vol_hot_water_equiv \
+            = vol_warm_water * frac_hot_water(temp_target, temp_hot, temp_cold)
+        return vol_hot_water_equiv, elec_demand
+
+    def demand_energy_series(self, elec_demand):
+        """ Record electrical energy required (in kWh) in every timestep of the
+        simulation, for events that are known before the simulation is run """
+        self.__elec_supply_conn.demand_energy_series(elec_demand)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+"""
+This module provides a binary store for weather data and the solar geometry
+derived from it. The store is a directory of NumPy arrays which are
+memory-mapped read-only when opened, so that many processes can use the same
+weather data without each holding its own copy.
+"""
+
+# Standard library imports
+import os
+import sys
+import json
+import hashlib
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+import core.units as units
+from core.simulation_time import SimulationTime
+from core.external_conditions import ExternalConditions
+
+METADATA_FILENAME = 'metadata.json'
+
+# Names of arrays of weather data (one entry per row of the time series)
+WEATHER_DATA_ARRAYS = (
+    'air_temperatures',
+    'wind_speeds',
+    'diffuse_horizontal_radiation',
+    'direct_beam_radiation',
+    'solar_reflectivity_of_ground',
+    )
+
+
+def weather_file_hash(filename):
+    """ Return hash of the contents of a weather file, to identify the file
+    that a weather store was created from """
+    file_hash = hashlib.sha256()
+    with open(filename, 'rb') as weather_file:
+        for block in iter(lambda: weather_file.read(1024 * 1024), b''):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+def weather_store_source_hash(path):
+    """ Return hash of the weather file that the weather store at path was
+    created from (see weather_file_hash), or None if there is no complete
+    weather store at path or it does not record the weather file it was
+    created from """
+    metadata_filename = os.path.join(path, METADATA_FILENAME)
+    if not os.path.isfile(metadata_filename):
+        return None
+    with open(metadata_filename) as metadata_file:
+        return json.load(metadata_file).get('source_file_hash')
+
+
+class WeatherStore:
+    """ An object to look up data from a weather store """
+
+    def __init__(self, path):
+        """ Open a weather store
+
+        Arguments:
+        path -- path to directory containing weather store (as created by
+                write_weather_store)
+        """
+        self.__path = path
+        metadata_filename = os.path.join(path, METADATA_FILENAME)
+        if not os.path.isfile(metadata_filename):
+            sys.exit('ERROR: Weather store not found at ' + str(path))
+        with open(metadata_filename) as metadata_file:
+            self.__metadata = json.load(metadata_file)
+
+        self.__arrays = {
+            name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r')
+            for name in self.__metadata['arrays']
+            }
+
+    def __reduce__(self):
+        """ Pickle as path to weather store, so that other processes open the
+        store themselves rather than receiving a copy of the data """
+        return (self.__class__, (self.__path,))
+
+    def metadata(self, name):
+        """ Return single value from weather store metadata """
+        return self.__metadata[name]
+
+    def array(self, name):
+        """ Return (read-only) array of weather data or solar geometry """
+        return self.__arrays[name]
+
+    def external_conditions_dict(self):
+        """ Return dictionary of weather data, in the same format as returned by
+        weather_data_to_dict (but with read-only arrays instead of lists) """
+        external_conditions = {name: self.__arrays[name] for name in WEATHER_DATA_ARRAYS}
+        for name in ('latitude', 'longitude', 'direct_beam_conversion_needed'):
+            external_conditions[name] = self.__metadata[name]
+        return external_conditions
+
+    def solar_data(self):
+        """ Return dictionary of solar geometry and sky model inputs, in format
+        accepted by ExternalConditions """
+        return {
+            name: self.__arrays['solar_data_' + name]
+            for name in self.__metadata['solar_data']
+            }
+
+
+def write_weather_store(path, external_conditions_dict, source_file_hash=None):
+    """ Write weather data and derived solar geometry to a weather store
+
+    Arguments:
+    path -- path to directory to write weather store to (created if it does not
+            exist, and overwritten if it does)
+    external_conditions_dict -- dictionary of weather data, as returned by
+                                weather_data_to_dict or
+                                CIBSE_weather_data_to_dict
+    source_file_hash -- hash of the weather file that the weather data was read
+                        from (see weather_file_hash), to be recorded in the
+                        store so that it can be checked before the store is
+                        reused
+
+    The derived solar geometry is calculated with the same settings that are
+    used for weather data from file in the rest of the program, i.e. time
+    series starting on 1st January, in hourly steps, with no leap day and
+    timezone of GMT.
+    """
+    metadata = {
+        'latitude': external_conditions_dict['latitude'],
+        'longitude': external_conditions_dict['longitude'],
+        'timezone': 0,
+        'start_day': 0,
+        'end_day': 365,
+        'time_series_step': 1,
+        'january_first': None,
+        'daylight_savings': None,
+        'leap_day_included': None,
+        'direct_beam_conversion_needed': external_conditions_dict['direct_beam_conversion_needed'],
+        'source_file_hash': source_file_hash,
+        }
+
+    arrays = {
+        name: np.asarray(external_conditions_dict[name], dtype=float)
+        for name in WEATHER_DATA_ARRAYS
+        }
+
+    # Calculate solar geometry and sky model inputs for each row of the time
+    # series, using a simulation with one timestep per row
+    no_of_rows = len(arrays['air_temperatures'])
+    time_start = metadata['start_day'] * units.hours_per_day
+    simtime = SimulationTime(
+        time_start,
+        time_start + no_of_rows * metadata['time_series_step'],
+        metadata['time_series_step'],
+        )
+    external_conditions = ExternalConditions(
+        simtime,
+        *(arrays[name] for name in WEATHER_DATA_ARRAYS),
+        metadata['latitude'],
+        metadata['longitude'],
+        metadata['timezone'],
+        metadata['start_day'],
+        metadata['end_day'],
+        metadata['time_series_step'],
+        metadata['january_first'],
+        metadata['daylight_savings'],
+        metadata['leap_day_included'],
+        metadata['direct_beam_conversion_needed'],
+        None,
+        )
+    solar_data = external_conditions.solar_data()
+    for name, values in solar_data.items():
+        arrays['solar_data_' + name] = np.asarray(values, dtype=float)
+
+    metadata['arrays'] = list(arrays.keys())
+    metadata['solar_data'] = list(solar_data.keys())
+
+    os.makedirs(path, exist_ok=True)
+    # Remove metadata of any existing store first, so that the store cannot be
+    # opened while it is partly overwritten
+    metadata_filename = os.path.join(path, METADATA_FILENAME)
+    if os.path.isfile(metadata_filename):
+        os.remove(metadata_filename)
+    for name, values in arrays.items():
+        # Write to a new file and then replace the old one, so that processes
+        # that still have the old array memory-mapped are not affected
+        array_filename = os.path.join(path, name + '.npy')
+        with open(array_filename + '.tmp', 'wb') as array_file:
+            np.save(array_file, values)
+        os.replace(array_filename + '.tmp', array_filename)
+    # Write metadata last, so that an incomplete store cannot be opened
+    with open(metadata_filename, 'w') as metadata_file:
+        json.dump(metadata, metadata_file, indent=4)
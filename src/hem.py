@@ -18,9 +18,14 @@ import numpy as np
 
 # Local imports
 from core.project import Project
+from core.project_batch import ProjectBatch
 import core.units as units
 from read_weather_file import weather_data_to_dict
 from read_CIBSE_weather_file import CIBSE_weather_data_to_dict
+from core.weather_store import WeatherStore, write_weather_store, \
+    weather_file_hash, weather_store_source_hash, METADATA_FILENAME
+from batch_scheduler import run_jobs
+from output_writers import OUTPUT_FORMATS, pyarrow_available, table_writer
 from wrappers.future_homes_standard.future_homes_standard import \
     apply_fhs_preprocessing, apply_fhs_postprocessing
 from wrappers.future_homes_standard.future_homes_standard_notional import \
@@ -29,7 +34,7 @@ from wrappers.future_homes_standard.future_homes_standard_FEE import \
     apply_fhs_FEE_preprocessing, apply_fhs_FEE_postprocessing
 
 
-def run_project(
+def run_project_timesteps(
         inp_filename,
         external_conditions_dict,
         preproc_only=False,
@@ -42,7 +47,22 @@ def run_project(
         heat_balance=False,
         detailed_output_heating_cooling=False,
         use_fast_solver=False,
+        precompute_solar=False,
+        weather_store=None,
+        use_fast_emitter_integrator=False,
+        use_fast_storage_heater_integrator=False,
+        heat_pump_performance_map_resolution=None,
+        iterate_throughput_factor=False,
+        output_format='csv',
+        stream_output=False,
+        summary_only=False,
         ):
+    """ Run the calculation for one input file and write the results
+
+    This is a generator which behaves in the same way as
+    Project.run_timesteps, so that the calculations for several input files
+    can be run in lock-step by a ProjectBatch object (see run_projects).
+    """
     file_name = os.path.splitext(os.path.basename(inp_filename))[0]
     file_path = os.path.splitext(os.path.abspath(inp_filename))[0]
     results_folder = os.path.join(file_path + '__results', '')
@@ -62,13 +82,16 @@ def run_project(
     else:
         output_file_run_name = 'core'
     output_file_name_stub = results_folder + file_name + '__' + output_file_run_name + '__'
-    output_file_detailed = output_file_name_stub + 'results.csv'
-    output_file_static = output_file_name_stub + 'results_static.csv'
-    output_file_summary = output_file_name_stub + 'results_summary.csv'
+    output_file_detailed = output_file_name_stub + 'results'
+    output_file_static = output_file_name_stub + 'results_static'
+    output_file_summary = output_file_name_stub + 'results_summary'
 
     with open(inp_filename) as json_file:
         project_dict = json.load(json_file)
 
+    if weather_store is not None:
+        external_conditions_dict = weather_store.external_conditions_dict()
+
     if external_conditions_dict is not None:
         # Note: Shading segments are an assessor input regardless, so save them
         # before overwriting the ExternalConditions and re-insert after
@@ -94,11 +117,45 @@ def run_project(
     if preproc_only:
         preproc_file_name = output_file_name_stub + 'preproc.json'
         with open(preproc_file_name, 'w') as preproc_file:
-            json.dump(project_dict, preproc_file, sort_keys=True, indent=4)
+            json.dump(
+                project_dict,
+                preproc_file,
+                sort_keys=True,
+                indent=4,
+                # Convert arrays from weather store to lists
+                default=lambda obj: obj.tolist(),
+                )
         shutil.copy2(inp_filename, results_folder)
         return # Skip actual calculation if preproc only option has been selected
 
-    project = Project(project_dict, heat_balance, detailed_output_heating_cooling, use_fast_solver)
+    project = Project(
+        project_dict,
+        heat_balance,
+        detailed_output_heating_cooling,
+        use_fast_solver,
+        precompute_solar,
+        weather_store,
+        use_fast_emitter_integrator,
+        use_fast_storage_heater_integrator,
+        heat_pump_performance_map_resolution,
+        iterate_throughput_factor,
+        # Results for each timestep are passed to output sinks as the
+        # simulation progresses, so only totals need to be kept
+        summary_only or stream_output,
+        )
+
+    if stream_output:
+        # Write time series results as the simulation progresses rather than
+        # after it has finished
+        project.register_output_sink(
+            CoreOutputSink(output_file_detailed, output_format),
+            )
+        if heat_balance:
+            project.register_output_sink(HeatBalanceOutputSink(
+                output_file_name_stub,
+                project_dict['SimulationTime']['step'],
+                output_format,
+                ))
 
     # Calculate static parameters and output
     heat_trans_coeff, heat_loss_param, HTC_dict, HLP_dict = project.calc_HTC_HLP()
@@ -110,6 +167,7 @@ def run_project(
         heat_loss_param,
         heat_capacity_param,
         heat_loss_form_factor,
+        output_format,
         )
 
     # Run main simulation
@@ -120,72 +178,84 @@ def run_project(
         heat_cop_dict, cool_cop_dict, dhw_cop_dict, \
         ductwork_gains, heat_balance_dict, heat_source_wet_results_dict, \
         heat_source_wet_results_annual_dict \
-        = project.run()
+        = yield from project.run_timesteps()
 
-    write_core_output_file(
-        output_file_detailed,
-        timestep_array,
-        results_totals,
-        results_end_user,
-        energy_import,
-        energy_export,
-        energy_generated_consumed,
-        energy_to_storage,
-        energy_from_storage,
-        energy_diverted,
-        betafactor,
-        zone_dict,
-        zone_list,
-        hc_system_dict,
-        hot_water_dict,
-        ductwork_gains
-        )
+    if not stream_output and not summary_only:
+        write_core_output_file(
+            output_file_detailed,
+            timestep_array,
+            results_totals,
+            results_end_user,
+            energy_import,
+            energy_export,
+            energy_generated_consumed,
+            energy_to_storage,
+            energy_from_storage,
+            energy_diverted,
+            betafactor,
+            zone_dict,
+            zone_list,
+            hc_system_dict,
+            hot_water_dict,
+            ductwork_gains,
+            output_format,
+            )
 
-    if heat_balance:
+    if heat_balance and not stream_output and not summary_only:
         hour_per_step = project_dict['SimulationTime']['step']
         for hb_name, hb_dict in heat_balance_dict.items():
-            heat_balance_output_file = output_file_name_stub + 'results_heat_balance_' + hb_name + '.csv'
+            heat_balance_output_file_stub = output_file_name_stub + 'results_heat_balance_' + hb_name
             write_heat_balance_output_file(
-                heat_balance_output_file,
+                heat_balance_output_file_stub,
                 timestep_array,
                 hour_per_step,
                 hb_dict,
+                output_format,
                 )
 
     if detailed_output_heating_cooling:
         for heat_source_wet_name, heat_source_wet_results in heat_source_wet_results_dict.items():
             heat_source_wet_output_file \
                 = output_file_name_stub + 'results_heat_source_wet__' \
-                + heat_source_wet_name + '.csv'
+                + heat_source_wet_name
             write_heat_source_wet_output_file(
                 heat_source_wet_output_file,
                 timestep_array,
                 heat_source_wet_results,
+                output_format,
                 )
         for heat_source_wet_name, heat_source_wet_results_annual \
             in heat_source_wet_results_annual_dict.items():
             heat_source_wet_output_file \
                 = output_file_name_stub + 'results_heat_source_wet_summary__' \
-                + heat_source_wet_name + '.csv'
+                + heat_source_wet_name
             write_heat_source_wet_summary_output_file(
                 heat_source_wet_output_file,
                 heat_source_wet_results_annual,
+                output_format,
                 )
 
+    throughput_factor_iterations = project.throughput_factor_iterations()
+    if throughput_factor_iterations is not None and not summary_only:
+        write_throughput_factor_iterations_output_file(
+            output_file_name_stub + 'results_throughput_factor_iterations',
+            throughput_factor_iterations,
+            output_format,
+            )
+
     # Sum per-timestep figures as needed
     space_heat_demand_total = sum(sum(h_dem) for h_dem in zone_dict['Space heat demand'].values())
     space_cool_demand_total = sum(sum(c_dem) for c_dem in zone_dict['Space cool demand'].values())
     total_floor_area = project.total_floor_area()
-    daily_hw_demand = units.convert_profile_to_daily(
-        hot_water_dict['Hot water energy demand incl pipework_loss']['energy_demand_incl_pipework_loss'],
-        project_dict['SimulationTime']['step'],
-        )
+    daily_hw_demand = project.hot_water_energy_demand_daily()
     daily_hw_demand_75th_percentile = np.percentile(daily_hw_demand, 75)
+    peak_elec_consumption, index_peak_elec_consumption \
+        = project.peak_net_import('mains elec')
 
     write_core_output_file_summary(
         output_file_summary,
         project_dict,
-        timestep_array,
+        project.no_of_timesteps(),
         results_end_user,
         energy_generated_consumed,
         energy_to_storage,
@@ -200,6 +270,9 @@ def run_project(
         cool_cop_dict,
         dhw_cop_dict,
         daily_hw_demand_75th_percentile,
+        peak_elec_consumption,
+        index_peak_elec_consumption,
+        output_format,
         )
 
     # Apply required postprocessing steps, if any
@@ -217,6 +290,7 @@ def run_project(
             timestep_array,
             output_file_name_stub,
             notional,
+            summary_only or stream_output,
             )
     elif fhs_FEE_assumptions or fhs_FEE_notA_assumptions or fhs_FEE_notB_assumptions:
         postprocfile = output_file_name_stub + 'postproc.csv'
@@ -229,73 +303,209 @@ def run_project(
 
     shutil.copy2(inp_filename, results_folder)
 
+class ProjectRun:
+    """ An object to run the calculation for one input file in lock-step
+    with others, using a ProjectBatch object """
+
+    def __init__(self, inp_filename, external_conditions_dict, **kwargs):
+        """ Construct a ProjectRun object
+
+        Arguments:
+        inp_filename -- path to file containing building specification to run
+        external_conditions_dict -- weather data to use instead of that in the
+                                    input file, or None
+        kwargs -- other options, as for run_project_timesteps
+        """
+        self.__inp_filename = inp_filename
+        self.__external_conditions_dict = external_conditions_dict
+        self.__kwargs = kwargs
+
+    def run_timesteps(self):
+        return run_project_timesteps(
+            self.__inp_filename,
+            self.__external_conditions_dict,
+            **self.__kwargs,
+            )
+
+def run_projects(inp_filenames, external_conditions_dict, **kwargs):
+    """ Run the calculations for several input files in lock-step, solving
+    the zone heat balance eqns for all of them together in each timestep (only
+    for projects using the optimised solver), and write the results
+
+    Note that all the projects are held in memory at the same time.
+    """
+    ProjectBatch([
+        ProjectRun(inp_filename, external_conditions_dict, **kwargs)
+        for inp_filename in inp_filenames
+        ]).run()
+
+def run_project(inp_filename, external_conditions_dict, **kwargs):
+    """ Run the calculation for one input file and write the results """
+    run_projects([inp_filename], external_conditions_dict, **kwargs)
+
 def write_static_output_file(
-        output_file,
+        output_file_stub,
         heat_trans_coeff,
         heat_loss_param,
         heat_capacity_param,
         heat_loss_form_factor,
+        output_format='csv',
         ):
+    rows = [
+        ['Heat transfer coefficient', 'W / K', heat_trans_coeff],
+        ['Heat loss parameter', 'W / m2.K', heat_loss_param],
+        ['Heat capacity parameter', 'kJ / m2.K', heat_capacity_param],
+        ['Heat loss form factor','',heat_loss_form_factor],
+        ]
+
+    if output_format != 'csv':
+        write_single_row_output_file(output_file_stub, output_format, rows)
+        return
+
     # Note: need to specify newline='' below, otherwise an extra carriage return
     # character is written when running on Windows
-    with open(output_file, 'w', newline='') as f:
+    with open(output_file_stub + '.csv', 'w', newline='') as f:
         writer = csv.writer(f)
-        writer.writerow(['Heat transfer coefficient', 'W / K', heat_trans_coeff])
-        writer.writerow(['Heat loss parameter', 'W / m2.K', heat_loss_param])
-        writer.writerow(['Heat capacity parameter', 'kJ / m2.K', heat_capacity_param])
-        writer.writerow(['Heat loss form factor','',heat_loss_form_factor])
+        writer.writerows(rows)
 
-def write_heat_balance_output_file(
-        heat_balance_output_file,
-        timestep_array,
-        hour_per_step,
+def write_single_row_output_file(output_file_stub, output_format, channels):
+    """ Write output file in binary format with one column for each output
+
+    This is used for outputs that are a single value for the whole
+    simulation, for which the CSV files have one row for each output.
+
+    Arguments:
+    output_file_stub -- path to file to write, without file extension
+    output_format -- one of output_writers.OUTPUT_FORMATS, other than 'csv'
+    channels -- list of (name, units, value) for each output
+    """
+    writer = table_writer(
+        output_file_stub,
+        output_format,
+        [name for name, _, _ in channels],
+        [units for _, units, _ in channels],
+        )
+    writer.write_row([value for _, _, value in channels])
+    writer.close()
+
+def heat_balance_output_headings(heat_balance_dict):
+    """ Return headings and units for heat balance output file, for the
+    results for each timestep and for the annual totals """
+    headings = ['Timestep']
+    units_row = ['index']
+
+    headings_annual = ['']
+    units_annual = ['']
+
+    for z_name, heat_loss_gain_dict in heat_balance_dict.items():
+        for heat_loss_gain_name in heat_loss_gain_dict.keys():
+            headings.append(z_name+': '+heat_loss_gain_name)
+            units_row.append('[W]')
+
+    for z_name, heat_loss_gain_dict in heat_balance_dict.items():
+        for heat_loss_gain_name in heat_loss_gain_dict.keys():
+            headings_annual.append(z_name+': total '+heat_loss_gain_name)
+            units_annual.append('[kWh]')
+
+    return headings, units_row, headings_annual, units_annual
+
+def heat_balance_output_row(
+        t_idx,
         heat_balance_dict,
+        hour_per_step,
+        annual_totals,
+        r_idx=None,
         ):
-    # Note: need to specify newline='' below, otherwise an extra carriage return
-    # character is written when running on Windows
-    with open(heat_balance_output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        headings = ['Timestep']
-        units_row = ['index']
-        rows = ['']
+    """ Return row of heat balance output file for timestep, and add results
+    for timestep to annual totals (see core_output_row for r_idx) """
+    if r_idx is None:
+        r_idx = t_idx
+    row = [t_idx]
+    annual_totals_index = 1
+    for z_name, heat_loss_gain_dict in heat_balance_dict.items():
+        for heat_loss_gain_name in heat_loss_gain_dict.keys():
+            row.append(heat_loss_gain_dict[heat_loss_gain_name][r_idx])
+            annual_totals[annual_totals_index] += \
+                heat_loss_gain_dict[heat_loss_gain_name][r_idx]*hour_per_step/units.W_per_kW
+            annual_totals_index += 1
+    return row
 
-        headings_annual = ['']
-        units_annual = ['']
+class HeatBalanceOutput:
+    """ An object to write a heat balance output file row by row """
 
-        nbr_of_zones = 0
-        for z_name, heat_loss_gain_dict in heat_balance_dict.items():
-            for heat_loss_gain_name in heat_loss_gain_dict.keys():
-                headings.append(z_name+': '+heat_loss_gain_name)
-                units_row.append('[W]')
-            nbr_of_zones += 1
+    def __init__(self, output_file_stub, hour_per_step, heat_balance_dict, output_format):
+        """ Construct a HeatBalanceOutput object
+
+        Arguments:
+        output_file_stub -- path to file to write, without file extension
+        hour_per_step -- length of timestep, in hours
+        heat_balance_dict -- dictionary of heat balance results for each zone
+                             (results need not be available yet, but all
+                             channels must be present)
+        output_format -- one of output_writers.OUTPUT_FORMATS
+        """
+        self.__hour_per_step = hour_per_step
+        self.__heat_balance_dict = heat_balance_dict
 
+        headings, units_row, self.__headings_annual, self.__units_annual \
+            = heat_balance_output_headings(heat_balance_dict)
+
+        nbr_of_zones = len(heat_balance_dict)
+        self.__annual_totals = []
         for z_name, heat_loss_gain_dict in heat_balance_dict.items():
-            annual_totals = [0]*(len(heat_loss_gain_dict.keys())*nbr_of_zones)
-            annual_totals.insert(0,'')
-            for heat_loss_gain_name in heat_loss_gain_dict.keys():
-                headings_annual.append(z_name+': total '+heat_loss_gain_name)
-                units_annual.append('[kWh]')
-
-        for t_idx, timestep in enumerate(timestep_array):
-            row = [t_idx]
-            annual_totals_index = 1
-            for z_name, heat_loss_gain_dict in heat_balance_dict.items():
-                for heat_loss_gain_name in heat_loss_gain_dict.keys():
-                    row.append(heat_loss_gain_dict[heat_loss_gain_name][t_idx])
-                    annual_totals[annual_totals_index] += \
-                        heat_loss_gain_dict[heat_loss_gain_name][t_idx]*hour_per_step/units.W_per_kW
-                    annual_totals_index += 1
-            rows.append(row)
-
-        writer.writerow(headings_annual)
-        writer.writerow(units_annual)
-        writer.writerow(annual_totals)
-        writer.writerow([''])
-        writer.writerow(headings)
-        writer.writerow(units_row)
-        writer.writerows(rows)
+            self.__annual_totals = [0]*(len(heat_loss_gain_dict.keys())*nbr_of_zones)
+            self.__annual_totals.insert(0,'')
+
+        self.__writer = table_writer(
+            output_file_stub,
+            output_format,
+            headings,
+            units_row,
+            has_preamble=True,
+            )
+        if output_format == 'csv':
+            # Blank row between units and results
+            self.__writer.write_row([])
 
-def write_heat_source_wet_output_file(output_file, timestep_array, heat_source_wet_results):
+    def write_timestep(self, t_idx, r_idx=None):
+        """ Write results for timestep (see core_output_row for r_idx) """
+        self.__writer.write_row(heat_balance_output_row(
+            t_idx,
+            self.__heat_balance_dict,
+            self.__hour_per_step,
+            self.__annual_totals,
+            r_idx,
+            ))
+
+    def close(self):
+        """ Write annual totals and finish writing file """
+        self.__writer.close(
+            [self.__headings_annual, self.__units_annual, self.__annual_totals, ['']],
+            )
+
+def write_heat_balance_output_file(
+        heat_balance_output_file_stub,
+        timestep_array,
+        hour_per_step,
+        heat_balance_dict,
+        output_format='csv',
+        ):
+    heat_balance_output = HeatBalanceOutput(
+        heat_balance_output_file_stub,
+        hour_per_step,
+        heat_balance_dict,
+        output_format,
+        )
+    for t_idx, timestep in enumerate(timestep_array):
+        heat_balance_output.write_timestep(t_idx)
+    heat_balance_output.close()
+
+def write_heat_source_wet_output_file(
+        output_file_stub,
+        timestep_array,
+        heat_source_wet_results,
+        output_format='csv',
+        ):
 
     # Repeat column headings for each service
     col_headings = ['Timestep count']
@@ -303,29 +513,44 @@ def write_heat_source_wet_output_file(output_file, timestep_array, heat_source_w
     columns = {}
     for service_name, service_results in heat_source_wet_results.items():
         columns[service_name] = [col for col in service_results.keys()]
-        col_headings += [col_heading for col_heading, _ in columns[service_name]]
+        if output_format == 'csv':
+            col_headings += [col_heading for col_heading, _ in columns[service_name]]
+        else:
+            # Column names must be unique in binary formats
+            col_headings += [
+                service_name + ': ' + col_heading
+                for col_heading, _ in columns[service_name]
+                ]
         col_units_row += [col_unit for _, col_unit in columns[service_name]]
 
-    # Note: need to specify newline='' below, otherwise an extra carriage return
-    # character is written when running on Windows
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-
-        # Write column headings and units
-        writer.writerow(col_headings)
-        writer.writerow(col_units_row)
+    writer = table_writer(output_file_stub, output_format, col_headings, col_units_row)
+    for t_idx in range(0, len(timestep_array)):
+        row = [t_idx]
+        for service_name, service_results in heat_source_wet_results.items():
+            row += [service_results[col][t_idx] for col in columns[service_name]]
+        writer.write_row(row)
+    writer.close()
 
-        # Write rows
-        for t_idx in range(0, len(timestep_array)):
-            row = [t_idx]
-            for service_name, service_results in heat_source_wet_results.items():
-                row += [service_results[col][t_idx] for col in columns[service_name]]
-            writer.writerow(row)
+def write_heat_source_wet_summary_output_file(
+        output_file_stub,
+        heat_source_wet_results_annual,
+        output_format='csv',
+        ):
+    if output_format != 'csv':
+        write_single_row_output_file(
+            output_file_stub,
+            output_format,
+            [
+                (service_name + ': ' + name[0], name[1], value)
+                for service_name, service_results in heat_source_wet_results_annual.items()
+                for name, value in service_results.items()
+            ],
+            )
+        return
 
-def write_heat_source_wet_summary_output_file(output_file, heat_source_wet_results_annual):
     # Note: need to specify newline='' below, otherwise an extra carriage return
     # character is written when running on Windows
-    with open(output_file, 'w', newline='') as f:
+    with open(output_file_stub + '.csv', 'w', newline='') as f:
         writer = csv.writer(f)
 
         for service_name, service_results in heat_source_wet_results_annual.items():
@@ -334,8 +559,178 @@ def write_heat_source_wet_summary_output_file(output_file, heat_source_wet_resul
                 writer.writerow((name[0], name[1], value))
             writer.writerow('')
 
+def write_throughput_factor_iterations_output_file(
+        output_file_stub,
+        throughput_factor_iterations,
+        output_format='csv',
+        ):
+    writer = table_writer(
+        output_file_stub,
+        output_format,
+        ['Timestep', 'Space heat demand calculations with overventilation'],
+        ['index', 'count'],
+        )
+    for t_idx, iterations in enumerate(throughput_factor_iterations):
+        writer.write_row([t_idx, iterations])
+    writer.close()
+
+def core_output_headings(
+        results_totals,
+        results_end_user,
+        zone_dict,
+        zone_list,
+        hc_system_dict,
+        hot_water_dict,
+        ):
+    """ Return headings and units for core output file """
+    headings = ['Timestep']
+    units_row = ['[count]']
+    for totals_key in results_totals.keys():
+        totals_header = str(totals_key)
+        totals_header = totals_header + ' total'
+        headings.append(totals_header)
+        units_row.append('[kWh]')
+        for end_user_key in results_end_user[totals_key].keys():
+            headings.append(end_user_key)
+            units_row.append('[kWh]')
+        headings.append(str(totals_key) + ' import')
+        units_row.append('[kWh]')
+        headings.append(str(totals_key) + ' export')
+        units_row.append('[kWh]')
+        headings.append(str(totals_key) + ' generated and consumed')
+        units_row.append('[kWh]')
+        headings.append(str(totals_key) + ' beta factor')
+        units_row.append('[ratio]')
+        headings.append(str(totals_key) + ' to storage')
+        units_row.append('[kWh]')
+        headings.append(str(totals_key) + ' from storage')
+        units_row.append('[kWh]')
+        headings.append(str(totals_key) + ' diverted')
+        units_row.append('[kWh]')
+
+    # Dictionary for most of the units (future output headings need respective units)
+    unitsDict = {
+        'Internal gains': '[W]',
+        'Solar gains': '[W]',
+        'Operative temp': '[deg C]',
+        'Internal air temp': '[deg C]',
+        'Space heat demand': '[kWh]',
+        'Space cool demand': '[kWh]',
+        'Hot water demand': '[litres]',
+        'Hot water energy demand': '[kWh]',
+        'Hot water duration': '[mins]',
+        'Hot Water Events': '[count]',
+        'Pipework losses': '[kWh]'
+    }
+
+    for zone in zone_list:
+        for zone_outputs in zone_dict.keys():
+            zone_headings = zone_outputs + ' ' + zone
+            headings.append(zone_headings)
+            if zone_outputs in unitsDict:
+                units_row.append(unitsDict.get(zone_outputs))
+            else:
+                this_filename = os.path.basename(__file__)
+                units_row.append('Unit not defined (unitsDict ' + this_filename + ')')
+
+    for system in hc_system_dict:
+        for hc_name in hc_system_dict[system].keys():
+            if hc_name == None:
+                hc_name = 'None'
+                hc_system_headings = system + ' ' + hc_name
+            else:
+                hc_system_headings = system + ' ' + hc_name
+            headings.append(hc_system_headings)
+            units_row.append('[kWh]')
+    #Hot_water_dict headings
+    for system in hot_water_dict:
+        headings.append(system)
+        if system in unitsDict:
+            units_row.append(unitsDict.get(system))
+        else:
+            this_filename = os.path.basename(__file__)
+            units_row.append('Unit not defined (add to unitsDict ' + this_filename + ')')
+
+    headings.append('Ductwork gains')
+    units_row.append('[kWh]')
+
+    return headings, units_row
+
+def core_output_row(
+        t_idx,
+        results_totals,
+        results_end_user,
+        energy_import,
+        energy_export,
+        energy_generated_consumed,
+        energy_to_storage,
+        energy_from_storage,
+        energy_diverted,
+        betafactor,
+        zone_dict,
+        zone_list,
+        hc_system_dict,
+        hot_water_dict,
+        ductwork_gains,
+        r_idx=None,
+        ):
+    """ Return row of core output file for timestep
+
+    r_idx is the index of the results for the timestep in each time series, if
+    this is different from the timestep index t_idx (e.g. if only the results
+    for the current timestep are held)
+    """
+    if r_idx is None:
+        r_idx = t_idx
+    energy_use_row = []
+    zone_row = []
+    hc_system_row = []
+    hw_system_row = []
+    hw_system_row_energy = []
+    hw_system_row_duration = []
+    hw_system_row_events = []
+    pw_losses_row = []
+    ductwork_row = []
+    energy_shortfall = []
+    i = 0
+    # Loop over end use totals
+    for totals_key in results_totals:
+        energy_use_row.append(results_totals[totals_key][r_idx])
+        for end_user_key in results_end_user[totals_key]:
+            energy_use_row.append(results_end_user[totals_key][end_user_key][r_idx])
+        energy_use_row.append(energy_import[totals_key][r_idx])
+        energy_use_row.append(energy_export[totals_key][r_idx])
+        energy_use_row.append(energy_generated_consumed[totals_key][r_idx])
+        energy_use_row.append(betafactor[totals_key][r_idx])
+        energy_use_row.append(energy_to_storage[totals_key][r_idx])
+        energy_use_row.append(energy_from_storage[totals_key][r_idx])
+        energy_use_row.append(energy_diverted[totals_key][r_idx])
+
+        # Loop over results separated by zone
+    for zone in zone_list:
+        for zone_outputs in zone_dict:
+            zone_row.append(zone_dict[zone_outputs][zone][r_idx])
+        # Loop over heating and cooling system demand
+    for system in hc_system_dict:
+        for hc_name in hc_system_dict[system]:
+            hc_system_row.append(hc_system_dict[system][hc_name][r_idx])
+
+    # loop over hot water demand
+    hw_system_row.append(hot_water_dict['Hot water demand']['demand'][r_idx])
+    hw_system_row_energy.append(hot_water_dict['Hot water energy demand']['energy_demand'][r_idx])
+    hw_system_row_duration.append(hot_water_dict['Hot water duration']['duration'][r_idx])
+    pw_losses_row.append(hot_water_dict['Pipework losses']['pw_losses'][r_idx])
+    hw_system_row_events.append(hot_water_dict['Hot Water Events']['no_events'][r_idx])
+    ductwork_row.append(ductwork_gains['ductwork_gains'][r_idx])
+
+    # create row of outputs
+    row = [t_idx] + energy_use_row + zone_row + hc_system_row + \
+    hw_system_row + hw_system_row_energy + hw_system_row_duration + \
+    hw_system_row_events + pw_losses_row + ductwork_row + energy_shortfall
+    return row
+
 def write_core_output_file(
-        output_file,
+        output_file_stub,
         timestep_array,
         results_totals,
         results_end_user,
@@ -350,139 +745,149 @@ def write_core_output_file(
         zone_list,
         hc_system_dict,
         hot_water_dict,
-        ductwork_gains
+        ductwork_gains,
+        output_format='csv',
         ):
-    # Note: need to specify newline='' below, otherwise an extra carriage return
-    # character is written when running on Windows
-    with open(output_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        headings = ['Timestep']
-        units_row = ['[count]']
-        for totals_key in results_totals.keys():
-            totals_header = str(totals_key)
-            totals_header = totals_header + ' total'
-            headings.append(totals_header)
-            units_row.append('[kWh]')
-            for end_user_key in results_end_user[totals_key].keys():
-                headings.append(end_user_key)
-                units_row.append('[kWh]')
-            headings.append(str(totals_key) + ' import')
-            units_row.append('[kWh]')
-            headings.append(str(totals_key) + ' export')
-            units_row.append('[kWh]')
-            headings.append(str(totals_key) + ' generated and consumed')
-            units_row.append('[kWh]')
-            headings.append(str(totals_key) + ' beta factor')
-            units_row.append('[ratio]')
-            headings.append(str(totals_key) + ' to storage')
-            units_row.append('[kWh]')
-            headings.append(str(totals_key) + ' from storage')
-            units_row.append('[kWh]')
-            headings.append(str(totals_key) + ' diverted')
-            units_row.append('[kWh]')
+    headings, units_row = core_output_headings(
+        results_totals,
+        results_end_user,
+        zone_dict,
+        zone_list,
+        hc_system_dict,
+        hot_water_dict,
+        )
+    writer = table_writer(output_file_stub, output_format, headings, units_row)
+    for t_idx, timestep in enumerate(timestep_array):
+        writer.write_row(core_output_row(
+            t_idx,
+            results_totals,
+            results_end_user,
+            energy_import,
+            energy_export,
+            energy_generated_consumed,
+            energy_to_storage,
+            energy_from_storage,
+            energy_diverted,
+            betafactor,
+            zone_dict,
+            zone_list,
+            hc_system_dict,
+            hot_water_dict,
+            ductwork_gains,
+            ))
+    writer.close()
 
-        # Dictionary for most of the units (future output headings need respective units)
-        unitsDict = {
-            'Internal gains': '[W]',
-            'Solar gains': '[W]',
-            'Operative temp': '[deg C]',
-            'Internal air temp': '[deg C]',
-            'Space heat demand': '[kWh]',
-            'Space cool demand': '[kWh]',
-            'Hot water demand': '[litres]',
-            'Hot water energy demand': '[kWh]',
-            'Hot water duration': '[mins]',
-            'Hot Water Events': '[count]',
-            'Pipework losses': '[kWh]'
-        }
+class CoreOutputSink:
+    """ An object to write the core output file as the simulation progresses
 
-        for zone in zone_list:
-            for zone_outputs in zone_dict.keys():
-                zone_headings = zone_outputs + ' ' + zone
-                headings.append(zone_headings)
-                if zone_outputs in unitsDict:
-                    units_row.append(unitsDict.get(zone_outputs))
-                else:
-                    this_filename = os.path.basename(__file__)
-                    units_row.append('Unit not defined (unitsDict ' + this_filename + ')')
-
-        for system in hc_system_dict:
-            for hc_name in hc_system_dict[system].keys():
-                if hc_name == None:
-                    hc_name = 'None'
-                    hc_system_headings = system + ' ' + hc_name
-                else:
-                    hc_system_headings = system + ' ' + hc_name
-                headings.append(hc_system_headings)
-                units_row.append('[kWh]')
-        #Hot_water_dict headings
-        for system in hot_water_dict:
-            headings.append(system)
-            if system in unitsDict:
-                units_row.append(unitsDict.get(system))
-            else:
-                this_filename = os.path.basename(__file__)
-                units_row.append('Unit not defined (add to unitsDict ' + this_filename + ')')
+    Register with Project.register_output_sink before running the simulation.
+    """
 
-        headings.append('Ductwork gains')
-        units_row.append('[kWh]')
+    def __init__(self, output_file_stub, output_format):
+        """ Construct a CoreOutputSink object
+
+        Arguments:
+        output_file_stub -- path to file to write, without file extension
+        output_format -- one of output_writers.OUTPUT_FORMATS
+        """
+        self.__output_file_stub = output_file_stub
+        self.__output_format = output_format
+        self.__results = None
+        self.__writer = None
+
+    def open(self, results):
+        """ Write headings, given ProjectResults object which is filled in as
+        the simulation progresses """
+        self.__results = results
+        headings, units_row = core_output_headings(
+            results.results_totals,
+            results.results_end_user,
+            results.zone_dict,
+            results.zone_list,
+            results.hc_system_dict,
+            results.hot_water_dict,
+            )
+        self.__writer = table_writer(
+            self.__output_file_stub,
+            self.__output_format,
+            headings,
+            units_row,
+            )
+
+    def write_timestep(self, t_idx, r_idx):
+        """ Write results for timestep, given index of results for timestep
+        in each time series """
+        results = self.__results
+        self.__writer.write_row(core_output_row(
+            t_idx,
+            results.results_totals,
+            results.results_end_user,
+            results.energy_import,
+            results.energy_export,
+            results.energy_generated_consumed,
+            results.energy_to_storage,
+            results.energy_from_storage,
+            results.energy_diverted,
+            results.betafactor,
+            results.zone_dict,
+            results.zone_list,
+            results.hc_system_dict,
+            results.hot_water_dict,
+            results.ductwork_gains,
+            r_idx,
+            ))
+
+    def close(self):
+        """ Finish writing file """
+        self.__writer.close()
+
+class HeatBalanceOutputSink:
+    """ An object to write the heat balance output files as the simulation progresses
+
+    Register with Project.register_output_sink before running the simulation.
+    """
+
+    def __init__(self, output_file_name_stub, hour_per_step, output_format):
+        """ Construct a HeatBalanceOutputSink object
 
-        # Write headings & units to output file
-        writer.writerow(headings)
-        writer.writerow(units_row)
-
-        for t_idx, timestep in enumerate(timestep_array):
-            energy_use_row = []
-            zone_row = []
-            hc_system_row = []
-            hw_system_row = []
-            hw_system_row_energy = []
-            hw_system_row_duration = []
-            hw_system_row_events = []
-            pw_losses_row = []
-            ductwork_row = []
-            energy_shortfall = []
-            i = 0
-            # Loop over end use totals
-            for totals_key in results_totals:
-                energy_use_row.append(results_totals[totals_key][t_idx])
-                for end_user_key in results_end_user[totals_key]:
-                    energy_use_row.append(results_end_user[totals_key][end_user_key][t_idx])
-                energy_use_row.append(energy_import[totals_key][t_idx])
-                energy_use_row.append(energy_export[totals_key][t_idx])
-                energy_use_row.append(energy_generated_consumed[totals_key][t_idx])
-                energy_use_row.append(betafactor[totals_key][t_idx])
-                energy_use_row.append(energy_to_storage[totals_key][t_idx])
-                energy_use_row.append(energy_from_storage[totals_key][t_idx])
-                energy_use_row.append(energy_diverted[totals_key][t_idx])
-
-                # Loop over results separated by zone
-            for zone in zone_list:
-                for zone_outputs in zone_dict:
-                    zone_row.append(zone_dict[zone_outputs][zone][t_idx])
-                # Loop over heating and cooling system demand
-            for system in hc_system_dict:
-                for hc_name in hc_system_dict[system]:
-                    hc_system_row.append(hc_system_dict[system][hc_name][t_idx])
-
-            # loop over hot water demand
-            hw_system_row.append(hot_water_dict['Hot water demand']['demand'][t_idx])
-            hw_system_row_energy.append(hot_water_dict['Hot water energy demand']['energy_demand'][t_idx])
-            hw_system_row_duration.append(hot_water_dict['Hot water duration']['duration'][t_idx])
-            pw_losses_row.append(hot_water_dict['Pipework losses']['pw_losses'][t_idx])
-            hw_system_row_events.append(hot_water_dict['Hot Water Events']['no_events'][t_idx])
-            ductwork_row.append(ductwork_gains['ductwork_gains'][t_idx])
-
-            # create row of outputs and write to output file
-            row = [t_idx] + energy_use_row + zone_row + hc_system_row + \
-            hw_system_row + hw_system_row_energy + hw_system_row_duration + \
-            hw_system_row_events + pw_losses_row + ductwork_row + energy_shortfall
-            writer.writerow(row)
+        Arguments:
+        output_file_name_stub -- path to output files, to which the name of
+                                 each heat balance and the file extension
+                                 are appended
+        hour_per_step -- length of timestep, in hours
+        output_format -- one of output_writers.OUTPUT_FORMATS
+        """
+        self.__output_file_name_stub = output_file_name_stub
+        self.__hour_per_step = hour_per_step
+        self.__output_format = output_format
+        self.__heat_balance_outputs = []
+
+    def open(self, results):
+        """ Write headings, given ProjectResults object which is filled in as
+        the simulation progresses """
+        for hb_name, hb_dict in results.heat_balance_dict.items():
+            self.__heat_balance_outputs.append(HeatBalanceOutput(
+                self.__output_file_name_stub + 'results_heat_balance_' + hb_name,
+                self.__hour_per_step,
+                hb_dict,
+                self.__output_format,
+                ))
+
+    def write_timestep(self, t_idx, r_idx):
+        """ Write results for timestep, given index of results for timestep
+        in each time series """
+        for heat_balance_output in self.__heat_balance_outputs:
+            heat_balance_output.write_timestep(t_idx, r_idx)
+
+    def close(self):
+        """ Write annual totals and finish writing files """
+        for heat_balance_output in self.__heat_balance_outputs:
+            heat_balance_output.close()
 
 def write_core_output_file_summary(
-        output_file_summary,
+        output_file_summary_stub,
         project_dict,
-        timestep_array,
+        no_of_timesteps,
         results_end_user,
         energy_generated_consumed,
         energy_to_storage,
@@ -497,6 +902,9 @@ def write_core_output_file_summary(
         cool_cop_dict,
         dhw_cop_dict,
         daily_hw_demand_75th_percentile,
+        peak_elec_consumption,
+        index_peak_elec_consumption,
+        output_format='csv',
         ):
     # Electricity breakdown
     elec_generated = 0
@@ -519,17 +927,9 @@ def write_core_output_file_summary(
     else:
         storage_eff = 'DIV/0'
 
-    #get peak electrcitiy consumption, and when it happens
+    #get when peak electrcitiy consumption happens
     start_timestep=project_dict['SimulationTime']['start']
     stepping = project_dict['SimulationTime']['step']
-    # Calculate net import by adding gross import and export figures. Add
-    # because export figures are already negative
-    net_import_per_timestep = [
-        energy_import['mains elec'][i] + energy_export['mains elec'][i]
-        for i in range(len(timestep_array))
-        ]
-    peak_elec_consumption = max(net_import_per_timestep)
-    index_peak_elec_consumption = net_import_per_timestep.index(peak_elec_consumption)
     #must reflect hour or half hour in the year (hour 0 to hour 8759)
     #to work with the dictionary below timestep_to_date
     #hence + start_timestep
@@ -563,7 +963,7 @@ def write_core_output_file_summary(
     #the step must reflect hour or half hour in the year (hour 0 to hour 8759)
     #step starts on the start_timestep 
     step = start_timestep
-    for hour_of_year in timestep_array:
+    for _ in range(no_of_timesteps):
         for month,start_end in months_start_end_timesteps.items():
             if step<=int(start_end[1]) and step>=int(start_end[0]):
                 hour_of_year = step * stepping
@@ -614,9 +1014,53 @@ def write_core_output_file_summary(
     cool_cop_rows = [(c_name, c_cop) for c_name, c_cop in cool_cop_dict.items()]
     dhw_cop_rows = [[hw_name, hw_cop] for hw_name, hw_cop in dhw_cop_dict.items()]
 
+    if output_format != 'csv':
+        peak_date = timestep_to_date[step_peak_elec_consumption]
+        channels = [
+            ('Space heat demand', 'kWh/m2', space_heat_demand_total/total_floor_area),
+            ('Space cool demand', 'kWh/m2', space_cool_demand_total/total_floor_area),
+            ('Peak half-hour consumption', 'kWh', peak_elec_consumption),
+            ('Peak half-hour consumption timestep', 'count', index_peak_elec_consumption),
+            ('Peak half-hour consumption month', '', peak_date['month']),
+            ('Peak half-hour consumption day', '', peak_date['day']),
+            ('Peak half-hour consumption hour of day', '', peak_date['hour']),
+            ('Consumption', 'kWh', elec_consumed),
+            ('Generation', 'kWh', elec_generated),
+            ('Generation to consumption (immediate, excl. diverter)', 'kWh', gen_to_consumption),
+            ('Generation to storage', 'kWh', gen_to_storage),
+            ('Generation to diverter', 'kWh', gen_to_diverter),
+            ('Generation to grid (export)', 'kWh', generation_to_grid),
+            ('Storage to consumption', 'kWh', storage_to_consumption),
+            ('Grid to consumption (import)', 'kWh', grid_to_consumption),
+            ('Net import', 'kWh', net_import),
+            ('Storage round-trip efficiency', 'ratio', storage_eff),
+            ]
+        for row in delivered_energy_rows:
+            for fuel, value in zip(delivered_energy_rows_title[1:], row[1:]):
+                channels.append(('Delivered energy: ' + fuel + ': ' + row[0], 'kWh/m2', value))
+        for hw_name, hw_cop in dhw_cop_rows:
+            channels.append(('Hot water system: ' + hw_name + ': Overall CoP', '', hw_cop))
+            channels.append((
+                'Hot water system: ' + hw_name + ': Daily HW demand (75th percentile)',
+                'kWh',
+                daily_hw_demand_75th_percentile,
+                ))
+            if project_dict['HotWaterSource'][hw_name]['type'] == 'StorageTank':
+                channels.append((
+                    'Hot water system: ' + hw_name + ': HW cylinder volume',
+                    'litres',
+                    project_dict['HotWaterSource'][hw_name]['volume'],
+                    ))
+        for h_name, h_cop in heat_cop_rows:
+            channels.append(('Space heating system: ' + h_name + ': Overall CoP', '', h_cop))
+        for c_name, c_cop in cool_cop_rows:
+            channels.append(('Space cooling system: ' + c_name + ': Overall CoP', '', c_cop))
+        write_single_row_output_file(output_file_summary_stub, output_format, channels)
+        return
+
     # Note: need to specify newline='' below, otherwise an extra carriage return
     # character is written when running on Windows
-    with open(output_file_summary, 'w', newline='') as f:
+    with open(output_file_summary_stub + '.csv', 'w', newline='') as f:
         writer = csv.writer(f)
         writer.writerow(['Energy Demand Summary'])
         writer.writerow(['', '', 'Total'])
@@ -690,6 +1134,15 @@ if __name__ == '__main__':
         default=None,
         help=('path to CIBSE weather file in .csv format'),
         )
+    parser.add_argument(
+        '--weather-store',
+        action='store',
+        default=None,
+        help=('path to directory containing binary weather store to use instead '
+              'of weather file (if a weather file is also specified, the store '
+              'is created from it unless it already exists and was created from '
+              'the same file)'),
+        )
     parser.add_argument(
         'input_file',
         nargs='+',
@@ -703,6 +1156,39 @@ if __name__ == '__main__':
         help=('run calculations for different input files in parallel'
               '(specify no of files to run simultaneously)'),
         )
+    parser.add_argument(
+        '--lock-step',
+        action='store',
+        type=int,
+        default=1,
+        help=('run calculations for different input files in lock-step, '
+              'solving the zone heat balance eqns for all of them together in '
+              'each timestep when the optimised solver is used (specify no of '
+              'files to run together; cannot be used with --parallel)'),
+        )
+    parser.add_argument(
+        '--timeout',
+        action='store',
+        type=float,
+        default=None,
+        help=('maximum run time for each input file when running in parallel, '
+              'in seconds (calculations exceeding this are terminated)'),
+        )
+    parser.add_argument(
+        '--retries',
+        action='store',
+        type=int,
+        default=0,
+        help=('number of times to retry calculations that fail or time out '
+              'when running in parallel'),
+        )
+    parser.add_argument(
+        '--manifest',
+        action='store',
+        default=None,
+        help=('path to file to write record of outcome of calculation for each '
+              'input file to, when running in parallel (JSON format)'),
+        )
     parser.add_argument(
         '--preprocess-only',
         action='store_true',
@@ -770,6 +1256,88 @@ if __name__ == '__main__':
               'provided to facilitate verification and debugging of the '
               'optimised version')
         )
+    parser.add_argument(
+        '--no-fast-emitter-integrator',
+        action='store_true',
+        default=False,
+        help=('calculate wet emitter temperatures using solve_ivp from scipy '
+              'rather than the dedicated integrator (results may differ '
+              'slightly, within the tolerance of solve_ivp); this option is '
+              'provided to facilitate verification and debugging of the '
+              'dedicated integrator')
+        )
+    parser.add_argument(
+        '--no-fast-storage-heater-integrator',
+        action='store_true',
+        default=False,
+        help=('calculate electric storage heater core and case temperatures '
+              'using solve_ivp from scipy rather than the dedicated integrator '
+              '(results may differ slightly, within the tolerance of '
+              'solve_ivp); this option is provided to facilitate verification '
+              'and debugging of the dedicated integrator')
+        )
+    parser.add_argument(
+        '--heat-pump-performance-map',
+        action='store',
+        nargs='?',
+        type=float,
+        const=0.5,
+        default=None,
+        metavar='RESOLUTION',
+        help=('look up heat pump performance at operating conditions from a '
+              'performance map with grid points spaced RESOLUTION Kelvin apart '
+              '(default 0.5) rather than calculating it from the test data '
+              'each time (results may differ slightly, within the tolerance of '
+              'the performance map)'),
+        )
+    parser.add_argument(
+        '--iterate-throughput-factor',
+        action='store_true',
+        default=False,
+        help=('where there is overventilation (e.g. due to an exhaust air heat '
+              'pump), iterate the calculation of space heating demand and '
+              'throughput factor until they converge rather than recalculating '
+              'space heating demand once, and output the number of '
+              'recalculations in each timestep'),
+        )
+    parser.add_argument(
+        '--precompute-solar',
+        action='store_true',
+        default=False,
+        help=('calculate solar irradiance on each surface for all timesteps '
+              'at once rather than timestep by timestep (results may differ '
+              'slightly due to reordering of floating-point ops)')
+        )
+    parser.add_argument(
+        '--output-format',
+        action='store',
+        choices=OUTPUT_FORMATS,
+        default='csv',
+        help=('format of results files; parquet is a compressed columnar '
+              'format and requires the pyarrow package (if this is not '
+              'installed, npz is used instead) and npz is a compressed NumPy '
+              'archive (default csv)'),
+        )
+    parser.add_argument(
+        '--stream-output',
+        action='store_true',
+        default=False,
+        help=('write time series results for each timestep (core results and '
+              'heat balance) to file as the simulation progresses rather than '
+              'after it has finished, keeping only totals over the simulation '
+              'in memory so that memory use does not depend on the length of '
+              'the simulation (Future Homes Standard postprocessing then writes '
+              'summary results only)'),
+        )
+    parser.add_argument(
+        '--summary-only',
+        action='store_true',
+        default=False,
+        help=('keep only totals over the simulation rather than results for '
+              'each timestep, so that memory use does not depend on the length '
+              'of the simulation, and write summary results only (i.e. no '
+              'results for each timestep)'),
+        )
     cli_args = parser.parse_args()
 
     inp_filenames = cli_args.input_file
@@ -785,8 +1353,59 @@ if __name__ == '__main__':
     heat_balance = cli_args.heat_balance
     detailed_output_heating_cooling = cli_args.detailed_output_heating_cooling
     use_fast_solver = not cli_args.no_fast_solver
+    precompute_solar = cli_args.precompute_solar
+    use_fast_emitter_integrator = not cli_args.no_fast_emitter_integrator
+    use_fast_storage_heater_integrator = not cli_args.no_fast_storage_heater_integrator
+    heat_pump_performance_map_resolution = cli_args.heat_pump_performance_map
+    iterate_throughput_factor = cli_args.iterate_throughput_factor
+    output_format = cli_args.output_format
+    if output_format == 'parquet' and not pyarrow_available():
+        print('Warning: The pyarrow package, which is required for Parquet '
+              'output, is not installed. Results will be written in npz '
+              'format instead.')
+        output_format = 'npz'
+    stream_output = cli_args.stream_output
+    summary_only = cli_args.summary_only
+    if summary_only and (heat_balance or detailed_output_heating_cooling or stream_output):
+        parser.error('--summary-only cannot be used with --heat-balance, '
+                     '--detailed-output-heating-cooling or --stream-output')
+    if stream_output and detailed_output_heating_cooling:
+        parser.error('--stream-output cannot be used with '
+                     '--detailed-output-heating-cooling')
+    if cli_args.lock_step < 1:
+        parser.error('--lock-step must be at least 1')
+    if cli_args.lock_step > 1 and cli_args.parallel != 0:
+        parser.error('--lock-step cannot be used with --parallel')
 
+    weather_store_path = cli_args.weather_store
     if epw_filename is not None:
+        weather_filename = epw_filename
+    else:
+        weather_filename = cibse_weather_filename
+
+    weather_source_hash = None
+    if weather_store_path is None:
+        weather_store_current = False
+    elif weather_filename is None:
+        # Use existing weather store, if any
+        weather_store_current \
+            = os.path.isfile(os.path.join(weather_store_path, METADATA_FILENAME))
+    else:
+        # Only reuse existing weather store if it was created from the same
+        # weather file
+        weather_source_hash = weather_file_hash(weather_filename)
+        weather_store_current \
+            = weather_store_source_hash(weather_store_path) == weather_source_hash
+        if not weather_store_current \
+        and os.path.isfile(os.path.join(weather_store_path, METADATA_FILENAME)):
+            print('Warning: Weather store at ' + weather_store_path
+                  + ' was not created from weather file ' + weather_filename
+                  + ' and will be recreated from it.')
+
+    if weather_store_current:
+        # Weather store already exists, so no need to read weather file
+        external_conditions_dict = None
+    elif epw_filename is not None:
         external_conditions_dict = weather_data_to_dict(epw_filename)
     elif cibse_weather_filename is not None:
         external_conditions_dict = CIBSE_weather_data_to_dict(cibse_weather_filename)
@@ -794,39 +1413,65 @@ if __name__ == '__main__':
     else:
         external_conditions_dict = None
 
+    if weather_store_path is not None:
+        if external_conditions_dict is not None:
+            write_weather_store(
+                weather_store_path,
+                external_conditions_dict,
+                weather_source_hash,
+                )
+            # Weather data will be taken from store instead
+            external_conditions_dict = None
+        weather_store = WeatherStore(weather_store_path)
+    else:
+        weather_store = None
+
+    run_project_kwargs = {
+        'preproc_only': preproc_only,
+        'fhs_assumptions': fhs_assumptions,
+        'fhs_FEE_assumptions': fhs_FEE_assumptions,
+        'fhs_notA_assumptions': fhs_notA_assumptions,
+        'fhs_notB_assumptions': fhs_notB_assumptions,
+        'fhs_FEE_notA_assumptions': fhs_FEE_notA_assumptions,
+        'fhs_FEE_notB_assumptions': fhs_FEE_notB_assumptions,
+        'heat_balance': heat_balance,
+        'detailed_output_heating_cooling': detailed_output_heating_cooling,
+        'use_fast_solver': use_fast_solver,
+        'precompute_solar': precompute_solar,
+        'weather_store': weather_store,
+        'use_fast_emitter_integrator': use_fast_emitter_integrator,
+        'use_fast_storage_heater_integrator': use_fast_storage_heater_integrator,
+        'heat_pump_performance_map_resolution': heat_pump_performance_map_resolution,
+        'iterate_throughput_factor': iterate_throughput_factor,
+        'output_format': output_format,
+        'stream_output': stream_output,
+        'summary_only': summary_only,
+        }
+
     if cli_args.parallel == 0:
         print('Running '+str(len(inp_filenames))+' cases in series')
-        for inpfile in inp_filenames:
-            run_project(
-                inpfile,
+        for i in range(0, len(inp_filenames), cli_args.lock_step):
+            run_projects(
+                inp_filenames[i:i + cli_args.lock_step],
                 external_conditions_dict,
-                preproc_only,
-                fhs_assumptions,
-                fhs_FEE_assumptions,
-                fhs_notA_assumptions,
-                fhs_notB_assumptions,
-                fhs_FEE_notA_assumptions,
-                fhs_FEE_notB_assumptions,
-                heat_balance,
-                detailed_output_heating_cooling,
-                use_fast_solver,
+                **run_project_kwargs,
                 )
     else:
-        import multiprocessing as mp
         print('Running '+str(len(inp_filenames))+' cases in parallel'
               ' ('+str(cli_args.parallel)+' at a time)')
-        run_project_args = [
-            ( inpfile,
-              external_conditions_dict,
-              preproc_only,
-              fhs_assumptions,
-              fhs_FEE_assumptions,
-              heat_balance,
-              detailed_output_heating_cooling,
-              use_fast_solver,
-            )
+        jobs = [
+            dict(inp_filename=inpfile, **run_project_kwargs)
             for inpfile in inp_filenames
             ]
-        with mp.Pool(processes=cli_args.parallel) as p:
-            p.starmap(run_project, run_project_args)
-
+        manifest = run_jobs(
+            run_project,
+            jobs,
+            cli_args.parallel,
+            shared_args={'external_conditions_dict': external_conditions_dict},
+            timeout=cli_args.timeout,
+            retries=cli_args.retries,
+            manifest_filename=cli_args.manifest,
+            )
+        no_of_jobs_failed = sum(1 for job in manifest if job['outcome'] != 'success')
+        if no_of_jobs_failed > 0:
+            sys.exit(str(no_of_jobs_failed) + ' of ' + str(len(jobs)) + ' cases failed')
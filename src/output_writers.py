@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+
+"""
+This module provides objects to write tables of results (e.g. one row per
+timestep) to file row by row, so that the results do not all need to be held
+in memory before they are written.
+
+Tables can be written as CSV (the default), as Parquet, a compressed columnar
+format, or as a compressed NumPy archive (.npz). Writing Parquet requires the
+optional pyarrow package; where this is not installed, npz can be used
+instead, as it only requires NumPy.
+
+In the binary formats, each column has a type, taken from the first row
+written: booleans are stored as booleans, strings (and other objects, such as
+enums) as strings and numbers as floating-point numbers, except in the first
+column, which is usually an index (e.g. timestep) and is stored as integers if
+the first value is an integer. A column is stored as strings instead if any
+value in the first block of rows (which is converted before the rest of the
+table is known) cannot be converted to the type of the first value, and a
+value in a later block that cannot be converted is an error. Missing values are
+stored as nulls (or NaN in npz files). The units of each column are stored in
+the file metadata, and the column headings must be unique.
+"""
+
+# Standard library imports
+import os
+import sys
+import csv
+import json
+import shutil
+import tempfile
+from numbers import Integral, Real
+
+# Third-party imports
+import numpy as np
+
+OUTPUT_FORMATS = ('csv', 'parquet', 'npz')
+FILE_EXTENSIONS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'npz': '.npz',
+    }
+
+
+def pyarrow_available():
+    """ Return True if the pyarrow package (needed for Parquet) is installed """
+    try:
+        import pyarrow.parquet
+    except ImportError:
+        return False
+    return True
+
+def column_kinds(row, no_of_cols):
+    """ Return list of column types ('int', 'float', 'bool' or 'str') for
+    table, based on first row of table (see module docstring) """
+    kinds = []
+    for col_idx in range(no_of_cols):
+        value = row[col_idx] if col_idx < len(row) else None
+        if isinstance(value, (bool, np.bool_)):
+            kinds.append('bool')
+        elif isinstance(value, Integral) and col_idx == 0:
+            kinds.append('int')
+        elif isinstance(value, Real) or value is None:
+            kinds.append('float')
+        else:
+            kinds.append('str')
+    return kinds
+
+def convert_to_bool(value):
+    if not isinstance(value, (bool, np.bool_)):
+        raise TypeError('not a boolean')
+    return bool(value)
+
+def convert_to_int(value):
+    if isinstance(value, Integral):
+        return int(value)
+    if isinstance(value, Real) and float(value).is_integer():
+        return int(value)
+    raise TypeError('not an integer')
+
+CONVERTERS = {
+    'str': str,
+    'bool': convert_to_bool,
+    'int': convert_to_int,
+    'float': float,
+    }
+
+def table_column_kinds(rows, no_of_cols):
+    """ Return list of column types for table, based on first row of table,
+    with columns widened to 'str' where any of the rows given holds a value
+    that cannot be converted to the type of the column (see module docstring) """
+    kinds = column_kinds(rows[0] if rows else [], no_of_cols)
+    for col_idx, column in enumerate(table_columns(rows, no_of_cols)):
+        convert = CONVERTERS[kinds[col_idx]]
+        for value in column:
+            if value is None:
+                continue
+            try:
+                convert(value)
+            except (TypeError, ValueError):
+                kinds[col_idx] = 'str'
+                break
+    return kinds
+
+def convert_column(values, kind, heading, first_row_idx=0):
+    """ Return list of values converted to the column type given
+
+    Arguments:
+    values -- list of values in column, where None denotes a missing value
+    kind -- column type (see column_kinds)
+    heading -- column heading, for error messages
+    first_row_idx -- index of first value in table, for error messages
+
+    Exits with an error if any value cannot be converted, rather than writing
+    the column without it.
+    """
+    convert = CONVERTERS[kind]
+    converted = []
+    for row_idx, value in enumerate(values, first_row_idx):
+        if value is None:
+            converted.append(None)
+            continue
+        try:
+            converted.append(convert(value))
+        except (TypeError, ValueError):
+            sys.exit('ERROR: Value ' + repr(value) + ' in row ' + str(row_idx)
+                     + ' of column "' + heading + '" cannot be converted to '
+                     + 'the type of the column (' + kind + ', taken from the '
+                     + 'first block of rows)')
+    return converted
+
+def check_headings_unique(headings):
+    """ Exit with an error if any column heading appears more than once, as
+    columns are identified by their headings in the binary formats """
+    seen = set()
+    for heading in headings:
+        if heading in seen:
+            sys.exit('ERROR: Column heading "' + heading + '" is not unique')
+        seen.add(heading)
+
+def table_columns(rows, no_of_cols):
+    """ Return list of columns of table, where rows shorter than the headings
+    are padded with None """
+    columns = [[] for _ in range(no_of_cols)]
+    for row in rows:
+        for col_idx in range(no_of_cols):
+            columns[col_idx].append(row[col_idx] if col_idx < len(row) else None)
+    return columns
+
+
+class CSVTableWriter:
+    """ An object to write a table of results to a CSV file row by row
+
+    The file contains a row of column headings, a row of units and then the
+    rows of results. Optionally, rows that are not known until all results
+    have been written (e.g. annual totals) can be placed before the headings.
+    """
+
+    def __init__(self, output_file, headings, units_row, has_preamble=False):
+        """ Construct a CSVTableWriter object
+
+        Arguments:
+        output_file -- path to file to write
+        headings    -- list of column headings
+        units_row   -- list of units for each column
+        has_preamble -- if True, rows to be placed before the headings will be
+                        passed to the close function. In this case, the table is
+                        written to a temporary file first and then copied after
+                        the preamble.
+        """
+        self.__output_file = output_file
+        self.__has_preamble = has_preamble
+        # Note: need to specify newline='' below, otherwise an extra carriage
+        # return character is written when running on Windows
+        if has_preamble:
+            # Temporary file is deleted automatically when closed, including
+            # if the simulation fails before the table is complete
+            self.__file = tempfile.TemporaryFile(
+                mode='w+',
+                newline='',
+                dir=os.path.dirname(os.path.abspath(output_file)),
+                )
+        else:
+            self.__file = open(output_file, 'w', newline='')
+        self.__writer = csv.writer(self.__file)
+        self.__writer.writerow(headings)
+        self.__writer.writerow(units_row)
+
+    def write_row(self, row):
+        """ Write a single row of results """
+        self.__writer.writerow(row)
+
+    def close(self, preamble=None):
+        """ Finish writing file
+
+        Arguments:
+        preamble -- list of rows to place before the headings (only if
+                    has_preamble was True on construction)
+        """
+        if self.__has_preamble:
+            self.__file.seek(0)
+            with open(self.__output_file, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerows(preamble or [])
+                shutil.copyfileobj(self.__file, f)
+        self.__file.close()
+
+
+class ParquetTableWriter:
+    """ An object to write a table of results to a Parquet file row by row
+
+    Rows are buffered and written as a row group each time the buffer is full,
+    so memory use does not depend on the number of rows. Units are stored in
+    the metadata of each column and any preamble (e.g. annual totals) is
+    stored in the file metadata under the key 'preamble'.
+    """
+
+    # Number of rows in each row group
+    __ROW_GROUP_SIZE = 8760
+
+    def __init__(self, output_file, headings, units_row, has_preamble=False):
+        """ Construct a ParquetTableWriter object
+
+        Arguments:
+        output_file -- path to file to write
+        headings    -- list of column headings (must be unique)
+        units_row   -- list of units for each column
+        has_preamble -- flag to indicate whether a preamble will be passed to
+                        the close function (not needed for Parquet files, as
+                        the preamble is stored in the file metadata, but
+                        accepted for consistency with CSVTableWriter)
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            sys.exit('ERROR: Writing results in Parquet format requires the '
+                     'pyarrow package, which is not installed.')
+        self.__pa = pyarrow
+        self.__output_file = output_file
+        self.__headings = [str(heading) for heading in headings]
+        check_headings_unique(self.__headings)
+        self.__units_row = [str(units) for units in units_row]
+        # Schema and file writer are created when first row group is written,
+        # as column types depend on the rows in it
+        self.__kinds = None
+        self.__schema = None
+        self.__writer = None
+        self.__rows = []
+        self.__no_of_rows_written = 0
+
+    def __create_writer(self, first_rows):
+        pa = self.__pa
+        types = {
+            'int': pa.int64(),
+            'float': pa.float64(),
+            'bool': pa.bool_(),
+            'str': pa.string(),
+            }
+        self.__kinds = table_column_kinds(first_rows, len(self.__headings))
+        self.__schema = pa.schema([
+            pa.field(heading, types[kind], metadata={'units': units})
+            for heading, units, kind
+            in zip(self.__headings, self.__units_row, self.__kinds)
+            ])
+        self.__writer = pa.parquet.ParquetWriter(
+            self.__output_file,
+            self.__schema,
+            compression='zstd',
+            )
+
+    def __write_row_group(self):
+        if self.__writer is None:
+            self.__create_writer(self.__rows)
+        columns = table_columns(self.__rows, len(self.__headings))
+        table = self.__pa.Table.from_arrays(
+            [
+                self.__pa.array(
+                    convert_column(column, kind, field.name, self.__no_of_rows_written),
+                    type=field.type,
+                    )
+                for column, kind, field in zip(columns, self.__kinds, self.__schema)
+            ],
+            schema=self.__schema,
+            )
+        self.__writer.write_table(table)
+        self.__no_of_rows_written += len(self.__rows)
+        self.__rows = []
+
+    def write_row(self, row):
+        """ Write a single row of results """
+        self.__rows.append(row)
+        if len(self.__rows) >= self.__ROW_GROUP_SIZE:
+            self.__write_row_group()
+
+    def close(self, preamble=None):
+        """ Finish writing file
+
+        Arguments:
+        preamble -- list of rows to store in the file metadata
+        """
+        if self.__rows or self.__writer is None:
+            self.__write_row_group()
+        if preamble is not None:
+            self.__writer.add_key_value_metadata(
+                {'preamble': json.dumps(preamble, default=float)},
+                )
+        self.__writer.close()
+
+
+def npz_column_name(col_idx):
+    """ Return name of array used to store a column in an npz file """
+    return 'column_' + str(col_idx)
+
+class NpzTableWriter:
+    """ An object to write a table of results to a compressed NumPy archive
+
+    Each column is stored as an array named 'column_<n>', where n is the index
+    of the column, so that any heading can be used without clashing with the
+    names of other arrays or of the arguments to np.savez_compressed. The
+    headings (in order) and units are stored in arrays named '__headings__'
+    and '__units__', and any preamble (e.g. annual totals) is stored as a JSON
+    string in an array named '__preamble__'.
+
+    An npz file cannot be appended to, so the table is held in memory until
+    the writer is closed. To limit memory use, each block of rows is converted
+    to compact arrays as soon as it is complete.
+    """
+
+    # Number of rows converted to arrays at once
+    __BLOCK_SIZE = 8760
+
+    def __init__(self, output_file, headings, units_row, has_preamble=False):
+        """ Construct an NpzTableWriter object
+
+        Arguments:
+        output_file -- path to file to write
+        headings    -- list of column headings (must be unique)
+        units_row   -- list of units for each column
+        has_preamble -- flag to indicate whether a preamble will be passed to
+                        the close function (accepted for consistency with
+                        CSVTableWriter)
+        """
+        self.__output_file = output_file
+        self.__headings = [str(heading) for heading in headings]
+        # Columns are looked up by heading (via '__headings__'), so a
+        # duplicate heading would make a column ambiguous
+        check_headings_unique(self.__headings)
+        self.__units_row = [str(units) for units in units_row]
+        self.__kinds = None
+        self.__blocks = [[] for _ in self.__headings]
+        self.__rows = []
+        self.__no_of_rows_converted = 0
+
+    def __convert_block(self):
+        if self.__kinds is None:
+            self.__kinds = table_column_kinds(self.__rows, len(self.__headings))
+        columns = table_columns(self.__rows, len(self.__headings))
+        for col_idx, (column, kind) in enumerate(zip(columns, self.__kinds)):
+            values = convert_column(
+                column,
+                kind,
+                self.__headings[col_idx],
+                self.__no_of_rows_converted,
+                )
+            if kind == 'str':
+                array = np.array(['' if value is None else value for value in values], dtype=str)
+            elif kind == 'bool':
+                array = np.array([bool(value) for value in values], dtype=bool)
+            elif kind == 'int' and None not in values:
+                array = np.array(values, dtype=np.int64)
+            else:
+                array = np.array(
+                    [np.nan if value is None else value for value in values],
+                    dtype=np.float64,
+                    )
+            self.__blocks[col_idx].append(array)
+        self.__no_of_rows_converted += len(self.__rows)
+        self.__rows = []
+
+    def write_row(self, row):
+        """ Write a single row of results """
+        self.__rows.append(row)
+        if len(self.__rows) >= self.__BLOCK_SIZE:
+            self.__convert_block()
+
+    def close(self, preamble=None):
+        """ Write file
+
+        Arguments:
+        preamble -- list of rows to store in the file
+        """
+        if self.__rows or self.__kinds is None:
+            self.__convert_block()
+        arrays = {
+            npz_column_name(col_idx): np.concatenate(blocks)
+            for col_idx, blocks in enumerate(self.__blocks)
+            }
+        arrays['__headings__'] = np.array(self.__headings, dtype=str)
+        arrays['__units__'] = np.array(self.__units_row, dtype=str)
+        if preamble is not None:
+            arrays['__preamble__'] = np.array(json.dumps(preamble, default=float))
+        self.__blocks = None
+        np.savez_compressed(self.__output_file, **arrays)
+
+
+def table_writer(output_file_stub, output_format, headings, units_row, has_preamble=False):
+    """ Return object to write a table of results to file in the format specified
+
+    Arguments:
+    output_file_stub -- path to file to write, without file extension
+    output_format    -- one of OUTPUT_FORMATS
+    headings         -- list of column headings
+    units_row        -- list of units for each column
+    has_preamble     -- flag to indicate whether rows to be placed before the
+                        headings will be passed to the close function
+    """
+    if output_format == 'csv':
+        writer_class = CSVTableWriter
+    elif output_format == 'parquet':
+        writer_class = ParquetTableWriter
+    elif output_format == 'npz':
+        writer_class = NpzTableWriter
+    else:
+        sys.exit('ERROR: Output format not recognised: ' + str(output_format))
+    return writer_class(
+        output_file_stub + FILE_EXTENSIONS[output_format],
+        headings,
+        units_row,
+        has_preamble,
+        )
@@ -6,7 +6,11 @@ This module reads in weather data from CIBSE csv file.
 
 import csv
 from enum import Enum
+
+import numpy as np
+
 import core.units as units
+from weather_file_cache import read_weather_file_cached
 
 COLUMN_LONGITUDE = 3
 COLUMN_LATITUDE = 1
@@ -17,44 +21,52 @@ COLUMN_GHI_RAD = 12 # global irradiation (horizantal plane) in Wh/m2
 #COLUMN_DIR_RAD = # direct beam (horizontal plane) irradiation in Wh/m2 NOT IN FILE
 COLUMN_DIF_RAD = 13 # diffuse irradiation (horizantal plane) in Wh/m2
 #COLUMN_GROUND_REFLECT = # NOT IN FILE. Using 0.2 default
+ROW_LOCATION = 5
+NO_OF_HEADER_ROWS = 32
 
-def CIBSE_weather_data_to_dict(weather_file):
-    """ Read in weather file, return dictionary"""
-    air_temperatures = []
-    wind_speeds = []
-    diff_hor_rad = []
-    dir_beam_rad = []
-    ground_solar_reflc = []
-
+def parse_CIBSE_weather_file(weather_file):
+    """ Parse weather file, return dictionary of location and arrays of data """
     with open(weather_file) as csv_file:
         csv_reader = csv.reader(csv_file, delimiter = ',')
-        line_count = 0
-        for row in csv_reader:
-            if line_count == 5:
+        for line_count, row in enumerate(csv_reader):
+            if line_count == ROW_LOCATION:
                 longitude = float(row[COLUMN_LONGITUDE])
                 latitude = float(row[COLUMN_LATITUDE])
-            elif line_count >= 32:
-                air_temperatures.append(float(row[COLUMN_AIR_TEMP]))
-                wind_speeds.append(float(row[COLUMN_WIND_SPEED]) / units.knots_per_m_per_sec)
-                #no DNI direct irradiation in file need to extract from global and diffuse values
-                global_horiz_irr = float(row[COLUMN_GHI_RAD])
-                diffuse_horiz_irr = float(row[COLUMN_DIF_RAD])
-                dir_beam_rad.append(global_horiz_irr - diffuse_horiz_irr)
-                diff_hor_rad.append(float(row[COLUMN_DIF_RAD]))
-                ground_solar_reflc.append(float(0.2))
-            line_count = line_count + 1
-
-    external_conditions = {
+                break
+
+    air_temperatures, wind_speeds_knots, global_horiz_irr, diff_hor_rad = np.loadtxt(
+        weather_file,
+        delimiter=',',
+        skiprows=NO_OF_HEADER_ROWS,
+        usecols=(COLUMN_AIR_TEMP, COLUMN_WIND_SPEED, COLUMN_GHI_RAD, COLUMN_DIF_RAD),
+        unpack=True,
+        ndmin=2,
+        )
+
+    return {
         "air_temperatures": air_temperatures,
-        "wind_speeds": wind_speeds,
+        "wind_speeds": wind_speeds_knots / units.knots_per_m_per_sec,
         "diffuse_horizontal_radiation": diff_hor_rad,
-        "direct_beam_radiation": dir_beam_rad,
-        "solar_reflectivity_of_ground": ground_solar_reflc,
+        #no DNI direct irradiation in file need to extract from global and diffuse values
+        "direct_beam_radiation": global_horiz_irr - diff_hor_rad,
         "longitude": longitude,
         "latitude": latitude,
-        #conversion is needed as direct irradiation will be horizontal not normal from this file
-        "direct_beam_conversion_needed": True 
         }
 
-    return external_conditions
+def CIBSE_weather_data_to_dict(weather_file):
+    """ Read in weather file, return dictionary
 
+    Weather data is returned as arrays. The parsed data is cached alongside
+    the weather file, so that it does not need to be parsed again.
+    """
+    external_conditions = read_weather_file_cached(
+        weather_file,
+        'CIBSE',
+        parse_CIBSE_weather_file,
+        )
+    external_conditions["solar_reflectivity_of_ground"] \
+        = np.full(len(external_conditions["air_temperatures"]), 0.2)
+    #conversion is needed as direct irradiation will be horizontal not normal from this file
+    external_conditions["direct_beam_conversion_needed"] = True
+
+    return external_conditions
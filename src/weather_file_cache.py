@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+"""
+This module provides a cache for weather data parsed from weather files, so
+that the same weather file does not need to be parsed again on every run.
+
+The parsed data is saved in a sidecar file next to the weather file, named
+using a hash of the contents of the weather file, so that the cache is not
+used if the weather file is changed.
+"""
+
+# Standard library imports
+import os
+import hashlib
+import tempfile
+import zipfile
+
+# Third-party imports
+import numpy as np
+
+# Increment this if the format of the cached data changes, so that existing
+# cache files are not used
+CACHE_VERSION = 1
+CACHE_FILENAME_SUFFIX = '.weather_cache.npz'
+
+
+def weather_file_hash(weather_file):
+    """ Return hash of contents of weather file """
+    hasher = hashlib.sha256()
+    with open(weather_file, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def cache_filename(weather_file, file_format, file_hash):
+    """ Return path to cache file for weather file
+
+    Arguments:
+    weather_file -- path to weather file
+    file_format  -- name of weather file format (e.g. 'epw')
+    file_hash    -- hash of contents of weather file
+    """
+    return weather_file + '.' + file_format + '.v' + str(CACHE_VERSION) \
+        + '.' + file_hash[:16] + CACHE_FILENAME_SUFFIX
+
+def read_weather_file_cached(weather_file, file_format, parse_func):
+    """ Return dictionary of arrays of weather data, reading from cache if possible
+
+    Arguments:
+    weather_file -- path to weather file
+    file_format  -- name of weather file format (e.g. 'epw'), used to
+                    distinguish cache files for different parsers
+    parse_func   -- function that takes path to weather file and returns
+                    dictionary of weather data, where each value is a number
+                    or an array of numbers
+
+    If there is no valid cache file, the weather file is parsed with
+    parse_func and the result is saved to a new cache file. If the cache file
+    cannot be written (e.g. the directory is read-only), the data is returned
+    without being cached.
+    """
+    filename = cache_filename(weather_file, file_format, weather_file_hash(weather_file))
+
+    if os.path.isfile(filename):
+        try:
+            with np.load(filename) as cached_data:
+                return {
+                    name: values.item() if values.ndim == 0 else values
+                    for name, values in cached_data.items()
+                    }
+        except (OSError, ValueError, zipfile.BadZipFile):
+            # Cache file is unreadable, so fall back to parsing weather file
+            pass
+
+    weather_data = parse_func(weather_file)
+
+    try:
+        # Write to temporary file then rename, so that other processes never
+        # see a partially-written cache file
+        fd, temp_filename = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(filename)),
+            suffix=CACHE_FILENAME_SUFFIX,
+            )
+        try:
+            with os.fdopen(fd, 'wb') as cache_file:
+                np.savez(cache_file, **weather_data)
+            os.replace(temp_filename, filename)
+        except BaseException:
+            os.remove(temp_filename)
+            raise
+    except OSError:
+        pass
+
+    return weather_data
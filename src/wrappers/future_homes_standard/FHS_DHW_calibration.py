@@ -36,14 +36,14 @@ with open(decilebandingfile,'r') as bandsfile:
 		testvol = [0 for x in seedrange]
 		for seed in seedrange:
 			HWtest = HW_events_generator(float(row["median_daily_dhw_vol"]), seed, False)
-			HWtestevents = HWtest.build_annual_HW_events()
-			for event in HWtestevents:
-				if event["type"].find("shower")!=-1:
-					#5.901 is the implied average flowrate of HOT water in the sample data
-					#this is not the same as the flowrate of a shower, whihch is of mixed warm water
-					testvol[seed] += float(event["dur"]) * 5.901 / 365
-				else:
-					testvol[seed] += float(event["vol"]) / 365
+			HWtestevents = HWtest.build_annual_HW_events_array()
+			is_shower = np.char.find(HWtestevents["type"], "shower") != -1
+			#5.901 is the implied average flowrate of HOT water in the sample data
+			#this is not the same as the flowrate of a shower, whihch is of mixed warm water
+			testvol[seed] = float(
+				np.sum(HWtestevents["dur"][is_shower] * 5.901 / 365)
+				+ np.sum(HWtestevents["vol"][~is_shower] / 365)
+				)
 		print(row["median_daily_dhw_vol"] + ",       " + str(statistics.mean(testvol)) + ",  " + str(statistics.variance(testvol)))
 		row["calibration_daily_dhw_vol"] = statistics.mean(testvol)
 		row["calibration_DHW_variance"] = statistics.variance(testvol)
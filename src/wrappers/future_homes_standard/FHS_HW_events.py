@@ -1,12 +1,84 @@
 import csv
+import bisect
 import sys
 import os
 import math
 import random
 import numpy as np
-from functools import partial
+from functools import partial, lru_cache
 from core.water_heat_demand.misc import frac_hot_water
 
+this_directory = os.path.dirname(os.path.abspath(__file__))
+decilebandingfile = os.path.join(this_directory, "decile_banding.csv")
+decileeventsfile = os.path.join(this_directory, "day_of_week_events_by_decile.csv")
+decileeventtimesfile = os.path.join(this_directory, "day_of_week_events_by_decile_event_times.csv")
+
+days_of_week = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+@lru_cache(maxsize=None)
+def load_decile_banding():
+    '''
+    read the decile banding table. Memoised so that the file is only read
+    once per process - rows are returned as a tuple of dicts and must not be
+    modified by the caller
+    '''
+    with open(decilebandingfile,'r') as bandsfile:
+        return tuple(csv.DictReader(bandsfile))
+
+@lru_cache(maxsize=None)
+def load_decile_events():
+    '''
+    read the event statistics for each decile and day of the week, and the
+    hourly event counts for each day of the week. Memoised so that the files
+    are only read once per process - the returned dicts must not be modified
+    by the caller
+
+    returns a tuple of:
+    - dict of decile (zero-based) -> day name -> event type -> event statistics
+    - dict of day name -> event type -> list of event counts for each hour of the day
+    '''
+    decile_events = {}
+    with open(decileeventsfile,'r') as varsfile:
+        for row in csv.DictReader(varsfile):
+            week = decile_events.setdefault(int(row["decile"]) - 1, {day: {} for day in days_of_week})
+            week[row['day_name']][row["simple_labels2_based_on_900k_sample"]] = {
+                "event_count": float(row["event_count"]),
+                "median_event_volume":float(row["median_event_volume"]),
+                "mean_event_volume":float(row["mean_event_volume"]),
+                "median_dur":float(row["median_dur"]) / 60,
+                "mean_dur":float(row["mean_dur"]) / 60, # convert units to minutes
+                }
+
+    hourly_event_counts = {day: {} for day in days_of_week}
+    with open(decileeventtimesfile,'r') as varsfile:
+        for row in csv.DictReader(varsfile):
+            hourly_event_counts[row["day_name"]]\
+                .setdefault(row["simple_labels2_based_on_900k_sample"], [0 for x in range(24)])\
+                [int(row["hour"])] = int(row["event_count"])
+
+    return decile_events, hourly_event_counts
+
+def random_floats(rng, count):
+    '''
+    draw count floats in [0, 1) from random.Random object rng in one vectorised call
+
+    Both random.Random and numpy's MT19937 bit generator use the Mersenne
+    Twister with the same 53-bit float construction, so copying the state of
+    rng into numpy gives exactly the values that count successive calls to
+    rng.random() would. The final state is copied back so that rng continues
+    the same stream afterwards.
+    '''
+    version, internal_state, gauss_next = rng.getstate()
+    bit_generator = np.random.MT19937()
+    bit_generator.state = {
+        'bit_generator': 'MT19937',
+        'state': {'key': np.array(internal_state[:-1], dtype=np.uint32), 'pos': internal_state[-1]},
+        }
+    values = np.random.Generator(bit_generator).random(count)
+    mt_state = bit_generator.state['state']
+    rng.setstate((version, tuple(mt_state['key'].tolist()) + (int(mt_state['pos']),), gauss_next))
+    return values
+
 class HW_event_adjust_allocate:
     '''
     class to determine HW events to be added to project dict
@@ -135,124 +207,255 @@ class HW_events_generator:
         
         self.target_DHW_vol = daily_DHW_vol
         
-        this_directory = os.path.dirname(os.path.relpath(__file__))
-        decilebandingfile =  os.path.join(this_directory, "decile_banding.csv")
-        decileeventsfile =  os.path.join(this_directory, "day_of_week_events_by_decile.csv")
-        decileeventtimesfile =  os.path.join(this_directory, "day_of_week_events_by_decile_event_times.csv")
-        
-        with open(decilebandingfile,'r') as bandsfile:
-            bandsfilereader = csv.DictReader(bandsfile)
-            bandsfiledata = []
-            for row in bandsfilereader:
-                bandsfiledata.append(row)
-                if daily_DHW_vol >= float(row["min_daily_dhw_vol"])\
-                    and daily_DHW_vol < float(row["max_daily_dhw_vol"]):
-                    self.decile = int(row["decile"]) - 1
-                    self.banding_correction = daily_DHW_vol / float(row["calibration_daily_dhw_vol"])
-            if self.decile == -1:
-                if daily_DHW_vol < float(bandsfiledata[0]["min_daily_dhw_vol"]):
-                    self.decile = 0
-                    self.banding_correction = daily_DHW_vol / float(row["calibration_daily_dhw_vol"])
-                elif daily_DHW_vol > float(bandsfiledata[9]["min_daily_dhw_vol"]):
-                    self.decile = 9
-                    self.banding_correction = daily_DHW_vol / float(row["calibration_daily_dhw_vol"])
-            if self.decile == -1:
-                print("HW decile error, exiting")
-                sys.exit()
+        bandsfiledata = load_decile_banding()
+        for row in bandsfiledata:
+            if daily_DHW_vol >= float(row["min_daily_dhw_vol"])\
+                and daily_DHW_vol < float(row["max_daily_dhw_vol"]):
+                self.decile = int(row["decile"]) - 1
+                self.banding_correction = daily_DHW_vol / float(row["calibration_daily_dhw_vol"])
+        if self.decile == -1:
+            if daily_DHW_vol < float(bandsfiledata[0]["min_daily_dhw_vol"]):
+                self.decile = 0
+                self.banding_correction = daily_DHW_vol / float(row["calibration_daily_dhw_vol"])
+            elif daily_DHW_vol > float(bandsfiledata[9]["min_daily_dhw_vol"]):
+                self.decile = 9
+                self.banding_correction = daily_DHW_vol / float(row["calibration_daily_dhw_vol"])
+        if self.decile == -1:
+            print("HW decile error, exiting")
+            sys.exit()
         if not correct_banding:
             self.banding_correction = 1.0
 
+        decile_events, hourly_event_counts = load_decile_events()
         self.week = {
-            'Monday':{},
-            'Tuesday':{},
-            'Wednesday':{},
-            'Thursday':{},
-            'Friday':{},
-            'Saturday':{},
-            'Sunday':{},
-        }
-
-        with open(decileeventsfile,'r') as varsfile:
-            varsfilereader = csv.DictReader(varsfile)
-            for i, row in enumerate(varsfilereader):
-                if int(row["decile"]) - 1 ==  self.decile:
-                    self.week[row['day_name']].update(
-                        {row["simple_labels2_based_on_900k_sample"]:{
-                            "event_count": float(row["event_count"]),
-                            "median_event_volume":float(row["median_event_volume"]),
-                            "mean_event_volume":float(row["mean_event_volume"]),
-                            "median_dur":float(row["median_dur"]) / 60,
-                            "mean_dur":float(row["mean_dur"]) / 60, # convert units to minutes
-                            "hourly_event_counts" : [0 for x in range(24)]
-                            }
-                        }
+            day: {
+                event_type: dict(
+                    event_stats,
+                    hourly_event_counts = list(hourly_event_counts[day][event_type]),
                     )
+                for event_type, event_stats in decile_events[self.decile][day].items()
+                }
+            for day in days_of_week
+            }
 
-        with open(decileeventtimesfile,'r') as varsfile:
-            varsfilereader = csv.DictReader(varsfile)
-            for i, row in enumerate(varsfilereader):
-                self.week[row["day_name"]]\
-                    [row["simple_labels2_based_on_900k_sample"]]\
-                    ["hourly_event_counts"]\
-                    [int(row["hour"])] = int(row["event_count"])
-
+        '''
+        sucessive calls to a poisson distribution with fixed seed 
+        will yield the same answer - have to ask rng to generate an 
+        array of poisson samples and draw from it.
+        generate array of size 53 as each hour is unique per week of the year.
+        All the arrays are drawn in one call, in the order day, event type, hour.
+        '''
+        poisson_means = []
         for day in self.week:
             for event_type in self.week[day]:
                 hrlyeventcnts = self.week[day][event_type]['hourly_event_counts']
                 sumeventcnt = sum(hrlyeventcnts)
-                '''
-                sucessive calls to a poisson distribution with fixed seed 
-                will yield the same answer - have to ask rng to generate an 
-                array of poisson samples and draw from it.
-                generate array of size 53 as each hour is unique per week of the year
-                
-                '''
-                self.week[day][event_type].update\
-                (
-                    {'hourly_event_distribution':\
-                     [{"poisson_arr":self.rng_poisson.poisson(self.banding_correction *\
-                     x * float(self.week[day][event_type]['event_count'])/ sumeventcnt,53).tolist(),\
-                     '__poisson_arr_idx':0}
-                    for x in hrlyeventcnts]}
-                )
-        
-
-    def events_in_hour(self, time, type, event_dict):
-        out = []
-        count = event_dict['hourly_event_distribution'][math.floor(time % 24)]["poisson_arr"]\
-                [event_dict['hourly_event_distribution'][math.floor(time % 24)]['__poisson_arr_idx']]
-        event_dict['hourly_event_distribution'][math.floor(time % 24)]['__poisson_arr_idx'] += 1
-        for i in range(count):
-            out.append({
-                'time': time + self.rng.random(), #random offset to time within the hour
-                'type': type,
-                'vol': event_dict["mean_event_volume"], #these could be distributed rather than always the mean
-                'dur': event_dict["mean_dur"]
-            })
-        return out
-    
-    def overlap_check(self,hrlyevents, matchingtypes, eventstart, duration):
-        for existing_event in hrlyevents[math.floor(eventstart)]:
-            if (existing_event["type"] in matchingtypes)\
-             and ((eventstart >= existing_event["eventstart"]\
-                   and eventstart < existing_event["eventend"])\
-                   or (eventstart + duration / 60 >= existing_event["eventstart"]\
-                   and eventstart + duration / 60 < existing_event["eventend"])):
-                #events are overlapping and we need to reroll the time until they arent.
-                eventstart = self.reroll_event_time(eventstart)
-                self.overlap_check(hrlyevents,matchingtypes, eventstart, duration)
+                poisson_means.extend(
+                    self.banding_correction * x * float(self.week[day][event_type]['event_count'])\
+                    / sumeventcnt
+                    for x in hrlyeventcnts
+                    )
+        poisson_arr = self.rng_poisson.poisson(
+            np.array(poisson_means)[:, np.newaxis],
+            (len(poisson_means), 53),
+            )
+        i = 0
+        for day in self.week:
+            for event_type in self.week[day]:
+                #array of event counts indexed by hour of day, then week of year
+                self.week[day][event_type]['hourly_event_distribution'] = poisson_arr[i:i + 24]
+                i += 24
     
     def reroll_event_time(self, time):
         #sometimes events will overlap and we need to change the time so they dont
         #do this by adding random value betwen 0-30 mins to current time until its not overlapping with anything
-        return (time + self.rng.random() / 2) % 8760
+        #the result may be beyond the end of the year, in which case the
+        #scheduler does not use it (rather than wrapping it to the start)
+        return time + self.rng.random() / 2
     
+    def build_annual_HW_events_array(self, startday = 0):
+        '''
+        return the events for the year as a structured array with fields
+        time, type, vol and dur, in order of day, hour and event type.
+
+        Each day of the week uses the next week of its poisson arrays, and
+        each event is given a random offset to its time within the hour.
+        '''
+        list_days = list(self.week.values())
+        days = 365
+        max_event_types = max(len(day_events) for day_events in list_days)
+        type_dtype = np.array([event_type for day_events in list_days for event_type in day_events]).dtype
+        #event counts, types, volumes and durations for each day, hour and
+        #event type. Days with fewer event types are padded with zero counts
+        slot_counts = np.zeros((days, 24, max_event_types), dtype=int)
+        slot_types = np.full((days, max_event_types), '', dtype=type_dtype)
+        slot_vols = np.zeros((days, max_event_types))
+        slot_durs = np.zeros((days, max_event_types))
+        for day_of_week in range(7):
+            event_types = list(list_days[(day_of_week + startday) % 7])
+            event_dicts = [list_days[day_of_week][event_type] for event_type in event_types]
+            n_event_types = len(event_types)
+            n_weeks = len(range(day_of_week, days, 7))
+            #poisson arrays are indexed by hour then week of year
+            slot_counts[day_of_week::7, :, :n_event_types] = np.stack(
+                [event_dict['hourly_event_distribution'][:, :n_weeks] for event_dict in event_dicts],
+                axis=2,
+                ).transpose(1, 0, 2)
+            slot_types[day_of_week::7, :n_event_types] = event_types
+            #these could be distributed rather than always the mean
+            slot_vols[day_of_week::7, :n_event_types] \
+                = [event_dict["mean_event_volume"] for event_dict in event_dicts]
+            slot_durs[day_of_week::7, :n_event_types] \
+                = [event_dict["mean_dur"] for event_dict in event_dicts]
+
+        slot_idx = np.repeat(np.arange(slot_counts.size), slot_counts.ravel())
+        day_idx, hour_idx, event_type_idx = np.unravel_index(slot_idx, slot_counts.shape)
+        events = np.empty(
+            len(slot_idx),
+            dtype=[
+                ('time', float),
+                ('type', type_dtype),
+                ('vol', float),
+                ('dur', float),
+                ],
+            )
+        #random offset to time within the hour
+        events['time'] = (day_idx * 24 + hour_idx) + random_floats(self.rng, len(slot_idx))
+        events['type'] = slot_types[day_idx, event_type_idx]
+        events['vol'] = slot_vols[day_idx, event_type_idx]
+        events['dur'] = slot_durs[day_idx, event_type_idx]
+        return events
+
     def build_annual_HW_events(self, startday = 0):
-        list_days = list(zip(*list(self.week.items())))[1]
-        annual_HW_events = []
-        for day in range(365):
-            for hour in range(24):
-                for event_type in list_days[(day + startday) % 7]:
-                    annual_HW_events.extend(self.events_in_hour(hour + (day * 24), event_type, list_days[day % 7][event_type]))
-        return annual_HW_events
-                    
\ No newline at end of file
+        events = self.build_annual_HW_events_array(startday)
+        return [
+            {'time': time, 'type': type, 'vol': vol, 'dur': dur}
+            for time, type, vol, dur in zip(
+                events['time'].tolist(),
+                events['type'].tolist(),
+                events['vol'].tolist(),
+                events['dur'].tolist(),
+                )
+            ]
+
+
+class HW_event_interval_index:
+    '''
+    sorted index of the time intervals (in hours) occupied by the events of
+    one event family, for O(log n) overlap queries.
+
+    Intervals are kept sorted by start time. An interval that overlaps a query
+    must start before the end of the query and no earlier than the longest
+    interval length before its start, so only that short run of the index is
+    scanned.
+    '''
+    #allowance for rounding in the interval lengths when bounding the scan
+    __length_tolerance = 1e-9
+
+    def __init__(self):
+        self.__starts = []
+        self.__ends = []
+        self.__max_length = 0.0
+
+    def __len__(self):
+        return len(self.__starts)
+
+    def overlapping_end(self, start, end):
+        '''
+        return the latest end time of the intervals that overlap [start, end),
+        or None if there are none
+        '''
+        scan_from = start - self.__max_length - self.__length_tolerance
+        latest_end = None
+        i = bisect.bisect_left(self.__starts, end) - 1
+        while i >= 0 and self.__starts[i] >= scan_from:
+            if self.__ends[i] > start and (latest_end is None or self.__ends[i] > latest_end):
+                latest_end = self.__ends[i]
+            i -= 1
+        return latest_end
+
+    def overlaps(self, start, end):
+        return self.overlapping_end(start, end) is not None
+
+    def first_free_start(self, start, length):
+        '''
+        return the earliest start time at or after start for which an interval
+        of the given length does not overlap any interval in the index
+        '''
+        while True:
+            latest_end = self.overlapping_end(start, start + length)
+            if latest_end is None:
+                return start
+            start = latest_end
+
+    def add(self, start, end):
+        i = bisect.bisect_right(self.__starts, start)
+        self.__starts.insert(i, start)
+        self.__ends.insert(i, end)
+        self.__max_length = max(self.__max_length, end - start)
+
+class HW_event_scheduler:
+    '''
+    schedules HW events so that events in the same family do not overlap,
+    keeping a sorted interval index for each family.
+
+    If an event overlaps an event already scheduled in its family, its start
+    time is rerolled with reroll_event_time, up to max_rerolls times or until
+    a reroll would start it at or after the end of the year (start times are
+    not wrapped round to the start of the year, so events stay in time order
+    at the end of the year). If it still overlaps, it is moved to the first
+    free time after its last rerolled start time. If that is beyond the end of
+    the year, the last rerolled start time within the year is used and the
+    overlap is left unresolved. For a given sequence of events and a seeded
+    reroll function the result is deterministic.
+    '''
+    def __init__(self, reroll_event_time, max_rerolls = 10, end_of_year = 8760):
+        self.__reroll_event_time = reroll_event_time
+        self.__max_rerolls = max_rerolls
+        self.__end_of_year = end_of_year
+        self.__interval_indexes = {}
+        self.reroll_stats = {
+            "events": 0,
+            "events_rerolled": 0,
+            "rerolls": 0,
+            "max_rerolls_for_event": 0,
+            "events_shifted": 0,
+            "events_unresolved": 0,
+            }
+
+    def schedule_event(self, family, eventstart, duration):
+        '''
+        return the start time (in hours) for an event in the given family,
+        and add the event to the family's interval index
+
+        duration is in minutes
+        '''
+        interval_index = self.__interval_indexes.setdefault(family, HW_event_interval_index())
+        length = duration / 60.0
+
+        rerolls = 0
+        while interval_index.overlaps(eventstart, eventstart + length) \
+        and rerolls < self.__max_rerolls:
+            eventstart_rerolled = self.__reroll_event_time(eventstart)
+            rerolls += 1
+            if eventstart_rerolled >= self.__end_of_year:
+                break
+            eventstart = eventstart_rerolled
+
+        if interval_index.overlaps(eventstart, eventstart + length):
+            free_start = interval_index.first_free_start(eventstart, length)
+            if free_start < self.__end_of_year:
+                eventstart = free_start
+                self.reroll_stats["events_shifted"] += 1
+            else:
+                self.reroll_stats["events_unresolved"] += 1
+
+        self.reroll_stats["events"] += 1
+        if rerolls > 0:
+            self.reroll_stats["events_rerolled"] += 1
+            self.reroll_stats["rerolls"] += rerolls
+            self.reroll_stats["max_rerolls_for_event"] \
+                = max(self.reroll_stats["max_rerolls_for_event"], rerolls)
+
+        interval_index.add(eventstart, eventstart + length)
+        return eventstart
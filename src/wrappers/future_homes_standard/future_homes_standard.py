@@ -14,7 +14,8 @@ from fractions import Fraction
 from core import project, schedule, units
 from core.water_heat_demand.misc import frac_hot_water
 from cmath import log
-from wrappers.future_homes_standard.FHS_HW_events import HW_event_adjust_allocate, HW_events_generator
+from wrappers.future_homes_standard.FHS_HW_events import HW_event_adjust_allocate, HW_events_generator, \
+    HW_event_scheduler
 
 this_directory = os.path.dirname(os.path.relpath(__file__))
 FHSEMISFACTORS =  os.path.join(this_directory, "FHS_emisPEfactors_07-06-2023.csv")
@@ -107,8 +108,14 @@ def apply_fhs_postprocessing(
         timestep_array,
         file_path,
         notional,
+        summary_only=False,
         ):
-    """ Post-process core simulation outputs as required for Future Homes Standard """
+    """ Post-process core simulation outputs as required for Future Homes Standard
+
+    If summary_only is True, the results passed in are totals over the
+    simulation (i.e. each series has a single element) and only the summary
+    file is written.
+    """
     no_of_timesteps = len(timestep_array)
 
     # Read factors from csv
@@ -251,9 +258,10 @@ def apply_fhs_postprocessing(
     total_PE_rate = sum([sum(PE['total']) for PE in PE_results.values()]) / TFA
 
     # Write results to output files
-    write_postproc_file(file_path, "emissions", emis_results, no_of_timesteps)
-    write_postproc_file(file_path, "emissions_incl_out_of_scope", emis_oos_results, no_of_timesteps)
-    write_postproc_file(file_path, "primary_energy", PE_results, no_of_timesteps)
+    if not summary_only:
+        write_postproc_file(file_path, "emissions", emis_results, no_of_timesteps)
+        write_postproc_file(file_path, "emissions_incl_out_of_scope", emis_oos_results, no_of_timesteps)
+        write_postproc_file(file_path, "primary_energy", PE_results, no_of_timesteps)
     write_postproc_summary_file(file_path, total_emissions_rate, total_PE_rate, notional)
 
 def write_postproc_file(file_path, results_type, results, no_of_timesteps):
@@ -1008,7 +1016,7 @@ def create_hot_water_use_pattern(project_dict, TFA, N_occupants, cold_water_feed
     Shower events should be  evenly spread across all showers in dwelling
     and so on for baths etc.
     '''
-    hrlyevents = [[] for x in range(8760)]
+    HW_event_sched = HW_event_scheduler(HWeventgen.reroll_event_time)
     for i, event in enumerate(ref_eventlist):
         if event["type"] != "None":
             if event["type"].find("shower")!=-1:
@@ -1024,10 +1032,9 @@ def create_hot_water_use_pattern(project_dict, TFA, N_occupants, cold_water_feed
             if not (name in project_dict["Shower"] and project_dict["Shower"][name]["type"] == "InstantElecShower"):
                 #IES can overlap with anything so ignore them entirely
                 #TODO - implies 2 uses of the same IES may overlap, could check them separately
-                HWeventgen.overlap_check(hrlyevents, ["Shower", "Bath"], eventstart, duration)
-                hrlyevents[math.floor(eventstart)].append({"type":"Shower",
-                                                           "eventstart": eventstart,
-                                                           "eventend": eventstart + duration / 60.0})
+                #all other drawoffs are scheduled as one family so that they
+                #do not overlap with each other
+                eventstart = HW_event_sched.schedule_event("HotWater", eventstart, duration)
                 
             project_dict["Events"][eventtype][name].append(
                 {"start": eventstart,
@@ -1035,6 +1042,16 @@ def create_hot_water_use_pattern(project_dict, TFA, N_occupants, cold_water_feed
                 "temperature": event_temperature}
                 )
 
+    reroll_stats = HW_event_sched.reroll_stats
+    if reroll_stats["events_shifted"] > 0 or reroll_stats["events_unresolved"] > 0:
+        print("Warning: " + str(reroll_stats["events_shifted"] + reroll_stats["events_unresolved"])
+              + " of " + str(reroll_stats["events"]) + " hot water events could not be "
+              "rerolled to avoid overlapping other events (after "
+              + str(reroll_stats["rerolls"]) + " rerolls in total); "
+              + str(reroll_stats["events_shifted"]) + " moved to next free time, "
+              + str(reroll_stats["events_unresolved"]) + " left overlapping.")
+    return reroll_stats
+
 def create_window_opening_schedule(project_dict):
 
     if "Window_Opening_For_Cooling" not in project_dict.keys():
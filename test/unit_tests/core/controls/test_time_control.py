@@ -60,6 +60,28 @@ class Test_OnOffCostMinimisingTimeControl(unittest.TestCase):
                     "incorrect schedule returned",
                     )
 
+    def test_is_on_ties(self):
+        """ Test that where several timesteps have the highest cost selected,
+        the earliest are set to "on" """
+        simtime = SimulationTime(0, 24, 0.5)
+        cost_schedule = [10.0] * 16 + [5.0] * 4 + [7.5] * 6 + [5.0] * 2 + [10.0] * 20
+        cost_minimising_ctrl = OnOffCostMinimisingTimeControl(
+            cost_schedule,
+            simtime,
+            0.0, # Start day
+            0.5, # Schedule data is half-hourly
+            5.0, # Need 5 "on" hours, i.e. 10 timesteps
+            )
+        resulting_schedule \
+            = [False] * 16 + [True] * 4 + [True] * 4 + [False] * 2 + [True] * 2 + [False] * 20
+        for t_idx, _, _ in simtime:
+            with self.subTest(i=t_idx):
+                self.assertEqual(
+                    cost_minimising_ctrl.is_on(),
+                    resulting_schedule[t_idx],
+                    "incorrect schedule returned",
+                    )
+
 
 class Test_SetpointTimeControl(unittest.TestCase):
     """ Unit tests for SetpointTimeControl class """
@@ -191,3 +213,32 @@ class Test_SetpointTimeControl(unittest.TestCase):
                     results_advstart_minmax[t_idx],
                     "incorrect schedule returned for control with advanced start and min and max set",
                     )
+
+    def test_setpnt_advstart_substep(self):
+        """ Test advanced start of more than one timestep, where the simulation
+        timestep is shorter than the timestep of the schedule """
+        simtime = SimulationTime(0, 8, 0.5)
+        schedule = [None, None, None, 21.0, None, None, 20.0, None]
+        timecontrol = SetpointTimeControl(schedule, simtime, 0, 1, None, None, False, 1.0)
+        # Advanced start of 1 hour is 2 simulation timesteps, so look ahead
+        # covers 2 entries of the schedule
+        results_setpnt = [None, None, 21.0, 21.0, 21.0, 21.0, 21.0, 21.0,
+                          20.0, 20.0, 20.0, 20.0, 20.0, 20.0, None, None]
+        for t_idx, _, _ in simtime:
+            with self.subTest(i=t_idx):
+                self.assertEqual(timecontrol.setpnt(), results_setpnt[t_idx])
+                self.assertEqual(timecontrol.is_on(), results_setpnt[t_idx] is not None)
+                self.assertEqual(
+                    timecontrol.in_required_period(),
+                    schedule[t_idx // 2] is not None,
+                    )
+
+    def test_setpnt_minmax_no_default(self):
+        """ Test that error is only reported if setpoint is requested for a
+        timestep where min and max are both set but setpoint is not """
+        timecontrol = SetpointTimeControl(self.schedule, self.simtime, 0, 1, 16.0, 24.0)
+        self.assertEqual(timecontrol.setpnt(), 21.0)
+        next(self.simtime)
+        next(self.simtime)
+        with self.assertRaises(SystemExit):
+            timecontrol.setpnt()
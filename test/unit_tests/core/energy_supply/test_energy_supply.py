@@ -91,6 +91,26 @@ class TestEnergySupply(unittest.TestCase):
                     "incorrect demand by end user returned",
                     )
 
+    def test_results_by_end_user_live(self):
+        """ Check that the live results for each connection reflect the
+        demand recorded so far and match the results returned at the end.
+        """
+        results_live = self.energysupply.results_by_end_user_live()
+        for t_idx, _, _ in self.simtime:
+            with self.subTest(i=t_idx):
+                self.energysupplyconn_1.demand_energy((t_idx+1.0)*50.0)
+                self.energysupplyconn_2.energy_out((t_idx)*20.0)
+                self.assertEqual(results_live["shower"][t_idx], (t_idx+1.0)*50.0)
+                self.assertEqual(results_live["bath"][t_idx], (t_idx)*20.0)
+
+        results = self.energysupply.results_by_end_user()
+        for user_name in ("shower", "bath"):
+            self.assertEqual(len(results_live[user_name]), len(results[user_name]))
+            self.assertListEqual(
+                [results_live[user_name][t_idx] for t_idx in range(len(results[user_name]))],
+                list(results[user_name]),
+                )
+
     def test_beta_factor(self):
         """check beta factor and surplus supply/demand are calculated correctly"""
         energysupplyconn_3 = self.energysupply.connection("PV")
@@ -129,4 +149,82 @@ class TestEnergySupply(unittest.TestCase):
                     demandnotmet[t_idx],
                     "incorrect energy import returned",
                     )
-    
\ No newline at end of file
+    
+    def test_summary_only(self):
+        """ Check that totals are accumulated correctly in summary-only mode,
+        and that the peak net import is recorded in both modes.
+        """
+        energysupply_summary = EnergySupply("mains_gas", self.simtime, summary_only=True)
+        energysupplies = (self.energysupply, energysupply_summary)
+        connections = (
+            (self.energysupplyconn_1, self.energysupplyconn_2, self.energysupply.connection("PV")),
+            (
+                energysupply_summary.connection("shower"),
+                energysupply_summary.connection("bath"),
+                energysupply_summary.connection("PV"),
+            ),
+            )
+
+        for t_idx, _, _ in self.simtime:
+            for energysupply, (conn_shower, conn_bath, conn_pv) \
+                    in zip(energysupplies, connections):
+                conn_shower.demand_energy((t_idx+1.0)*50.0)
+                conn_bath.demand_energy((t_idx)*20.0)
+                conn_pv.supply_energy((t_idx)*(t_idx)*80.0)
+                energysupply.calc_energy_import_export_betafactor()
+                energysupply.timestep_end()
+
+        for user_name in ("shower", "bath", "PV"):
+            self.assertEqual(len(energysupply_summary.results_by_end_user()[user_name]), 1)
+            self.assertAlmostEqual(
+                energysupply_summary.results_by_end_user()[user_name][0],
+                sum(self.energysupply.results_by_end_user()[user_name]),
+                msg="incorrect total demand by end user returned",
+                )
+        for get_results in ('results_total', 'get_energy_import', 'get_energy_export'):
+            with self.subTest(get_results=get_results):
+                results_summary = getattr(energysupply_summary, get_results)()
+                self.assertEqual(len(results_summary), 1)
+                self.assertAlmostEqual(
+                    results_summary[0],
+                    sum(getattr(self.energysupply, get_results)()),
+                    msg="incorrect total returned",
+                    )
+
+        self.assertEqual(self.energysupply.get_peak_net_import(), (50.0, 0))
+        self.assertEqual(energysupply_summary.get_peak_net_import(), (50.0, 0))
+
+    def test_demand_energy_series(self):
+        """ Check that demand recorded for every timestep in advance is
+        included in the results, in both normal and summary-only modes.
+        """
+        energysupply_summary = EnergySupply("mains_gas", self.simtime, summary_only=True)
+        energysupplyconn_summary = energysupply_summary.connection("shower")
+
+        amounts_demanded = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+        self.energysupplyconn_2.demand_energy_series(amounts_demanded)
+        energysupply_summary.connection("bath").demand_energy_series(amounts_demanded)
+
+        for t_idx, _, _ in self.simtime:
+            self.energysupplyconn_1.demand_energy((t_idx+1.0)*50.0)
+            energysupplyconn_summary.demand_energy((t_idx+1.0)*50.0)
+            for energysupply in (self.energysupply, energysupply_summary):
+                energysupply.calc_energy_import_export_betafactor()
+                energysupply.timestep_end()
+
+        self.assertListEqual(
+            self.energysupply.results_by_end_user()["bath"].tolist(),
+            amounts_demanded,
+            )
+        self.assertListEqual(
+            self.energysupply.results_total(),
+            [(t_idx+1.0)*50.0 + amounts_demanded[t_idx] for t_idx in range(8)],
+            )
+        self.assertEqual(
+            energysupply_summary.results_by_end_user()["bath"][0],
+            sum(amounts_demanded),
+            )
+        self.assertEqual(
+            energysupply_summary.get_energy_import()[0],
+            sum(self.energysupply.get_energy_import()),
+            )
@@ -63,28 +63,41 @@ class TestElecStorageHeater(unittest.TestCase):
                 "fan_pwr": 11.0,
                 "n_units": 2}
 
-        self.elecstorageheater = ElecStorageHeater(data['rated_power'],
-                                               data['rated_power_instant'],
-                                               data['air_flow_type'],
-                                               data['temp_dis_safe'],
-                                               data['thermal_mass'],
-                                               data['frac_convective'],
-                                               data['U_ins'],
-                                               data['temp_charge_cut'],
-                                               data['mass_core'],
-                                               data['c_pcore'],
-                                               data['temp_core_target'],
-                                               data['A_core'],
-                                               data['c_wall'],
-                                               data['n_wall'],
-                                               data['thermal_mass_wall'],
-                                               data['fan_pwr'],
-                                               data['n_units'],
-                                               zone,
-                                               energysupplyconn,
-                                               self.simtime,
-                                               control,
-                                               charge_control)
+        def create_elec_storage_heater(zone, use_fast_integrator=False):
+            return ElecStorageHeater(data['rated_power'],
+                                     data['rated_power_instant'],
+                                     data['air_flow_type'],
+                                     data['temp_dis_safe'],
+                                     data['thermal_mass'],
+                                     data['frac_convective'],
+                                     data['U_ins'],
+                                     data['temp_charge_cut'],
+                                     data['mass_core'],
+                                     data['c_pcore'],
+                                     data['temp_core_target'],
+                                     data['A_core'],
+                                     data['c_wall'],
+                                     data['n_wall'],
+                                     data['thermal_mass_wall'],
+                                     data['fan_pwr'],
+                                     data['n_units'],
+                                     zone,
+                                     energysupplyconn,
+                                     self.simtime,
+                                     control,
+                                     charge_control,
+                                     use_fast_integrator)
+
+        self.elecstorageheater = create_elec_storage_heater(zone)
+        self.elecstorageheater_fast = create_elec_storage_heater(zone, use_fast_integrator=True)
+
+        # Also test case where zone is cold enough for heater to charge
+        class ZoneCold:
+            def temp_internal_air(self):
+                return 14.0
+
+        self.elecstorageheater_charging_fast \
+            = create_elec_storage_heater(ZoneCold(), use_fast_integrator=True)
 
     def test_demand_energy(self):
         """ Test that ElecStorageHeater object returns correct energy supplied """
@@ -105,3 +118,47 @@ class TestElecStorageHeater(unittest.TestCase):
                      0.02, 1.58, 1.57, 1.56][t_idx],
                     "incorrect energy supplied returned",
                     )
+
+    def test_demand_energy_fast_integrator(self):
+        """ Test that ElecStorageHeater object using fast integrator returns correct
+        energy supplied and core temperature """
+        # Expected results calculated using solve_ivp (Radau method) with relative
+        # and absolute tolerances of 1e-10 and 1e-8 respectively
+        cases = [
+            (
+                self.elecstorageheater_fast,
+                [3.1797, 2.9239, 2.7069, 2.4804, 0.31, 2.2526, 2.11, 2.0257,
+                 1.9464, 1.9003, 1.8563, 1.8089, 1.763, 1.725, 1.6934, 1.666,
+                 1.6431, 1.6239, 1.6076, 1.5937, 0.0215, 1.5793, 1.5694, 1.5568],
+                [172.5128, 149.2115, 129.4605, 113.0161, 108.3508, 95.846, 85.5123, 76.8756,
+                 69.5885, 63.2193, 57.5291, 52.5042, 48.2119, 44.5488, 41.4076, 38.7087,
+                 36.3876, 34.3828, 32.6447, 31.133, 30.8046, 29.5276, 28.4106, 27.4616],
+                ),
+            (
+                self.elecstorageheater_charging_fast,
+                [4.2957, 3.59, 4.26, 2.82, 0.8155, 3.72, 2.11, 4.7462,
+                 4.71, 4.5974, 4.4245, 2.92, 3.42, 3.4939, 3.1903, 2.9329,
+                 3.9323, 4.4512, 4.65, 3.85, 0.7933, 1.86, 2.27, 2.62],
+                [283.0731, 358.7352, 431.0974, 449.9882, 449.9966, 449.9864, 449.9912, 449.9864,
+                 401.3014, 353.7578, 308.3642, 266.0113, 227.764, 195.1379, 167.4775, 144.0292,
+                 235.1342, 314.3327, 388.3199, 449.9864, 437.8816, 409.889, 375.7264, 336.2965],
+                ),
+            ]
+        energy_demand = [4.69, 3.59, 4.26, 2.82, 0.31, 3.72, 2.11, 6.55,
+                         7.59, 7.55, 4.52, 2.92, 3.42, 5.83, 4.26, 3.63,
+                         4.38, 5.34, 4.65, 3.85, 0, 1.86, 2.27, 2.62]
+        for elecstorageheater, energy_supplied_expected, temp_core_expected in cases:
+            for t_idx, _, _ in self.simtime:
+                with self.subTest(i=t_idx):
+                    self.assertAlmostEqual(
+                        elecstorageheater.demand_energy(energy_demand[t_idx]),
+                        energy_supplied_expected[t_idx],
+                        places=3,
+                        msg="incorrect energy supplied returned",
+                        )
+                    self.assertAlmostEqual(
+                        elecstorageheater.t_core,
+                        temp_core_expected[t_idx],
+                        delta=0.05,
+                        msg="incorrect core temperature",
+                        )
@@ -91,6 +91,16 @@ class TestEmitters(unittest.TestCase):
                 "min_flow_temp": 30}
 
         self.emitters = Emitters(0.14, 0.08, 1.2, 10.0, 0.4, heat_source, zone, ext_cond, ecodesign_controller, 55.0, self.simtime)
+        self.emitters_fast = Emitters(
+            0.14, 0.08, 1.2, 10.0, 0.4, heat_source, zone, ext_cond, ecodesign_controller, 55.0, self.simtime,
+            use_fast_integrator=True,
+            )
+        # Emitters with exponent of 1, for which the fast integrator uses the
+        # analytical solution
+        self.emitters_fast_n1 = Emitters(
+            0.14, 0.08, 1.0, 10.0, 0.4, heat_source, zone, ext_cond, ecodesign_controller, 55.0, self.simtime,
+            use_fast_integrator=True,
+            )
 
     def test_demand_energy(self):
         """ Test that Emitter object returns correct energy supplied """
@@ -116,3 +126,93 @@ class TestEmitters(unittest.TestCase):
                     msg='incorrect emitter temperature calculated'
                     )
 
+
+    def test_demand_energy_fast_integrator(self):
+        """ Test that Emitter object using fast integrator returns energy
+        supplied close to that returned when using solve_ivp """
+        energy_demand_list = [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 0.0, 0.0]
+        energy_demand = 0.0
+        for t_idx, _, _ in self.simtime:
+            with self.subTest(i=t_idx):
+                energy_demand += energy_demand_list[t_idx]
+                energy_provided = self.emitters_fast.demand_energy(energy_demand)
+                energy_demand -= energy_provided
+                # Expected results are the same as for test_demand_energy, but
+                # are compared at lower precision as the results differ within
+                # the tolerance of solve_ivp
+                self.assertAlmostEqual(
+                    energy_provided,
+                    [0.26481930394248643, 0.8287480680413242, 1.053315069769369, 1.053315069769369,
+                     0.9604801440326911, 0.9419772896929609, 0.915353814620655, 0.7639281136418886]
+                    [t_idx],
+                    places=4,
+                    msg='incorrect energy provided by emitters',
+                    )
+                self.assertAlmostEqual(
+                    self.emitters_fast._Emitters__temp_emitter_prev,
+                    [35.96557640041081, 47.20238095238095, 47.20238095238095, 47.20238095238095,
+                     44.78422619047619, 44.78422619047619, 43.67306169524251, 38.21643231208616]
+                    [t_idx],
+                    places=3,
+                    msg='incorrect emitter temperature calculated'
+                    )
+
+    def test_temp_emitter_fast_integrator(self):
+        """ Test that fast integrator returns correct emitter temperatures and
+        times at which max. temperature is reached """
+        # Expected results calculated using solve_ivp with relative and absolute
+        # tolerances of 1e-12
+        cases = [
+            # Cooling towards equilibrium temperature
+            ((0.0, 0.25, 35.0, 20.0, 1.5, None), (34.12945186030022, None)),
+            # Starting below room temperature
+            ((0.0, 0.5, 15.0, 20.0, 2.0, None), (22.04894995171162, None)),
+            ((0.0, 1.0, 15.0, 20.0, 2.5, 25.0), (25.0, 0.5929050378121536)),
+            # Max. temperature reached while heating up
+            ((0.0, 1.0, 25.0, 20.0, 2.5, 30.0), (30.0, 0.44561420747065816)),
+            # Max. temperature not reached
+            ((0.0, 1.0, 25.0, 20.0, 2.5, 45.0), (33.640121950651434, None)),
+            # No power input (solved analytically)
+            ((0.0, 1.0, 50.0, 20.0, 0.0, None), (30.846922209472858, None)),
+            ((0.0, 1.0, 50.0, 20.0, 0.0, 40.0), (40.0, 0.3743651409832324)),
+            ]
+        for args, (temp_emitter_expected, time_max_expected) in cases:
+            with self.subTest(args=args):
+                temp_emitter, time_max = self.emitters_fast.temp_emitter(*args)
+                self.assertAlmostEqual(
+                    temp_emitter,
+                    temp_emitter_expected,
+                    places=7,
+                    msg='incorrect emitter temperature calculated',
+                    )
+                if time_max_expected is None:
+                    self.assertIsNone(time_max, 'max. temperature unexpectedly reached')
+                else:
+                    self.assertAlmostEqual(
+                        time_max,
+                        time_max_expected,
+                        places=8,
+                        msg='incorrect time at which max. temperature is reached',
+                        )
+
+    def test_temp_emitter_fast_integrator_n1(self):
+        """ Test that fast integrator returns correct emitter temperatures and
+        times at which max. temperature is reached for emitters with exponent
+        of 1, including where max. temperature is the equilibrium temperature """
+        # Equilibrium temperature difference is power input / c = 25 K
+        cases = [
+            ((0.0, 1.0, 25.0, 20.0, 2.0, None), (33.70563755984482, None)),
+            ((0.0, 1.0, 25.0, 20.0, 2.0, 30.0), (30.0, 0.5034436267906165)),
+            # Max. temperature is equilibrium temperature, so not reached...
+            ((0.0, 1.0, 25.0, 20.0, 2.0, 45.0), (33.70563755984482, None)),
+            # ... unless reached to within rounding, at end of time period
+            ((0.0, 100.0, 25.0, 20.0, 2.0, 45.0), (45.0, 100.0)),
+            ]
+        for args, (temp_emitter_expected, time_max_expected) in cases:
+            with self.subTest(args=args):
+                temp_emitter, time_max = self.emitters_fast_n1.temp_emitter(*args)
+                self.assertAlmostEqual(temp_emitter, temp_emitter_expected, places=10)
+                if time_max_expected is None:
+                    self.assertIsNone(time_max, 'max. temperature unexpectedly reached')
+                else:
+                    self.assertAlmostEqual(time_max, time_max_expected, places=10)
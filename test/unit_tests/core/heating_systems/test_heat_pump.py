@@ -13,7 +13,7 @@ test_setup()
 
 # Local imports
 from core.heating_systems.heat_pump import \
-    HeatPumpTestData, SourceType, SinkType, \
+    HeatPumpTestData, HeatPumpPerformanceMap, SourceType, SinkType, \
     interpolate_exhaust_air_heat_pump_test_data
 from core.units import Celcius2Kelvin
 
@@ -755,6 +755,95 @@ class TestHeatPumpTestData(unittest.TestCase):
                     )
 
 
+class TestHeatPumpPerformanceMap(unittest.TestCase):
+    """ Unit tests for HeatPumpPerformanceMap class """
+
+    def setUp(self):
+        """ Create HeatPumpTestData object to provide exact values """
+        self.hp_testdata = HeatPumpTestData(data_unsorted)
+
+    def test_lookup_bilinear(self):
+        """ Test that a bilinear function is reproduced exactly """
+        def func(temp_output, temp_source):
+            return (
+                2.0 + 0.1 * temp_output - 0.05 * temp_source,
+                0.001 * temp_output * temp_source,
+                )
+        perf_map = HeatPumpPerformanceMap(func, 0.5, 1e-6)
+
+        for temp_output, temp_source in [
+            [308.15, 283.15],
+            [308.40, 283.30],
+            [318.00, 270.00],
+            [323.15, 278.65],
+            ]:
+            with self.subTest(temp_output=temp_output, temp_source=temp_source):
+                for value, value_exact \
+                in zip(perf_map.lookup(temp_output, temp_source), func(temp_output, temp_source)):
+                    self.assertAlmostEqual(
+                        value,
+                        value_exact,
+                        msg="incorrect value looked up from performance map",
+                        )
+        self.assertAlmostEqual(perf_map.error_max(), 0.0)
+
+    def test_lookup_inaccurate_cell(self):
+        """ Test that no values are returned in cells where interpolation is
+        not accurate enough """
+        def func(temp_output, temp_source):
+            # Kink at temp_output == temp_source + 30.2
+            return (abs(temp_output - temp_source - 30.2), )
+        perf_map = HeatPumpPerformanceMap(func, 0.5, 1e-3)
+
+        for temp_output, temp_source in [
+            [310.40, 280.00],
+            [310.20, 280.00],
+            [310.30, 280.10],
+            ]:
+            with self.subTest(temp_output=temp_output, temp_source=temp_source):
+                self.assertIsNone(
+                    perf_map.lookup(temp_output, temp_source),
+                    "values returned where interpolation is inaccurate",
+                    )
+        self.assertEqual(perf_map.error_max(), 0.0)
+
+    def test_lookup_test_data(self):
+        """ Test that values looked up from map of CoP and capacity calculated
+        from test data are within tolerance of exact values """
+        tolerance = 1e-3
+
+        def func(temp_output, temp_source):
+            return (
+                self.hp_testdata.cop_op_cond_if_not_air_source(
+                    5.0,
+                    Celcius2Kelvin(5.0),
+                    temp_source,
+                    temp_output,
+                    ),
+                self.hp_testdata.capacity_op_cond_if_not_air_source(
+                    temp_output,
+                    temp_source,
+                    True,
+                    ),
+                )
+        perf_map = HeatPumpPerformanceMap(func, 0.5, tolerance)
+
+        for temp_output in [308.15, 310.37, 313.15, 318.90, 323.15, 327.81]:
+            for temp_source in [273.15, 275.42, 278.15, 283.15, 286.07]:
+                with self.subTest(temp_output=temp_output, temp_source=temp_source):
+                    values = perf_map.lookup(temp_output, temp_source)
+                    if values is None:
+                        # Caller would use exact values
+                        continue
+                    for value, value_exact in zip(values, func(temp_output, temp_source)):
+                        self.assertLessEqual(
+                            abs(value - value_exact) / max(1.0, abs(value_exact)),
+                            tolerance,
+                            "value looked up from performance map not within tolerance",
+                            )
+        self.assertLessEqual(perf_map.error_max(), tolerance)
+
+
 class TestSourceType(unittest.TestCase):
     """ Unit tests for SourceType """
 
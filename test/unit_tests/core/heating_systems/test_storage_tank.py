@@ -106,6 +106,23 @@ class Test_StorageTank(unittest.TestCase):
                     msg="incorrect energy supplied returned in case where heater does not heat all layers",
                     )
 
+    def test_rearrange_temperatures(self):
+        # Layers are mixed in a single pass from the bottom of the tank, with
+        # each unstable layer mixed with the group of layers below it
+        cases = [
+            ([50.0, 51.0, 52.0, 53.0], [50.0, 51.0, 52.0, 53.0]),
+            ([54.0, 51.0, 52.0, 53.0], [52.333333333333336, 52.333333333333336, 52.333333333333336, 53.0]),
+            ([55.0, 51.0, 50.0, 49.0], [51.25, 51.25, 51.25, 51.25]),
+            ([50.0, 56.0, 52.0, 49.0], [50.0, 52.333333333333336, 52.333333333333336, 52.333333333333336]),
+            ([50.0, 49.0, 53.0, 52.0], [49.5, 49.5, 52.5, 52.5]),
+            ]
+        for temp_s6_n, temp_s7_n_expected in cases:
+            with self.subTest(temp_s6_n=temp_s6_n):
+                Q_h_sto_end, temp_s7_n = self.storagetank.rearrange_temperatures(temp_s6_n)
+                self.assertListEqual(temp_s7_n, temp_s7_n_expected)
+                for Q_h_sto_i, temp_s7_i in zip(Q_h_sto_end, temp_s7_n):
+                    self.assertAlmostEqual(Q_h_sto_i, 37.5 * WATER.specific_heat_capacity_kWh() * WATER.density() * temp_s7_i)
+
 class Test_ImmersionHeater(unittest.TestCase):
     """ Unit tests for ImmersionHeater class """
 
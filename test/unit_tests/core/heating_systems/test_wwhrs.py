@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+"""
+This module contains unit tests for the WWHRS module
+"""
+
+# Standard library imports
+import unittest
+
+# Third-party imports
+import numpy as np
+
+# Set path to include modules to be tested (must be before local imports)
+from unit_tests.common import test_setup
+test_setup()
+
+# Local imports
+from core.simulation_time import SimulationTime
+from core.water_heat_demand.cold_water_source import ColdWaterSource
+from core.heating_systems.wwhrs import \
+    WWHRS_InstantaneousSystemA, WWHRS_InstantaneousSystemB, WWHRS_InstantaneousSystemC
+
+
+class TestWWHRS_InstantaneousSystemB(unittest.TestCase):
+    """ Unit tests for WWHRS_InstantaneousSystemB class """
+
+    def setUp(self):
+        """ Create WWHRS object to be tested """
+        self.simtime = SimulationTime(0, 3, 1)
+        self.cold_water_source = ColdWaterSource([8.0, 9.0, 10.0], self.simtime, 0, 1)
+        # Flow rates deliberately not in ascending order
+        flow_rates = [14.0, 5.0, 7.0, 9.0, 11.0, 13.0]
+        efficiencies = [30.0, 44.8, 39.1, 34.8, 31.4, 28.4]
+        self.wwhrs = WWHRS_InstantaneousSystemB(
+            flow_rates,
+            efficiencies,
+            self.cold_water_source,
+            0.81,
+            )
+
+    def test_get_efficiency_from_flowrate(self):
+        """ Test that efficiency is interpolated correctly for scalar and array inputs """
+        self.assertAlmostEqual(self.wwhrs.get_efficiency_from_flowrate(8.0), 36.95)
+        self.assertAlmostEqual(self.wwhrs.get_efficiency_from_flowrate(13.5), 29.2)
+        self.assertEqual(self.wwhrs.get_efficiency_from_flowrate(5.0), 44.8)
+
+        flowrates = [5.0, 8.0, 13.5, 14.0]
+        np.testing.assert_allclose(
+            self.wwhrs.get_efficiency_from_flowrate(flowrates),
+            [44.8, 36.95, 29.2, 30.0],
+            err_msg="incorrect efficiencies for array of flow rates",
+            )
+
+    def test_get_efficiency_from_flowrate_out_of_range(self):
+        """ Test that flow rates outside the efficiency table are rejected """
+        with self.assertRaises(ValueError):
+            self.wwhrs.get_efficiency_from_flowrate(4.0)
+        with self.assertRaises(ValueError):
+            self.wwhrs.get_efficiency_from_flowrate([8.0, 15.0])
+
+    def test_return_temperature(self):
+        """ Test that pre-heated cold water temperature is calculated correctly """
+        for t_idx, _, _ in self.simtime:
+            with self.subTest(i=t_idx):
+                temp_cold = [8.0, 9.0, 10.0][t_idx]
+                self.assertAlmostEqual(
+                    self.wwhrs.return_temperature(41.0, 8.0),
+                    temp_cold + 36.95 * 0.81 / 100 * (41.0 - temp_cold),
+                    )
+
+
+class TestWWHRS_InstantaneousSystemsAC(unittest.TestCase):
+    """ Unit tests for WWHRS_InstantaneousSystemA and C classes """
+
+    def test_get_efficiency_from_flowrate(self):
+        """ Test that System A and C interpolate efficiency in the same way as System B """
+        simtime = SimulationTime(0, 1, 1)
+        cold_water_source = ColdWaterSource([10.0], simtime, 0, 1)
+        for wwhrs_class in (WWHRS_InstantaneousSystemA, WWHRS_InstantaneousSystemC):
+            with self.subTest(wwhrs_class=wwhrs_class.__name__):
+                wwhrs = wwhrs_class([5.0, 10.0], [40.0, 30.0], cold_water_source, 1.0)
+                self.assertAlmostEqual(wwhrs.get_efficiency_from_flowrate(7.5), 35.0)
+                np.testing.assert_allclose(
+                    wwhrs.get_efficiency_from_flowrate(np.array([5.0, 6.0, 10.0])),
+                    [40.0, 38.0, 30.0],
+                    )
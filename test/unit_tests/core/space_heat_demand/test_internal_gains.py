@@ -35,6 +35,24 @@ class TestInternalGains(unittest.TestCase):
                     "incorrect internal gains returned",
                     )
 
+    def test_precompute_zone_gains(self):
+        """ Test that InternalGains object returns correct internal gains for
+        each zone for every timestep """
+        self.internalgains.precompute_zone_gains({'zone 1': 10.0, 'zone 2': 5.0})
+        internal_gain_by_zone = self.internalgains.internal_gain_by_zone()
+        for t_idx, _, _ in self.simtime:
+            with self.subTest(i=t_idx):
+                self.assertEqual(
+                    internal_gain_by_zone['zone 1'][t_idx],
+                    self.internalgains.total_internal_gain(10.0),
+                    "incorrect internal gains returned for zone 1",
+                    )
+                self.assertEqual(
+                    internal_gain_by_zone['zone 2'][t_idx],
+                    self.internalgains.total_internal_gain(5.0),
+                    "incorrect internal gains returned for zone 2",
+                    )
+
 
 class TestApplianceGains(unittest.TestCase):
     """ Unit tests for ApplianceGains class """
@@ -61,3 +79,19 @@ class TestApplianceGains(unittest.TestCase):
                     [0.32, 0.46, 0.30, 0.20][t_idx],
                     "incorrect electricity demand  returned"
                     )
+
+    def test_precompute_zone_gains(self):
+        """ Test that ApplianceGains object returns correct internal gains for
+        each zone for every timestep, and records electricity demand for all
+        zones in advance """
+        self.appliancegains.precompute_zone_gains({'zone 1': 6.0, 'zone 2': 4.0})
+        internal_gain_by_zone = self.appliancegains.internal_gain_by_zone()
+        self.assertListEqual(internal_gain_by_zone['zone 1'], [96.0, 138.0, 90.0, 60.0])
+        self.assertListEqual(internal_gain_by_zone['zone 2'], [64.0, 92.0, 60.0, 40.0])
+        for t_idx, _, _ in self.simtime:
+            with self.subTest(i=t_idx):
+                self.assertAlmostEqual(
+                    self.energysupply.results_by_end_user()["lighting"][t_idx],
+                    [0.32, 0.46, 0.30, 0.20][t_idx],
+                    msg="incorrect electricity demand returned"
+                    )
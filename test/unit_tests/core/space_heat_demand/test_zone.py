@@ -7,6 +7,9 @@ This module contains unit tests for the building_element module
 # Standard library imports
 import unittest
 
+# Third-party imports
+import numpy as np
+
 # Set path to include modules to be tested (must be before local imports)
 from unit_tests.common import test_setup
 test_setup()
@@ -158,6 +161,24 @@ class TestZone(unittest.TestCase):
                          ve_objs,
                          temp_ext_air_init,
                          temp_setpnt_init)
+        self.zone_fast_solver = Zone(50.0,
+                                     125.0,
+                                     be_objs,
+                                     tb_objs,
+                                     ve_objs,
+                                     temp_ext_air_init,
+                                     temp_setpnt_init,
+                                     use_fast_solver = True)
+        self.zone_linear_superposition = Zone(50.0,
+                                              125.0,
+                                              be_objs,
+                                              tb_objs,
+                                              ve_objs,
+                                              temp_ext_air_init,
+                                              temp_setpnt_init,
+                                              use_fast_solver = True,
+                                              use_linear_superposition = True,
+                                              simulation_time = self.simtime)
 
     def test_volume(self):
         """ Test that the correct volume is returned when queried """
@@ -196,3 +217,108 @@ class TestZone(unittest.TestCase):
                                157.9,
                                1,
                                "incorrect total ventilation heat loss returned")
+
+    def __run_zones_and_compare(self, zone_ref, zone_test, msg, solve_externally=False):
+        """ Run heating/cooling demand and temperature update for two zones over
+        the simulation and check that the results are the same. If
+        solve_externally is True, the heat balance eqns for zone_test are
+        solved outside the Zone object.
+        """
+        gains_internal = [100.0, 250.0, 0.0, 400.0]
+        gains_solar = [0.0, 50.0, 150.0, 0.0]
+        for t_idx, _, delta_t_h in self.simtime:
+            with self.subTest(i=t_idx):
+                delta_t = delta_t_h * 3600.0
+                results = []
+                for zone in (zone_ref, zone_test):
+                    if solve_externally and zone is zone_test:
+                        matrix_a, vector_b = zone.heat_balance_system(
+                            delta_t_h,
+                            self.airtemp[t_idx],
+                            gains_internal[t_idx],
+                            gains_solar[t_idx],
+                            )
+                        zone.set_heat_balance_solution(np.linalg.solve(matrix_a, vector_b))
+                    space_heat_demand, space_cool_demand, _ = zone.space_heat_cool_demand(
+                        delta_t_h,
+                        self.airtemp[t_idx],
+                        gains_internal[t_idx],
+                        gains_solar[t_idx],
+                        0.4,
+                        0.4,
+                        21.0,
+                        24.0,
+                        )
+                    gains_heat_cool = (space_heat_demand + space_cool_demand) \
+                                    * 1000.0 / delta_t_h
+                    zone.update_temperatures(
+                        delta_t,
+                        self.airtemp[t_idx],
+                        gains_internal[t_idx],
+                        gains_solar[t_idx],
+                        gains_heat_cool,
+                        0.4,
+                        )
+                    results.append(
+                        (space_heat_demand, space_cool_demand, zone.temp_internal_air(), zone.temp_operative())
+                        )
+
+                for result, result_test in zip(*results):
+                    self.assertAlmostEqual(result, result_test, msg=msg)
+
+    def test_fast_solver(self):
+        """ Test that the optimised solver gives the same results as the full
+        matrix solver
+        """
+        self.__run_zones_and_compare(
+            self.zone,
+            self.zone_fast_solver,
+            "results from optimised solver do not match full matrix solver",
+            )
+
+    def test_linear_superposition(self):
+        """ Test that linear superposition gives the same results as solving
+        the heat balance eqns for each calculation of temperatures
+        """
+        self.__run_zones_and_compare(
+            self.zone,
+            self.zone_linear_superposition,
+            "results using linear superposition do not match full matrix solver",
+            )
+
+    def test_linear_superposition_new_timestep(self):
+        """ Test that solutions from linear superposition are not reused in
+        a later timestep, even if the temperatures have not been updated and
+        the other inputs are the same
+        """
+        results = {}
+        for t_idx, _, delta_t_h in self.simtime:
+            for zone in (self.zone, self.zone_linear_superposition):
+                results.setdefault(zone, []).append(
+                    zone.space_heat_cool_demand(delta_t_h, 10.0, 100.0, 0.0, 0.4, 0.4, 21.0, 24.0)
+                    )
+        demand_ref = results[self.zone]
+        # Check that results do depend on the timestep, otherwise the test is ineffective
+        self.assertNotAlmostEqual(demand_ref[0][0], demand_ref[-1][0])
+        for t_idx, (result_ref, result) \
+        in enumerate(zip(demand_ref, results[self.zone_linear_superposition])):
+            with self.subTest(i=t_idx):
+                for value_ref, value in zip(result_ref, result):
+                    self.assertAlmostEqual(value_ref, value)
+
+    def test_linear_superposition_requires_simulation_time(self):
+        with self.assertRaises(SystemExit):
+            Zone(50.0, 125.0, [], 0.0, [], 17, 21,
+                 use_fast_solver = True,
+                 use_linear_superposition = True)
+
+    def test_heat_balance_system(self):
+        """ Test that solving the heat balance eqns outside the Zone object
+        gives the same results as the full matrix solver
+        """
+        self.__run_zones_and_compare(
+            self.zone,
+            self.zone_linear_superposition,
+            "results using external solution do not match full matrix solver",
+            solve_externally = True,
+            )
@@ -6,6 +6,7 @@ This module contains unit tests for the external_conditions module
 
 # Standard library imports
 import unittest
+from itertools import product
 
 # Set path to include modules to be tested (must be before local imports)
 from unit_tests.common import test_setup
@@ -205,3 +206,209 @@ class TestExternalConditions(unittest.TestCase):
                     self.solar_reflectivity_of_ground[t_idx],
                     "incorrect solar_reflectivity_of_ground returned",
                     )
+
+    def test_calculated_direct_diffuse_total_irradiance(self):
+        """ Test that ExternalConditions object returns correct direct, diffuse
+        and total irradiance on a vertical south-facing surface in August,
+        with and without solar irradiance precalculated for all timesteps
+        """
+        # Radiation data starts at the beginning of day 212, 8 hours before
+        # the simulation start
+        diffuse_horizontal_radiation = [0.0] * 8 + self.diffuse_horizontal_radiation
+        direct_beam_radiation = [0.0] * 8 + self.direct_beam_radiation
+
+        expected = {
+            False: [
+                (147.1026323977398, 173.62793082313448, 320.7305632208743),
+                (433.1695296445282, 278.1002845435503, 711.2698141880785),
+                (362.67958205065145, 249.07998894447135, 611.7595709951228),
+                (395.9622340288817, 213.8934205175872, 609.8556545464689),
+                (0.0, 0.0, 0.0),
+                (25.520602778549534, 8.087031984160333, 33.607634762709864),
+                (0.0, 47.70569306021568, 47.70569306021568),
+                (161.1284674269115, 151.91349386554896, 313.0419612924604),
+                ],
+            True: [
+                (217.12039563503086, 191.0643349374652, 408.18473057249605),
+                (512.7477656888452, 294.4272574860459, 807.1750231748911),
+                (427.93246258312183, 259.658479385907, 687.5909419690288),
+                (452.26177319219846, 222.5405195213985, 674.8022927135969),
+                (0.0, 0.0, 0.0),
+                (30.5835179160548, 8.890680586720155, 39.474198502774954),
+                (0.0, 47.70569306021568, 47.70569306021568),
+                (227.48815002406513, 166.5762951139816, 394.0644451380467),
+                ],
+            }
+
+        for (direct_beam_conversion_needed, expected_irradiance), precompute_solar \
+                in product(expected.items(), (False, True)):
+            simtime = SimulationTime(5096, 5104, 1)
+            extcond = ExternalConditions(
+                simtime,
+                self.airtemp,
+                self.windspeed,
+                diffuse_horizontal_radiation,
+                direct_beam_radiation,
+                self.solar_reflectivity_of_ground,
+                self.latitude,
+                self.longitude,
+                self.timezone,
+                212,
+                self.end_day,
+                self.time_series_step,
+                self.january_first,
+                self.daylight_savings,
+                self.leap_day_included,
+                direct_beam_conversion_needed,
+                self.shading_segments,
+                precompute_solar,
+                )
+            for t_idx, _, _ in simtime:
+                with self.subTest(
+                        conversion=direct_beam_conversion_needed,
+                        precompute_solar=precompute_solar,
+                        i=t_idx,
+                        ):
+                    for result, expected_value in zip(
+                            extcond.calculated_direct_diffuse_total_irradiance(90, 0),
+                            expected_irradiance[t_idx],
+                            ):
+                        self.assertAlmostEqual(
+                            result,
+                            expected_value,
+                            msg="incorrect irradiance returned",
+                            )
+
+    def test_precompute_solar(self):
+        """ Test that precalculating solar irradiance for all timesteps gives
+        the same results as calculating it timestep by timestep
+        """
+        diffuse_horizontal_radiation = [0.0] * 8 + self.diffuse_horizontal_radiation
+        direct_beam_radiation = [0.0] * 8 + self.direct_beam_radiation
+
+        simtime = SimulationTime(5096, 5104, 1)
+        extconds = [
+            ExternalConditions(
+                simtime,
+                self.airtemp,
+                self.windspeed,
+                diffuse_horizontal_radiation,
+                direct_beam_radiation,
+                self.solar_reflectivity_of_ground,
+                self.latitude,
+                self.longitude,
+                self.timezone,
+                212,
+                self.end_day,
+                self.time_series_step,
+                self.january_first,
+                self.daylight_savings,
+                self.leap_day_included,
+                True,
+                self.shading_segments,
+                precompute_solar,
+                )
+            for precompute_solar in (False, True)
+            ]
+
+        for t_idx, _, _ in simtime:
+            for tilt, orientation in ((90, 90), (90, -90), (45, 180), (0, 0), (135, 30)):
+                with self.subTest(i=t_idx, tilt=tilt, orientation=orientation):
+                    results, results_precomputed = [
+                        extcond.calculated_direct_diffuse_total_irradiance(
+                            tilt,
+                            orientation,
+                            diffuse_breakdown=True,
+                            )
+                        for extcond in extconds
+                        ]
+                    for result, result_precomputed in zip(results[:3], results_precomputed[:3]):
+                        self.assertAlmostEqual(
+                            result,
+                            result_precomputed,
+                            msg="incorrect precomputed irradiance returned",
+                            )
+                    for component, result in results[3].items():
+                        self.assertAlmostEqual(
+                            result,
+                            results_precomputed[3][component],
+                            msg="incorrect precomputed diffuse irradiance breakdown returned",
+                            )
+                    self.assertAlmostEqual(
+                        extconds[0].calculated_total_solar_irradiance(tilt, orientation),
+                        extconds[1].calculated_total_solar_irradiance(tilt, orientation),
+                        msg="incorrect precomputed total irradiance returned",
+                        )
+
+    def test_shading_reduction_factor_direct_diffuse(self):
+        """ Test that ExternalConditions object returns correct direct and
+        diffuse shading factors for a window with overhang and side fins and
+        distant obstacle and overhang shading, with and without shading
+        factors precalculated for all timesteps
+        """
+        diffuse_horizontal_radiation = [0.0] * 8 + self.diffuse_horizontal_radiation
+        direct_beam_radiation = [0.0] * 8 + self.direct_beam_radiation
+        shading_segments = [
+            {"number": 1, "start": 180, "end": 135},
+            {"number": 2, "start": 135, "end": 90},
+            {"number": 3, "start": 90, "end": 45},
+            {"number": 4, "start": 45, "end": 0,
+             "shading": [{"type": "obstacle", "height": 10.5, "distance": 12}]},
+            {"number": 5, "start": 0, "end": -45,
+             "shading": [{"type": "overhang", "height": 2.2, "distance": 6}]},
+            {"number": 6, "start": -45, "end": -90},
+            {"number": 7, "start": -90, "end": -135},
+            {"number": 8, "start": -135, "end": -180}
+        ]
+        window_shading = [
+            {"type": "overhang", "depth": 0.5, "distance": 0.5},
+            {"type": "sidefinleft", "depth": 0.25, "distance": 0.1},
+            {"type": "sidefinright", "depth": 0.25, "distance": 0.1},
+        ]
+
+        expected_Fdir = [
+            0.5711668133826009, 0.6475300781950809, 0.7211632753252005, 0.7861544076217551,
+            0.0, 0.0, 0.7615378206088294, 0.7653904529514828,
+            ]
+        expected_Fdiff = [
+            0.5905238865770632, 0.5905238865770632, 0.5905238865770632, 0.5905238865770632,
+            0.0, 0.5905238865770632, 0.5905238865770632, 0.5905238865770632,
+            ]
+
+        for precompute_solar in (False, True):
+            simtime = SimulationTime(5096, 5104, 1)
+            extcond = ExternalConditions(
+                simtime,
+                self.airtemp,
+                self.windspeed,
+                diffuse_horizontal_radiation,
+                direct_beam_radiation,
+                self.solar_reflectivity_of_ground,
+                self.latitude,
+                self.longitude,
+                self.timezone,
+                212,
+                self.end_day,
+                self.time_series_step,
+                self.january_first,
+                self.daylight_savings,
+                self.leap_day_included,
+                self.direct_beam_conversion_needed,
+                shading_segments,
+                precompute_solar,
+                )
+            for t_idx, _, _ in simtime:
+                with self.subTest(precompute_solar=precompute_solar, i=t_idx):
+                    Fdir, Fdiff = extcond.shading_reduction_factor_direct_diffuse(
+                        1.0, 1.25, 1.5, 90, 0, window_shading,
+                        )
+                    self.assertAlmostEqual(
+                        Fdir,
+                        expected_Fdir[t_idx],
+                        msg="incorrect direct shading factor returned",
+                        )
+                    self.assertAlmostEqual(
+                        Fdiff,
+                        expected_Fdiff[t_idx],
+                        msg="incorrect diffuse shading factor returned",
+                        )
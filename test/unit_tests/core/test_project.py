@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+
+"""
+This module contains unit tests for the Project class
+"""
+
+# Standard library imports
+import unittest
+import os
+import io
+import json
+import shutil
+import tempfile
+from copy import deepcopy
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+# Third-party imports
+import numpy as np
+
+# Set path to include modules to be tested (must be before local imports)
+from unit_tests.common import test_setup
+test_setup()
+
+# Local imports
+from read_weather_file import weather_data_to_dict
+from core.project import Project
+
+def load_demo_eahp_project_dict():
+    """ Return input for the exhaust air heat pump demo (which has WHEV
+    ventilation), using weather data from the Edinburgh weather file """
+    proj_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__)
+        ))))
+    with open(os.path.join(proj_path, 'test', 'demo_files', 'core', 'demo_eahp.json')) \
+    as json_file:
+        project_dict = json.load(json_file)
+
+    # Copy weather file to temporary directory, so that cache files are
+    # written there
+    with tempfile.TemporaryDirectory() as tempdir:
+        weather_file = os.path.join(tempdir, 'weather.epw')
+        shutil.copy2(
+            os.path.join(proj_path, 'GBR_SCT_Edinburgh.Gogarbank.031660_TMYx.epw'),
+            weather_file,
+            )
+        external_conditions = weather_data_to_dict(weather_file)
+    external_conditions['shading_segments'] \
+        = project_dict['ExternalConditions']['shading_segments']
+    project_dict['ExternalConditions'] = external_conditions
+    return project_dict
+
+class TestProjectThroughputFactor(unittest.TestCase):
+    """ Unit tests for iteration of throughput factor in Project class, using
+    the exhaust air heat pump demo (which has WHEV ventilation) """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.project_dict = load_demo_eahp_project_dict()
+
+    def run_project(self, iterate_throughput_factor, use_fast_solver=False):
+        project = Project(
+            deepcopy(self.project_dict),
+            False,
+            False,
+            use_fast_solver,
+            iterate_throughput_factor=iterate_throughput_factor,
+            )
+        return project, project.run()
+
+    def test_iterate_throughput_factor(self):
+        """ Test that iterating the throughput factor converges, records the
+        number of iterations and makes a small change to space heating demand
+        compared to recalculating it once """
+        project_single, results_single = self.run_project(False)
+        project_iter, results_iter = self.run_project(True)
+
+        self.assertIsNone(project_single.throughput_factor_iterations())
+        iterations = project_iter.throughput_factor_iterations()
+        self.assertEqual(len(iterations), len(results_iter.timestep_array))
+        # Iterated in some timesteps, and not others (no overventilation)
+        self.assertTrue(np.any(iterations > 1))
+        self.assertTrue(np.any(iterations == 0))
+        self.assertEqual(project_iter.throughput_factor_not_converged(), 0)
+
+        for z_name, space_heat_demand in results_single.zone_dict['Space heat demand'].items():
+            with self.subTest(zone=z_name):
+                space_heat_demand_iter = results_iter.zone_dict['Space heat demand'][z_name]
+                # No overventilation, so no change in first timestep
+                self.assertEqual(space_heat_demand_iter[0], space_heat_demand[0])
+                self.assertNotEqual(sum(space_heat_demand_iter), sum(space_heat_demand))
+                self.assertAlmostEqual(
+                    sum(space_heat_demand_iter) / sum(space_heat_demand),
+                    1.0,
+                    places=2,
+                    )
+
+    def test_iterate_throughput_factor_fast_solver(self):
+        """ Test that reusing zone solver inputs between iterations with the
+        optimised solver gives the same results as the default solver """
+        project_fast, results_fast = self.run_project(True, use_fast_solver=True)
+        project_iter, results_iter = self.run_project(True)
+
+        np.testing.assert_array_equal(
+            project_fast.throughput_factor_iterations(),
+            project_iter.throughput_factor_iterations(),
+            )
+        for z_name, space_heat_demand in results_iter.zone_dict['Space heat demand'].items():
+            with self.subTest(zone=z_name):
+                np.testing.assert_allclose(
+                    results_fast.zone_dict['Space heat demand'][z_name],
+                    space_heat_demand,
+                    rtol=1e-10,
+                    )
+
+    def test_iterate_throughput_factor_not_converged(self):
+        """ Test that, when the iteration limit is reached, the throughput
+        factor returned is the last one for which space heating demand was
+        calculated, and that non-convergence is reported """
+        # With one iteration allowed, the only throughput factor for which
+        # demand is calculated is the one from the demand with no
+        # overventilation, so results should match the single-pass calculation
+        _, results_single = self.run_project(False)
+        with patch.object(Project, '_Project__THROUGHPUT_FACTOR_MAX_ITERATIONS', 1):
+            with redirect_stdout(io.StringIO()) as stdout:
+                project_iter, results_iter = self.run_project(True)
+
+        self.assertTrue(np.all(project_iter.throughput_factor_iterations() <= 1))
+        not_converged = project_iter.throughput_factor_not_converged()
+        self.assertGreater(not_converged, 0)
+        self.assertIn(
+            'Warning: Throughput factor calculation did not converge in '
+            + str(not_converged) + ' timesteps',
+            stdout.getvalue(),
+            )
+        for results_group in ('Space heat demand', 'Internal air temp'):
+            for z_name, results in results_single.zone_dict[results_group].items():
+                with self.subTest(results_group=results_group, zone=z_name):
+                    np.testing.assert_array_equal(
+                        results_iter.zone_dict[results_group][z_name],
+                        results,
+                        )
+        for name in results_single.results_end_user['mains elec']:
+            with self.subTest(end_user=name):
+                np.testing.assert_array_equal(
+                    results_iter.results_end_user['mains elec'][name],
+                    results_single.results_end_user['mains elec'][name],
+                    )
+
+class RecordingSink:
+    """ Output sink that records the results passed to it for each timestep """
+
+    def __init__(self, fail_at_t_idx=None):
+        self.fail_at_t_idx = fail_at_t_idx
+        self.space_heat_demand = {}
+        self.energy_import = []
+        self.closed = False
+
+    def open(self, results):
+        self.results = results
+        for z_name in results.zone_dict['Space heat demand'].keys():
+            self.space_heat_demand[z_name] = []
+
+    def write_timestep(self, t_idx, r_idx):
+        if t_idx == self.fail_at_t_idx:
+            raise RuntimeError('Failed at timestep ' + str(t_idx))
+        for z_name, demand in self.results.zone_dict['Space heat demand'].items():
+            self.space_heat_demand[z_name].append(demand[r_idx])
+        self.energy_import.append(self.results.energy_import['mains elec'][r_idx])
+
+    def close(self):
+        self.closed = True
+
+class TestProjectOutputSinks(unittest.TestCase):
+    """ Unit tests for writing results as the simulation progresses using
+    output sinks registered with the Project class """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.project_dict = load_demo_eahp_project_dict()
+
+    def create_project(self, summary_only):
+        return Project(
+            deepcopy(self.project_dict),
+            False,
+            False,
+            True,
+            summary_only=summary_only,
+            )
+
+    def test_summary_only(self):
+        """ Test that, in summary-only mode, output sinks receive the results
+        for every timestep while only totals are returned """
+        results_full = self.create_project(False).run()
+        project = self.create_project(True)
+        sink = RecordingSink()
+        project.register_output_sink(sink)
+        results = project.run()
+
+        self.assertTrue(sink.closed)
+        for z_name, space_heat_demand in results_full.zone_dict['Space heat demand'].items():
+            with self.subTest(zone=z_name):
+                np.testing.assert_array_equal(sink.space_heat_demand[z_name], space_heat_demand)
+                self.assertEqual(len(results.zone_dict['Space heat demand'][z_name]), 1)
+                self.assertAlmostEqual(
+                    results.zone_dict['Space heat demand'][z_name][0],
+                    sum(space_heat_demand),
+                    )
+        np.testing.assert_array_equal(
+            sink.energy_import,
+            results_full.energy_import['mains elec'],
+            )
+
+    def test_sinks_closed_on_error(self):
+        """ Test that output sinks are closed if the simulation stops early """
+        project = self.create_project(True)
+        sink = RecordingSink(fail_at_t_idx=3)
+        project.register_output_sink(sink)
+        with self.assertRaises(RuntimeError):
+            project.run()
+
+        self.assertTrue(sink.closed)
+        self.assertEqual(len(sink.energy_import), 3)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+"""
+This module contains unit tests for the ProjectBatch class
+"""
+
+# Standard library imports
+import unittest
+import os
+import json
+import shutil
+import tempfile
+from copy import deepcopy
+
+# Third-party imports
+import numpy as np
+
+# Set path to include modules to be tested (must be before local imports)
+from unit_tests.common import test_setup
+test_setup()
+
+# Local imports
+from read_weather_file import weather_data_to_dict
+from core.project import Project
+from core.project_batch import ProjectBatch
+
+class FinishedProject:
+    """ Minimal stand-in for a Project object whose calculation finishes
+    without any timesteps being run """
+
+    def run_timesteps(self):
+        return 'results'
+        yield
+
+class TestProjectBatch(unittest.TestCase):
+    """ Unit tests for ProjectBatch class """
+
+    @classmethod
+    def setUpClass(cls):
+        proj_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__)
+            ))))
+
+        # Copy weather file to temporary directory, so that cache files are
+        # written there
+        with tempfile.TemporaryDirectory() as tempdir:
+            weather_file = os.path.join(tempdir, 'weather.epw')
+            shutil.copy2(
+                os.path.join(proj_path, 'GBR_SCT_Edinburgh.Gogarbank.031660_TMYx.epw'),
+                weather_file,
+                )
+            external_conditions = weather_data_to_dict(weather_file)
+
+        # Projects with different numbers of zones, systems and timesteps
+        cls.project_dicts = []
+        for demo_file, end in (('demo_hp.json', 8), ('demo_eahp.json', 5)):
+            with open(os.path.join(proj_path, 'test', 'demo_files', 'core', demo_file)) \
+            as json_file:
+                project_dict = json.load(json_file)
+            project_dict['SimulationTime']['end'] = end
+            for events_by_name in project_dict['Events'].values():
+                for name, events in events_by_name.items():
+                    events_by_name[name] = [e for e in events if e['start'] < end]
+            external_conditions_proj = deepcopy(external_conditions)
+            external_conditions_proj['shading_segments'] \
+                = project_dict['ExternalConditions']['shading_segments']
+            project_dict['ExternalConditions'] = external_conditions_proj
+            cls.project_dicts.append(project_dict)
+
+    def create_project(self, project_dict, use_fast_solver):
+        return Project(deepcopy(project_dict), False, False, use_fast_solver)
+
+    def test_run(self):
+        """ Test that running projects in a batch gives exactly the same
+        results as running them individually """
+        for use_fast_solver in (True, False):
+            with self.subTest(use_fast_solver=use_fast_solver):
+                results_batch = ProjectBatch([
+                    self.create_project(project_dict, use_fast_solver)
+                    for project_dict in self.project_dicts
+                    ]).run()
+
+                self.assertEqual(len(results_batch), len(self.project_dicts))
+                for project_dict, results in zip(self.project_dicts, results_batch):
+                    results_single \
+                        = self.create_project(project_dict, use_fast_solver).run()
+                    self.assertEqual(
+                        len(results.timestep_array),
+                        project_dict['SimulationTime']['end'],
+                        )
+                    for field in results_single._fields:
+                        np.testing.assert_equal(
+                            getattr(results, field),
+                            getattr(results_single, field),
+                            err_msg=field,
+                            )
+
+    def test_run_project_finished_immediately(self):
+        """ Test that a project that finishes before yielding any zone heat
+        balance eqns does not stop the others from running """
+        project_dict = self.project_dicts[1]
+        results_batch = ProjectBatch([
+            FinishedProject(),
+            self.create_project(project_dict, True),
+            ]).run()
+
+        self.assertEqual(results_batch[0], 'results')
+        results_single = self.create_project(project_dict, True).run()
+        np.testing.assert_equal(results_batch[1].zone_dict, results_single.zone_dict)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+
+"""
+This module contains unit tests for the results module
+"""
+
+# Standard library imports
+import unittest
+
+# Set path to include modules to be tested (must be before local imports)
+from unit_tests.common import test_setup
+test_setup()
+
+# Local imports
+from core.results import ResultsBuffers, ResultsTotals
+
+class TestResultsBuffers(unittest.TestCase):
+    """ Unit tests for ResultsBuffers class """
+
+    def setUp(self):
+        """ Create ResultsBuffers object to be tested """
+        self.results = ResultsBuffers(4)
+
+    def test_register(self):
+        """ Test that registered channels are preallocated and appear in groups """
+        temps = self.results.register('Operative temp', 'zone 1')
+        self.assertEqual(list(temps), [0.0, 0.0, 0.0, 0.0])
+
+        for t_idx, temp in enumerate([20.0, 20.5, 21.0, 21.5]):
+            temps[t_idx] = temp
+        self.assertEqual(
+            list(self.results.group('Operative temp')['zone 1']),
+            [20.0, 20.5, 21.0, 21.5],
+            )
+
+        with self.assertRaises(ValueError):
+            self.results.register('Operative temp', 'zone 1')
+
+    def test_group(self):
+        """ Test that groups retrieved before registration are populated """
+        heat_balance = self.results.group('Heat balance')
+        self.assertEqual(heat_balance, {})
+        self.results.register('Heat balance', 'air_node', 'zone 1', 'solar gains')[1] = 5.0
+        self.assertEqual(
+            list(heat_balance['air_node']['zone 1']['solar gains']),
+            [0.0, 5.0, 0.0, 0.0],
+            )
+
+class TestResultsTotals(unittest.TestCase):
+    """ Unit tests for ResultsTotals class """
+
+    def setUp(self):
+        """ Create ResultsTotals object to be tested """
+        self.results = ResultsTotals()
+
+    def test_totals(self):
+        """ Test that results for each timestep are accumulated into totals """
+        heat_demand = self.results.register('Space heat demand', 'zone 1')
+        # Register enough channels to need more than one block
+        others = [self.results.register('Other', str(i)) for i in range(100)]
+        space_heat_demand = self.results.group('Space heat demand')
+
+        for heat_demand_t in [1.0, 2.5, 0.0, 4.0]:
+            heat_demand[0] = heat_demand_t
+            others[-1][0] = 1.0
+            self.results.timestep_end()
+            self.assertEqual(heat_demand[0], 0.0)
+
+        with self.assertRaises(ValueError):
+            self.results.register('Space heat demand', 'zone 1')
+
+        self.results.finalise()
+        self.assertEqual(list(space_heat_demand['zone 1']), [7.5])
+        self.assertEqual(list(self.results.group('Other')['99']), [4.0])
+        self.assertEqual(list(self.results.group('Other')['0']), [0.0])
+
+    def test_reductions(self):
+        """ Test that each channel is reduced as chosen when it was registered,
+        and that all reductions are available for every channel """
+        temp = self.results.register('Operative temp', 'zone 1', reduction='mean')
+        temp_min = self.results.register('Min temp', 'zone 1', reduction='min')
+        heat_demand = self.results.register('Space heat demand', 'zone 1')
+        with self.assertRaises(ValueError):
+            self.results.register('Other', 'zone 1', reduction='median')
+
+        for temp_t, heat_demand_t in [(18.0, 1.0), (21.0, 0.0), (19.5, 2.0)]:
+            temp[0] = temp_t
+            temp_min[0] = temp_t
+            heat_demand[0] = heat_demand_t
+            self.results.timestep_end()
+
+        self.assertDictEqual(
+            self.results.statistics('Operative temp', 'zone 1'),
+            {'sum': 58.5, 'mean': 19.5, 'min': 18.0, 'max': 21.0},
+            )
+        self.assertDictEqual(
+            self.results.statistics('Space heat demand', 'zone 1'),
+            {'sum': 3.0, 'mean': 1.0, 'min': 0.0, 'max': 2.0},
+            )
+
+        self.results.finalise()
+        self.assertEqual(list(self.results.group('Operative temp')['zone 1']), [19.5])
+        self.assertEqual(list(self.results.group('Min temp')['zone 1']), [18.0])
+        self.assertEqual(list(self.results.group('Space heat demand')['zone 1']), [3.0])
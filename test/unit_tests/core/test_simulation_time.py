@@ -30,6 +30,16 @@ class TestSimulationTime(unittest.TestCase):
         """ Test that total steps has been calculated correctly """
         self.assertEqual(self.simtime.total_steps(), 8, "incorrect total steps")
 
+    def test_times(self):
+        """ Test that array of times matches the times returned by iteration """
+        for start, end, step in ((742, 746, 0.5), (0, 24, 1.0 / 12.0), (0, 1, 0.1)):
+            simtime = SimulationTime(start, end, step)
+            times = simtime.times()
+            expected = [simtime.current() for _ in simtime]
+            with self.subTest(step=step):
+                self.assertEqual(len(times), len(expected), "incorrect number of times")
+                self.assertEqual(list(times), expected, "incorrect times returned")
+
     def test_iteration(self):
         """ Test that SimulationTime object works as an iterator """
         # Call to iter() should return reference to same object
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+"""
+This module contains unit tests for the weather_store module
+"""
+
+# Standard library imports
+import unittest
+import os
+import pickle
+import tempfile
+from math import sin, pi
+
+# Set path to include modules to be tested (must be before local imports)
+from unit_tests.common import test_setup
+test_setup()
+
+# Local imports
+from core.simulation_time import SimulationTime
+from core.external_conditions import ExternalConditions
+from core.weather_store import WeatherStore, write_weather_store, \
+    weather_file_hash, weather_store_source_hash
+
+class TestWeatherStore(unittest.TestCase):
+    """ Unit tests for WeatherStore class """
+
+    def setUp(self):
+        """ Create weather data and write it to a weather store """
+        hours_per_year = 8760
+        self.external_conditions_dict = {
+            'air_temperatures': [
+                10.0 + 8.0 * sin(2.0 * pi * (h - 2000) / hours_per_year)
+                + 4.0 * sin(2.0 * pi * (h - 9) / 24)
+                for h in range(hours_per_year)
+                ],
+            'wind_speeds': [4.0 + (h % 7) * 0.3 for h in range(hours_per_year)],
+            'diffuse_horizontal_radiation': [
+                max(0.0, 150.0 * sin(2.0 * pi * (h - 6) / 24))
+                for h in range(hours_per_year)
+                ],
+            'direct_beam_radiation': [
+                max(0.0, 400.0 * sin(2.0 * pi * (h - 6) / 24)) * (h % 3) / 2.0
+                for h in range(hours_per_year)
+                ],
+            'solar_reflectivity_of_ground': [0.2] * hours_per_year,
+            'latitude': 51.383,
+            'longitude': -0.783,
+            'direct_beam_conversion_needed': False,
+            }
+        self.shading_segments = [
+            {"number": 1, "start": 180, "end": 135},
+            {"number": 2, "start": 135, "end": 90},
+            {"number": 3, "start": 90, "end": 45},
+            {"number": 4, "start": 45, "end": 0},
+            {"number": 5, "start": 0, "end": -45},
+            {"number": 6, "start": -45, "end": -90},
+            {"number": 7, "start": -90, "end": -135},
+            {"number": 8, "start": -135, "end": -180},
+            ]
+
+        self.tempdir = tempfile.TemporaryDirectory()
+        write_weather_store(self.tempdir.name, self.external_conditions_dict)
+        self.weather_store = WeatherStore(self.tempdir.name)
+
+    def tearDown(self):
+        """ Remove weather store """
+        del self.weather_store
+        self.tempdir.cleanup()
+
+    def __external_conditions(self, simtime):
+        """ Create ExternalConditions object directly from weather data """
+        return ExternalConditions(
+            simtime,
+            self.external_conditions_dict['air_temperatures'],
+            self.external_conditions_dict['wind_speeds'],
+            self.external_conditions_dict['diffuse_horizontal_radiation'],
+            self.external_conditions_dict['direct_beam_radiation'],
+            self.external_conditions_dict['solar_reflectivity_of_ground'],
+            self.external_conditions_dict['latitude'],
+            self.external_conditions_dict['longitude'],
+            0,
+            0,
+            365,
+            1,
+            None,
+            None,
+            None,
+            self.external_conditions_dict['direct_beam_conversion_needed'],
+            self.shading_segments,
+            )
+
+    def test_external_conditions_dict(self):
+        """ Test that weather data read from store matches original data """
+        external_conditions_dict = self.weather_store.external_conditions_dict()
+        for name, expected in self.external_conditions_dict.items():
+            if isinstance(expected, list):
+                self.assertEqual(
+                    list(external_conditions_dict[name]),
+                    expected,
+                    "incorrect " + name,
+                    )
+            else:
+                self.assertEqual(
+                    external_conditions_dict[name],
+                    expected,
+                    "incorrect " + name,
+                    )
+
+    def test_from_weather_store(self):
+        """ Test that ExternalConditions created from store gives the same
+        results as one created directly from weather data """
+        for start, end, step in ((0, 48, 1), (4000, 4024, 0.5)):
+            with self.subTest(start=start, end=end, step=step):
+                simtime_ref = SimulationTime(start, end, step)
+                simtime_store = SimulationTime(start, end, step)
+                ext_cond_ref = self.__external_conditions(simtime_ref)
+                ext_cond_store = ExternalConditions.from_weather_store(
+                    simtime_store,
+                    self.weather_store,
+                    self.shading_segments,
+                    )
+                for _, _ in zip(simtime_ref, simtime_store):
+                    self.assertEqual(ext_cond_store.air_temp(), ext_cond_ref.air_temp())
+                    self.assertEqual(ext_cond_store.wind_speed(), ext_cond_ref.wind_speed())
+                    for tilt, orientation in ((90, 0), (45, 90), (0, 0), (90, -135)):
+                        self.assertAlmostEqual(
+                            ext_cond_store.calculated_total_solar_irradiance(tilt, orientation),
+                            ext_cond_ref.calculated_total_solar_irradiance(tilt, orientation),
+                            msg="incorrect solar irradiance at tilt " + str(tilt)
+                                + " and orientation " + str(orientation),
+                            )
+
+    def test_pickle(self):
+        """ Test that weather store can be passed to other processes """
+        weather_store = pickle.loads(pickle.dumps(self.weather_store))
+        self.assertEqual(
+            list(weather_store.array('air_temperatures')),
+            list(self.weather_store.array('air_temperatures')),
+            )
+        self.assertEqual(
+            weather_store.metadata('latitude'),
+            self.external_conditions_dict['latitude'],
+            )
+
+    def test_source_hash(self):
+        """ Test that the weather file a store was created from is recorded
+        and that the store can be overwritten """
+        weather_filenames = [
+            os.path.join(self.tempdir.name, 'weather_' + str(i) + '.epw')
+            for i in range(2)
+            ]
+        for i, weather_filename in enumerate(weather_filenames):
+            with open(weather_filename, 'w') as weather_file:
+                weather_file.write('weather data ' + str(i))
+        hashes = [weather_file_hash(filename) for filename in weather_filenames]
+        self.assertNotEqual(hashes[0], hashes[1])
+        self.assertEqual(hashes[0], weather_file_hash(weather_filenames[0]))
+
+        # Store written without a hash, and no store at all
+        self.assertIsNone(weather_store_source_hash(self.tempdir.name))
+        self.assertIsNone(
+            weather_store_source_hash(os.path.join(self.tempdir.name, 'missing')),
+            )
+
+        store_path = os.path.join(self.tempdir.name, 'store')
+        write_weather_store(store_path, self.external_conditions_dict, hashes[0])
+        self.assertEqual(weather_store_source_hash(store_path), hashes[0])
+
+        # Overwrite store with different weather data
+        self.external_conditions_dict['air_temperatures'] \
+            = [t + 1.0 for t in self.external_conditions_dict['air_temperatures']]
+        write_weather_store(store_path, self.external_conditions_dict, hashes[1])
+        self.assertEqual(weather_store_source_hash(store_path), hashes[1])
+        weather_store = WeatherStore(store_path)
+        self.assertEqual(
+            list(weather_store.array('air_temperatures')),
+            self.external_conditions_dict['air_temperatures'],
+            )
+        self.assertEqual(weather_store.metadata('source_file_hash'), hashes[1])
+        self.assertFalse(any(name.endswith('.tmp') for name in os.listdir(store_path)))
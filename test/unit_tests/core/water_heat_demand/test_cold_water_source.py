@@ -33,3 +33,11 @@ class TestColdWaterSource(unittest.TestCase):
                     self.watertemp[t_idx],
                     "incorrect water temp returned",
                     )
+
+    def test_temperature_per_timestep(self):
+        """ Test that ColdWaterSource object returns correct water temperatures
+        for every timestep """
+        self.assertListEqual(
+            self.coldwater.temperature_per_timestep().tolist(),
+            self.watertemp,
+            )
@@ -7,6 +7,9 @@ This module contains unit tests for the shower module
 # Standard library imports
 import unittest
 
+# Third-party imports
+import numpy as np
+
 # Set path to include modules to be tested (must be before local imports)
 from unit_tests.common import test_setup
 test_setup()
@@ -16,6 +19,7 @@ from core.simulation_time import SimulationTime
 from core.energy_supply.energy_supply import EnergySupplyConnection, EnergySupply
 from core.water_heat_demand.cold_water_source import ColdWaterSource
 from core.water_heat_demand.shower import MixerShower, InstantElecShower
+from core.heating_systems.wwhrs import WWHRS_InstantaneousSystemB
 
 class TestMixerShower(unittest.TestCase):
     """ Unit tests for MixerShower class """
@@ -26,6 +30,13 @@ class TestMixerShower(unittest.TestCase):
         coldwatertemps       = [2.0, 3.0, 4.0]
         coldwatersource      = ColdWaterSource(coldwatertemps, self.simtime, 0, 1)
         self.mixershower     = MixerShower(6.5, coldwatersource)
+        wwhrs = WWHRS_InstantaneousSystemB(
+            [5.0, 7.0, 9.0, 11.0, 13.0],
+            [44.8, 39.1, 34.8, 31.0, 27.1],
+            coldwatersource,
+            0.81,
+            )
+        self.mixershower_wwhrs = MixerShower(6.5, coldwatersource, wwhrs)
 
     def test_hot_water_demand(self):
         """ Test that MixerShower object returns correct volume of hot water """
@@ -37,6 +48,35 @@ class TestMixerShower(unittest.TestCase):
                     "incorrect volume of hot water returned"
                     )
 
+    def test_hot_water_demand_events(self):
+        """ Test that MixerShower object returns correct volume of hot water
+        for several events at once """
+        self.assertListEqual(
+            self.mixershower.hot_water_demand_events(
+                np.array([40.0, 40.0, 40.0]),
+                np.array([5.0, 5.0, 5.0]),
+                np.array([2.0, 3.0, 4.0]),
+                ).tolist(),
+            [24.7, 24.54081632653061, 24.375],
+            )
+
+    def test_hot_water_demand_events_with_wwhrs(self):
+        """ Test that hot water demand for several events at once cannot be
+        calculated for a shower with WWHRS """
+        with self.assertRaises(SystemExit):
+            self.mixershower_wwhrs.hot_water_demand_events(
+                np.array([40.0]),
+                np.array([5.0]),
+                np.array([2.0]),
+                )
+        # Per-timestep calculation still accounts for heat recovered by WWHRS
+        for t_idx, _, _ in self.simtime:
+            with self.subTest(i=t_idx):
+                self.assertLess(
+                    self.mixershower_wwhrs.hot_water_demand(40.0, 5.0),
+                    self.mixershower.hot_water_demand(40.0, 5.0),
+                    )
+
 class TestInstantElecShower(unittest.TestCase):
     """ Unit tests for InstantElecShower class """
 
@@ -66,3 +106,19 @@ class TestInstantElecShower(unittest.TestCase):
                     [86.04206500956023, 175.59605103991885, 268.8814531548757][t_idx],
                     "correct hot water demand not returned"
                     )
+
+    def test_hot_water_demand_events(self):
+        """ Test that correct electricity demand and equivalent hot water
+        volume are returned for several events at once, without recording
+        demand on the energy supply """
+        vol_hot_water_equiv, elec_demand = self.instantelecshower.hot_water_demand_events(
+            np.array([40.0, 40.0, 40.0]),
+            np.array([6.0, 12.0, 18.0]),
+            np.array([2.0, 3.0, 4.0]),
+            )
+        self.assertListEqual(elec_demand.tolist(), [5.0, 10.0, 15.0])
+        self.assertListEqual(
+            vol_hot_water_equiv.tolist(),
+            [86.04206500956023, 175.59605103991885, 268.8814531548757],
+            )
+        self.assertListEqual(self.energysupply.results_total(), [0, 0, 0])
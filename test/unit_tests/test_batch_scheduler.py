@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+"""
+This module contains unit tests for the batch_scheduler module
+"""
+
+# Standard library imports
+import unittest
+import os
+import io
+import json
+import time
+import tempfile
+from contextlib import redirect_stdout, redirect_stderr
+
+# Set path to include modules to be tested (must be before local imports)
+from unit_tests.common import test_setup
+test_setup()
+
+# Local imports
+from batch_scheduler import run_jobs
+
+def example_job(inp_filename, behaviour, output_dir):
+    """ Job for testing, which records each attempt in a file named after the
+    job and then behaves as specified """
+    attempts_file = os.path.join(output_dir, inp_filename + '.attempts')
+    with open(attempts_file, 'a') as f:
+        f.write('x')
+    with open(attempts_file) as f:
+        attempt = len(f.read())
+
+    if behaviour == 'hang':
+        time.sleep(60)
+    elif behaviour == 'fail':
+        raise ValueError('Invalid input in ' + inp_filename)
+    elif behaviour == 'fail_first' and attempt == 1:
+        raise ValueError('Transient failure in ' + inp_filename)
+    elif behaviour == 'crash':
+        os._exit(3)
+
+class TestRunJobs(unittest.TestCase):
+    """ Unit tests for run_jobs function """
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def run_example_jobs(self, behaviours, **kwargs):
+        jobs = [
+            {'inp_filename': 'job' + str(i), 'behaviour': behaviour}
+            for i, behaviour in enumerate(behaviours)
+            ]
+        manifest_filename = os.path.join(self.tempdir.name, 'manifest.json')
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            manifest = run_jobs(
+                example_job,
+                jobs,
+                2,
+                shared_args={'output_dir': self.tempdir.name},
+                manifest_filename=manifest_filename,
+                **kwargs,
+                )
+        with open(manifest_filename) as manifest_file:
+            self.assertEqual(json.load(manifest_file), manifest)
+        return manifest
+
+    def attempts(self, job_name):
+        with open(os.path.join(self.tempdir.name, job_name + '.attempts')) as f:
+            return len(f.read())
+
+    def test_outcomes(self):
+        """ Test that each job is isolated from the others, that failed and
+        timed-out jobs are retried and that the outcomes are recorded """
+        time_start = time.monotonic()
+        manifest = self.run_example_jobs(
+            ['succeed', 'hang', 'fail_first', 'fail', 'crash'],
+            timeout=1.0,
+            retries=1,
+            )
+        # Hanging job is terminated rather than waited for
+        self.assertLess(time.monotonic() - time_start, 30.0)
+
+        self.assertListEqual([entry['job'] for entry in manifest], list(range(5)))
+        self.assertListEqual(
+            [entry['name'] for entry in manifest],
+            ['job' + str(i) for i in range(5)],
+            )
+        self.assertListEqual(
+            [entry['outcome'] for entry in manifest],
+            ['success', 'timeout', 'success', 'failed', 'failed'],
+            )
+        self.assertListEqual([entry['attempts'] for entry in manifest], [1, 2, 2, 2, 2])
+        for entry in manifest:
+            with self.subTest(job=entry['name']):
+                self.assertEqual(self.attempts(entry['name']), entry['attempts'])
+
+        self.assertIsNone(manifest[0]['error'])
+        self.assertIsNone(manifest[2]['error'])
+        self.assertEqual(manifest[1]['error'], 'Exceeded time limit of 1.0 s')
+        self.assertGreaterEqual(manifest[1]['run_time'], 1.0)
+        self.assertIn('ValueError: Invalid input in job3', manifest[3]['error'])
+        self.assertEqual(manifest[4]['error'], 'Process exited with code 3')
+
+    def test_no_retries(self):
+        """ Test that failed jobs are not retried by default """
+        manifest = self.run_example_jobs(['fail_first', 'succeed'])
+        self.assertListEqual(
+            [(entry['outcome'], entry['attempts']) for entry in manifest],
+            [('failed', 1), ('success', 1)],
+            )
+        self.assertIn('Transient failure in job0', manifest[0]['error'])
+        self.assertEqual(self.attempts('job0'), 1)
+
+    def test_invalid_processes(self):
+        with self.assertRaises(SystemExit):
+            run_jobs(example_job, [], 0)
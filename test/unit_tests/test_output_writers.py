@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+
+"""
+This module contains unit tests for the output_writers module
+"""
+
+# Standard library imports
+import unittest
+import os
+import csv
+import json
+import tempfile
+
+# Set path to include modules to be tested (must be before local imports)
+from unit_tests.common import test_setup
+test_setup()
+
+# Third-party imports
+import numpy as np
+
+# Local imports
+from output_writers import table_writer, column_kinds, npz_column_name
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+def load_npz_columns(filename):
+    """ Return dict of columns in npz file, keyed by heading """
+    with np.load(filename) as results:
+        return {
+            heading: results[npz_column_name(col_idx)]
+            for col_idx, heading in enumerate(results['__headings__'])
+            }
+
+class TestColumnKinds(unittest.TestCase):
+    """ Unit tests for column_kinds function """
+
+    def test_column_kinds(self):
+        self.assertListEqual(
+            column_kinds([0, 1, 2.5, True, 'JAN', None], 7),
+            ['int', 'float', 'float', 'bool', 'str', 'float', 'float'],
+            )
+        self.assertListEqual(column_kinds([1.5, np.int64(3)], 2), ['float', 'float'])
+
+class TestTableWriter(unittest.TestCase):
+    """ Unit tests for objects returned by table_writer function """
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.output_file_stub = os.path.join(self.tempdir.name, 'results')
+        self.headings = ['Timestep', 'Energy', 'Temp']
+        self.units_row = ['[count]', '[kWh]', '[deg C]']
+        self.rows = [[t_idx, t_idx * 1.5, 20.0 + t_idx] for t_idx in range(20000)]
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_csv(self):
+        writer = table_writer(self.output_file_stub, 'csv', self.headings, self.units_row)
+        for row in self.rows[0:3]:
+            writer.write_row(row)
+        writer.close()
+
+        with open(self.output_file_stub + '.csv', newline='') as f:
+            self.assertListEqual(
+                list(csv.reader(f)),
+                [
+                    self.headings,
+                    self.units_row,
+                    ['0', '0.0', '20.0'],
+                    ['1', '1.5', '21.0'],
+                    ['2', '3.0', '22.0'],
+                ],
+                )
+
+    def test_csv_preamble(self):
+        writer = table_writer(
+            self.output_file_stub,
+            'csv',
+            self.headings,
+            self.units_row,
+            has_preamble=True,
+            )
+        writer.write_row(self.rows[0])
+        writer.close([['', 'Total'], ['', 4.5]])
+
+        with open(self.output_file_stub + '.csv', newline='') as f:
+            self.assertListEqual(
+                list(csv.reader(f)),
+                [['', 'Total'], ['', '4.5'], self.headings, self.units_row, ['0', '0.0', '20.0']],
+                )
+        # Check that temporary file for body of table has been removed
+        self.assertListEqual(os.listdir(self.tempdir.name), ['results.csv'])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet(self):
+        writer = table_writer(
+            self.output_file_stub,
+            'parquet',
+            self.headings,
+            self.units_row,
+            has_preamble=True,
+            )
+        for row in self.rows:
+            writer.write_row(row)
+        writer.write_row([len(self.rows), 1.0])
+        writer.close([['', 'Total'], ['', 4.5]])
+
+        parquet_file = pyarrow.parquet.ParquetFile(self.output_file_stub + '.parquet')
+        # Rows are written in more than one row group
+        self.assertGreater(parquet_file.num_row_groups, 1)
+        table = parquet_file.read()
+        self.assertListEqual(table.column_names, self.headings)
+        for field, units in zip(table.schema, self.units_row):
+            self.assertEqual(field.metadata[b'units'].decode(), units)
+        self.assertListEqual(
+            table.to_pylist()[0:2],
+            [
+                {'Timestep': 0, 'Energy': 0.0, 'Temp': 20.0},
+                {'Timestep': 1, 'Energy': 1.5, 'Temp': 21.0},
+            ],
+            )
+        # Short row is padded with nulls
+        self.assertDictEqual(
+            table.to_pylist()[-1],
+            {'Timestep': len(self.rows), 'Energy': 1.0, 'Temp': None},
+            )
+        self.assertEqual(
+            json.loads(parquet_file.metadata.metadata[b'preamble']),
+            [['', 'Total'], ['', 4.5]],
+            )
+
+    def test_npz(self):
+        writer = table_writer(
+            self.output_file_stub,
+            'npz',
+            self.headings + ['Month'],
+            self.units_row + [''],
+            has_preamble=True,
+            )
+        for row in self.rows:
+            writer.write_row(row + ['JAN'])
+        writer.write_row([len(self.rows), 1.0])
+        writer.close([['', 'Total'], ['', 4.5]])
+
+        columns = load_npz_columns(self.output_file_stub + '.npz')
+        self.assertEqual(columns['Timestep'].dtype, np.int64)
+        self.assertListEqual(list(columns['Timestep']), list(range(len(self.rows) + 1)))
+        self.assertListEqual(list(columns['Energy'][0:3]), [0.0, 1.5, 3.0])
+        # Short row is padded with NaN
+        self.assertTrue(np.isnan(columns['Temp'][-1]))
+        self.assertListEqual(list(columns['Month'][-2:]), ['JAN', ''])
+        with np.load(self.output_file_stub + '.npz') as results:
+            self.assertListEqual(list(results['__headings__']), self.headings + ['Month'])
+            self.assertListEqual(list(results['__units__']), self.units_row + [''])
+            self.assertEqual(
+                json.loads(results['__preamble__'].item()),
+                [['', 'Total'], ['', 4.5]],
+                )
+
+    def test_npz_headings(self):
+        """ Test that headings that are not valid keyword argument names, or
+        that clash with the names of arguments or other arrays, are stored """
+        headings = ['file', 'allow_pickle', '__units__', 'Energy [kWh/m2]', '']
+        writer = table_writer(self.output_file_stub, 'npz', headings, [''] * len(headings))
+        writer.write_row([1.0, 2.0, 3.0, 4.0, 5.0])
+        writer.close()
+
+        columns = load_npz_columns(self.output_file_stub + '.npz')
+        self.assertListEqual(list(columns.keys()), headings)
+        self.assertListEqual(
+            [column.tolist() for column in columns.values()],
+            [[1.0], [2.0], [3.0], [4.0], [5.0]],
+            )
+
+    def test_widen_column(self):
+        """ Test that a column is stored as strings if a value in the first
+        block of rows cannot be converted to the type of the first value """
+        formats = ['npz'] if pyarrow is None else ['npz', 'parquet']
+        for output_format in formats:
+            with self.subTest(output_format=output_format):
+                writer = table_writer(
+                    self.output_file_stub,
+                    output_format,
+                    self.headings,
+                    self.units_row,
+                    )
+                writer.write_row([0, 1.5, 20.0])
+                writer.write_row([1, 3.0, 'DIV/0'])
+                writer.write_row([2, 4.5])
+                writer.close()
+
+                if output_format == 'npz':
+                    columns = load_npz_columns(self.output_file_stub + '.npz')
+                    self.assertListEqual(list(columns['Energy']), [1.5, 3.0, 4.5])
+                    self.assertListEqual(list(columns['Temp']), ['20.0', 'DIV/0', ''])
+                else:
+                    table = pyarrow.parquet.read_table(self.output_file_stub + '.parquet')
+                    self.assertListEqual(table.column('Energy').to_pylist(), [1.5, 3.0, 4.5])
+                    self.assertListEqual(
+                        table.column('Temp').to_pylist(),
+                        ['20.0', 'DIV/0', None],
+                        )
+
+    def test_unconvertible_value(self):
+        """ Test that a value after the first block of rows that cannot be
+        converted to the type of its column is an error, rather than being
+        written as a missing value """
+        formats = ['npz'] if pyarrow is None else ['npz', 'parquet']
+        for output_format in formats:
+            with self.subTest(output_format=output_format):
+                writer = table_writer(
+                    self.output_file_stub,
+                    output_format,
+                    self.headings,
+                    self.units_row,
+                    )
+                for row in self.rows:
+                    writer.write_row(row)
+                writer.write_row([len(self.rows), 1.0, 'DIV/0'])
+                with self.assertRaises(SystemExit) as cm:
+                    writer.close()
+                self.assertIn('DIV/0', str(cm.exception.code))
+                self.assertIn('row ' + str(len(self.rows)), str(cm.exception.code))
+                self.assertIn('column "Temp"', str(cm.exception.code))
+
+    def test_duplicate_headings(self):
+        """ Test that duplicate headings are an error in the binary formats,
+        where columns are identified by their headings """
+        formats = ['npz'] if pyarrow is None else ['npz', 'parquet']
+        for output_format in formats:
+            with self.subTest(output_format=output_format):
+                with self.assertRaises(SystemExit) as cm:
+                    table_writer(
+                        self.output_file_stub,
+                        output_format,
+                        self.headings + ['Energy'],
+                        self.units_row + ['[kWh]'],
+                        )
+                self.assertIn('"Energy"', str(cm.exception.code))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+"""
+This module contains unit tests for the read_weather_file module
+"""
+
+# Standard library imports
+import unittest
+import os
+import csv
+import shutil
+import tempfile
+
+# Set path to include modules to be tested (must be before local imports)
+from unit_tests.common import test_setup
+test_setup()
+
+# Local imports
+from read_weather_file import weather_data_to_dict
+from weather_file_cache import CACHE_FILENAME_SUFFIX
+
+class TestReadWeatherFile(unittest.TestCase):
+    """ Unit tests for weather_data_to_dict function """
+
+    def setUp(self):
+        """ Copy weather file to temporary directory, so that cache files are
+        written there """
+        proj_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.weather_file = os.path.join(self.tempdir.name, 'weather.epw')
+        shutil.copy(
+            os.path.join(proj_path, 'GBR_SCT_Edinburgh.Gogarbank.031660_TMYx.epw'),
+            self.weather_file,
+            )
+
+        # Read weather file row by row for comparison
+        self.expected = {
+            "air_temperatures": [],
+            "wind_speeds": [],
+            "diffuse_horizontal_radiation": [],
+            "direct_beam_radiation": [],
+            }
+        with open(self.weather_file) as csv_file:
+            for line_count, row in enumerate(csv.reader(csv_file)):
+                if line_count == 0:
+                    self.expected["longitude"] = float(row[7])
+                    self.expected["latitude"] = float(row[6])
+                elif line_count >= 8:
+                    self.expected["air_temperatures"].append(float(row[6]))
+                    self.expected["wind_speeds"].append(float(row[21]))
+                    self.expected["direct_beam_radiation"].append(float(row[14]))
+                    self.expected["diffuse_horizontal_radiation"].append(float(row[15]))
+        self.expected["solar_reflectivity_of_ground"] \
+            = [0.2] * len(self.expected["air_temperatures"])
+        self.expected["direct_beam_conversion_needed"] = False
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def __cache_files(self):
+        return [
+            filename for filename in os.listdir(self.tempdir.name)
+            if filename.endswith(CACHE_FILENAME_SUFFIX)
+            ]
+
+    def __assert_data_correct(self, external_conditions):
+        self.assertEqual(external_conditions.keys(), self.expected.keys())
+        for name, expected in self.expected.items():
+            if isinstance(expected, list):
+                self.assertEqual(list(external_conditions[name]), expected, "incorrect " + name)
+            else:
+                self.assertEqual(external_conditions[name], expected, "incorrect " + name)
+
+    def test_weather_data_to_dict(self):
+        """ Test that weather data is read correctly, both from the weather
+        file and from the cache """
+        self.assertEqual(self.__cache_files(), [])
+        self.__assert_data_correct(weather_data_to_dict(self.weather_file))
+        self.assertEqual(len(self.__cache_files()), 1, "cache file not written")
+        self.__assert_data_correct(weather_data_to_dict(self.weather_file))
+        self.assertEqual(len(self.__cache_files()), 1)
+
+    def test_cache_invalidated(self):
+        """ Test that cache is not used if weather file is changed """
+        weather_data_to_dict(self.weather_file)
+        with open(self.weather_file) as f:
+            lines = f.readlines()
+        row = lines[8].split(',')
+        row[6] = '-12.5'
+        lines[8] = ','.join(row)
+        with open(self.weather_file, 'w') as f:
+            f.writelines(lines)
+
+        external_conditions = weather_data_to_dict(self.weather_file)
+        self.assertEqual(external_conditions["air_temperatures"][0], -12.5)
+        self.assertEqual(len(self.__cache_files()), 2)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+"""
+This module contains unit tests for the FHS hot water events module
+"""
+
+# Standard library imports
+import unittest
+import random
+
+# Third-party imports
+import numpy as np
+
+# Set path to include modules to be tested (must be before local imports)
+from unit_tests.common import test_setup
+test_setup()
+
+# Local imports
+from wrappers.future_homes_standard.FHS_HW_events import \
+    HW_events_generator, load_decile_banding, load_decile_events, random_floats, \
+    HW_event_interval_index, HW_event_scheduler
+
+
+class TestHWEventsGenerator(unittest.TestCase):
+    """ Unit tests for HW_events_generator class """
+
+    def test_random_floats(self):
+        """ Test that vectorised draws match successive calls to random.Random """
+        rng = random.Random(37)
+        rng_ref = random.Random(37)
+        rng.random()
+        rng_ref.random()
+
+        self.assertEqual(
+            random_floats(rng, 1000).tolist(),
+            [rng_ref.random() for _ in range(1000)],
+            )
+        self.assertEqual(rng.random(), rng_ref.random(), "rng state not advanced")
+
+    def test_tables_memoised(self):
+        """ Test that the decile tables are only read once """
+        HW_events_generator(100.0)
+        banding_misses = load_decile_banding.cache_info().misses
+        events_misses = load_decile_events.cache_info().misses
+        HW_events_generator(60.0, 12)
+        self.assertEqual(load_decile_banding.cache_info().misses, banding_misses)
+        self.assertEqual(load_decile_events.cache_info().misses, events_misses)
+
+    def test_build_annual_HW_events(self):
+        """ Test that events are reproducible and consistent with event statistics """
+        HWeventgen = HW_events_generator(100.0)
+        events = HWeventgen.build_annual_HW_events()
+        events_array = HW_events_generator(100.0).build_annual_HW_events_array()
+
+        self.assertEqual(events, HW_events_generator(100.0).build_annual_HW_events())
+        self.assertNotEqual(events, HW_events_generator(100.0, 38).build_annual_HW_events())
+        self.assertEqual(len(events), len(events_array))
+        self.assertEqual([event['time'] for event in events], events_array['time'].tolist())
+
+        # Events are in time order, within the hour they were generated for
+        times = events_array['time']
+        self.assertTrue(np.all(np.diff(np.floor(times)) >= 0))
+        self.assertTrue(np.all((times >= 0.0) & (times < 8760.0)))
+
+        # Volumes and durations are the mean values for the event type
+        for event in events[:50]:
+            with self.subTest(event=event):
+                day_name = list(HWeventgen.week)[int(event['time'] // 24) % 7]
+                event_stats = HWeventgen.week[day_name][event['type']]
+                self.assertEqual(event['vol'], event_stats['mean_event_volume'])
+                self.assertEqual(event['dur'], event_stats['mean_dur'])
+
+
+class TestHWEventIntervalIndex(unittest.TestCase):
+    """ Unit tests for HW_event_interval_index class """
+
+    def setUp(self):
+        self.interval_index = HW_event_interval_index()
+        self.interval_index.add(10.9, 11.2)
+        self.interval_index.add(3.0, 3.1)
+        self.interval_index.add(12.0, 15.0)
+
+    def test_overlaps(self):
+        """ Test overlap queries, including intervals straddling an hour boundary """
+        self.assertEqual(len(self.interval_index), 3)
+        self.assertTrue(self.interval_index.overlaps(11.1, 11.3))
+        self.assertTrue(self.interval_index.overlaps(10.8, 10.95))
+        self.assertTrue(self.interval_index.overlaps(10.0, 16.0))
+        self.assertTrue(self.interval_index.overlaps(14.5, 14.6))
+        self.assertFalse(self.interval_index.overlaps(11.2, 12.0))
+        self.assertFalse(self.interval_index.overlaps(3.1, 10.9))
+        self.assertFalse(self.interval_index.overlaps(15.0, 15.5))
+
+    def test_overlapping_end_and_first_free_start(self):
+        """ Test that the latest overlapping end and next free start are found """
+        self.assertEqual(self.interval_index.overlapping_end(10.0, 12.5), 15.0)
+        self.assertIsNone(self.interval_index.overlapping_end(5.0, 6.0))
+        self.assertEqual(self.interval_index.first_free_start(10.8, 0.5), 11.2)
+        self.assertEqual(self.interval_index.first_free_start(10.8, 1.0), 15.0)
+        self.assertEqual(self.interval_index.first_free_start(5.0, 1.0), 5.0)
+
+
+class TestHWEventScheduler(unittest.TestCase):
+    """ Unit tests for HW_event_scheduler class """
+
+    def test_schedule_event(self):
+        """ Test that overlapping events are rerolled, with bounded rerolls """
+        # Reroll moves the event 7.5 minutes later each time. Use a short
+        # "year" so that there is no free time after the events scheduled here
+        scheduler = HW_event_scheduler(lambda time: time + 0.125, max_rerolls = 3, end_of_year = 8.0)
+
+        self.assertEqual(scheduler.schedule_event("HotWater", 7.0, 30.0), 7.0)
+        # Events in a different family are not affected
+        self.assertEqual(scheduler.schedule_event("Other", 7.25, 30.0), 7.25)
+        # Rerolled until clear of first event (2 rerolls)
+        self.assertEqual(scheduler.schedule_event("HotWater", 7.25, 7.5), 7.5)
+        # Still overlapping after 3 rerolls, so moved to the end of the
+        # overlapping events
+        self.assertEqual(scheduler.schedule_event("HotWater", 6.875, 60.0), 7.625)
+        # No free time before the end of the year, so overlap left unresolved
+        self.assertEqual(scheduler.schedule_event("HotWater", 6.875, 60.0), 7.25)
+
+        self.assertEqual(
+            scheduler.reroll_stats,
+            {
+                "events": 5,
+                "events_rerolled": 3,
+                "rerolls": 8,
+                "max_rerolls_for_event": 3,
+                "events_shifted": 1,
+                "events_unresolved": 1,
+                },
+            )
+
+    def test_schedule_event_end_of_year(self):
+        """ Test that rerolled start times are not wrapped round to the start
+        of the year """
+        scheduler = HW_event_scheduler(lambda time: time + 0.125, end_of_year = 8.0)
+
+        self.assertEqual(scheduler.schedule_event("HotWater", 7.5, 30.0), 7.5)
+        # Rerolled to 7.75, 7.875 and then 8.0, which is not used, and there
+        # is no free time before the end of the year, so overlap left
+        # unresolved at the last start time within the year
+        self.assertEqual(scheduler.schedule_event("HotWater", 7.625, 15.0), 7.875)
+        self.assertEqual(scheduler.reroll_stats["rerolls"], 3)
+        self.assertEqual(scheduler.reroll_stats["events_shifted"], 0)
+        self.assertEqual(scheduler.reroll_stats["events_unresolved"], 1)
+        # Events away from the end of the year are rerolled as usual
+        self.assertEqual(scheduler.schedule_event("HotWater", 0.0, 30.0), 0.0)
+        self.assertEqual(scheduler.schedule_event("HotWater", 0.25, 15.0), 0.5)
+
+    def test_reroll_event_time(self):
+        """ Test that rerolled times are later by up to 30 minutes, including
+        at the end of the year """
+        HWeventgen = HW_events_generator(100.0)
+        for time in (0.0, 4000.5, 8759.9):
+            with self.subTest(time=time):
+                time_rerolled = HWeventgen.reroll_event_time(time)
+                self.assertGreaterEqual(time_rerolled, time)
+                self.assertLess(time_rerolled, time + 0.5)
@@ -330,43 +330,43 @@ class NotionalBuildingHeatPump(unittest.TestCase):
 			)
 		expected_result = [
 			5.332358870360489, 5.939519167409699, 4.092522651160197, 11.125709204618492, 2.683734986543989,
-			9.383926198021308, 7.276644602132959, 9.905550232417198, 5.868348111624264, 5.000004314682442,
+			9.383926198021308, 7.273304449049013, 9.905550232417198, 5.868348111624264, 5.000004314682442,
 			9.102840819741823, 4.234526304946405, 11.100186816381557, 15.348824847273903, 9.246285943546356,
 			6.5696948007576434, 11.1612061494084, 10.733958619860395, 7.791532848311438, 6.627265970392273,
 			5.96606164905874, 3.618690579010297, 5.097644689351863, 7.905654183398964, 3.5911429248554914,
 			6.931386421275378, 3.9821383566541404, 4.3033711847540035, 13.556004119647904, 9.954514852596839,
 			6.964478582194271, 4.734046394182493, 8.649179975112212, 5.25478413888494, 3.9530611705058227,
-			6.283086643171573, 6.406706699161304, 5.606989680610464, 12.468376402873018, 5.419626263745942,
-			5.872152585988534, 7.429943144307275, 3.8932783845394705, 5.606267945072289, 9.65440986957507,
+			6.28220194987002, 6.397168529116641, 5.606989680610464, 12.468376402873018, 5.419626263745942,
+			5.872152585988534, 7.429943144307275, 3.8932783845394705, 5.606267945072289, 9.654409869575073,
 			6.890177600713714, 4.845355757781505, 9.193220976778155, 5.655617973289041, 6.064895583458154,
 			7.244053287963995, 6.269171253951853, 3.017063334618479, 14.935951183776739, 12.94660499419203,
 			9.207290605900793, 10.064548272991349, 6.357349410695312, 4.988309743710779, 5.944119882202128,
 			5.484461140494693, 15.177903714441321, 7.4169541627030595, 6.053285706116112, 7.249558004142308,
 			4.046916402279789, 5.721069409428999, 4.056253121219603, 3.8410601558871202, 7.441963364046647,
 			5.211078637540669, 3.594949370189899, 8.582498633450516, 12.520468311045741, 3.182405750163948,
-			8.549383500720023, 8.484923528552315, 6.11991505631395, 11.264431683507613, 7.968546208361992,
+			8.549383500720023, 8.475505259700615, 6.11991505631395, 11.264431683507613, 7.968546208361992,
 			4.891724308327831, 8.878345140054341, 5.897584047536178, 10.1082495590307, 4.901851444485903,
 			4.474580986555416, 5.048224350533313, 4.678526095553983, 6.702824355759434, 1.9932691952303097,
-			11.309874044799988, 8.909469281155683, 4.232998459222833, 6.9549019272738475, 2.899788163834349,
+			11.300579664878157, 8.909469281155683, 4.232998459222834, 6.9549019272738475, 2.899788163834349,
 			11.335766800758424, 9.83674039550925, 5.272144007862989, 6.261738757123254, 7.601760156441395,
-			5.204361575580094, 4.619565231848526, 6.176137776056494, 5.514045731129771, 3.1366923956877186,
+			5.204361575580094, 4.619565231848526, 6.176137776056494, 5.514045731129771, 3.136692395687719,
 			10.630811892389696, 3.542033417123719, 5.410401859498289, 6.519151906355308, 6.019958035401171,
-			6.243292125689517, 9.084965214352255, 2.7428629227499153, 2.1752807626132418, 5.6836654164665825,
-			6.628277939182285, 6.341991586154915, 6.440185068183707, 6.576397433157791, 10.78952628021809,
-			5.048102876562236, 3.6386977195991745, 7.648896063912615, 4.781780460377417, 3.095000623305923,
+			6.242423188112191, 9.084965214352255, 2.7428629227499153, 2.1752807626132418, 5.6836654164665825,
+			6.627412949571453, 6.341991586154915, 6.440185068183707, 6.576397433157791, 10.78952628021809,
+			5.048102876562236, 3.639985339521483, 7.648896063912615, 4.781780460377417, 3.095000623305923,
 			4.46257059778781, 10.329596970282955, 6.942969560891599, 6.318260467422231, 13.433436450614568,
 			5.926103248090028, 3.6064719273950407, 4.867494151718431, 6.17627162034108, 3.4840860111547816,
 			3.4788248811311133, 3.6075680564251598, 3.1708644065257845, 5.140059056069278, 11.377969510009006,
-			9.88361662129783, 2.412095962863254, 8.039098871530262, 4.513498906513583, 8.39182153549336,
+			9.88361662129783, 2.412095962863254, 8.039098871530262, 4.513498906513583, 8.393108315838798,
 			5.237748680991073, 7.710727087549717, 5.545313188367929, 3.2614142620635564, 8.15102417032649,
-			6.113786765235915, 3.0462008728724186, 4.627644745707857, 8.96760363640186, 7.869720648636622,
+			6.113786765235915, 3.0462008728724186, 4.627644745707857, 8.967603636401861, 7.869720648636622,
 			2.5572171241264674, 7.772911678408069, 4.5205213857079505, 4.7241011656160286, 4.31583260334098,
 			8.392297126697175, 3.0390045323633097, 2.561758635743069, 3.8055121960102465, 4.957770707010701,
 			7.676816787247491, 2.407241282557557, 10.288106047693773, 5.3664644008984395, 9.688582162151178,
 			6.2758152163561824, 3.426156337911544, 4.605934996360963, 6.920271447213809, 6.671093970146627,
 			4.463070793041712, 8.134076860487129, 7.464564386260888, 3.184254920801133, 7.6831295559993285,
 			3.1992792494123745, 2.8910535510553643, 6.221241585813495, 6.033380220879017, 7.734043467487455,
-			2.8823504901399866, 7.09612065230572, 6.0253402880463085, 3.50287184242603, 3.500113166159563,
+			2.8823504901399866, 7.09612065230572, 6.016263175095261, 3.50287184242603, 3.500113166159563,
 			4.8838421894295205, 5.568459031472862, 5.801671459276577, 7.318062945413172, 4.560137196453809,
 			5.952778364534861, 4.263543713756446, 6.097632784863535, 4.696865417816497, 3.7740902405565064,
 			5.16877248875722, 5.162480044689767, 3.480470677115114, 7.75192694081488, 4.101755187715797,
@@ -374,26 +374,26 @@ class NotionalBuildingHeatPump(unittest.TestCase):
 			6.317681344440151, 2.7439044812169926, 5.898142422154367, 7.371060672897773, 7.9382069864356595,
 			3.5265885568978854, 7.728561460772754, 6.90935469115776, 4.430635427013582, 8.170763380469982,
 			6.132657970862075, 4.631615784693746, 6.264405801911571, 6.464844354983229, 4.266327548130808,
-			5.963112907970409, 6.933072249037472, 4.229825026146224, 4.013862525963428, 9.039362396709436,
+			5.963112907970409, 6.906324518889032, 4.229825026146224, 4.013862525963428, 9.039362396709436,
 			7.285707935765941, 8.968099095377662, 4.341081900663293, 6.917518202342683, 5.164935282976035,
 			2.530324124620448, 5.393220314414821, 5.189402505814991, 5.574963098297244, 5.598838783559906,
-			3.1739305639235624, 4.460613099897497, 3.627833706011235, 10.003466367606544, 2.975228012155293,
+			3.1739305639235624, 4.460613099897497, 3.627833706011235, 10.003466367606544, 2.9719554364440843,
 			8.150670425984215, 5.12934624417735, 4.324060208032451, 4.927430673530184, 4.221873521091226,
-			2.9607093976509526, 3.010109340930027, 3.8080504716951387, 5.334896616074902, 3.6586567562894654,
+			2.9607093976509526, 3.010109340930027, 3.8080504716951387, 5.334013646683913, 3.6586567562894654,
 			6.271402247498758, 7.0782813369230455, 2.342073386651291, 3.144078875386038, 3.44667994569649,
 			6.298084449774622, 3.3299572531554333, 6.949389429005877, 7.263536771162239, 6.072254433289421,
 			3.8155899819551684, 4.790116413410102, 5.655326040499874, 2.4737002270904354, 3.780632006228946,
-			4.3535064060269955, 4.201068552779499, 7.761334516016323, 7.5540577560987385, 8.083786382102824,
-			10.846122101158743, 4.142063737640603, 6.267918299159879, 4.433010039599949, 3.8922385480764823,
+			4.350246943969588, 4.201068552779499, 7.761334516016323, 7.5540577560987385, 8.08289862638957,
+			10.846122101158743, 4.141177562945547, 6.267918299159879, 4.433010039599949, 3.8922385480764823,
 			7.922987532593388, 5.394915277228311, 8.128547962099702, 3.2364949656999573, 8.236112522045971,
-			2.9501733840944353, 5.095266550325053, 6.1431501896601235, 6.950637135573592, 4.171005399737451,
+			2.9468594998878883, 5.095266550325053, 6.1431501896601235, 6.950637135573592, 4.171005399737451,
 			9.35599615925421, 2.899378069279008, 4.8121788692676715, 6.570167885003649, 2.565849518392064,
 			4.7137771160765345, 5.088347786050735, 6.463968407009868, 5.968097693153073, 14.438774178973642,
 			4.637304612995721, 5.275561066357465, 7.551761898546344, 2.1214983279627213, 6.470868818895256,
-			6.474595656576856, 8.024048638394715, 12.889956558433163, 8.95785021997712, 5.419468841823875,
+			6.474595656576856, 8.024048638394715, 12.875309072952353, 8.95785021997712, 5.419468841823875,
 			4.414912376452211, 8.40783283608238, 3.104171170052293, 7.360305184226255, 14.139815632055676,
-			8.789288381510925, 5.952974166665065, 4.078494012824973, 5.080258668518449, 4.488561133836422,
-			4.764103823990652, 5.798522605564636, 10.74911588213892, 5.022580729207448, 6.324466421123345,
+			8.78596490689364, 5.952974166665065, 4.078494012824973, 5.080258668518449, 4.488561133836422,
+			4.764103823990652, 5.798522605564636, 10.74911588213892, 5.022580729207448, 6.324466421123346,
 			3.988806746396135, 6.840653301262988, 9.825079826042588, 6.040742518638523, 6.0589415306794905,
 			3.094885568167805, 6.660422855536369, 6.611471757465271, 3.0122910773699885, 4.9934335234921035,
 			5.07034302912691, 5.996529254492781, 6.437875615060707, 5.558383928156852, 8.582394315779466,